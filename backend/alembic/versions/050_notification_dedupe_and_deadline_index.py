@@ -0,0 +1,39 @@
+"""Add notification dedupe keys and an RFP deadline index for reminders.
+
+Revision ID: 050
+Revises: 049
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "050"
+down_revision = "049"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if _has_table("notifications"):
+        op.add_column(
+            "notifications",
+            sa.Column("dedupe_key", sa.String(length=255), nullable=True),
+        )
+        op.create_index(
+            "ix_notifications_dedupe_key",
+            "notifications",
+            ["dedupe_key"],
+            unique=True,
+        )
+    op.create_index("ix_rfps_response_deadline", "rfps", ["response_deadline"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rfps_response_deadline", table_name="rfps")
+    if _has_table("notifications"):
+        op.drop_index("ix_notifications_dedupe_key", table_name="notifications")
+        op.drop_column("notifications", "dedupe_key")
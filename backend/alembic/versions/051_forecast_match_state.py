@@ -0,0 +1,36 @@
+"""Add per-user watermark table for incremental forecast matching.
+
+Revision ID: 051
+Revises: 050
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "051"
+down_revision = "050"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "forecast_match_states",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_forecast_match_states_user_id",
+        "forecast_match_states",
+        ["user_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecast_match_states_user_id", table_name="forecast_match_states")
+    op.drop_table("forecast_match_states")
@@ -0,0 +1,58 @@
+"""Convert teaming partner JSON arrays to JSONB and index partner discovery.
+
+Revision ID: 052
+Revises: 051
+"""
+
+from alembic import op
+
+revision = "052"
+down_revision = "051"
+branch_labels = None
+depends_on = None
+
+_JSON_COLUMNS = ("naics_codes", "set_asides", "capabilities")
+# Capabilities are searched by keyword substring, which containment indexes
+# cannot serve, so only the exact-match columns get a GIN index.
+_GIN_COLUMNS = ("naics_codes", "set_asides")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # SQLite filters through json_each(); there is no index to build.
+        return
+
+    for column in _JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE teaming_partners ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+        )
+    for column in _GIN_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_teaming_partners_{column}_gin "
+            f"ON teaming_partners USING gin ({column} jsonb_path_ops)"
+        )
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_teaming_partners_name_trgm "
+        "ON teaming_partners USING gin (lower(name) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_teaming_partners_public_name "
+        "ON teaming_partners (name, id) WHERE is_public"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_teaming_partners_public_name")
+    op.execute("DROP INDEX IF EXISTS ix_teaming_partners_name_trgm")
+    for column in _JSON_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_teaming_partners_{column}_gin")
+        op.execute(
+            f"ALTER TABLE teaming_partners ALTER COLUMN {column} TYPE json USING {column}::json"
+        )
@@ -0,0 +1,24 @@
+"""Store MinHash signatures on knowledge base documents for near-duplicate detection.
+
+Revision ID: 053
+Revises: 052
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "053"
+down_revision = "052"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_base_documents",
+        sa.Column("content_minhash", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("knowledge_base_documents", "content_minhash")
@@ -0,0 +1,25 @@
+"""Track IMAP UIDVALIDITY/UID watermarks per email ingest config.
+
+Revision ID: 054
+Revises: 053
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "054"
+down_revision = "053"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("email_ingest_configs", sa.Column("uid_validity", sa.BigInteger(), nullable=True))
+    op.add_column(
+        "email_ingest_configs", sa.Column("last_seen_uid", sa.BigInteger(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("email_ingest_configs", "last_seen_uid")
+    op.drop_column("email_ingest_configs", "uid_validity")
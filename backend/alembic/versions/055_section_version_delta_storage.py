@@ -0,0 +1,118 @@
+"""Store section versions as keyframes plus token deltas.
+
+Revision ID: 055
+Revises: 054
+"""
+
+import json
+import re
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "055"
+down_revision = "054"
+branch_labels = None
+depends_on = None
+
+# Mirrors app.services.section_version_store so the downgrade stays standalone.
+_WORD_TOKEN_RE = re.compile(r"\s+|[^\s]+")
+
+
+def _renumber_duplicate_versions() -> None:
+    """Give sections with repeated version numbers a gap-free 1..n sequence."""
+    conn = op.get_bind()
+    section_ids = conn.execute(
+        sa.text(
+            "SELECT section_id FROM section_versions "
+            "GROUP BY section_id, version_number HAVING COUNT(*) > 1"
+        )
+    ).scalars()
+    for section_id in set(section_ids):
+        rows = conn.execute(
+            sa.text(
+                "SELECT id FROM section_versions WHERE section_id = :section_id "
+                "ORDER BY version_number, id"
+            ),
+            {"section_id": section_id},
+        )
+        for number, row_id in enumerate(rows.scalars().all(), start=1):
+            conn.execute(
+                sa.text("UPDATE section_versions SET version_number = :number WHERE id = :id"),
+                {"number": number, "id": row_id},
+            )
+
+
+def upgrade() -> None:
+    _renumber_duplicate_versions()
+    with op.batch_alter_table("section_versions") as batch_op:
+        batch_op.add_column(
+            sa.Column("storage_kind", sa.String(length=10), nullable=False, server_default="full")
+        )
+        batch_op.add_column(sa.Column("base_version_number", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("content_hash", sa.String(length=64), nullable=True))
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=True)
+    op.create_index(
+        "ix_section_versions_section_version",
+        "section_versions",
+        ["section_id", "version_number"],
+        unique=True,
+    )
+
+
+def _apply_delta(base: str, delta: list) -> str:
+    base_tokens = _WORD_TOKEN_RE.findall(base)
+    position = 0
+    pieces: list[str] = []
+    for op_ in delta:
+        if isinstance(op_, str):
+            pieces.append(op_)
+        elif op_ >= 0:
+            pieces.extend(base_tokens[position : position + op_])
+            position += op_
+        else:
+            position -= op_
+    return "".join(pieces)
+
+
+def _rebuild_delta_rows() -> None:
+    """Write full content back into delta rows before the columns go away."""
+    conn = op.get_bind()
+    section_ids = conn.execute(
+        sa.text("SELECT DISTINCT section_id FROM section_versions WHERE storage_kind = 'delta'")
+    ).scalars()
+    for section_id in list(section_ids):
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, version_number, storage_kind, content, diff_from_previous, "
+                "base_version_number FROM section_versions "
+                "WHERE section_id = :section_id ORDER BY version_number"
+            ),
+            {"section_id": section_id},
+        )
+        # Bases always precede their deltas, so one ordered pass resolves every link.
+        contents: dict[int, str] = {}
+        for row_id, number, storage_kind, content, delta, base_number in rows.all():
+            if storage_kind != "delta":
+                contents[number] = content or ""
+                continue
+            base = contents.get(number - 1 if base_number is None else base_number, "")
+            current = contents[number] = _apply_delta(base, json.loads(delta or "[]"))
+            conn.execute(
+                sa.text(
+                    "UPDATE section_versions SET content = :content, diff_from_previous = NULL "
+                    "WHERE id = :id"
+                ),
+                {"content": current, "id": row_id},
+            )
+
+
+def downgrade() -> None:
+    _rebuild_delta_rows()
+    op.execute("UPDATE section_versions SET content = '' WHERE content IS NULL")
+    op.drop_index("ix_section_versions_section_version", table_name="section_versions")
+    with op.batch_alter_table("section_versions") as batch_op:
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("base_version_number")
+        batch_op.drop_column("storage_kind")
@@ -0,0 +1,34 @@
+"""Index shared data permissions for per-workspace governance aggregates.
+
+Revision ID: 056
+Revises: 055
+"""
+
+from alembic import op
+
+revision = "056"
+down_revision = "055"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_shared_data_permissions_workspace_created",
+        "shared_data_permissions",
+        ["workspace_id", "created_at"],
+    )
+    op.create_index(
+        "ix_shared_data_permissions_workspace_approved",
+        "shared_data_permissions",
+        ["workspace_id", "approval_status", "approved_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_shared_data_permissions_workspace_approved", table_name="shared_data_permissions"
+    )
+    op.drop_index(
+        "ix_shared_data_permissions_workspace_created", table_name="shared_data_permissions"
+    )
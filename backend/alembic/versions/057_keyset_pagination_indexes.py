@@ -0,0 +1,64 @@
+"""Composite indexes for keyset-paginated list endpoints.
+
+Revision ID: 057
+Revises: 056
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "057"
+down_revision = "056"
+branch_labels = None
+depends_on = None
+
+# Each index leads with the endpoint's filter columns and ends with its
+# (sort key, id) ordering so a page is a single index range scan.
+_INDEXES = [
+    ("ix_rfps_user_created_id", "rfps", ["user_id", "created_at", "id"]),
+    ("ix_rfps_user_status_created_id", "rfps", ["user_id", "status", "created_at", "id"]),
+    (
+        "ix_activity_feed_proposal_user_created_id",
+        "activity_feed",
+        ["proposal_id", "user_id", "created_at", "id"],
+    ),
+    ("ix_notifications_user_created_id", "notifications", ["user_id", "created_at", "id"]),
+    (
+        "ix_notifications_user_read_created_id",
+        "notifications",
+        ["user_id", "is_read", "created_at", "id"],
+    ),
+    (
+        "ix_opportunity_contacts_user_created_id",
+        "opportunity_contacts",
+        ["user_id", "created_at", "id"],
+    ),
+    ("ix_award_records_user_created_id", "award_records", ["user_id", "created_at", "id"]),
+    (
+        "ix_budget_intelligence_user_created_id",
+        "budget_intelligence",
+        ["user_id", "created_at", "id"],
+    ),
+    ("ix_market_signals_user_created_id", "market_signals", ["user_id", "created_at", "id"]),
+    (
+        "ix_market_signals_user_relevance_created_id",
+        "market_signals",
+        ["user_id", "relevance_score", "created_at", "id"],
+    ),
+]
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        if _has_table(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        if _has_table(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,41 @@
+"""Deliver webhooks from an outbox with retries and per-endpoint circuit breakers.
+
+Revision ID: 058
+Revises: 057
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "058"
+down_revision = "057"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("webhook_deliveries") as batch_op:
+        batch_op.add_column(
+            sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_webhook_deliveries_status_next_attempt",
+        "webhook_deliveries",
+        ["status", "next_attempt_at"],
+    )
+    with op.batch_alter_table("webhook_subscriptions") as batch_op:
+        batch_op.add_column(
+            sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(sa.Column("circuit_open_until", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("webhook_subscriptions") as batch_op:
+        batch_op.drop_column("circuit_open_until")
+        batch_op.drop_column("consecutive_failures")
+    op.drop_index("ix_webhook_deliveries_status_next_attempt", table_name="webhook_deliveries")
+    with op.batch_alter_table("webhook_deliveries") as batch_op:
+        batch_op.drop_column("next_attempt_at")
+        batch_op.drop_column("attempt_count")
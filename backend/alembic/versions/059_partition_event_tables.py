@@ -0,0 +1,132 @@
+"""Partition audit_events and activity_feed by month on created_at (Postgres only).
+
+Revision ID: 059
+Revises: 058
+"""
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "059"
+down_revision = "058"
+branch_labels = None
+depends_on = None
+
+TABLES = ("audit_events", "activity_feed")
+MONTHS_AHEAD = 2
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _partition(conn, table: str) -> None:
+    old = f"{table}_unpartitioned"
+    sequence = conn.execute(sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+    foreign_keys = conn.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+    indexes = conn.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexname <> :pkey"
+        ),
+        {"table": table, "pkey": f"{table}_pkey"},
+    ).all()
+    oldest = conn.execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+
+    if sequence:
+        conn.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    conn.execute(sa.text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(
+        sa.text(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+    )
+    conn.execute(sa.text(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)"))
+
+    now = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now, MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        conn.execute(
+            sa.text(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+            )
+        )
+        month = upper
+    conn.execute(sa.text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+
+    conn.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    conn.execute(sa.text(f"DROP TABLE {old}"))
+
+    for name, definition in foreign_keys:
+        conn.execute(sa.text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"))
+    for _name, definition in indexes:
+        conn.execute(sa.text(definition.replace(f" ON public.{old} ", f" ON public.{table} ")))
+    if sequence:
+        conn.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+
+
+def _unpartition(conn, table: str) -> None:
+    old = f"{table}_partitioned"
+    sequence = conn.execute(sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+    foreign_keys = conn.execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+        ),
+        {"table": table},
+    ).all()
+    indexes = conn.execute(
+        sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = :table AND indexname <> :pkey"
+        ),
+        {"table": table, "pkey": f"{table}_pkey"},
+    ).all()
+
+    if sequence:
+        conn.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY NONE"))
+    conn.execute(sa.text(f"ALTER TABLE {table} RENAME TO {old}"))
+    conn.execute(
+        sa.text(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    conn.execute(sa.text(f"ALTER TABLE {table} ADD PRIMARY KEY (id)"))
+    conn.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {old}"))
+    conn.execute(sa.text(f"DROP TABLE {old} CASCADE"))
+
+    for name, definition in foreign_keys:
+        conn.execute(sa.text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"))
+    for _name, definition in indexes:
+        conn.execute(sa.text(definition.replace(f" ON public.{old} ", f" ON public.{table} ")))
+    if sequence:
+        conn.execute(sa.text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        # SQLite and other dev databases keep plain tables; retention falls
+        # back to row deletes there.
+        return
+    for table in TABLES:
+        _partition(conn, table)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        return
+    for table in TABLES:
+        _unpartition(conn, table)
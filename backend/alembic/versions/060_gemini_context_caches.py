@@ -0,0 +1,43 @@
+"""Track Gemini context caches by document content so they can be reused.
+
+Revision ID: 060
+Revises: 059
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "060"
+down_revision = "059"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "gemini_context_caches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("content_key", sa.String(length=64), nullable=False),
+        sa.Column("cache_name", sa.String(length=255), nullable=False),
+        sa.Column("model_name", sa.String(length=128), nullable=False),
+        sa.Column("document_ids", sa.JSON(), nullable=True),
+        sa.Column("token_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("storage_token_hours", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refresh_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", "content_key", name="uq_gemini_context_caches_user_key"),
+        sa.UniqueConstraint("cache_name"),
+    )
+    op.create_index("ix_gemini_context_caches_user_id", "gemini_context_caches", ["user_id"])
+    op.create_index("ix_gemini_context_caches_expires_at", "gemini_context_caches", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_gemini_context_caches_expires_at", table_name="gemini_context_caches")
+    op.drop_index("ix_gemini_context_caches_user_id", table_name="gemini_context_caches")
+    op.drop_table("gemini_context_caches")
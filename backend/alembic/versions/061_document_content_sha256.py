@@ -0,0 +1,32 @@
+"""Store the SHA-256 of uploaded knowledge base documents for dedupe.
+
+Revision ID: 061
+Revises: 060
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "061"
+down_revision = "060"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "knowledge_base_documents",
+        sa.Column("content_sha256", sa.String(length=64), nullable=True),
+    )
+    op.create_index(
+        "ix_knowledge_base_documents_content_sha256",
+        "knowledge_base_documents",
+        ["content_sha256"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_knowledge_base_documents_content_sha256", table_name="knowledge_base_documents"
+    )
+    op.drop_column("knowledge_base_documents", "content_sha256")
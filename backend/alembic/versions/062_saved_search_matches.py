@@ -0,0 +1,48 @@
+"""Store saved-search matches recorded when RFPs are written.
+
+Revision ID: 062
+Revises: 061
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "062"
+down_revision = "061"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("saved_searches", sa.Column("matches_built_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "saved_search_matches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "saved_search_id",
+            sa.Integer(),
+            sa.ForeignKey("saved_searches.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "rfp_id", sa.Integer(), sa.ForeignKey("rfps.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("matched_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("saved_search_id", "rfp_id", name="uq_saved_search_matches_search_rfp"),
+    )
+    op.create_index(
+        "ix_saved_search_matches_saved_search_id", "saved_search_matches", ["saved_search_id"]
+    )
+    op.create_index("ix_saved_search_matches_rfp_id", "saved_search_matches", ["rfp_id"])
+    op.create_index("ix_saved_search_matches_user_id", "saved_search_matches", ["user_id"])
+    op.create_index("ix_saved_search_matches_matched_at", "saved_search_matches", ["matched_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_search_matches_matched_at", table_name="saved_search_matches")
+    op.drop_index("ix_saved_search_matches_user_id", table_name="saved_search_matches")
+    op.drop_index("ix_saved_search_matches_rfp_id", table_name="saved_search_matches")
+    op.drop_index("ix_saved_search_matches_saved_search_id", table_name="saved_search_matches")
+    op.drop_table("saved_search_matches")
+    op.drop_column("saved_searches", "matches_built_at")
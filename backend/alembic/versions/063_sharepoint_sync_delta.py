@@ -0,0 +1,29 @@
+"""Track the last pushed content hash and watch delta link for SharePoint sync.
+
+Revision ID: 063
+Revises: 062
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "063"
+down_revision = "062"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sharepoint_sync_configs",
+        sa.Column("last_synced_hash", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        "sharepoint_sync_configs",
+        sa.Column("watch_delta_link", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("sharepoint_sync_configs", "watch_delta_link")
+    op.drop_column("sharepoint_sync_configs", "last_synced_hash")
@@ -0,0 +1,30 @@
+"""Drop the unused GIN index on teaming partner capabilities.
+
+Capability search is a substring match over array elements, which a
+jsonb_path_ops index cannot serve; the index only cost write amplification.
+
+Revision ID: 064
+Revises: 063
+"""
+
+from alembic import op
+
+revision = "064"
+down_revision = "063"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_teaming_partners_capabilities_gin")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_teaming_partners_capabilities_gin "
+        "ON teaming_partners USING gin (capabilities jsonb_path_ops)"
+    )
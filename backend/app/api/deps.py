@@ -4,6 +4,8 @@ RFP Sniper - API Dependencies
 FastAPI dependencies for authentication, database sessions, and rate limiting.
 """
 
+import math
+import time
 from datetime import datetime
 from typing import Annotated, Any
 
@@ -19,6 +21,7 @@ from app.database import get_session
 from app.models.organization import Organization, OrganizationMember, OrgRole
 from app.models.user import User, UserProfile, UserTier
 from app.services.auth_service import UserAuth, decode_token
+from app.services.llm_gateway import bind_llm_tenant, user_tenant
 
 logger = structlog.get_logger(__name__)
 
@@ -53,6 +56,7 @@ async def get_current_user_optional(
     if not user or not user.is_active:
         return None
 
+    bind_llm_tenant(user_tenant(user.id))
     return UserAuth(
         id=user.id,
         email=user.email,
@@ -97,6 +101,8 @@ async def get_current_user(
             detail="User account is deactivated",
         )
 
+    # Attribute any model calls made while serving this request to the user.
+    bind_llm_tenant(user_tenant(user.id))
     return UserAuth(
         id=user.id,
         email=user.email,
@@ -127,16 +133,63 @@ async def get_current_user_with_profile(
 # =============================================================================
 
 
+# Atomic GCRA (generic cell rate algorithm): a single key holds the
+# theoretical arrival time (TAT) in milliseconds. A request of ``cost`` tokens
+# is allowed while the new TAT stays within one window of now, which enforces
+# the limit over any sliding window. The script first tries ``cost + lease``
+# tokens and falls back to ``cost`` alone, so leasing never denies a request
+# that would otherwise pass. Returns {granted, remaining, retry_after_ms}.
+_GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local lease = tonumber(ARGV[4])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+for _, granted in ipairs({cost + lease, cost}) do
+    local new_tat = tat + interval * granted
+    if new_tat - window <= now then
+        redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+        return {granted, math.floor((window - (new_tat - now)) / interval), 0}
+    end
+    if lease == 0 then break end
+end
+return {0, math.floor((window - (tat - now)) / interval), math.ceil(tat + interval * cost - window - now)}
+"""
+
+
+class _LocalLease:
+    __slots__ = ("tokens", "expires_at", "remaining", "hits", "leased_at")
+
+    def __init__(self) -> None:
+        self.tokens = 0
+        self.expires_at = 0.0
+        self.remaining = 0
+        self.hits = 0
+        self.leased_at = 0.0
+
+
 class RedisRateLimiter:
     """
-    Redis-backed rate limiter using INCR + EXPIRE pattern.
-    Supports horizontal scaling — all instances share state via Redis.
+    Redis-backed sliding-window rate limiter (GCRA in one Lua round-trip).
+
+    Supports horizontal scaling — all instances share state via Redis. Hot
+    keys lease a small batch of tokens into a per-process bucket so repeated
+    requests are answered locally; the lease grows with the key's recent
+    request rate and is capped at 1/20 of the limit. Unused leased tokens
+    expire after ``rate_limit_lease_seconds``, and idle keys are swept out of
+    the local table on the same cadence.
     Fails open if Redis is unavailable (availability over strictness).
     """
 
     def __init__(self, redis_url: str) -> None:
         self._redis_url = redis_url
         self._redis = None
+        self._script = None
+        self._leases: dict[str, _LocalLease] = {}
+        self._next_sweep = 0.0
 
     async def _get_redis(self):
         if self._redis is None:
@@ -147,43 +200,90 @@ class RedisRateLimiter:
             )
         return self._redis
 
+    def reset_local(self) -> None:
+        """Drop all locally leased tokens."""
+        self._leases.clear()
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop leases past both their expiry and their lease-sizing window."""
+        if now < self._next_sweep:
+            return
+        horizon = settings.rate_limit_lease_seconds
+        self._next_sweep = now + max(horizon, 1.0)
+        idle = [
+            key
+            for key, lease in self._leases.items()
+            if lease.expires_at <= now and now - lease.leased_at > horizon
+        ]
+        for key in idle:
+            del self._leases[key]
+
+    def _lease_size(self, lease: _LocalLease, max_requests: int, now: float) -> int:
+        max_tokens = min(settings.rate_limit_lease_max_tokens, max_requests // 20)
+        if max_tokens <= 0 or now - lease.leased_at > settings.rate_limit_lease_seconds:
+            # Only keys that used their last lease window get to lease.
+            return 0
+        return min(max_tokens, lease.hits)
+
     async def is_allowed(
         self,
         key: str,
         max_requests: int,
         window_seconds: int,
-    ) -> tuple[bool, int]:
+        cost: int = 1,
+    ) -> tuple[bool, int, int]:
+        """Return ``(allowed, remaining, retry_after_ms)``."""
+        redis_key = f"rate:{key}"
+        now = time.monotonic()
+        self._evict_idle(now)
+        lease = self._leases.get(redis_key)
+        if lease is not None and lease.tokens >= cost and lease.expires_at > now:
+            lease.tokens -= cost
+            lease.hits += 1
+            return True, lease.remaining, 0
+
+        if lease is None:
+            lease = self._leases[redis_key] = _LocalLease()
+        lease_tokens = self._lease_size(lease, max_requests, now)
         try:
             r = await self._get_redis()
-            redis_key = f"rate:{key}"
-            current = await r.incr(redis_key)
-            if current == 1:
-                await r.expire(redis_key, window_seconds)
-            remaining = max(0, max_requests - current)
-            return current <= max_requests, remaining
+            if self._script is None:
+                self._script = r.register_script(_GCRA_LUA)
+            window_ms = window_seconds * 1000
+            granted, remaining, retry_ms = await self._script(
+                keys=[redis_key],
+                args=[window_ms / max_requests, window_ms, cost, lease_tokens],
+            )
         except Exception:
             # Fail open — allow request if Redis is down
             logger.warning("rate_limiter_redis_unavailable", key=key)
-            return True, max_requests
+            return True, max_requests, 0
+
+        granted = int(granted)
+        lease.hits = 1
+        lease.leased_at = now
+        lease.remaining = max(0, int(remaining))
+        lease.tokens = max(0, granted - cost)
+        lease.expires_at = now + settings.rate_limit_lease_seconds
+        return granted >= cost, lease.remaining, max(0, int(retry_ms))
 
 
 # Global rate limiter instance
 rate_limiter = RedisRateLimiter(settings.redis_url)
 
+RATE_LIMIT_WINDOW_SECONDS = 3600
 
-async def check_rate_limit(
+# Per-route token costs. LLM-backed routes spend several tokens per call so a
+# tier's budget reflects load rather than raw request counts.
+RATE_COST_DEFAULT = 1
+RATE_COST_GENERATION = 5
+
+
+async def _enforce_rate_limit(
     request: Request,
-    current_user: UserAuth | None = Depends(get_current_user_optional),
+    current_user: UserAuth | None,
+    cost: int,
 ) -> None:
-    """
-    Check rate limit for the current request.
-
-    Limits vary by user tier:
-    - Free: 100 requests/hour
-    - Starter: 500 requests/hour
-    - Professional: 2000 requests/hour
-    - Enterprise: 10000 requests/hour
-    """
     # Determine rate limit based on tier
     tier_limits = {
         "free": 100,
@@ -202,20 +302,52 @@ async def check_rate_limit(
         key = f"ip:{client_ip}:{request.url.path}"
         max_requests = 200 if settings.debug else 50
 
-    is_allowed, remaining = await rate_limiter.is_allowed(
+    is_allowed, remaining, retry_after_ms = await rate_limiter.is_allowed(
         key=key,
         max_requests=max_requests,
-        window_seconds=3600,  # 1 hour
+        window_seconds=RATE_LIMIT_WINDOW_SECONDS,
+        cost=cost,
     )
 
     if not is_allowed:
+        retry_after = max(1, math.ceil(retry_after_ms / 1000))
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded. Please try again later.",
-            headers={"Retry-After": "3600"},
+            headers={"Retry-After": str(retry_after)},
         )
 
 
+async def check_rate_limit(
+    request: Request,
+    current_user: UserAuth | None = Depends(get_current_user_optional),
+) -> None:
+    """
+    Check rate limit for the current request.
+
+    Limits vary by user tier (tokens per sliding hour; most routes cost 1):
+    - Free: 100 requests/hour
+    - Starter: 500 requests/hour
+    - Professional: 2000 requests/hour
+    - Enterprise: 10000 requests/hour
+    """
+    await _enforce_rate_limit(request, current_user, RATE_COST_DEFAULT)
+
+
+def rate_limit(cost: int = RATE_COST_DEFAULT):
+    """Rate-limit dependency charging ``cost`` tokens per request."""
+    if cost == RATE_COST_DEFAULT:
+        return check_rate_limit
+
+    async def check_weighted_rate_limit(
+        request: Request,
+        current_user: UserAuth | None = Depends(get_current_user_optional),
+    ) -> None:
+        await _enforce_rate_limit(request, current_user, cost)
+
+    return check_weighted_rate_limit
+
+
 # =============================================================================
 # User ID Resolution
 # =============================================================================
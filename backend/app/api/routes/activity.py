@@ -4,11 +4,12 @@ RFP Sniper - Activity Feed Routes
 Paginated activity feed per proposal.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import get_current_user
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.activity import ActivityFeedEntry, ActivityType
 from app.models.proposal import Proposal
@@ -21,8 +22,10 @@ router = APIRouter(prefix="/activity", tags=["Activity"])
 @router.get("/proposals/{proposal_id}", response_model=list[ActivityFeedRead])
 async def list_activity(
     proposal_id: int,
+    response: Response,
     limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Offset paging; prefer cursor"),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     activity_type: str | None = None,
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
@@ -34,17 +37,18 @@ async def list_activity(
     if not proposal_result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Proposal not found")
 
-    stmt = (
-        select(ActivityFeedEntry)
-        .where(
-            ActivityFeedEntry.proposal_id == proposal_id,
-            ActivityFeedEntry.user_id == current_user.id,
-        )
-        .order_by(ActivityFeedEntry.created_at.desc())
+    stmt = select(ActivityFeedEntry).where(
+        ActivityFeedEntry.proposal_id == proposal_id,
+        ActivityFeedEntry.user_id == current_user.id,
     )
     if activity_type:
         stmt = stmt.where(ActivityFeedEntry.activity_type == ActivityType(activity_type))
-    stmt = stmt.offset(offset).limit(limit)
+    order = [(ActivityFeedEntry.created_at, True), (ActivityFeedEntry.id, True)]
+    stmt = keyset_paginate(stmt, order, cursor, limit)
+    if offset and not cursor:
+        stmt = stmt.offset(offset)
 
     result = await session.execute(stmt)
-    return [ActivityFeedRead.model_validate(e) for e in result.scalars().all()]
+    entries, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
+    return [ActivityFeedRead.model_validate(e) for e in entries]
@@ -54,6 +54,17 @@ async def _require_org_admin(
     return org, member
 
 
+def _require_profiling_admin(user: UserAuth) -> None:
+    """Profiling overrides are process-wide, so only platform operators may change them."""
+    allowed = {
+        email.strip().lower()
+        for email in settings.profiling_admin_emails.split(",")
+        if email.strip()
+    }
+    if user.email.lower() not in allowed:
+        raise HTTPException(status_code=403, detail="Platform admin access required")
+
+
 def _celery_broker_available() -> bool:
     """
     Best-effort broker probe for capability diagnostics.
@@ -1,5 +1,5 @@
 """
-Admin routes - Provider maturity + release gate.
+Admin routes - Provider maturity + release gate + runtime profiling.
 """
 
 from datetime import datetime
@@ -9,9 +9,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import UserAuth, get_current_user
 from app.database import get_session
+from app.observability.profiling import get_profiling_config, set_profiling_config
 from app.services.slo_service import slo_collector
 
-from .helpers import _require_org_admin
+from .helpers import _require_org_admin, _require_profiling_admin
+from .schemas import ProfilingConfigUpdate
 
 router = APIRouter()
 
@@ -52,3 +54,27 @@ async def get_release_gate(
     """Release gate based on SLO error budgets across all critical flows."""
     await _require_org_admin(current_user, session)
     return slo_collector.get_release_gate()
+
+
+@router.get("/profiling")
+async def get_profiling(
+    current_user: UserAuth = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Return the effective hot-path profiling configuration."""
+    await _require_org_admin(current_user, session)
+    config = await get_profiling_config()
+    return config.to_dict()
+
+
+@router.put("/profiling")
+async def update_profiling(
+    payload: ProfilingConfigUpdate,
+    current_user: UserAuth = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """Toggle request/task profiling at runtime without a redeploy (all tenants)."""
+    await _require_org_admin(current_user, session)
+    _require_profiling_admin(current_user)
+    config = await set_profiling_config(payload.model_dump(exclude_unset=True))
+    return config.to_dict()
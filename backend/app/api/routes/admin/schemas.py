@@ -2,7 +2,7 @@
 Admin route schemas.
 """
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 from app.models.organization import (
     OrganizationInvitation,
@@ -92,3 +92,10 @@ def _serialize_org_invitation(
         days_until_expiry=days_until_expiry,
         sla_state=sla_state,
     )
+
+
+class ProfilingConfigUpdate(BaseModel):
+    enabled: bool | None = None
+    sample_rate: float | None = Field(default=None, ge=0.0, le=1.0)
+    stack_sampling: bool | None = None
+    allow_header: bool | None = None
@@ -27,18 +27,25 @@ from app.models.proposal import Proposal, ProposalSection, SectionStatus
 from app.models.rfp import RFP, ComplianceMatrix, RFPStatus
 from app.observability.metrics import get_metrics
 from app.services.alert_service import get_alert_counts
+from app.services.cache_service import cached_route
+from app.services.cache_tags import user_tag
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
+def _user_tags(args: dict, _payload: object) -> list[str]:
+    return [user_tag(args["current_user"].id)]
+
+
 # =============================================================================
 # Dashboard Overview
 # =============================================================================
 
 
 @router.get("/dashboard")
+@cached_route("analytics.dashboard", tags=_user_tags)
 async def get_dashboard_metrics(
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
@@ -121,6 +128,7 @@ async def get_dashboard_metrics(
 
 
 @router.get("/rfps")
+@cached_route("analytics.rfps", tags=_user_tags)
 async def get_rfp_analytics(
     days: int = Query(30, ge=7, le=365),
     current_user: UserAuth = Depends(get_current_user),
@@ -218,6 +226,7 @@ async def get_rfp_analytics(
 
 
 @router.get("/proposals")
+@cached_route("analytics.proposals", tags=_user_tags)
 async def get_proposal_analytics(
     days: int = Query(30, ge=7, le=365),
     current_user: UserAuth = Depends(get_current_user),
@@ -319,6 +328,7 @@ async def get_proposal_analytics(
 
 
 @router.get("/documents")
+@cached_route("analytics.documents", tags=_user_tags)
 async def get_document_analytics(
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
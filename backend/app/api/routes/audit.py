@@ -46,6 +46,17 @@ class AuditSummaryResponse(BaseModel):
     by_entity_type: list[dict]
 
 
+def _earliest_retained(start_date: datetime | None) -> datetime:
+    """
+    Lower bound on created_at for audit queries.
+
+    Nothing older than the retention window is kept, so bounding every query
+    by it lets Postgres skip the monthly partitions outside the range.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=settings.audit_retention_days)
+    return max(start_date, cutoff) if start_date else cutoff
+
+
 @router.get("", response_model=list[AuditEventResponse])
 async def list_audit_events(
     entity_type: str | None = Query(None),
@@ -57,14 +68,15 @@ async def list_audit_events(
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[AuditEventResponse]:
-    query = select(AuditEvent).where(AuditEvent.user_id == current_user.id)
+    query = select(AuditEvent).where(
+        AuditEvent.user_id == current_user.id,
+        AuditEvent.created_at >= _earliest_retained(start_date),
+    )
 
     if entity_type:
         query = query.where(AuditEvent.entity_type == entity_type)
     if action:
         query = query.where(AuditEvent.action == action)
-    if start_date:
-        query = query.where(AuditEvent.created_at >= start_date)
     if end_date:
         query = query.where(AuditEvent.created_at <= end_date)
 
@@ -130,10 +142,11 @@ async def export_audit_events(
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
-    query = select(AuditEvent).where(AuditEvent.user_id == current_user.id)
+    query = select(AuditEvent).where(
+        AuditEvent.user_id == current_user.id,
+        AuditEvent.created_at >= _earliest_retained(start_date),
+    )
 
-    if start_date:
-        query = query.where(AuditEvent.created_at >= start_date)
     if end_date:
         query = query.where(AuditEvent.created_at <= end_date)
 
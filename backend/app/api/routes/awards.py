@@ -6,12 +6,13 @@ CRUD for award intelligence records.
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import get_current_user
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.award import AwardRecord
 from app.models.rfp import RFP
@@ -78,17 +79,20 @@ class AwardResponse(BaseModel):
 
 @router.get("", response_model=list[AwardResponse])
 async def list_awards(
+    response: Response,
     rfp_id: int | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[AwardResponse]:
     query = select(AwardRecord).where(AwardRecord.user_id == current_user.id)
     if rfp_id:
         query = query.where(AwardRecord.rfp_id == rfp_id)
-    query = query.order_by(AwardRecord.created_at.desc()).limit(limit)
-    result = await session.execute(query)
-    awards = result.scalars().all()
+    order = [(AwardRecord.created_at, True), (AwardRecord.id, True)]
+    result = await session.execute(keyset_paginate(query, order, cursor, limit))
+    awards, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
     return [AwardResponse.model_validate(award) for award in awards]
 
 
@@ -6,12 +6,13 @@ CRUD endpoints for budget intel records.
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import get_current_user
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.budget_intel import BudgetIntelligence
 from app.models.rfp import RFP
@@ -54,15 +55,20 @@ class BudgetIntelRead(BaseModel):
 
 @router.get("", response_model=list[BudgetIntelRead])
 async def list_budget_intel(
+    response: Response,
     rfp_id: int | None = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[BudgetIntelRead]:
     query = select(BudgetIntelligence).where(BudgetIntelligence.user_id == current_user.id)
     if rfp_id:
         query = query.where(BudgetIntelligence.rfp_id == rfp_id)
-    result = await session.execute(query)
-    records = result.scalars().all()
+    order = [(BudgetIntelligence.created_at, True), (BudgetIntelligence.id, True)]
+    result = await session.execute(keyset_paginate(query, order, cursor, limit))
+    records, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
     return [BudgetIntelRead.model_validate(record) for record in records]
 
 
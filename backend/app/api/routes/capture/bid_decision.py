@@ -4,8 +4,10 @@ Bid Decision Routes
 AI-powered and human bid/no-bid scoring endpoints.
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -52,6 +54,34 @@ class BidScenarioSimulationRequest(BaseModel):
     scenarios: list[ScenarioDefinitionRequest] = Field(default_factory=list)
 
 
+class BidScenarioBatchRequest(BaseModel):
+    rfp_ids: list[int] = Field(..., min_length=1, max_length=200)
+    scenarios: list[ScenarioDefinitionRequest] = Field(default_factory=list, max_length=20)
+    iterations: int = Field(default=2000, ge=100, le=20000)
+    score_std: float = Field(default=10.0, ge=0, le=50)
+    weight_std: float = Field(default=0.15, ge=0, le=1)
+    confidence_level: float = Field(default=0.9, gt=0.5, lt=1)
+    seed: int | None = None
+
+    @model_validator(mode="after")
+    def limit_simulation_size(self):
+        from app.services.bid_decision_service import DEFAULT_BID_CRITERIA
+        from app.services.bid_scenario_service import MAX_BATCH_CELLS
+
+        cells = (
+            len(self.rfp_ids)
+            * (len(self.scenarios) + 1)
+            * self.iterations
+            * len(DEFAULT_BID_CRITERIA)
+        )
+        if cells > MAX_BATCH_CELLS:
+            raise ValueError(
+                "Simulation too large: reduce rfp_ids, scenarios or iterations "
+                f"(scorecards x scenarios x iterations x criteria must not exceed {MAX_BATCH_CELLS})"
+            )
+        return self
+
+
 class ScorecardResponse(BaseModel):
     id: int
     rfp_id: int
@@ -265,6 +295,26 @@ async def get_bid_summary(
     }
 
 
+def _scenario_definitions(scenarios: list[ScenarioDefinitionRequest]) -> list:
+    from app.services.bid_scenario_service import ScenarioAdjustment, ScenarioDefinition
+
+    return [
+        ScenarioDefinition(
+            name=scenario.name,
+            notes=scenario.notes,
+            adjustments=[
+                ScenarioAdjustment(
+                    criterion=adjustment.criterion,
+                    delta=adjustment.delta,
+                    reason=adjustment.reason,
+                )
+                for adjustment in scenario.adjustments
+            ],
+        )
+        for scenario in scenarios
+    ]
+
+
 @router.post("/scorecards/{rfp_id}/scenario-simulator")
 async def simulate_bid_scenarios(
     payload: BidScenarioSimulationRequest,
@@ -277,11 +327,7 @@ async def simulate_bid_scenarios(
     Run deterministic stress-test scenarios against the latest scorecard.
     Returns calibrated confidence, recommendation shift, and explainable drivers.
     """
-    from app.services.bid_scenario_service import (
-        BidScenarioService,
-        ScenarioAdjustment,
-        ScenarioDefinition,
-    )
+    from app.services.bid_scenario_service import BidScenarioService
 
     rfp_result = await session.execute(
         select(RFP).where(RFP.id == rfp_id, RFP.user_id == current_user.id)
@@ -304,26 +350,63 @@ async def simulate_bid_scenarios(
 
     baseline_scorecard = next((card for card in scorecards if card.criteria_scores), scorecards[0])
     simulator = BidScenarioService()
-
-    scenario_defs: list[ScenarioDefinition] = []
-    for scenario in payload.scenarios:
-        adjustments = [
-            ScenarioAdjustment(
-                criterion=adjustment.criterion,
-                delta=adjustment.delta,
-                reason=adjustment.reason,
-            )
-            for adjustment in scenario.adjustments
-        ]
-        scenario_defs.append(
-            ScenarioDefinition(
-                name=scenario.name,
-                notes=scenario.notes,
-                adjustments=adjustments,
-            )
-        )
+    scenario_defs = _scenario_definitions(payload.scenarios)
 
     return simulator.simulate(
         scorecard=baseline_scorecard,
         scenarios=scenario_defs if scenario_defs else None,
     )
+
+
+@router.post("/scorecards/scenario-simulator/batch")
+async def simulate_bid_scenarios_batch(
+    payload: BidScenarioBatchRequest,
+    current_user: UserAuth = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    _rate_limit: None = Depends(check_rate_limit),
+) -> dict:
+    """
+    Monte Carlo sensitivity sweep across a portfolio of scorecards.
+    Returns score distributions, confidence intervals and per-criterion
+    tornado sensitivities for the baseline and each scenario.
+    """
+    from app.services.bid_scenario_service import BidScenarioService, MonteCarloSettings
+
+    rfp_ids = list(dict.fromkeys(payload.rfp_ids))
+    scorecard_result = await session.execute(
+        select(BidScorecard)
+        .join(RFP, RFP.id == BidScorecard.rfp_id)
+        .where(
+            BidScorecard.rfp_id.in_(rfp_ids),
+            BidScorecard.user_id == current_user.id,
+            RFP.user_id == current_user.id,
+        )
+        .order_by(BidScorecard.created_at.desc())
+    )
+    by_rfp: dict[int, list[BidScorecard]] = {}
+    for card in scorecard_result.scalars().all():
+        by_rfp.setdefault(card.rfp_id, []).append(card)
+    if not by_rfp:
+        raise HTTPException(status_code=404, detail="No bid scorecards found for these RFPs")
+
+    # Same baseline choice as the single-RFP simulator: latest card with criteria.
+    baselines = [
+        next((card for card in cards if card.criteria_scores), cards[0])
+        for rfp_id in rfp_ids
+        if (cards := by_rfp.get(rfp_id))
+    ]
+    settings = MonteCarloSettings(
+        iterations=payload.iterations,
+        score_std=payload.score_std,
+        weight_std=payload.weight_std,
+        confidence_level=payload.confidence_level,
+        seed=payload.seed,
+    )
+    result = await asyncio.to_thread(
+        BidScenarioService().simulate_batch,
+        baselines,
+        _scenario_definitions(payload.scenarios),
+        settings,
+    )
+    result["missing_rfp_ids"] = [rfp_id for rfp_id in rfp_ids if rfp_id not in by_rfp]
+    return result
@@ -13,7 +13,6 @@ from app.models.collaboration import (
     ComplianceDigestDeliveryStatus,
     ComplianceDigestFrequency,
     ComplianceDigestRecipientRole,
-    SharedDataPermission,
     WorkspaceComplianceDigestDelivery,
     WorkspaceComplianceDigestSchedule,
     WorkspaceRole,
@@ -142,21 +141,10 @@ async def get_workspace_compliance_digest_preview(
     session: AsyncSession = Depends(get_session),
 ) -> ComplianceDigestPreviewRead:
     await _require_member_role(workspace_id, current_user.id, WorkspaceRole.ADMIN, session)
-    permissions = (
-        (
-            await session.execute(
-                select(SharedDataPermission).where(
-                    SharedDataPermission.workspace_id == workspace_id
-                )
-            )
-        )
-        .scalars()
-        .all()
-    )
-    summary = _calculate_governance_summary(workspace_id, permissions)
-    trends = _calculate_governance_trends(
+    summary = await _calculate_governance_summary(workspace_id, session)
+    trends = await _calculate_governance_trends(
         workspace_id,
-        permissions,
+        session,
         days=days,
         sla_hours=sla_hours,
     )
@@ -232,21 +220,10 @@ async def send_workspace_compliance_digest(
     if not schedule_row.is_enabled:
         raise HTTPException(400, "Compliance digest schedule is disabled")
 
-    permissions = (
-        (
-            await session.execute(
-                select(SharedDataPermission).where(
-                    SharedDataPermission.workspace_id == workspace_id
-                )
-            )
-        )
-        .scalars()
-        .all()
-    )
-    summary = _calculate_governance_summary(workspace_id, permissions)
-    trends = _calculate_governance_trends(
+    summary = await _calculate_governance_summary(workspace_id, session)
+    trends = await _calculate_governance_trends(
         workspace_id,
-        permissions,
+        session,
         days=days,
         sla_hours=sla_hours,
     )
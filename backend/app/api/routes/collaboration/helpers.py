@@ -1,12 +1,15 @@
 """Collaboration helper functions."""
 
+import math
 from datetime import datetime, timedelta
 
 from fastapi import HTTPException
+from sqlalchemy import Date, case, cast, extract
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import func, select
 
 from app.api.utils import get_or_404
+from app.config import settings
 from app.models.collaboration import (
     ComplianceDigestChannel,
     ComplianceDigestDeliveryStatus,
@@ -32,6 +35,8 @@ from app.schemas.collaboration import (
     ShareGovernanceTrendPointRead,
     ShareGovernanceTrendRead,
 )
+from app.services.cache_service import cache_get, cache_invalidate_tags, cache_set
+from app.services.cache_tags import workspace_tag
 
 from .constants import CONTRACT_FEED_CATALOG
 
@@ -114,139 +119,211 @@ def _is_portal_visible_shared_item(
     )
 
 
-def _calculate_governance_summary(
+GOVERNANCE_CACHE_PREFIX = "collab:governance"
+
+
+def _governance_cache_key(workspace_id: int, *parts: object) -> str:
+    return ":".join([GOVERNANCE_CACHE_PREFIX, str(workspace_id), *map(str, parts)])
+
+
+async def _invalidate_governance_cache(workspace_id: int) -> None:
+    """Drop cached governance aggregates after a share is created, approved or removed."""
+    await cache_invalidate_tags([workspace_tag(workspace_id)])
+
+
+def _count_where(condition) -> object:
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _min_where(condition, column) -> object:
+    return func.min(case((condition, column)))
+
+
+def _governance_ttl(now: datetime, *boundaries: datetime | None) -> int:
+    """
+    Cache TTL ending at the next moment a time-based count changes.
+
+    Shares expiring or pending approvals crossing the SLA fire no event that
+    could invalidate the workspace tag, so the entry must age out by then.
+    """
+    ttl = settings.cache_ttl_seconds
+    for boundary in boundaries:
+        if boundary is not None:
+            ttl = min(ttl, math.ceil((boundary - now).total_seconds()))
+    return max(1, ttl)
+
+
+def _day_bucket(column, dialect: str):
+    if dialect == "sqlite":
+        return func.date(column)
+    return cast(column, Date)
+
+
+def _approval_hours(dialect: str):
+    approved_at = SharedDataPermission.approved_at
+    created_at = SharedDataPermission.created_at
+    if dialect == "sqlite":
+        hours = (func.julianday(approved_at) - func.julianday(created_at)) * 24.0
+        return func.max(hours, 0.0)
+    hours = extract("epoch", approved_at - created_at) / 3600.0
+    return func.greatest(hours, 0.0)
+
+
+def _bucket_label(value: object) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+async def _calculate_governance_summary(
     workspace_id: int,
-    permissions: list[SharedDataPermission],
+    session: AsyncSession,
 ) -> ShareGovernanceSummaryRead:
+    cache_key = _governance_cache_key(workspace_id, "summary")
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return ShareGovernanceSummaryRead.model_validate(cached)
+
     now = datetime.utcnow()
     next_week = now + timedelta(days=7)
+    status = SharedDataPermission.approval_status
+    expires_at = SharedDataPermission.expires_at
+    partner = SharedDataPermission.partner_user_id
 
-    pending_approval_count = 0
-    approved_count = 0
-    revoked_count = 0
-    expired_count = 0
-    expiring_7d_count = 0
-    scoped_share_count = 0
-    global_share_count = 0
-
-    for permission in permissions:
-        status = _enum_value(permission.approval_status)
-        if status == ShareApprovalStatus.PENDING.value:
-            pending_approval_count += 1
-        elif status == ShareApprovalStatus.APPROVED.value:
-            approved_count += 1
-        elif status == ShareApprovalStatus.REVOKED.value:
-            revoked_count += 1
-
-        if permission.partner_user_id is None:
-            global_share_count += 1
-        else:
-            scoped_share_count += 1
-
-        if permission.expires_at is None:
-            continue
-        if permission.expires_at <= now:
-            expired_count += 1
-            continue
-        if permission.expires_at <= next_week:
-            expiring_7d_count += 1
+    row = (
+        await session.execute(
+            select(
+                func.count(SharedDataPermission.id),
+                _count_where(status == ShareApprovalStatus.PENDING),
+                _count_where(status == ShareApprovalStatus.APPROVED),
+                _count_where(status == ShareApprovalStatus.REVOKED),
+                _count_where(expires_at <= now),
+                _count_where((expires_at > now) & (expires_at <= next_week)),
+                _count_where(partner.is_not(None)),
+                _count_where(partner.is_(None)),
+                _min_where(expires_at > now, expires_at),
+                _min_where(expires_at > next_week, expires_at),
+            ).where(SharedDataPermission.workspace_id == workspace_id)
+        )
+    ).one()
+    next_expiry, next_expiring_window_entry = row[8], row[9]
 
-    return ShareGovernanceSummaryRead(
+    summary = ShareGovernanceSummaryRead(
         workspace_id=workspace_id,
-        total_shared_items=len(permissions),
-        pending_approval_count=pending_approval_count,
-        approved_count=approved_count,
-        revoked_count=revoked_count,
-        expired_count=expired_count,
-        expiring_7d_count=expiring_7d_count,
-        scoped_share_count=scoped_share_count,
-        global_share_count=global_share_count,
+        total_shared_items=row[0],
+        pending_approval_count=row[1],
+        approved_count=row[2],
+        revoked_count=row[3],
+        expired_count=row[4],
+        expiring_7d_count=row[5],
+        scoped_share_count=row[6],
+        global_share_count=row[7],
+    )
+    await cache_set(
+        cache_key,
+        summary.model_dump(mode="json"),
+        ttl_seconds=_governance_ttl(
+            now,
+            next_expiry,
+            next_expiring_window_entry and next_expiring_window_entry - timedelta(days=7),
+        ),
+        tags=[workspace_tag(workspace_id)],
     )
+    return summary
 
 
-def _calculate_governance_trends(
+async def _calculate_governance_trends(
     workspace_id: int,
-    permissions: list[SharedDataPermission],
+    session: AsyncSession,
     *,
     days: int,
     sla_hours: int,
 ) -> ShareGovernanceTrendRead:
+    cache_key = _governance_cache_key(workspace_id, "trends", days, sla_hours)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return ShareGovernanceTrendRead.model_validate(cached)
+
+    dialect = session.get_bind().dialect.name
     now = datetime.utcnow()
     window_start = (now - timedelta(days=days - 1)).replace(
         hour=0, minute=0, second=0, microsecond=0
     )
+    window_end = window_start + timedelta(days=days)
     sla_cutoff = now - timedelta(hours=sla_hours)
+    in_workspace = SharedDataPermission.workspace_id == workspace_id
+
+    created_day = _day_bucket(SharedDataPermission.created_at, dialect).label("day")
+    shared_rows = await session.execute(
+        select(created_day, func.count(SharedDataPermission.id))
+        .where(
+            in_workspace,
+            SharedDataPermission.created_at >= window_start,
+            SharedDataPermission.created_at < window_end,
+        )
+        .group_by(created_day)
+    )
+    shared_by_day = {_bucket_label(day): count for day, count in shared_rows.all()}
+
+    approval_hours = _approval_hours(dialect)
+    within_sla = approval_hours <= sla_hours
+    approved_day = _day_bucket(SharedDataPermission.approved_at, dialect).label("day")
+    approval_rows = await session.execute(
+        select(
+            approved_day,
+            func.count(SharedDataPermission.id),
+            _count_where(within_sla),
+            func.avg(approval_hours),
+        )
+        .where(
+            in_workspace,
+            SharedDataPermission.approval_status == ShareApprovalStatus.APPROVED,
+            SharedDataPermission.approved_at >= window_start,
+            SharedDataPermission.approved_at < window_end,
+        )
+        .group_by(approved_day)
+    )
+    approvals_by_day = {
+        _bucket_label(day): (completed, within, average)
+        for day, completed, within, average in approval_rows.all()
+    }
 
-    day_buckets: dict[str, dict[str, float | int | list[float]]] = {}
-    for offset in range(days):
-        day = (window_start + timedelta(days=offset)).date().isoformat()
-        day_buckets[day] = {
-            "shared_count": 0,
-            "approvals_completed_count": 0,
-            "approved_within_sla_count": 0,
-            "approved_after_sla_count": 0,
-            "approval_durations": [],
-        }
+    created_at = SharedDataPermission.created_at
+    overdue_pending_count, next_overdue_created_at = (
+        await session.execute(
+            select(
+                _count_where(created_at <= sla_cutoff),
+                _min_where(created_at > sla_cutoff, created_at),
+            ).where(
+                in_workspace,
+                SharedDataPermission.approval_status == ShareApprovalStatus.PENDING,
+            )
+        )
+    ).one()
 
-    overdue_pending_count = 0
+    points: list[ShareGovernanceTrendPointRead] = []
     total_within_sla = 0
     total_after_sla = 0
-
-    for permission in permissions:
-        status = _enum_value(permission.approval_status)
-        created_day = permission.created_at.date().isoformat()
-        if created_day in day_buckets:
-            day_buckets[created_day]["shared_count"] += 1
-
-        if status == ShareApprovalStatus.PENDING.value and permission.created_at <= sla_cutoff:
-            overdue_pending_count += 1
-
-        if status != ShareApprovalStatus.APPROVED.value or not permission.approved_at:
-            continue
-
-        approved_day = permission.approved_at.date().isoformat()
-        if approved_day not in day_buckets:
-            continue
-
-        approval_hours = max(
-            (permission.approved_at - permission.created_at).total_seconds() / 3600,
-            0.0,
+    for offset in range(days):
+        day = (window_start + timedelta(days=offset)).date().isoformat()
+        completed, within, average = approvals_by_day.get(day, (0, 0, None))
+        total_within_sla += within
+        total_after_sla += completed - within
+        points.append(
+            ShareGovernanceTrendPointRead(
+                date=day,
+                shared_count=shared_by_day.get(day, 0),
+                approvals_completed_count=completed,
+                approved_within_sla_count=within,
+                approved_after_sla_count=completed - within,
+                average_approval_hours=round(float(average), 2) if average is not None else None,
+            )
         )
-        day_buckets[approved_day]["approvals_completed_count"] += 1
-        day_buckets[approved_day]["approval_durations"].append(approval_hours)
-
-        if approval_hours <= sla_hours:
-            day_buckets[approved_day]["approved_within_sla_count"] += 1
-            total_within_sla += 1
-        else:
-            day_buckets[approved_day]["approved_after_sla_count"] += 1
-            total_after_sla += 1
 
     total_approved = total_within_sla + total_after_sla
     sla_approval_rate = (
         round((total_within_sla / total_approved) * 100, 2) if total_approved else 0.0
     )
 
-    points: list[ShareGovernanceTrendPointRead] = []
-    for day, bucket in day_buckets.items():
-        approval_durations = bucket["approval_durations"]
-        average_approval_hours = (
-            round(sum(approval_durations) / len(approval_durations), 2)
-            if approval_durations
-            else None
-        )
-        points.append(
-            ShareGovernanceTrendPointRead(
-                date=day,
-                shared_count=int(bucket["shared_count"]),
-                approvals_completed_count=int(bucket["approvals_completed_count"]),
-                approved_within_sla_count=int(bucket["approved_within_sla_count"]),
-                approved_after_sla_count=int(bucket["approved_after_sla_count"]),
-                average_approval_hours=average_approval_hours,
-            )
-        )
-
-    return ShareGovernanceTrendRead(
+    trends = ShareGovernanceTrendRead(
         workspace_id=workspace_id,
         days=days,
         sla_hours=sla_hours,
@@ -254,6 +331,19 @@ def _calculate_governance_trends(
         sla_approval_rate=sla_approval_rate,
         points=points,
     )
+    # The day buckets roll over at midnight; pending shares turn overdue at
+    # created_at + sla_hours.
+    await cache_set(
+        cache_key,
+        trends.model_dump(mode="json"),
+        ttl_seconds=_governance_ttl(
+            now,
+            window_end,
+            next_overdue_created_at and next_overdue_created_at + timedelta(hours=sla_hours),
+        ),
+        tags=[workspace_tag(workspace_id)],
+    )
+    return trends
 
 
 def _calculate_governance_anomalies(
@@ -48,6 +48,7 @@ from .helpers import (
     _calculate_governance_summary,
     _calculate_governance_trends,
     _enum_value,
+    _invalidate_governance_cache,
     _require_member_role,
     _resolve_shared_data_label,
     _serialize_shared_data,
@@ -195,6 +196,7 @@ async def share_data(
     session.add(perm)
     await session.commit()
     await session.refresh(perm)
+    await _invalidate_governance_cache(workspace_id)
     return _serialize_shared_data(perm)
 
 
@@ -253,6 +255,8 @@ async def apply_contract_feed_preset(
         applied_count += 1
 
     await session.commit()
+    if applied_count:
+        await _invalidate_governance_cache(workspace_id)
 
     shared_result = await session.execute(
         select(SharedDataPermission).where(SharedDataPermission.workspace_id == workspace_id)
@@ -289,11 +293,7 @@ async def get_shared_data_governance_summary(
     session: AsyncSession = Depends(get_session),
 ) -> ShareGovernanceSummaryRead:
     await _require_member_role(workspace_id, current_user.id, WorkspaceRole.VIEWER, session)
-    result = await session.execute(
-        select(SharedDataPermission).where(SharedDataPermission.workspace_id == workspace_id)
-    )
-    permissions = result.scalars().all()
-    return _calculate_governance_summary(workspace_id, permissions)
+    return await _calculate_governance_summary(workspace_id, session)
 
 
 @router.get(
@@ -308,13 +308,9 @@ async def get_shared_data_governance_trends(
     session: AsyncSession = Depends(get_session),
 ) -> ShareGovernanceTrendRead:
     await _require_member_role(workspace_id, current_user.id, WorkspaceRole.VIEWER, session)
-    result = await session.execute(
-        select(SharedDataPermission).where(SharedDataPermission.workspace_id == workspace_id)
-    )
-    permissions = result.scalars().all()
-    return _calculate_governance_trends(
+    return await _calculate_governance_trends(
         workspace_id,
-        permissions,
+        session,
         days=days,
         sla_hours=sla_hours,
     )
@@ -332,14 +328,10 @@ async def get_shared_data_governance_anomalies(
     session: AsyncSession = Depends(get_session),
 ) -> list[GovernanceAnomalyRead]:
     await _require_member_role(workspace_id, current_user.id, WorkspaceRole.VIEWER, session)
-    result = await session.execute(
-        select(SharedDataPermission).where(SharedDataPermission.workspace_id == workspace_id)
-    )
-    permissions = result.scalars().all()
-    summary = _calculate_governance_summary(workspace_id, permissions)
-    trends = _calculate_governance_trends(
+    summary = await _calculate_governance_summary(workspace_id, session)
+    trends = await _calculate_governance_trends(
         workspace_id,
-        permissions,
+        session,
         days=days,
         sla_hours=sla_hours,
     )
@@ -500,6 +492,7 @@ async def approve_shared_data(
         session.add(permission)
         await session.commit()
         await session.refresh(permission)
+        await _invalidate_governance_cache(workspace_id)
     return _serialize_shared_data(permission)
 
 
@@ -522,3 +515,4 @@ async def unshare_data(
         raise HTTPException(404, "Permission not found")
     await session.delete(perm)
     await session.commit()
+    await _invalidate_governance_cache(workspace_id)
@@ -13,7 +13,7 @@ from app.models.collaboration import SharedWorkspace, WorkspaceMember
 from app.schemas.collaboration import WorkspaceCreate, WorkspaceRead, WorkspaceUpdate
 from app.services.auth_service import UserAuth
 
-from .helpers import _member_count
+from .helpers import _invalidate_governance_cache, _member_count
 
 router = APIRouter()
 
@@ -126,3 +126,4 @@ async def delete_workspace(
         raise HTTPException(403, "Only the workspace owner can delete it")
     await session.delete(ws)
     await session.commit()
+    await _invalidate_governance_cache(workspace_id)
@@ -7,13 +7,14 @@ CRUD for opportunity contacts, AI extraction, and agency directory.
 from datetime import datetime
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import check_rate_limit, get_current_user
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.contact import AgencyContactDatabase, OpportunityContact
 from app.models.rfp import RFP
@@ -239,17 +240,20 @@ def _merge_contact_metadata(
 
 @router.get("", response_model=list[ContactResponse])
 async def list_contacts(
+    response: Response,
     rfp_id: int | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[ContactResponse]:
     query = select(OpportunityContact).where(OpportunityContact.user_id == current_user.id)
     if rfp_id:
         query = query.where(OpportunityContact.rfp_id == rfp_id)
-    query = query.order_by(OpportunityContact.created_at.desc()).limit(limit)
-    result = await session.execute(query)
-    contacts = result.scalars().all()
+    order = [(OpportunityContact.created_at, True), (OpportunityContact.id, True)]
+    result = await session.execute(keyset_paginate(query, order, cursor, limit))
+    contacts, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
     return [ContactResponse.model_validate(contact) for contact in contacts]
 
 
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from sse_starlette.sse import EventSourceResponse
 
-from app.api.deps import check_rate_limit, get_current_user
+from app.api.deps import RATE_COST_GENERATION, get_current_user, rate_limit
 from app.database import get_session
 from app.models.dash import DashMessage, DashRole, DashSession
 from app.services.audit_service import log_audit_event
@@ -221,7 +221,9 @@ async def _persist_exchange(
     return msg_id
 
 
-@router.post("/ask", response_model=DashAskResponse, dependencies=[Depends(check_rate_limit)])
+@router.post(
+    "/ask", response_model=DashAskResponse, dependencies=[Depends(rate_limit(RATE_COST_GENERATION))]
+)
 async def ask_dash(
     payload: DashAskRequest,
     current_user: UserAuth = Depends(get_current_user),
@@ -260,7 +262,7 @@ async def ask_dash(
     return DashAskResponse(answer=answer, citations=citations, message_id=message_id)
 
 
-@router.post("/chat", dependencies=[Depends(check_rate_limit)])
+@router.post("/chat", dependencies=[Depends(rate_limit(RATE_COST_GENERATION))])
 async def chat_dash_stream(
     payload: DashChatRequest,
     current_user: UserAuth = Depends(get_current_user),
@@ -4,14 +4,16 @@ RFP Sniper - Document Management Routes
 Knowledge Base document upload and management.
 """
 
+import asyncio
 import errno
 import os
 import tempfile
+import uuid
 from datetime import datetime
 
 import structlog
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Path, Query, UploadFile
-from sqlalchemy import delete
+from sqlalchemy import delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -44,6 +46,14 @@ from app.services.embedding_service import (
     delete_entity_embeddings,
     index_entity,
 )
+from app.services.near_duplicate_service import compute_document_minhash
+from app.services.upload_storage import (
+    UploadTooLargeError,
+    read_file,
+    remove_file,
+    safe_upload_filename,
+    save_upload,
+)
 from app.services.webhook_service import dispatch_webhook_event
 
 router = APIRouter(prefix="/documents", tags=["Knowledge Base"])
@@ -106,24 +116,32 @@ async def _process_text_document_inline(
     await session.commit()
 
     await session.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document.id))
-    session.add(
-        DocumentChunk(
-            document_id=document.id,
-            content=full_text,
-            page_number=1,
-            start_char=0,
-            end_char=len(full_text),
-            chunk_index=0,
-            word_count=len(full_text.split()),
-        )
+    chunk = DocumentChunk(
+        document_id=document.id,
+        content=full_text,
+        page_number=1,
+        start_char=0,
+        end_char=len(full_text),
+        chunk_index=0,
+        word_count=len(full_text.split()),
     )
+    session.add(chunk)
 
     document.full_text = full_text
+    # Signatures are always computed from chunk contents so every ingest path
+    # agrees; hashing is CPU-bound, so keep it off the event loop.
+    document.content_minhash = await asyncio.to_thread(compute_document_minhash, [chunk.content])
     document.page_count = 1
     document.extracted_metadata = {"source": "text"}
     document.processing_status = ProcessingStatus.READY
     document.processed_at = datetime.utcnow()
 
+    await _index_knowledge_document(session, document)
+    await session.commit()
+    await session.refresh(document)
+
+
+async def _index_knowledge_document(session: AsyncSession, document: KnowledgeBaseDocument) -> None:
     try:
         await index_entity(
             session,
@@ -144,6 +162,69 @@ async def _process_text_document_inline(
             error=str(exc),
         )
 
+
+async def _find_stored_duplicate(
+    session: AsyncSession, user_id: int, content_sha256: str
+) -> KnowledgeBaseDocument | None:
+    """
+    Earlier upload by the same user with identical bytes whose file still exists.
+
+    Processed uploads are preferred so their extraction results can be reused.
+    """
+    result = await session.execute(
+        select(KnowledgeBaseDocument)
+        .where(
+            KnowledgeBaseDocument.user_id == user_id,
+            KnowledgeBaseDocument.content_sha256 == content_sha256,
+        )
+        .order_by(KnowledgeBaseDocument.created_at.desc())
+    )
+    candidates = sorted(
+        result.scalars().all(),
+        key=lambda doc: doc.processing_status != ProcessingStatus.READY,
+    )
+    for candidate in candidates:
+        if await asyncio.to_thread(os.path.exists, candidate.file_path):
+            return candidate
+    return None
+
+
+async def _reuse_processed_duplicate(
+    *,
+    session: AsyncSession,
+    source: KnowledgeBaseDocument,
+    document: KnowledgeBaseDocument,
+) -> None:
+    """Copy extraction results from an identical upload instead of reprocessing."""
+    result = await session.execute(
+        select(DocumentChunk)
+        .where(DocumentChunk.document_id == source.id)
+        .order_by(DocumentChunk.chunk_index)
+    )
+    for chunk in result.scalars().all():
+        session.add(
+            DocumentChunk(
+                document_id=document.id,
+                content=chunk.content,
+                page_number=chunk.page_number,
+                start_char=chunk.start_char,
+                end_char=chunk.end_char,
+                chunk_index=chunk.chunk_index,
+                word_count=chunk.word_count,
+                content_hash=chunk.content_hash,
+            )
+        )
+
+    document.full_text = source.full_text
+    document.content_minhash = source.content_minhash
+    document.page_count = source.page_count
+    document.extracted_metadata = {**(source.extracted_metadata or {}), "duplicate_of": source.id}
+    document.processing_status = ProcessingStatus.READY
+    document.processing_error = None
+    document.processed_at = datetime.utcnow()
+
+    # Embeddings cover title and description too, so they are not copied.
+    await _index_knowledge_document(session, document)
     await session.commit()
     await session.refresh(document)
 
@@ -193,8 +274,6 @@ async def get_document_stats(
     """
     Get document statistics for the current user.
     """
-    from sqlalchemy import func
-
     total_result = await session.execute(
         select(func.count(KnowledgeBaseDocument.id)).where(
             KnowledgeBaseDocument.user_id == current_user.id
@@ -273,28 +352,32 @@ async def upload_document(
             detail=f"Unsupported file type: {file.content_type}. Allowed: PDF, TXT, DOC, DOCX",
         )
 
-    # Check file size
-    file_content = await file.read()
-    file_size = len(file_content)
-    max_size = settings.max_upload_size_mb * 1024 * 1024
-
-    if file_size > max_size:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB",
-        )
-
-    # Save file
     resolved_user_id = resolve_user_id(user_id, current_user)
     upload_dir = _ensure_upload_dir(resolved_user_id)
 
-    # Generate unique filename
+    # Stream to disk in chunks, enforcing the size limit and hashing as we go
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    safe_filename = f"{timestamp}_{file.filename}"
-    file_path = os.path.join(upload_dir, safe_filename)
+    token = uuid.uuid4().hex[:8]
+    safe_filename = f"{timestamp}_{token}_{safe_upload_filename(file.filename)}"
+    try:
+        stored = await save_upload(
+            file,
+            upload_dir,
+            safe_filename,
+            max_bytes=settings.max_upload_size_mb * 1024 * 1024,
+        )
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB",
+        ) from None
 
-    with open(file_path, "wb") as f:
-        f.write(file_content)
+    # Identical bytes already stored for this user: keep one copy on disk
+    duplicate = await _find_stored_duplicate(session, resolved_user_id, stored.sha256)
+    file_path = stored.path
+    if duplicate is not None:
+        await remove_file(stored.path)
+        file_path = duplicate.file_path
 
     # Create database record
     document = KnowledgeBaseDocument(
@@ -305,7 +388,8 @@ async def upload_document(
         description=description,
         original_filename=file.filename,
         file_path=file_path,
-        file_size_bytes=file_size,
+        file_size_bytes=stored.size_bytes,
+        content_sha256=stored.sha256,
         mime_type=file.content_type,
         processing_status=ProcessingStatus.PENDING,
     )
@@ -332,14 +416,36 @@ async def upload_document(
     await session.commit()
     await session.refresh(document)
 
+    if duplicate is not None and duplicate.processing_status == ProcessingStatus.READY:
+        try:
+            await _reuse_processed_duplicate(session=session, source=duplicate, document=document)
+            logger.info(
+                "Reused processed duplicate upload",
+                document_id=document.id,
+                duplicate_of=duplicate.id,
+            )
+        except Exception as exc:
+            await session.rollback()
+            await session.refresh(document)
+            logger.warning(
+                "Reusing duplicate upload failed; processing normally",
+                document_id=document.id,
+                duplicate_of=duplicate.id,
+                error=str(exc),
+            )
+
     # Queue processing task (non-fatal if broker unavailable). In local/mock mode
     # without a worker, process text uploads inline for deterministic E2E behavior.
-    if _should_process_documents_synchronously() and file.content_type == "text/plain":
+    if (
+        document.processing_status != ProcessingStatus.READY
+        and _should_process_documents_synchronously()
+        and file.content_type == "text/plain"
+    ):
         try:
             await _process_text_document_inline(
                 session=session,
                 document=document,
-                file_content=file_content,
+                file_content=await read_file(document.file_path),
             )
         except Exception as exc:
             logger.warning(
@@ -455,9 +561,15 @@ async def delete_document(
     if not document or document.user_id != current_user.id:
         raise HTTPException(status_code=404, detail=f"Document {document_id} not found")
 
-    # Delete file from disk
-    if os.path.exists(document.file_path):
-        os.remove(document.file_path)
+    # Delete file from disk unless an identical upload still shares it
+    shared_result = await session.execute(
+        select(func.count(KnowledgeBaseDocument.id)).where(
+            KnowledgeBaseDocument.file_path == document.file_path,
+            KnowledgeBaseDocument.id != document.id,
+        )
+    )
+    if not shared_result.scalar():
+        await remove_file(document.file_path)
 
     await log_audit_event(
         session,
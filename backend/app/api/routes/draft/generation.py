@@ -15,13 +15,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import (
+    RATE_COST_GENERATION,
     check_rate_limit,
     get_current_user,
     get_current_user_optional,
+    rate_limit,
     resolve_user_id,
 )
 from app.config import settings
 from app.database import get_session
+from app.lazy_imports import loaded_attr
 from app.models.proposal import Proposal, ProposalSection, SectionStatus
 from app.models.rfp import ComplianceMatrix
 from app.schemas.generation import (
@@ -42,6 +45,7 @@ from app.schemas.proposal import (
 )
 from app.services.auth_service import UserAuth
 from app.services.embedding_service import compose_proposal_section_text, index_entity
+from app.services.generation_stream import SectionStreamPublisher
 from app.tasks.generation_tasks import (
     generate_all_sections,
     generate_proposal_section,
@@ -56,11 +60,6 @@ _GEMINI_RETRY_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
-try:
-    from google.api_core.exceptions import ResourceExhausted as GeminiResourceExhausted
-except Exception:  # pragma: no cover - dependency may be absent in some environments
-    GeminiResourceExhausted = None
-
 
 def _raise_http_from_generation_error(exc: Exception) -> None:
     if isinstance(exc, HTTPException):
@@ -68,8 +67,9 @@ def _raise_http_from_generation_error(exc: Exception) -> None:
 
     message = str(exc)
     lowered = message.lower()
+    resource_exhausted = loaded_attr("google.api_core.exceptions", "ResourceExhausted")
     is_quota_error = (
-        (GeminiResourceExhausted is not None and isinstance(exc, GeminiResourceExhausted))
+        (resource_exhausted is not None and isinstance(exc, resource_exhausted))
         or "quota exceeded" in lowered
         or "resourceexhausted" in lowered
         or "rate limit reached" in lowered
@@ -201,7 +201,7 @@ async def generate_sections_from_matrix(
     proposal_id: int,
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-    _rate_limit: None = Depends(check_rate_limit),
+    _rate_limit: None = Depends(rate_limit(RATE_COST_GENERATION)),
 ) -> dict:
     """
     Auto-generate proposal sections from the RFP's compliance matrix.
@@ -268,7 +268,7 @@ async def rewrite_section(
     request: RewriteRequest,
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-    _rate_limit: None = Depends(check_rate_limit),
+    _rate_limit: None = Depends(rate_limit(RATE_COST_GENERATION)),
 ) -> ProposalSectionRead:
     """Rewrite a section's content with a new tone or custom instructions."""
     resolved_user_id = current_user.id
@@ -296,14 +296,25 @@ async def rewrite_section(
     from app.services.gemini_service import GeminiService
 
     gemini = GeminiService()
+    # Collaborators in the proposal room watch the rewrite as it is written.
+    stream = SectionStreamPublisher(
+        proposal_id=proposal.id,
+        section_id=section.id,
+        user_id=proposal.user_id,
+        extract_citations=gemini._extract_citations,
+        operation="rewrite",
+    )
+    await stream.started()
     try:
         generated = await gemini.rewrite_section(
             content=content,
             requirement_text=section.requirement_text or section.title,
             tone=request.tone,
             instructions=request.instructions,
+            on_chunk=stream.chunk,
         )
     except Exception as exc:
+        await stream.error(str(exc))
         _raise_http_from_generation_error(exc)
 
     section.set_generated_content(generated)
@@ -340,6 +351,11 @@ async def rewrite_section(
 
     await session.commit()
     await session.refresh(section)
+    await stream.complete(
+        status=section.status.value,
+        word_count=len(generated.clean_text.split()),
+        quality_score=section.quality_score,
+    )
     return ProposalSectionRead.model_validate(section)
 
 
@@ -349,7 +365,7 @@ async def expand_section(
     request: ExpandRequest,
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-    _rate_limit: None = Depends(check_rate_limit),
+    _rate_limit: None = Depends(rate_limit(RATE_COST_GENERATION)),
 ) -> ProposalSectionRead:
     """Expand a section's content with more detail."""
     resolved_user_id = current_user.id
@@ -377,14 +393,25 @@ async def expand_section(
     from app.services.gemini_service import GeminiService
 
     gemini = GeminiService()
+    # Collaborators in the proposal room watch the expand as it is written.
+    stream = SectionStreamPublisher(
+        proposal_id=proposal.id,
+        section_id=section.id,
+        user_id=proposal.user_id,
+        extract_citations=gemini._extract_citations,
+        operation="expand",
+    )
+    await stream.started()
     try:
         generated = await gemini.expand_section(
             content=content,
             requirement_text=section.requirement_text or section.title,
             target_words=request.target_words,
             focus_area=request.focus_area,
+            on_chunk=stream.chunk,
         )
     except Exception as exc:
+        await stream.error(str(exc))
         _raise_http_from_generation_error(exc)
 
     section.set_generated_content(generated)
@@ -421,6 +448,11 @@ async def expand_section(
 
     await session.commit()
     await session.refresh(section)
+    await stream.complete(
+        status=section.status.value,
+        word_count=len(generated.clean_text.split()),
+        quality_score=section.quality_score,
+    )
     return ProposalSectionRead.model_validate(section)
 
 
@@ -606,7 +638,7 @@ async def generate_all_proposal_sections(
     tone: str = Query("professional", pattern="^(professional|technical|executive)$"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-    _rate_limit: None = Depends(check_rate_limit),
+    _rate_limit: None = Depends(rate_limit(RATE_COST_GENERATION)),
 ) -> dict:
     """
     Generate all pending sections for a proposal.
@@ -35,6 +35,8 @@ from app.schemas.outline import (
     OutlineSectionRead,
     OutlineSectionUpdate,
 )
+from app.services.cache_service import cached_route
+from app.services.cache_tags import outline_tag, proposal_tag
 
 router = APIRouter()
 
@@ -164,6 +166,10 @@ async def generate_outline(
 
 
 @router.get("/proposals/{proposal_id}/outline", response_model=OutlineRead)
+@cached_route(
+    "draft.outline",
+    tags=lambda args, payload: [proposal_tag(args["proposal_id"]), outline_tag(payload["id"])],
+)
 async def get_outline(
     proposal_id: int,
     user_id: int | None = Query(None),
@@ -19,7 +19,6 @@ from app.models.proposal import (
     ProposalVersion,
     ProposalVersionType,
     SectionStatus,
-    SectionVersion,
 )
 from app.models.rfp import ComplianceMatrix
 from app.schemas.proposal import (
@@ -31,6 +30,7 @@ from app.services.activity_service import log_activity
 from app.services.audit_service import log_audit_event
 from app.services.auth_service import UserAuth
 from app.services.embedding_service import compose_proposal_section_text, index_entity
+from app.services.section_version_store import add_section_version
 from app.services.webhook_service import dispatch_webhook_event
 
 router = APIRouter()
@@ -275,22 +275,15 @@ async def update_section(
 
     # Version tracking
     if "final_content" in update_data or "status" in update_data:
-        max_version_result = await session.execute(
-            select(func.max(SectionVersion.version_number)).where(
-                SectionVersion.section_id == section.id
-            )
-        )
-        max_version = max_version_result.scalar() or 0
-        section_version = SectionVersion(
+        await add_section_version(
+            session,
             section_id=section.id,
             user_id=resolved_user_id,
-            version_number=max_version + 1,
             content=section.final_content or "",
             word_count=section.word_count or 0,
             change_type="edited" if "final_content" in update_data else "status_change",
             change_summary="Section updated",
         )
-        session.add(section_version)
 
         proposal_max_result = await session.execute(
             select(func.max(ProposalVersion.version_number)).where(
@@ -125,6 +125,14 @@ async def update_config(
         )
     if "password" in update_data:
         config.encrypted_password = encrypt_value(update_data.pop("password"))
+    mailbox_fields = ("imap_server", "imap_port", "email_address", "folder")
+    if any(
+        field in update_data and update_data[field] != getattr(config, field)
+        for field in mailbox_fields
+    ):
+        # A different mailbox has its own UID space; start from UNSEEN again.
+        config.uid_validity = None
+        config.last_seen_uid = None
     for field, value in update_data.items():
         setattr(config, field, value)
     config.updated_at = datetime.utcnow()
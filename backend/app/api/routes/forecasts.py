@@ -4,7 +4,7 @@ Procurement forecast CRUD and matching routes.
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -159,10 +159,11 @@ async def link_forecast_to_rfp(
 
 @router.post("/match")
 async def trigger_matching(
+    full: bool = Query(False, description="Re-score all pairs instead of only changes"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
-    new_alerts = await run_forecast_matching(session, current_user.id)
+    new_alerts = await run_forecast_matching(session, current_user.id, full=full)
     await session.commit()
     return {"new_alerts": len(new_alerts)}
 
@@ -25,7 +25,8 @@ from app.database import get_session
 from app.models.rfp import RFP, RFPStatus
 from app.schemas.rfp import SAMIngestResponse, SAMSearchParams
 from app.services.auth_service import UserAuth
-from app.services.cache_service import cache_clear_prefix
+from app.services.cache_service import cache_invalidate_tags
+from app.services.cache_tags import user_tag
 from app.services.ingest_service import SAMGovAPIError, SAMGovService
 from app.tasks.ingest_tasks import ingest_sam_opportunities
 
@@ -133,7 +134,7 @@ async def _run_synchronous_ingest(
         saved_count += 1
 
     await session.commit()
-    await cache_clear_prefix(f"rfps:list:{user_id}:")
+    await cache_invalidate_tags([user_tag(user_id)])
 
     task_id = f"sync-{int(datetime.utcnow().timestamp())}"
 
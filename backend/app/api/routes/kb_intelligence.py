@@ -9,11 +9,21 @@ from datetime import datetime
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from sqlmodel import select
 
 from app.api.deps import UserAuth, check_rate_limit, get_current_user, resolve_user_id
 from app.database import get_session
-from app.models.knowledge_base import DocumentType, KnowledgeBaseDocument, ProcessingStatus
+from app.models.knowledge_base import (
+    DocumentType,
+    KnowledgeBaseDocument,
+    ProcessingStatus,
+)
+from app.services.near_duplicate_service import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    LSHIndex,
+    group_similar_pairs,
+)
 
 logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/kb-intelligence", tags=["Knowledge Base Intelligence"])
@@ -293,26 +303,42 @@ async def auto_tag_document(
     return {"document_id": doc.id, "tags": doc.tags, "tags_added": len(tags) - len(doc.tags or [])}
 
 
+def _duplicate_entry(doc: KnowledgeBaseDocument) -> dict:
+    return {
+        "id": doc.id,
+        "title": doc.title,
+        "type": doc.document_type.value
+        if hasattr(doc.document_type, "value")
+        else str(doc.document_type),
+        "size": doc.file_size_bytes,
+    }
+
+
 @router.get("/duplicates")
 async def detect_duplicates(
     user_id: int | None = Query(default=None),
+    threshold: float = Query(default=DEFAULT_SIMILARITY_THRESHOLD, ge=0.1, le=1.0),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    Detect potential duplicate documents based on title similarity and metadata.
+    Detect potential duplicate documents.
+
+    Groups documents by normalized title, by contract number, and by content
+    similarity (MinHash/LSH over chunk text, estimated Jaccard >= ``threshold``).
     """
     uid = resolve_user_id(user_id, current_user)
 
     result = await session.execute(
         select(KnowledgeBaseDocument)
+        .options(defer(KnowledgeBaseDocument.full_text))
         .where(
             KnowledgeBaseDocument.user_id == uid,
             KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
         )
         .order_by(KnowledgeBaseDocument.title)
     )
-    docs = result.scalars().all()
+    docs = list(result.scalars().all())
 
     duplicates: list[dict] = []
     seen: dict[str, list[dict]] = {}
@@ -326,14 +352,7 @@ async def detect_duplicates(
         normalized = normalized.strip()
 
         key = normalized
-        entry = {
-            "id": doc.id,
-            "title": doc.title,
-            "type": doc.document_type.value
-            if hasattr(doc.document_type, "value")
-            else str(doc.document_type),
-            "size": doc.file_size_bytes,
-        }
+        entry = _duplicate_entry(doc)
 
         if key in seen:
             seen[key].append(entry)
@@ -360,6 +379,29 @@ async def detect_duplicates(
         if len(group) > 1:
             duplicates.append({"match_type": "contract_number", "key": cn, "documents": group})
 
+    # Near-duplicate content via LSH candidate retrieval
+    index = LSHIndex()
+    for doc in docs:
+        if doc.content_minhash:
+            index.add(doc.id, doc.content_minhash)
+    similar = index.similar_pairs(threshold)
+    docs_by_id = {doc.id: doc for doc in docs}
+    for members in group_similar_pairs(similar):
+        pairs = [
+            {"document_ids": [left, right], "similarity": round(score, 3)}
+            for left, right, score in similar
+            if left in members
+        ]
+        duplicates.append(
+            {
+                "match_type": "content",
+                "key": f"content:{min(members)}",
+                "similarity": max(pair["similarity"] for pair in pairs),
+                "pairs": pairs,
+                "documents": [_duplicate_entry(docs_by_id[doc_id]) for doc_id in sorted(members)],
+            }
+        )
+
     return {
         "duplicate_groups": duplicates,
         "total_potential_duplicates": sum(len(g["documents"]) for g in duplicates),
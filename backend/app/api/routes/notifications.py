@@ -5,135 +5,29 @@ Email notifications and deadline reminders.
 """
 
 from datetime import datetime, timedelta
-from enum import Enum
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import JSON, Column, Field, SQLModel, Text, select
+from sqlmodel import select
 
 from app.api.deps import UserAuth, get_current_user
-from app.config import settings
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
+from app.models.notification import (
+    Notification,
+    NotificationPreferences,
+    NotificationType,
+    PushSubscription,
+)
 from app.models.rfp import RFP
-from app.models.user import User
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
-# =============================================================================
-# Notification Models
-# =============================================================================
-
-
-class NotificationType(str, Enum):
-    """Types of notifications."""
-
-    DEADLINE_REMINDER = "deadline_reminder"
-    RFP_MATCH = "rfp_match"
-    ANALYSIS_COMPLETE = "analysis_complete"
-    GENERATION_COMPLETE = "generation_complete"
-    SYSTEM_ALERT = "system_alert"
-    TEAM_INVITE = "team_invite"
-    COMMENT_ADDED = "comment_added"
-    MENTION = "mention"
-
-
-class NotificationChannel(str, Enum):
-    """Delivery channels."""
-
-    EMAIL = "email"
-    IN_APP = "in_app"
-    SLACK = "slack"
-    WEBHOOK = "webhook"
-
-
-class Notification(SQLModel, table=True):
-    """
-    Notification record.
-    """
-
-    __tablename__ = "notifications"
-
-    id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
-
-    # Notification content
-    notification_type: NotificationType
-    title: str = Field(max_length=255)
-    message: str = Field(sa_column=Column(Text))
-
-    # Delivery
-    channels: list[str] = Field(default=["in_app"], sa_column=Column(JSON))
-    is_read: bool = Field(default=False)
-    is_sent: bool = Field(default=False)
-    sent_at: datetime | None = None
-
-    # Related entities
-    rfp_id: int | None = Field(default=None, foreign_key="rfps.id")
-    proposal_id: int | None = Field(default=None, foreign_key="proposals.id")
-
-    # Metadata
-    meta: dict = Field(default={}, sa_column=Column("metadata", JSON))
-
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
-
-class NotificationPreferences(SQLModel, table=True):
-    """
-    User notification preferences.
-    """
-
-    __tablename__ = "notification_preferences"
-
-    id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", unique=True)
-
-    # Email preferences
-    email_enabled: bool = Field(default=True)
-    email_address: str | None = Field(default=None, max_length=255)
-
-    # Notification types
-    deadline_reminders: bool = Field(default=True)
-    deadline_days_before: list[int] = Field(default=[7, 3, 1], sa_column=Column(JSON))
-    rfp_matches: bool = Field(default=True)
-    analysis_complete: bool = Field(default=True)
-    generation_complete: bool = Field(default=True)
-    team_activity: bool = Field(default=True)
-
-    # Slack integration
-    slack_enabled: bool = Field(default=False)
-    slack_webhook_url: str | None = Field(default=None, max_length=500)
-
-    # Quiet hours (no notifications)
-    quiet_hours_enabled: bool = Field(default=False)
-    quiet_hours_start: str | None = Field(default=None, max_length=5)  # "22:00"
-    quiet_hours_end: str | None = Field(default=None, max_length=5)  # "08:00"
-
-    # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-
-
-class PushSubscription(SQLModel, table=True):
-    """Browser push subscription registration."""
-
-    __tablename__ = "push_subscriptions"
-
-    id: int | None = Field(default=None, primary_key=True)
-    user_id: int = Field(foreign_key="users.id", index=True)
-    endpoint: str = Field(max_length=1000)
-    p256dh_key: str = Field(max_length=500)
-    auth_key: str = Field(max_length=500)
-    user_agent: str | None = Field(default=None, max_length=500)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_used_at: datetime | None = None
-
-
 # =============================================================================
 # Request/Response Schemas
 # =============================================================================
@@ -193,190 +87,6 @@ class PushSubscriptionResponse(BaseModel):
     created_at: datetime
 
 
-# =============================================================================
-# Email Service
-# =============================================================================
-
-
-class EmailService:
-    """Email sending service via Resend."""
-
-    @staticmethod
-    async def send_email(
-        to_email: str,
-        subject: str,
-        body_html: str,
-        body_text: str = None,
-    ) -> bool:
-        """Send an email via Resend API."""
-        if not settings.email_enabled:
-            logger.info("Email delivery disabled, skipping", to=to_email, subject=subject)
-            return True
-
-        api_key = settings.resend_api_key
-        if not api_key:
-            logger.warning("RESEND_API_KEY not configured, email skipped", to=to_email)
-            return False
-
-        try:
-            import httpx
-
-            async with httpx.AsyncClient(timeout=10) as client:
-                payload = {
-                    "from": settings.email_from,
-                    "to": [to_email],
-                    "subject": subject,
-                    "html": body_html,
-                }
-                if body_text:
-                    payload["text"] = body_text
-
-                resp = await client.post(
-                    "https://api.resend.com/emails",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    json=payload,
-                )
-                resp.raise_for_status()
-
-            logger.info("Email sent via Resend", to=to_email, subject=subject)
-            return True
-
-        except Exception as e:
-            logger.error("Email send failed", to=to_email, error=str(e))
-            return False
-
-    @staticmethod
-    def build_deadline_reminder_email(
-        rfp: RFP,
-        days_until: int,
-    ) -> tuple[str, str, str]:
-        """
-        Build deadline reminder email content.
-
-        Returns: (subject, html_body, text_body)
-        """
-        subject = (
-            f"⏰ RFP Deadline in {days_until} day{'s' if days_until != 1 else ''}: {rfp.title[:50]}"
-        )
-
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <div style="background: #1a365d; color: white; padding: 20px; text-align: center;">
-                <h1 style="margin: 0;">RFP Sniper</h1>
-            </div>
-
-            <div style="padding: 20px;">
-                <h2>⏰ Deadline Reminder</h2>
-
-                <p>The response deadline for the following opportunity is in <strong>{days_until} day{"s" if days_until != 1 else ""}</strong>:</p>
-
-                <div style="background: #f7f7f7; padding: 15px; border-left: 4px solid #e53e3e; margin: 20px 0;">
-                    <h3 style="margin-top: 0;">{rfp.title}</h3>
-                    <p><strong>Solicitation:</strong> {rfp.solicitation_number}</p>
-                    <p><strong>Agency:</strong> {rfp.agency}</p>
-                    <p><strong>Deadline:</strong> {rfp.response_deadline.strftime("%B %d, %Y at %I:%M %p") if rfp.response_deadline else "TBD"}</p>
-                </div>
-
-                <p>
-                    <a href="{settings.app_url}/opportunities/{rfp.id}"
-                       style="background: #3182ce; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
-                        View in RFP Sniper
-                    </a>
-                </p>
-            </div>
-
-            <div style="background: #f7f7f7; padding: 15px; text-align: center; font-size: 12px; color: #666;">
-                <p>You're receiving this because you have deadline reminders enabled.</p>
-                <p><a href="{settings.app_url}/settings/notifications">Manage notification preferences</a></p>
-            </div>
-        </body>
-        </html>
-        """
-
-        text_body = f"""
-RFP Sniper - Deadline Reminder
-
-The response deadline for the following opportunity is in {days_until} day{"s" if days_until != 1 else ""}:
-
-{rfp.title}
-Solicitation: {rfp.solicitation_number}
-Agency: {rfp.agency}
-Deadline: {rfp.response_deadline.strftime("%B %d, %Y at %I:%M %p") if rfp.response_deadline else "TBD"}
-
-View in RFP Sniper: {settings.app_url}/opportunities/{rfp.id}
-        """
-
-        return subject, html_body, text_body
-
-
-email_service = EmailService()
-
-
-# =============================================================================
-# Slack Service
-# =============================================================================
-
-
-class SlackService:
-    """
-    Slack webhook notification service.
-    """
-
-    @staticmethod
-    async def send_webhook(
-        webhook_url: str,
-        message: dict,
-    ) -> bool:
-        """
-        Send a message to Slack via webhook.
-        """
-        try:
-            import httpx
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url,
-                    json=message,
-                    timeout=10.0,
-                )
-                return response.status_code == 200
-
-        except Exception as e:
-            logger.error(f"Slack webhook failed: {e}")
-            return False
-
-    @staticmethod
-    def build_deadline_message(rfp: RFP, days_until: int) -> dict:
-        """Build Slack message for deadline reminder."""
-        return {
-            "blocks": [
-                {
-                    "type": "header",
-                    "text": {
-                        "type": "plain_text",
-                        "text": f"⏰ RFP Deadline in {days_until} Day{'s' if days_until != 1 else ''}",
-                    },
-                },
-                {
-                    "type": "section",
-                    "fields": [
-                        {"type": "mrkdwn", "text": f"*Title:*\n{rfp.title[:100]}"},
-                        {"type": "mrkdwn", "text": f"*Agency:*\n{rfp.agency}"},
-                        {"type": "mrkdwn", "text": f"*Solicitation:*\n{rfp.solicitation_number}"},
-                        {
-                            "type": "mrkdwn",
-                            "text": f"*Deadline:*\n{rfp.response_deadline.strftime('%B %d, %Y') if rfp.response_deadline else 'TBD'}",
-                        },
-                    ],
-                },
-            ],
-        }
-
-
-slack_service = SlackService()
-
-
 # =============================================================================
 # Endpoints
 # =============================================================================
@@ -385,8 +95,10 @@ slack_service = SlackService()
 @router.get("", response_model=list[NotificationResponse], include_in_schema=False)
 @router.get("/", response_model=list[NotificationResponse])
 async def list_notifications(
+    response: Response,
     unread_only: bool = Query(False),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[NotificationResponse]:
@@ -398,10 +110,12 @@ async def list_notifications(
     if unread_only:
         query = query.where(Notification.is_read == False)
 
-    query = query.order_by(Notification.created_at.desc()).limit(limit)
+    order = [(Notification.created_at, True), (Notification.id, True)]
+    query = keyset_paginate(query, order, cursor, limit)
 
     result = await session.execute(query)
-    notifications = list(result.scalars().all())
+    notifications, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
 
     return [
         NotificationResponse(
@@ -720,60 +434,14 @@ async def create_notification(
     return notification
 
 
-async def send_deadline_reminders(session: AsyncSession):
+async def send_deadline_reminders(session: AsyncSession) -> dict[str, int]:
     """
     Check for upcoming deadlines and send reminders.
     Called by Celery beat scheduler.
-    """
-    # Get all users with preferences
-    users_result = await session.execute(
-        select(User, NotificationPreferences)
-        .join(
-            NotificationPreferences,
-            User.id == NotificationPreferences.user_id,
-        )
-        .where(NotificationPreferences.deadline_reminders == True)
-    )
 
-    for user, prefs in users_result.all():
-        reminder_days = prefs.deadline_days_before or [7, 3, 1]
-
-        for days in reminder_days:
-            target_date = datetime.utcnow().date() + timedelta(days=days)
-
-            # Find RFPs with deadline on target date
-            rfps_result = await session.execute(
-                select(RFP)
-                .where(
-                    RFP.user_id == user.id,
-                    RFP.response_deadline != None,
-                )
-                .where(
-                    RFP.response_deadline >= datetime.combine(target_date, datetime.min.time()),
-                    RFP.response_deadline
-                    < datetime.combine(target_date + timedelta(days=1), datetime.min.time()),
-                )
-            )
+    Delegates to the set-based reminder engine: one windowed query for all
+    due reminders, idempotent bulk insert, concurrent batched delivery.
+    """
+    from app.services.deadline_reminder_service import run_deadline_reminders
 
-            for rfp in rfps_result.scalars().all():
-                # Create in-app notification
-                await create_notification(
-                    session=session,
-                    user_id=user.id,
-                    notification_type=NotificationType.DEADLINE_REMINDER,
-                    title=f"RFP Deadline in {days} day{'s' if days != 1 else ''}",
-                    message=f"{rfp.title} - {rfp.agency}",
-                    rfp_id=rfp.id,
-                )
-
-                # Send email if enabled
-                if prefs.email_enabled and prefs.email_address:
-                    subject, html, text = email_service.build_deadline_reminder_email(rfp, days)
-                    await email_service.send_email(prefs.email_address, subject, html, text)
-
-                # Send Slack if enabled
-                if prefs.slack_enabled and prefs.slack_webhook_url:
-                    message = slack_service.build_deadline_message(rfp, days)
-                    await slack_service.send_webhook(prefs.slack_webhook_url, message)
-
-    logger.info("Deadline reminders sent")
+    return await run_deadline_reminders(session)
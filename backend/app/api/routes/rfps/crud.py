@@ -7,7 +7,7 @@ List, create, update, delete RFPs and summary statistics.
 from datetime import datetime
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
@@ -16,6 +16,7 @@ from app.api.deps import (
     get_current_user_optional,
     resolve_user_id,
 )
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.rfp import RFP, RFPStatus
 from app.schemas.rfp import (
@@ -26,7 +27,13 @@ from app.schemas.rfp import (
 )
 from app.services.audit_service import log_audit_event
 from app.services.auth_service import UserAuth
-from app.services.cache_service import cache_clear_prefix, cache_get, cache_set
+from app.services.cache_service import (
+    cache_get,
+    cache_invalidate_tags,
+    cache_set,
+    cached_route,
+)
+from app.services.cache_tags import rfp_tag, user_tag
 from app.services.embedding_service import (
     compose_rfp_text,
     delete_entity_embeddings,
@@ -40,28 +47,35 @@ logger = structlog.get_logger(__name__)
 
 @router.get("/", response_model=list[RFPListItem])
 async def list_rfps(
+    response: Response,
     user_id: int | None = Query(None, description="User ID (optional if authenticated)"),
     status: RFPStatus | None = Query(None, description="Filter by status"),
     qualified_only: bool = Query(False, description="Only show qualified RFPs"),
     source_type: str | None = Query(None, description="Filter by source type"),
     jurisdiction: str | None = Query(None, description="Filter by jurisdiction"),
     currency: str | None = Query(None, description="Filter by currency code"),
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Offset paging; prefer cursor"),
     limit: int = Query(50, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth | None = Depends(get_current_user_optional),
     session: AsyncSession = Depends(get_session),
 ) -> list[RFPListItem]:
     """
     List RFPs for a user with optional filtering.
+
+    Newest first. The cursor for the next page is returned in the
+    ``X-Next-Cursor`` response header.
     """
     resolved_user_id = resolve_user_id(user_id, current_user)
+    # v2: entries are {"items", "next_cursor"}; bare lists were v1.
     cache_key = (
-        f"rfps:list:{resolved_user_id}:{status}:{qualified_only}:{source_type}:"
-        f"{jurisdiction}:{currency}:{skip}:{limit}"
+        f"rfps:list:v2:{resolved_user_id}:{status}:{qualified_only}:{source_type}:"
+        f"{jurisdiction}:{currency}:{skip}:{limit}:{cursor}"
     )
     cached = await cache_get(cache_key)
     if cached is not None:
-        return cached
+        set_next_cursor(response, cached["next_cursor"])
+        return cached["items"]
     query = select(RFP).where(RFP.user_id == resolved_user_id)
 
     if status:
@@ -91,12 +105,20 @@ async def list_rfps(
         elif currency_values:
             query = query.where(RFP.currency.in_(currency_values))
 
-    query = query.order_by(RFP.created_at.desc()).offset(skip).limit(limit)
+    order = [(RFP.created_at, True), (RFP.id, True)]
+    query = keyset_paginate(query, order, cursor, limit)
+    if skip and not cursor:
+        query = query.offset(skip)
 
     result = await session.execute(query)
-    rfps = result.scalars().all()
+    rfps, next_cursor = keyset_page(result.scalars().all(), order, limit)
     payload = [RFPListItem.model_validate(rfp).model_dump() for rfp in rfps]
-    await cache_set(cache_key, payload)
+    await cache_set(
+        cache_key,
+        {"items": payload, "next_cursor": next_cursor},
+        tags=[user_tag(resolved_user_id)],
+    )
+    set_next_cursor(response, next_cursor)
     return payload
 
 
@@ -148,6 +170,7 @@ async def get_rfp_stats(
 
 
 @router.get("/{rfp_id}", response_model=RFPRead)
+@cached_route("rfps.detail", tags=lambda args, _: [rfp_tag(args["rfp_id"])])
 async def get_rfp(
     rfp_id: int = Path(..., description="RFP ID"),
     current_user: UserAuth = Depends(get_current_user),
@@ -240,7 +263,7 @@ async def create_rfp(
         logger.warning("RFP semantic index update failed", rfp_id=rfp.id, error=str(exc))
     await session.commit()
     await session.refresh(rfp)
-    await cache_clear_prefix(f"rfps:list:{resolved_user_id}:")
+    await cache_invalidate_tags([user_tag(resolved_user_id)])
 
     return RFPRead.model_validate(rfp)
 
@@ -307,7 +330,7 @@ async def update_rfp(
         logger.warning("RFP semantic reindex failed", rfp_id=rfp.id, error=str(exc))
     await session.commit()
     await session.refresh(rfp)
-    await cache_clear_prefix(f"rfps:list:{rfp.user_id}:")
+    await cache_invalidate_tags([rfp_tag(rfp.id), user_tag(rfp.user_id)])
 
     return RFPRead.model_validate(rfp)
 
@@ -356,7 +379,7 @@ async def delete_rfp(
         logger.warning("RFP embedding cleanup failed", rfp_id=rfp.id, error=str(exc))
     await session.delete(rfp)
     await session.commit()
-    await cache_clear_prefix(f"rfps:list:{rfp.user_id}:")
+    await cache_invalidate_tags([rfp_tag(rfp.id), user_tag(rfp.user_id)])
 
     return {"message": f"RFP {rfp_id} deleted"}
 
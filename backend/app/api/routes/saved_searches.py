@@ -2,23 +2,27 @@
 RFP Sniper - Saved Search Routes
 ================================
 Saved opportunity searches and match evaluation.
+
+Matches are recorded as RFPs are written (see
+``app.services.saved_search_percolator``); running a search reads them.
 """
 
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import or_
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import check_rate_limit, get_current_user
 from app.database import get_session
-from app.models.rfp import RFP, RFPStatus
-from app.models.saved_search import SavedSearch
+from app.models.rfp import RFP
+from app.models.saved_search import SavedSearch, SavedSearchMatch
 from app.schemas.rfp import RFPListItem
 from app.services.audit_service import log_audit_event
 from app.services.auth_service import UserAuth
+from app.services.saved_search_percolator import rebuild_search_matches
 
 router = APIRouter(prefix="/saved-searches", tags=["Saved Searches"])
 
@@ -55,80 +59,6 @@ class SavedSearchRunResponse(BaseModel):
     ran_at: datetime
 
 
-def _normalize_list(value: object | None) -> list[str]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [str(item).strip() for item in value if str(item).strip()]
-    if isinstance(value, str):
-        return [item.strip() for item in value.split(",") if item.strip()]
-    return []
-
-
-def _apply_filters(query, filters: dict):
-    keywords = _normalize_list(filters.get("keywords"))
-    agencies = _normalize_list(filters.get("agencies"))
-    naics_codes = _normalize_list(filters.get("naics_codes"))
-    set_asides = _normalize_list(filters.get("set_asides"))
-    statuses = _normalize_list(filters.get("statuses"))
-    source_types = _normalize_list(filters.get("source_types"))
-    jurisdictions = _normalize_list(filters.get("jurisdictions"))
-    currencies = _normalize_list(filters.get("currencies"))
-    contract_vehicles = _normalize_list(filters.get("contract_vehicles"))
-
-    min_value = filters.get("min_value")
-    max_value = filters.get("max_value")
-
-    if keywords:
-        like_terms = []
-        for keyword in keywords:
-            pattern = f"%{keyword}%"
-            like_terms.append(RFP.title.ilike(pattern))
-            like_terms.append(RFP.description.ilike(pattern))
-            like_terms.append(RFP.summary.ilike(pattern))
-            like_terms.append(RFP.solicitation_number.ilike(pattern))
-        query = query.where(or_(*like_terms))
-
-    if agencies:
-        agency_filters = [RFP.agency.ilike(f"%{agency}%") for agency in agencies]
-        query = query.where(or_(*agency_filters))
-
-    if naics_codes:
-        query = query.where(RFP.naics_code.in_(naics_codes))
-
-    if set_asides:
-        query = query.where(RFP.set_aside.in_(set_asides))
-
-    if statuses:
-        valid_statuses = [
-            RFPStatus(status) for status in statuses if status in RFPStatus._value2member_map_
-        ]
-        if valid_statuses:
-            query = query.where(RFP.status.in_(valid_statuses))
-
-    if source_types:
-        query = query.where(RFP.source_type.in_(source_types))
-
-    if jurisdictions:
-        query = query.where(RFP.jurisdiction.in_(jurisdictions))
-
-    if currencies:
-        query = query.where(RFP.currency.in_([value.upper() for value in currencies]))
-
-    if contract_vehicles:
-        query = query.where(RFP.contract_vehicle.in_(contract_vehicles))
-
-    if isinstance(min_value, (int, float)):
-        query = query.where(RFP.estimated_value != None)  # noqa: E711
-        query = query.where(RFP.estimated_value >= int(min_value))
-
-    if isinstance(max_value, (int, float)):
-        query = query.where(RFP.estimated_value != None)  # noqa: E711
-        query = query.where(RFP.estimated_value <= int(max_value))
-
-    return query
-
-
 @router.get("", response_model=list[SavedSearchResponse])
 async def list_saved_searches(
     current_user: UserAuth = Depends(get_current_user),
@@ -157,6 +87,7 @@ async def create_saved_search(
     )
     session.add(search)
     await session.flush()
+    await rebuild_search_matches(session, search)
 
     await log_audit_event(
         session,
@@ -193,6 +124,8 @@ async def update_saved_search(
     for field, value in update_data.items():
         setattr(search, field, value)
     search.updated_at = datetime.utcnow()
+    if "filters" in update_data:
+        await rebuild_search_matches(session, search)
 
     await log_audit_event(
         session,
@@ -232,6 +165,9 @@ async def delete_saved_search(
         action="saved_search.deleted",
         metadata={"name": search.name},
     )
+    await session.execute(
+        delete(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == search.id)
+    )
     await session.delete(search)
     await session.commit()
 
@@ -256,9 +192,19 @@ async def run_saved_search(
     if not search:
         raise HTTPException(status_code=404, detail="Saved search not found")
 
-    query = select(RFP).where(RFP.user_id == current_user.id)
-    query = _apply_filters(query, search.filters)
-    query = query.order_by(RFP.created_at.desc()).limit(limit)
+    if search.matches_built_at is None:
+        await rebuild_search_matches(session, search)
+
+    query = (
+        select(RFP)
+        .join(SavedSearchMatch, SavedSearchMatch.rfp_id == RFP.id)
+        .where(
+            SavedSearchMatch.saved_search_id == search.id,
+            RFP.user_id == current_user.id,
+        )
+        .order_by(RFP.created_at.desc())
+        .limit(limit)
+    )
     matches_result = await session.execute(query)
     matches = matches_result.scalars().all()
 
@@ -84,6 +84,9 @@ async def configure_sync(
     existing = result.scalar_one_or_none()
 
     if existing:
+        if existing.sharepoint_folder != payload.sharepoint_folder:
+            # Files already in the new folder are reported on the next watch run.
+            existing.watch_delta_link = None
         existing.sharepoint_folder = payload.sharepoint_folder
         existing.sync_direction = payload.sync_direction
         existing.auto_sync_enabled = payload.auto_sync_enabled
@@ -6,11 +6,12 @@ from typing import Any, Optional
 
 import httpx
 from defusedxml import ElementTree
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import check_rate_limit, get_current_user
+from app.api.utils import keyset_page, keyset_paginate, set_next_cursor
 from app.database import get_session
 from app.models.budget_intel import BudgetIntelligence
 from app.models.market_signal import MarketSignal, SignalSubscription, SignalType
@@ -196,8 +197,9 @@ async def get_signal_feed(
     signal_type: SignalType | None = None,
     agency: str | None = None,
     unread_only: bool = False,
-    limit: int = Query(default=50, le=200),
-    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0, description="Offset paging; prefer cursor"),
+    cursor: str | None = Query(None, description="Opaque cursor from next_cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> SignalListResponse:
@@ -217,29 +219,43 @@ async def get_signal_feed(
     total = (await session.execute(count_query)).scalar() or 0
 
     # Fetch page
-    query = query.order_by(MarketSignal.relevance_score.desc(), MarketSignal.created_at.desc())
-    query = query.offset(offset).limit(limit)
+    order = [
+        (MarketSignal.relevance_score, True),
+        (MarketSignal.created_at, True),
+        (MarketSignal.id, True),
+    ]
+    query = keyset_paginate(query, order, cursor, limit)
+    if offset and not cursor:
+        query = query.offset(offset)
     result = await session.execute(query)
-    signals = result.scalars().all()
+    signals, next_cursor = keyset_page(result.scalars().all(), order, limit)
 
     return SignalListResponse(
         signals=[SignalRead.model_validate(s) for s in signals],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
 @router.get("", response_model=list[SignalRead])
 async def list_signals(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=200),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[SignalRead]:
+    order = [(MarketSignal.created_at, True), (MarketSignal.id, True)]
     result = await session.execute(
-        select(MarketSignal)
-        .where(MarketSignal.user_id == current_user.id)
-        .order_by(MarketSignal.created_at.desc())
-        .limit(100)
+        keyset_paginate(
+            select(MarketSignal).where(MarketSignal.user_id == current_user.id),
+            order,
+            cursor,
+            limit,
+        )
     )
-    signals = result.scalars().all()
+    signals, next_cursor = keyset_page(result.scalars().all(), order, limit)
+    set_next_cursor(response, next_cursor)
     return [SignalRead.model_validate(s) for s in signals]
 
 
@@ -1,10 +1,12 @@
 """Teaming Board - Partner Search / Discovery."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, case, exists, func, literal, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.api.deps import get_current_user
+from app.api.utils import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
 from app.database import get_session
 from app.models.capture import TeamingPartner
 from app.schemas.teaming import TeamingPartnerPublicProfile
@@ -13,41 +15,120 @@ from app.services.auth_service import UserAuth
 router = APIRouter()
 
 
+def _is_sqlite(session: AsyncSession) -> bool:
+    bind = session.get_bind()
+    return bool(bind and bind.dialect.name == "sqlite")
+
+
+def _like_contains(text: str) -> str:
+    escaped = text.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _json_array_contains(session: AsyncSession, column, value: str):
+    """Exact element match on a JSON array column (GIN ``@>`` on Postgres)."""
+    if _is_sqlite(session):
+        elements = func.json_each(column).table_valued("value").alias()
+        return exists(select(literal(1)).select_from(elements).where(elements.c.value == value))
+    return column.contains([value])
+
+
+def _json_array_element_like(session: AsyncSession, column, text: str):
+    """
+    Case-insensitive substring match against any element of a JSON array.
+
+    No index can serve this; it scans the elements of the partners left after
+    the indexed filters.
+    """
+    if _is_sqlite(session):
+        elements = func.json_each(column).table_valued("value").alias()
+    else:
+        elements = func.jsonb_array_elements_text(column).table_valued("value").alias()
+    return exists(
+        select(literal(1))
+        .select_from(elements)
+        .where(func.lower(elements.c.value).like(_like_contains(text), escape="\\"))
+    )
+
+
+def _relevance_expr(q: str | None):
+    """Exact name > prefix > substring; constant when there is no text query."""
+    if not q:
+        return literal(0)
+    lowered = func.lower(TeamingPartner.name)
+    escaped = _like_contains(q)[1:]
+    return case(
+        (lowered == q.lower(), 3),
+        (lowered.like(escaped, escape="\\"), 2),
+        else_=1,
+    )
+
+
 @router.get("/search", response_model=list[TeamingPartnerPublicProfile])
 async def search_partners(
+    response: Response,
     naics: str | None = Query(None, description="Filter by NAICS code"),
     set_aside: str | None = Query(None, description="Filter by set-aside type"),
     capability: str | None = Query(None, description="Filter by capability keyword"),
     clearance: str | None = Query(None, description="Filter by clearance level"),
     q: str | None = Query(None, description="Free-text name search"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> list[TeamingPartnerPublicProfile]:
-    """Search public partner profiles with optional filters."""
-    stmt = select(TeamingPartner).where(TeamingPartner.is_public == True)  # noqa: E712
+    """
+    Search public partner profiles with optional filters.
+
+    Filters run in the database (JSONB containment / trigram indexes on
+    Postgres, ``json_each`` on SQLite). Results are ordered by name relevance
+    and paginated by keyset; the next page cursor is returned in the
+    ``X-Next-Cursor`` response header.
+    """
+    relevance = _relevance_expr(q)
+    stmt = select(TeamingPartner, relevance.label("relevance")).where(
+        TeamingPartner.is_public == True  # noqa: E712
+    )
 
     if q:
-        stmt = stmt.where(TeamingPartner.name.ilike(f"%{q}%"))
-
-    results = await session.execute(stmt)
-    partners = results.scalars().all()
-
-    # Apply JSON-field filters in Python (SQLite/Postgres JSON compatibility)
-    filtered = []
-    for p in partners:
-        if naics and naics not in (p.naics_codes or []):
-            continue
-        if set_aside and set_aside not in (p.set_asides or []):
-            continue
-        if capability:
-            caps = [c.lower() for c in (p.capabilities or [])]
-            if not any(capability.lower() in c for c in caps):
-                continue
-        if clearance and (p.clearance_level or "").lower() != clearance.lower():
-            continue
-        filtered.append(p)
-
-    return [TeamingPartnerPublicProfile.model_validate(p) for p in filtered]
+        stmt = stmt.where(func.lower(TeamingPartner.name).like(_like_contains(q), escape="\\"))
+    if naics:
+        stmt = stmt.where(_json_array_contains(session, TeamingPartner.naics_codes, naics))
+    if set_aside:
+        stmt = stmt.where(_json_array_contains(session, TeamingPartner.set_asides, set_aside))
+    if capability:
+        stmt = stmt.where(
+            _json_array_element_like(session, TeamingPartner.capabilities, capability)
+        )
+    if clearance:
+        stmt = stmt.where(func.lower(TeamingPartner.clearance_level) == clearance.lower())
+
+    if cursor:
+        last_relevance, last_name, last_id = decode_cursor(cursor, 3)
+        stmt = stmt.where(
+            or_(
+                relevance < last_relevance,
+                and_(
+                    relevance == last_relevance,
+                    or_(
+                        TeamingPartner.name > last_name,
+                        and_(TeamingPartner.name == last_name, TeamingPartner.id > last_id),
+                    ),
+                ),
+            )
+        )
+
+    stmt = stmt.order_by(relevance.desc(), TeamingPartner.name, TeamingPartner.id).limit(limit + 1)
+    rows = (await session.execute(stmt)).all()
+
+    page = rows[:limit]
+    if len(rows) > limit:
+        last_partner, last_relevance = page[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [last_relevance, last_partner.name, last_partner.id]
+        )
+
+    return [TeamingPartnerPublicProfile.model_validate(partner) for partner, _ in page]
 
 
 @router.get("/profile/{partner_id}", response_model=TeamingPartnerPublicProfile)
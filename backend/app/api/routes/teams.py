@@ -679,8 +679,8 @@ async def resolve_comment(
 # Import needed for member count
 from datetime import timedelta
 
-from app.api.routes.notifications import email_service
 from app.config import settings
+from app.services.notification_channels import email_service
 
 
 async def _send_invitation_email(team: Team, to_email: str, token: str) -> None:
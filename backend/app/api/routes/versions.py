@@ -5,6 +5,7 @@ API endpoints for proposal and section version history.
 """
 
 from datetime import datetime
+from typing import Literal
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -21,6 +22,13 @@ from app.models.proposal import (
     ProposalVersionType,
     SectionVersion,
 )
+from app.services.section_version_store import (
+    add_section_version,
+    diff_hunks,
+    load_version_content,
+    load_version_contents,
+    readable_diff,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -130,32 +138,19 @@ async def create_section_version(
     change_summary: str | None = None,
 ) -> SectionVersion:
     """Create a new section version entry."""
-    # Get current max version number
-    result = await session.execute(
-        select(func.max(SectionVersion.version_number)).where(
-            SectionVersion.section_id == section.id
-        )
-    )
-    max_version = result.scalar() or 0
-
-    # Get content
     content = section.final_content or ""
     if not content and section.generated_content:
         content = section.generated_content.get("clean_text", "")
 
-    version = SectionVersion(
+    return await add_section_version(
+        session,
         section_id=section.id,
         user_id=user_id,
-        version_number=max_version + 1,
         content=content,
-        word_count=len(content.split()) if content else 0,
         change_type=change_type,
         change_summary=change_summary,
     )
 
-    session.add(version)
-    return version
-
 
 # =============================================================================
 # Proposal Version Endpoints
@@ -345,14 +340,39 @@ async def get_section_version(
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
 
+    previous = (
+        await session.execute(
+            select(SectionVersion)
+            .where(
+                SectionVersion.section_id == section_id,
+                SectionVersion.version_number < version.version_number,
+            )
+            .order_by(SectionVersion.version_number.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    # diff_from_previous on the row holds the storage delta; return a real diff.
+    contents = await load_version_contents(
+        session, section_id, [version, previous] if previous else [version]
+    )
+    content = contents[version.version_number]
+    diff_text = None
+    if previous is not None:
+        diff_text = readable_diff(
+            contents[previous.version_number],
+            content,
+            f"v{previous.version_number}",
+            f"v{version.version_number}",
+        )
+
     return VersionDetailResponse(
         id=version.id,
         version_number=version.version_number,
         change_type=version.change_type,
-        content=version.content,
+        content=content,
         word_count=version.word_count,
         created_at=version.created_at,
-        diff_from_previous=version.diff_from_previous,
+        diff_from_previous=diff_text,
     )
 
 
@@ -392,6 +412,8 @@ async def restore_section_version(
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
 
+    restored_content = await load_version_content(session, version)
+
     # Save current state first
     await create_section_version(
         session=session,
@@ -402,7 +424,7 @@ async def restore_section_version(
     )
 
     # Restore content
-    section.final_content = version.content
+    section.final_content = restored_content
     section.word_count = version.word_count
     section.updated_at = datetime.utcnow()
 
@@ -450,12 +472,15 @@ async def compare_section_versions(
     section_id: int,
     version_a: int = Query(..., description="First version number"),
     version_b: int = Query(..., description="Second version number"),
+    granularity: Literal["word", "line"] = Query("word"),
+    include_content: bool = Query(False, description="Also return both full texts"),
     current_user: UserAuth = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> dict:
     """
     Compare two versions of a section.
-    Returns the content of both versions for diff display.
+    Returns the changed hunks from version_a to version_b; full texts are only
+    included on request.
     """
     # Verify section access
     section_result = await session.execute(
@@ -485,19 +510,17 @@ async def compare_section_versions(
 
     va = versions[version_a]
     vb = versions[version_b]
-
-    return {
-        "section_id": section_id,
-        "version_a": {
-            "version_number": va.version_number,
-            "content": va.content,
-            "word_count": va.word_count,
-            "created_at": va.created_at,
-        },
-        "version_b": {
-            "version_number": vb.version_number,
-            "content": vb.content,
-            "word_count": vb.word_count,
-            "created_at": vb.created_at,
-        },
-    }
+    contents = await load_version_contents(session, section_id, [va, vb])
+    diff = diff_hunks(contents[version_a], contents[version_b], granularity)
+
+    summaries = {}
+    for key, version in (("version_a", va), ("version_b", vb)):
+        summaries[key] = {
+            "version_number": version.version_number,
+            "word_count": version.word_count,
+            "created_at": version.created_at,
+        }
+        if include_content:
+            summaries[key]["content"] = contents[version.version_number]
+
+    return {"section_id": section_id, **summaries, **diff}
@@ -57,6 +57,8 @@ class DeliveryResponse(BaseModel):
     status: str
     response_code: int | None
     response_body: str | None
+    attempt_count: int
+    next_attempt_at: datetime | None
     created_at: datetime
     delivered_at: datetime | None
 
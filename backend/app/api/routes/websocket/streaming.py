@@ -0,0 +1,64 @@
+"""
+WebSocket Routes - Generation Stream Relay
+==========================================
+Forwards generation stream events (see ``app.services.generation_stream``) to
+the users present in each proposal's document room. The user who started a
+generation also gets its events when they are not in the room.
+"""
+
+import asyncio
+
+import structlog
+
+from app.api.routes.websocket.manager import ConnectionManager, manager
+from app.services.generation_stream import get_stream_broker
+
+logger = structlog.get_logger(__name__)
+
+MAX_BACKOFF_SECONDS = 30.0
+
+_relay_task: asyncio.Task | None = None
+
+
+async def deliver_generation_event(message: dict, connections: ConnectionManager = manager):
+    """Send one stream event to the proposal room and the requesting user."""
+    proposal_id = message.get("proposal_id")
+    recipients = set(connections.document_presence.get(proposal_id, {}))
+    if isinstance(message.get("user_id"), int):
+        recipients.add(message["user_id"])
+    for user_id in recipients:
+        await connections.send_to_user(user_id, message)
+
+
+async def relay_generation_streams(connections: ConnectionManager = manager) -> None:
+    """Subscribe to the stream broker until cancelled, reconnecting on errors."""
+    backoff = 1.0
+    while True:
+        try:
+            async for message in get_stream_broker().subscribe():
+                backoff = 1.0
+                await deliver_generation_event(message, connections)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Generation stream relay disconnected", error=str(exc), retry_in=backoff)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+
+
+def start_generation_relay() -> None:
+    global _relay_task
+    if _relay_task is None or _relay_task.done():
+        _relay_task = asyncio.get_running_loop().create_task(relay_generation_streams())
+
+
+async def stop_generation_relay() -> None:
+    global _relay_task
+    if _relay_task is None:
+        return
+    _relay_task.cancel()
+    try:
+        await _relay_task
+    except asyncio.CancelledError:
+        pass
+    _relay_task = None
@@ -4,12 +4,15 @@ RFP Sniper - Word Add-in Routes
 Scaffolding for Word add-in session management.
 """
 
+import asyncio
+import json
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
+from sse_starlette.sse import EventSourceResponse
 
 from app.api.deps import check_rate_limit, get_current_user
 from app.config import settings
@@ -19,6 +22,7 @@ from app.models.word_addin import WordAddinEvent, WordAddinSession, WordAddinSes
 from app.services.audit_service import log_audit_event
 from app.services.auth_service import UserAuth
 from app.services.gemini_service import GeminiService
+from app.services.llm_gateway import LLMPriority, llm_generate, llm_generate_stream
 
 router = APIRouter(prefix="/word-addin", tags=["Word Add-in"])
 
@@ -441,6 +445,27 @@ _REWRITE_PROMPTS = {
 }
 
 
+def _rewrite_service() -> GeminiService:
+    gemini = GeminiService()
+    if not gemini.flash_model:
+        raise HTTPException(status_code=503, detail="AI service not configured")
+    return gemini
+
+
+def _rewrite_call_kwargs(gemini: GeminiService, content: str) -> dict:
+    import google.generativeai as genai
+
+    return {
+        "operation": "word_addin_rewrite",
+        "model_name": gemini.flash_model_name,
+        "generation_config": genai.GenerationConfig(
+            temperature=0.4,
+            max_output_tokens=len(content) * 2,
+        ),
+        "priority": LLMPriority.INTERACTIVE,
+    }
+
+
 @router.post("/ai/rewrite", response_model=AIRewriteResponse)
 async def ai_rewrite(
     payload: AIRewritePayload,
@@ -460,17 +485,11 @@ async def ai_rewrite(
         # Deterministic fallback for testing
         rewritten = f"[{mode}] {content}"
     else:
-        gemini = GeminiService()
-        if not gemini.flash_model:
-            raise HTTPException(status_code=503, detail="AI service not configured")
-        import google.generativeai as genai
-
-        response = await gemini.flash_model.generate_content_async(
+        gemini = _rewrite_service()
+        response = await llm_generate(
+            gemini.flash_model,
             prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.4,
-                max_output_tokens=len(content) * 2,
-            ),
+            **_rewrite_call_kwargs(gemini, content),
         )
         rewritten = response.text.strip()
 
@@ -480,3 +499,70 @@ async def ai_rewrite(
         rewritten_length=len(rewritten),
         mode=mode,
     )
+
+
+@router.post("/ai/rewrite/stream")
+async def ai_rewrite_stream(
+    payload: AIRewritePayload,
+    current_user: UserAuth = Depends(get_current_user),
+    _rate_limit: None = Depends(check_rate_limit),
+) -> EventSourceResponse:
+    """
+    Streaming variant of ``/ai/rewrite``.
+
+    Emits ``chunk`` events (``{"content"}``) as text arrives, then a ``done``
+    event with the ``/ai/rewrite`` response body, or an ``error`` event.
+    """
+    content = payload.content
+    mode = payload.mode
+
+    if mode not in _REWRITE_PROMPTS:
+        raise HTTPException(status_code=400, detail="Mode must be shorten, expand, or improve")
+
+    prompt = _REWRITE_PROMPTS[mode].format(content=content)
+    gemini = None if settings.mock_ai else _rewrite_service()
+
+    def done_event(rewritten: str) -> dict:
+        body = AIRewriteResponse(
+            original_length=len(content),
+            rewritten=rewritten,
+            rewritten_length=len(rewritten),
+            mode=mode,
+        )
+        return {"event": "done", "data": body.model_dump_json()}
+
+    async def event_generator():
+        if gemini is None:
+            rewritten = f"[{mode}] {content}"
+            yield {"event": "chunk", "data": json.dumps({"content": rewritten})}
+            yield done_event(rewritten)
+            return
+
+        chunks: asyncio.Queue[str | None] = asyncio.Queue()
+
+        async def produce():
+            try:
+                return await llm_generate_stream(
+                    gemini.flash_model,
+                    prompt,
+                    on_chunk=chunks.put,
+                    **_rewrite_call_kwargs(gemini, content),
+                )
+            finally:
+                await chunks.put(None)
+
+        task = asyncio.create_task(produce())
+        try:
+            while (chunk := await chunks.get()) is not None:
+                yield {"event": "chunk", "data": json.dumps({"content": chunk})}
+            response = await task
+        except Exception as exc:
+            yield {"event": "error", "data": json.dumps({"detail": str(exc)})}
+            return
+        finally:
+            # Client went away mid-stream: stop the model call too.
+            if not task.done():
+                task.cancel()
+        yield done_event(response.text.strip())
+
+    return EventSourceResponse(event_generator())
@@ -4,10 +4,23 @@ RFP Sniper - API Utilities
 Shared helpers for route handlers.
 """
 
-from fastapi import HTTPException
+import base64
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from sqlmodel import SQLModel
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (column, descending) pairs; the last column must be unique (normally the id).
+KeysetOrder = Sequence[tuple[Any, bool]]
+
 
 async def get_or_404[T: SQLModel](
     session: AsyncSession,
@@ -20,3 +33,70 @@ async def get_or_404[T: SQLModel](
     if not obj:
         raise HTTPException(status_code=404, detail=detail)
     return obj
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Encode keyset position values as an opaque URL-safe cursor."""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, expected_length: int) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor``, raising 400 if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def _cursor_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _coerce_cursor_value(column: Any, value: Any) -> Any:
+    if value is not None and isinstance(column.type, DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value
+
+
+def keyset_paginate(stmt: Select, order: KeysetOrder, cursor: str | None, limit: int) -> Select:
+    """Order ``stmt`` by ``order``, seek past ``cursor`` and fetch one extra row.
+
+    The extra row tells ``keyset_page`` whether another page exists. Sort
+    columns are assumed non-null.
+    """
+    if cursor:
+        values = [
+            _coerce_cursor_value(column, value)
+            for (column, _), value in zip(order, decode_cursor(cursor, len(order)), strict=True)
+        ]
+        clauses = []
+        for index, (column, descending) in enumerate(order):
+            ties = [order[i][0] == values[i] for i in range(index)]
+            beyond = column < values[index] if descending else column > values[index]
+            clauses.append(and_(*ties, beyond))
+        stmt = stmt.where(or_(*clauses))
+    return stmt.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in order)
+    ).limit(limit + 1)
+
+
+def keyset_page[T](rows: Sequence[T], order: KeysetOrder, limit: int) -> tuple[list[T], str | None]:
+    """Trim the probe row and build the cursor for the following page."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor([_cursor_value(getattr(last, column.key)) for column, _ in order])
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
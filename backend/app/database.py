@@ -4,11 +4,17 @@ RFP Sniper - Database Connection & Session Management
 Async PostgreSQL connection using SQLModel + SQLAlchemy.
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel
 
@@ -19,7 +25,6 @@ from app.config import settings
 # =============================================================================
 
 # Create async engine with connection pooling
-# NullPool is used for Celery workers to avoid connection issues
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # Log SQL queries in debug mode
@@ -151,8 +156,17 @@ async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
 
 
 # =============================================================================
-# Celery-specific Engine (NullPool for worker processes)
+# Celery Worker Engine
 # =============================================================================
+# Each worker process runs tasks on one persistent event loop
+# (app.tasks.worker_runtime) and binds a pooled engine to it, so tasks reuse
+# warm connections. Sessions opened on any other loop (scripts, tests, ad-hoc
+# ``asyncio.run``) fall back to a throwaway NullPool engine, since pooled
+# asyncpg connections cannot cross event loops.
+
+_worker_loop: asyncio.AbstractEventLoop | None = None
+_worker_engine: AsyncEngine | None = None
+_worker_session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
 def get_celery_engine():
@@ -167,22 +181,81 @@ def get_celery_engine():
     )
 
 
-@asynccontextmanager
-async def get_celery_session_context() -> AsyncGenerator[AsyncSession, None]:
-    """
-    Context manager for Celery tasks using a per-task engine.
+def bind_worker_engine(loop: asyncio.AbstractEventLoop) -> None:
+    """Create the pooled engine used by tasks running on ``loop``."""
+    global _worker_loop, _worker_engine, _worker_session_factory
 
-    Using NullPool + per-task engine avoids event loop conflicts
-    when Celery runs tasks with fresh event loops.
-    """
-    engine = get_celery_engine()
-    session_factory = async_sessionmaker(
-        engine,
+    pool_options = {}
+    if not settings.database_url.startswith("sqlite"):
+        pool_options = {
+            "pool_size": settings.celery_db_pool_size,
+            "max_overflow": settings.celery_db_max_overflow,
+            "pool_recycle": settings.celery_db_pool_recycle_seconds,
+        }
+    _worker_loop = loop
+    _worker_engine = create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_pre_ping=True,
+        **pool_options,
+    )
+    _worker_session_factory = async_sessionmaker(
+        _worker_engine,
         class_=AsyncSession,
         expire_on_commit=False,
         autocommit=False,
         autoflush=False,
     )
+
+
+def forget_worker_engine() -> None:
+    """
+    Drop the worker engine without touching its connections.
+
+    Used after fork: pooled connections inherited from the parent belong to
+    the parent, so the child discards them instead of closing them.
+    """
+    global _worker_loop, _worker_engine, _worker_session_factory
+
+    if _worker_engine is not None:
+        _worker_engine.sync_engine.dispose(close=False)
+    _worker_loop = None
+    _worker_engine = None
+    _worker_session_factory = None
+
+
+async def dispose_worker_engine() -> None:
+    """Close the worker engine's pooled connections (worker shutdown)."""
+    global _worker_loop, _worker_engine, _worker_session_factory
+
+    engine_to_close = _worker_engine
+    _worker_loop = None
+    _worker_engine = None
+    _worker_session_factory = None
+    if engine_to_close is not None:
+        await engine_to_close.dispose()
+
+
+@asynccontextmanager
+async def get_celery_session_context() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Context manager for Celery task sessions.
+
+    On the worker's persistent loop this draws from the pooled worker engine;
+    anywhere else it uses a per-call NullPool engine disposed on exit.
+    """
+    engine_to_dispose = None
+    if _worker_session_factory is not None and asyncio.get_running_loop() is _worker_loop:
+        session_factory = _worker_session_factory
+    else:
+        engine_to_dispose = get_celery_engine()
+        session_factory = async_sessionmaker(
+            engine_to_dispose,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autocommit=False,
+            autoflush=False,
+        )
     async with session_factory() as session:
         try:
             yield session
@@ -192,4 +265,26 @@ async def get_celery_session_context() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
-            await engine.dispose()
+            if engine_to_dispose is not None:
+                await engine_to_dispose.dispose()
+
+
+# =============================================================================
+# Dialect Helpers
+# =============================================================================
+
+
+def insert_ignoring_conflicts(table, dialect_name: str, index_elements: list[str]):
+    """
+    ``INSERT ... ON CONFLICT (index_elements) DO NOTHING``.
+
+    Lets concurrent writers race on a unique key without failing the
+    transaction. Supports the PostgreSQL and SQLite dialects.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect_name}")
+    return insert(table).on_conflict_do_nothing(index_elements=index_elements)
@@ -0,0 +1,98 @@
+"""
+RFP Sniper - Deferred SDK Imports
+=================================
+Importing the Gemini, Stripe, PDF and feed SDKs costs hundreds of
+milliseconds each. Routers and task modules that only touch them on some
+code paths bind them with ``lazy_module`` / ``lazy_attr`` instead of a
+top-level import, so the import happens on first use rather than at API or
+worker startup.
+
+The binding is still a module attribute, so ``patch("app.services.x.genai")``
+style tests keep working. Annotations that name SDK types need
+``from __future__ import annotations`` in the using module.
+
+``HEAVY_MODULES`` lists what must stay out of a cold ``import app.main`` and
+``import app.tasks.celery_app``; ``scripts/import_time.py`` and
+``tests/test_import_budget.py`` enforce it.
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+HEAVY_MODULES = (
+    "google.generativeai",
+    "stripe",
+    "pdfplumber",
+    "pypdf",
+    "feedparser",
+    "docx",
+    "weasyprint",
+)
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with _import_lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class LazyAttr:
+    """Proxy for ``from module import name`` that resolves on first use."""
+
+    def __init__(self, module: str, name: str) -> None:
+        self._module = LazyModule(module)
+        self._name = name
+
+    def _resolve(self) -> Any:
+        return getattr(self._module, self._name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module._name}.{self._name}>"
+
+
+def lazy_module(name: str) -> Any:
+    """Stand-in for ``import name`` that defers the import to first use."""
+    return LazyModule(name)
+
+
+def lazy_attr(module: str, name: str) -> Any:
+    """Stand-in for ``from module import name`` that defers the import to first use."""
+    return LazyAttr(module, name)
+
+
+def loaded_attr(module: str, name: str) -> Any | None:
+    """
+    ``module.name`` if ``module`` is already imported, else None.
+
+    For ``isinstance`` checks against SDK exception types: an instance can only
+    exist once its module has been loaded, so there is no need to import it.
+    """
+    loaded = sys.modules.get(module)
+    return getattr(loaded, name, None) if loaded is not None else None
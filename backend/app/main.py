@@ -8,10 +8,10 @@ import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api.routes import (
     activity_router,
@@ -74,6 +74,8 @@ from app.api.routes import (
     word_addin_router,
     workflows_router,
 )
+from app.api.routes.websocket.streaming import start_generation_relay, stop_generation_relay
+from app.api.utils import NEXT_CURSOR_HEADER
 from app.config import settings
 from app.database import close_db, init_db
 from app.observability import (
@@ -84,7 +86,13 @@ from app.observability import (
 )
 from app.observability.logging import CorrelationIDMiddleware, RequestLoggingMiddleware
 from app.observability.metrics import get_metrics
+from app.observability.profiling import ProfilingMiddleware, install_instrumentation
 from app.observability.sentry import capture_exception
+from app.services.cache_tags import install_cache_invalidation
+from app.services.event_buffer import start_event_buffer, stop_event_buffer
+from app.services.model_registry import warm_model_registry
+from app.services.saved_search_percolator import install_saved_search_percolator
+from app.services.webhook_service import install_webhook_outbox
 
 # Configure structured logging
 setup_logging(
@@ -148,11 +156,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+    start_event_buffer()
+    warm_model_registry()
+    start_generation_relay()
 
     yield
 
     # Shutdown
     logger.info("Shutting down RFP Sniper API")
+    await stop_generation_relay()
+    await stop_event_buffer()
     await close_db()
     logger.info("Database connections closed")
 
@@ -243,26 +256,48 @@ class SecurityHeadersMiddleware:
 
 
 class MaxUploadSizeMiddleware:
-    """Reject requests whose Content-Length exceeds the configured limit."""
+    """
+    Reject request bodies larger than the configured limit.
+
+    Oversized Content-Length headers are refused up front. Bodies without one
+    (chunked uploads) or with a wrong one are counted as they stream in. Reading
+    stops with a 413 as soon as the limit is passed.
+    """
 
     def __init__(self, app: ASGIApp, max_bytes: int) -> None:
         self.app = app
         self.max_bytes = max_bytes
 
+    @property
+    def detail(self) -> str:
+        return f"Request body too large. Max {self.max_bytes // (1024 * 1024)}MB."
+
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        if scope["type"] == "http":
-            headers = dict(scope.get("headers", []))
-            content_length = headers.get(b"content-length")
-            if content_length and int(content_length) > self.max_bytes:
-                response = JSONResponse(
-                    status_code=413,
-                    content={
-                        "detail": f"Request body too large. Max {self.max_bytes // (1024 * 1024)}MB."
-                    },
-                )
-                await response(scope, receive, send)
-                return
-        await self.app(scope, receive, send)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        content_length = headers.get(b"content-length")
+        if content_length and int(content_length) > self.max_bytes:
+            response = JSONResponse(status_code=413, content={"detail": self.detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Body parsing re-raises HTTPException; the exception
+                    # middleware turns it into the response.
+                    raise HTTPException(status_code=413, detail=self.detail)
+            return message
+
+        await self.app(scope, receive_limited, send)
 
 
 # Upload size limit
@@ -279,6 +314,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Security headers on all responses
@@ -289,10 +325,17 @@ app.add_middleware(SecurityHeadersMiddleware, debug=settings.debug)
 if settings.enable_metrics:
     app.add_middleware(MetricsMiddleware)
 
-# 2. Request logging
+# 2. Hot-path profiling (sampled / X-Profile header)
+install_instrumentation()
+install_cache_invalidation()
+install_webhook_outbox()
+install_saved_search_percolator()
+app.add_middleware(ProfilingMiddleware)
+
+# 3. Request logging
 app.add_middleware(RequestLoggingMiddleware, logger=logger)
 
-# 3. Correlation ID (outermost)
+# 4. Correlation ID (outermost)
 app.add_middleware(CorrelationIDMiddleware)
 
 
@@ -81,7 +81,12 @@ from app.models.dash import DashMessage, DashRole, DashSession
 from app.models.email_ingest import EmailIngestConfig, EmailProcessingStatus, IngestedEmail
 from app.models.embedding import DocumentEmbedding
 from app.models.event import EventType, IndustryEvent
-from app.models.forecast import ForecastAlert, ForecastSource, ProcurementForecast
+from app.models.forecast import (
+    ForecastAlert,
+    ForecastMatchState,
+    ForecastSource,
+    ProcurementForecast,
+)
 from app.models.graphics import GraphicsRequestStatus, ProposalGraphicRequest
 from app.models.inbox import InboxMessage, InboxMessageType
 from app.models.integration import (
@@ -91,8 +96,15 @@ from app.models.integration import (
     IntegrationSyncStatus,
     IntegrationWebhookEvent,
 )
-from app.models.knowledge_base import DocumentChunk, KnowledgeBaseDocument
+from app.models.knowledge_base import DocumentChunk, GeminiContextCache, KnowledgeBaseDocument
 from app.models.market_signal import DigestFrequency, MarketSignal, SignalSubscription, SignalType
+from app.models.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationPreferences,
+    NotificationType,
+    PushSubscription,
+)
 from app.models.opportunity_snapshot import SAMOpportunitySnapshot
 from app.models.organization import (
     InvitationStatus,
@@ -128,7 +140,7 @@ from app.models.review import (
 )
 from app.models.rfp import RFP, ComplianceMatrix, ComplianceRequirement
 from app.models.salesforce_mapping import SalesforceFieldMapping
-from app.models.saved_search import SavedSearch
+from app.models.saved_search import SavedSearch, SavedSearchMatch
 from app.models.secret import SecretRecord
 from app.models.sharepoint_sync import SharePointSyncConfig, SharePointSyncLog, SyncDirection
 from app.models.user import CompanySize, User, UserProfile
@@ -151,6 +163,7 @@ __all__ = [
     "SectionEvidence",
     "KnowledgeBaseDocument",
     "DocumentChunk",
+    "GeminiContextCache",
     "SAMOpportunitySnapshot",
     "AuditEvent",
     "IntegrationConfig",
@@ -165,6 +178,7 @@ __all__ = [
     "DashMessage",
     "DashRole",
     "SavedSearch",
+    "SavedSearchMatch",
     "CapturePlan",
     "CaptureStage",
     "BidDecision",
@@ -209,6 +223,7 @@ __all__ = [
     "CLINType",
     "ProcurementForecast",
     "ForecastAlert",
+    "ForecastMatchState",
     "ForecastSource",
     "TeamingRequest",
     "TeamingRequestStatus",
@@ -244,6 +259,11 @@ __all__ = [
     "IndustryEvent",
     "EventType",
     "MarketSignal",
+    "Notification",
+    "NotificationChannel",
+    "NotificationPreferences",
+    "NotificationType",
+    "PushSubscription",
     "SignalSubscription",
     "SignalType",
     "DigestFrequency",
@@ -7,7 +7,7 @@ Tracks user actions across proposals for real-time activity feeds.
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from sqlmodel import Column, Field, SQLModel
 
 
@@ -28,6 +28,15 @@ class ActivityFeedEntry(SQLModel, table=True):
     """Single activity event within a proposal."""
 
     __tablename__ = "activity_feed"
+    __table_args__ = (
+        Index(
+            "ix_activity_feed_proposal_user_created_id",
+            "proposal_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     proposal_id: int = Field(foreign_key="proposals.id", index=True)
@@ -6,6 +6,7 @@ Award and contract intelligence records.
 
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Column, Field, SQLModel, Text
 
 
@@ -15,6 +16,7 @@ class AwardRecord(SQLModel, table=True):
     """
 
     __tablename__ = "award_records"
+    __table_args__ = (Index("ix_award_records_user_created_id", "user_id", "created_at", "id"),)
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -6,11 +6,15 @@ Tracks budget documents and funding intel tied to opportunities.
 
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class BudgetIntelligence(SQLModel, table=True):
     __tablename__ = "budget_intelligence"
+    __table_args__ = (
+        Index("ix_budget_intelligence_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
@@ -7,8 +7,11 @@ Capture pipeline, bid decisions, and teaming partners.
 from datetime import date, datetime
 from enum import Enum
 
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import JSON, Column, Field, SQLModel, Text
 
+_JSON_DOCUMENT = JSON().with_variant(JSONB(), "postgresql")
+
 
 class CaptureStage(str, Enum):
     IDENTIFIED = "identified"
@@ -83,9 +86,10 @@ class TeamingPartner(SQLModel, table=True):
     # Extended fields for teaming board
     company_duns: str | None = Field(default=None, max_length=20)
     cage_code: str | None = Field(default=None, max_length=10)
-    naics_codes: list = Field(default=[], sa_column=Column(JSON))
-    set_asides: list = Field(default=[], sa_column=Column(JSON))
-    capabilities: list = Field(default=[], sa_column=Column(JSON))
+    # JSONB on Postgres so directory search can use GIN containment indexes.
+    naics_codes: list = Field(default=[], sa_column=Column(_JSON_DOCUMENT))
+    set_asides: list = Field(default=[], sa_column=Column(_JSON_DOCUMENT))
+    capabilities: list = Field(default=[], sa_column=Column(_JSON_DOCUMENT))
     clearance_level: str | None = Field(default=None, max_length=50)
     past_performance_summary: str | None = None
     website: str | None = Field(default=None, max_length=500)
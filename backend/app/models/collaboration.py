@@ -7,7 +7,7 @@ Cross-organization collaboration: shared workspaces, invitations, and data permi
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String
 from sqlmodel import Field, SQLModel
 
 
@@ -109,6 +109,15 @@ class SharedDataPermission(SQLModel, table=True):
     """Controls which data items are visible inside a workspace."""
 
     __tablename__ = "shared_data_permissions"
+    __table_args__ = (
+        Index("ix_shared_data_permissions_workspace_created", "workspace_id", "created_at"),
+        Index(
+            "ix_shared_data_permissions_workspace_approved",
+            "workspace_id",
+            "approval_status",
+            "approved_at",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     workspace_id: int = Field(foreign_key="shared_workspaces.id", index=True)
@@ -7,6 +7,7 @@ plus agency-level contact directory.
 
 from datetime import datetime
 
+from sqlalchemy import Index
 from sqlmodel import JSON, Column, Field, SQLModel, Text
 
 
@@ -16,6 +17,9 @@ class OpportunityContact(SQLModel, table=True):
     """
 
     __tablename__ = "opportunity_contacts"
+    __table_args__ = (
+        Index("ix_opportunity_contacts_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="users.id", index=True)
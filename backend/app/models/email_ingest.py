@@ -3,7 +3,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import BigInteger, UniqueConstraint
 from sqlmodel import JSON, Column, Field, SQLModel, Text
 
 
@@ -33,6 +33,10 @@ class EmailIngestConfig(SQLModel, table=True):
     auto_create_rfps: bool = Field(default=True)
     min_rfp_confidence: float = Field(default=0.35, ge=0.0, le=1.0)
     last_checked_at: datetime | None = None
+    # IMAP watermark: only UIDs above last_seen_uid are fetched while the
+    # mailbox UIDVALIDITY is unchanged.
+    uid_validity: int | None = Field(default=None, sa_column=Column(BigInteger))
+    last_seen_uid: int | None = Field(default=None, sa_column=Column(BigInteger))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -59,3 +59,16 @@ class ForecastAlert(SQLModel, table=True):
     is_dismissed: bool = Field(default=False)
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ForecastMatchState(SQLModel, table=True):
+    """
+    Per-user watermark for incremental forecast-to-RFP matching.
+    """
+
+    __tablename__ = "forecast_match_states"
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", unique=True, index=True)
+    last_run_at: datetime | None = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
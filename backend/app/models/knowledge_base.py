@@ -8,6 +8,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel, Text
 
 if TYPE_CHECKING:
@@ -72,6 +73,8 @@ class KnowledgeBaseDocument(KnowledgeBaseDocumentBase, table=True):
     file_size_bytes: int = Field(default=0)
     mime_type: str = Field(max_length=100, default="application/pdf")
     page_count: int | None = None
+    # SHA-256 of the uploaded bytes; identical uploads share one stored file
+    content_sha256: str | None = Field(default=None, max_length=64, index=True)
 
     # Processing status
     processing_status: ProcessingStatus = Field(default=ProcessingStatus.PENDING)
@@ -80,6 +83,9 @@ class KnowledgeBaseDocument(KnowledgeBaseDocumentBase, table=True):
     # Extracted content
     full_text: str | None = Field(default=None, sa_column=Column(Text))
 
+    # MinHash signature of chunk content for near-duplicate detection
+    content_minhash: list[int] | None = Field(default=None, sa_column=Column(JSON))
+
     # Gemini Context Caching
     # When uploaded to Gemini, we store the cache reference
     gemini_cache_name: str | None = Field(default=None, max_length=255)
@@ -155,3 +161,42 @@ class DocumentChunk(SQLModel, table=True):
     # Relationship
     document: KnowledgeBaseDocument | None = Relationship(back_populates="chunks")
     evidence_links: list["SectionEvidence"] = Relationship(back_populates="chunk")
+
+
+# =============================================================================
+# Gemini Context Cache Model
+# =============================================================================
+
+
+class GeminiContextCache(SQLModel, table=True):
+    """
+    A Gemini ``CachedContent`` holding a set of knowledge base documents.
+
+    Caches are keyed per user by ``content_key``, the hash of the sorted
+    content hashes of the cached documents, so any proposal or focus-document
+    selection with the same documents reuses the same cache.
+    """
+
+    __tablename__ = "gemini_context_caches"
+    __table_args__ = (
+        UniqueConstraint("user_id", "content_key", name="uq_gemini_context_caches_user_key"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    content_key: str = Field(max_length=64)
+    cache_name: str = Field(max_length=255, unique=True)
+    model_name: str = Field(max_length=128)
+    document_ids: list[int] = Field(default=[], sa_column=Column(JSON))
+
+    # Size and cost accounting
+    token_count: int = Field(default=0)
+    size_bytes: int = Field(default=0)
+    storage_token_hours: float = Field(default=0.0)
+    hit_count: int = Field(default=0)
+    refresh_count: int = Field(default=0)
+
+    expires_at: datetime = Field(index=True)
+    last_used_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
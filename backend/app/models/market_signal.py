@@ -4,6 +4,7 @@ from datetime import datetime
 from enum import Enum
 
 from pydantic import field_validator
+from sqlalchemy import Index
 from sqlmodel import JSON, Column, Field, SQLModel, Text
 
 
@@ -22,6 +23,16 @@ class DigestFrequency(str, Enum):
 
 class MarketSignal(SQLModel, table=True):
     __tablename__ = "market_signals"
+    __table_args__ = (
+        Index("ix_market_signals_user_created_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_market_signals_user_relevance_created_id",
+            "user_id",
+            "relevance_score",
+            "created_at",
+            "id",
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     user_id: int | None = Field(default=None, foreign_key="users.id", index=True)
@@ -0,0 +1,123 @@
+"""
+RFP Sniper - Notification Models
+================================
+In-app notifications, per-user delivery preferences and push subscriptions.
+"""
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Index
+from sqlmodel import JSON, Column, Field, SQLModel, Text
+
+
+class NotificationType(str, Enum):
+    """Types of notifications."""
+
+    DEADLINE_REMINDER = "deadline_reminder"
+    RFP_MATCH = "rfp_match"
+    ANALYSIS_COMPLETE = "analysis_complete"
+    GENERATION_COMPLETE = "generation_complete"
+    SYSTEM_ALERT = "system_alert"
+    TEAM_INVITE = "team_invite"
+    COMMENT_ADDED = "comment_added"
+    MENTION = "mention"
+
+
+class NotificationChannel(str, Enum):
+    """Delivery channels."""
+
+    EMAIL = "email"
+    IN_APP = "in_app"
+    SLACK = "slack"
+    WEBHOOK = "webhook"
+
+
+class Notification(SQLModel, table=True):
+    """
+    Notification record.
+    """
+
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_read_created_id", "user_id", "is_read", "created_at", "id"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    # Notification content
+    notification_type: NotificationType
+    title: str = Field(max_length=255)
+    message: str = Field(sa_column=Column(Text))
+
+    # Delivery
+    channels: list[str] = Field(default=["in_app"], sa_column=Column(JSON))
+    is_read: bool = Field(default=False)
+    is_sent: bool = Field(default=False)
+    sent_at: datetime | None = None
+
+    # Related entities
+    rfp_id: int | None = Field(default=None, foreign_key="rfps.id")
+    proposal_id: int | None = Field(default=None, foreign_key="proposals.id")
+
+    # Metadata
+    meta: dict = Field(default={}, sa_column=Column("metadata", JSON))
+
+    # Idempotency key for scheduled notifications (e.g. deadline reminders)
+    dedupe_key: str | None = Field(default=None, max_length=255, unique=True, index=True)
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class NotificationPreferences(SQLModel, table=True):
+    """
+    User notification preferences.
+    """
+
+    __tablename__ = "notification_preferences"
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", unique=True)
+
+    # Email preferences
+    email_enabled: bool = Field(default=True)
+    email_address: str | None = Field(default=None, max_length=255)
+
+    # Notification types
+    deadline_reminders: bool = Field(default=True)
+    deadline_days_before: list[int] = Field(default=[7, 3, 1], sa_column=Column(JSON))
+    rfp_matches: bool = Field(default=True)
+    analysis_complete: bool = Field(default=True)
+    generation_complete: bool = Field(default=True)
+    team_activity: bool = Field(default=True)
+
+    # Slack integration
+    slack_enabled: bool = Field(default=False)
+    slack_webhook_url: str | None = Field(default=None, max_length=500)
+
+    # Quiet hours (no notifications)
+    quiet_hours_enabled: bool = Field(default=False)
+    quiet_hours_start: str | None = Field(default=None, max_length=5)  # "22:00"
+    quiet_hours_end: str | None = Field(default=None, max_length=5)  # "08:00"
+
+    # Timestamps
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class PushSubscription(SQLModel, table=True):
+    """Browser push subscription registration."""
+
+    __tablename__ = "push_subscriptions"
+
+    id: int | None = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", index=True)
+    endpoint: str = Field(max_length=1000)
+    p256dh_key: str = Field(max_length=500)
+    auth_key: str = Field(max_length=500)
+    user_agent: str | None = Field(default=None, max_length=500)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: datetime | None = None
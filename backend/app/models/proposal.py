@@ -9,6 +9,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
 from pydantic import BaseModel
+from sqlalchemy import Index
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel, Text
 
 if TYPE_CHECKING:
@@ -278,6 +279,14 @@ class SectionVersion(SQLModel, table=True):
     """
 
     __tablename__ = "section_versions"
+    __table_args__ = (
+        Index(
+            "ix_section_versions_section_version",
+            "section_id",
+            "version_number",
+            unique=True,
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     section_id: int = Field(foreign_key="proposal_sections.id", index=True)
@@ -286,16 +295,20 @@ class SectionVersion(SQLModel, table=True):
     # Version info
     version_number: int
 
-    # Content at this version
-    content: str = Field(sa_column=Column(Text))
+    # Content at this version (None for delta rows; see section_version_store)
+    content: str | None = Field(default=None, sa_column=Column(Text))
     word_count: int = Field(default=0)
 
     # Change details
     change_type: str = Field(max_length=50)  # "generated", "edited", "restored"
     change_summary: str | None = Field(default=None, max_length=500)
 
-    # Diff from previous (optional, for efficient storage)
+    # Storage: "full" keyframes hold content, "delta" rows hold a token delta
+    # against base_version_number in diff_from_previous
+    storage_kind: str = Field(default="full", max_length=10)
+    base_version_number: int | None = Field(default=None)
     diff_from_previous: str | None = Field(default=None, sa_column=Column(Text))
+    content_hash: str | None = Field(default=None, max_length=64)
 
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -9,7 +9,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, Optional
 
 from pydantic import BaseModel, field_validator
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import JSON, Column, Field, Relationship, SQLModel, Text
 
 if TYPE_CHECKING:
@@ -151,6 +151,9 @@ class RFP(RFPBase, table=True):
             "solicitation_number",
             name="uq_rfps_user_solicitation_number",
         ),
+        Index("ix_rfps_response_deadline", "response_deadline"),
+        Index("ix_rfps_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_rfps_user_status_created_id", "user_id", "status", "created_at", "id"),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -1,11 +1,12 @@
 """
 RFP Sniper - Saved Search Models
 ================================
-Saved opportunity searches and filters.
+Saved opportunity searches, filters and their stored RFP matches.
 """
 
 from datetime import datetime
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import JSON, Column, Field, SQLModel
 
 
@@ -25,6 +26,31 @@ class SavedSearch(SQLModel, table=True):
 
     last_run_at: datetime | None = None
     last_match_count: int = Field(default=0)
+    # When stored matches were last rebuilt from the full RFP table; None means
+    # the next run rebuilds them (new filters, searches created before matching)
+    matches_built_at: datetime | None = None
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SavedSearchMatch(SQLModel, table=True):
+    """
+    RFP matched by a saved search.
+
+    Rows are written by the percolator (``app.services.saved_search_percolator``)
+    when RFPs are created or updated, so runs and digests read matches instead of
+    rescanning RFPs.
+    """
+
+    __tablename__ = "saved_search_matches"
+    __table_args__ = (
+        UniqueConstraint("saved_search_id", "rfp_id", name="uq_saved_search_matches_search_rfp"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    saved_search_id: int = Field(foreign_key="saved_searches.id", index=True, ondelete="CASCADE")
+    rfp_id: int = Field(foreign_key="rfps.id", index=True, ondelete="CASCADE")
+    user_id: int = Field(foreign_key="users.id", index=True)
+
+    matched_at: datetime = Field(default_factory=datetime.utcnow, index=True)
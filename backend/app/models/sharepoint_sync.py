@@ -7,7 +7,7 @@ Configuration and logging for SharePoint auto-sync and folder watching.
 from datetime import datetime
 from enum import Enum
 
-from sqlmodel import JSON, Column, Field, SQLModel
+from sqlmodel import JSON, Column, Field, SQLModel, Text
 
 
 class SyncDirection(str, Enum):
@@ -31,6 +31,10 @@ class SharePointSyncConfig(SQLModel, table=True):
     watch_for_rfps: bool = Field(default=False)
 
     last_synced_at: datetime | None = None
+    # Hash of the proposal content last pushed; unchanged proposals are not re-uploaded.
+    last_synced_hash: str | None = Field(default=None, max_length=64)
+    # Graph delta cursor for folder watching.
+    watch_delta_link: str | None = Field(default=None, sa_column=Column(Text))
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -7,6 +7,7 @@ Webhook subscriptions and delivery logs.
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy import Index
 from sqlmodel import JSON, Column, Field, SQLModel
 
 
@@ -34,6 +35,10 @@ class WebhookSubscription(SQLModel, table=True):
     event_types: list[str] = Field(default=[], sa_column=Column(JSON))
     is_active: bool = Field(default=True)
 
+    # Per-endpoint circuit breaker, shared by all delivery workers.
+    consecutive_failures: int = Field(default=0)
+    circuit_open_until: datetime | None = None
+
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -41,9 +46,15 @@ class WebhookSubscription(SQLModel, table=True):
 class WebhookDelivery(SQLModel, table=True):
     """
     Delivery log for webhook events.
+
+    Pending rows double as the transactional outbox: they are written with the
+    triggering change and sent later by the delivery worker.
     """
 
     __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_status_next_attempt", "status", "next_attempt_at"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     subscription_id: int = Field(foreign_key="webhook_subscriptions.id", index=True)
@@ -54,6 +65,8 @@ class WebhookDelivery(SQLModel, table=True):
     status: WebhookDeliveryStatus = Field(default=WebhookDeliveryStatus.PENDING)
     response_code: int | None = None
     response_body: str | None = None
+    attempt_count: int = Field(default=0)
+    next_attempt_at: datetime | None = None
 
     created_at: datetime = Field(default_factory=datetime.utcnow)
     delivered_at: datetime | None = None
@@ -0,0 +1,617 @@
+"""
+RFP Sniper - Hot-Path Profiling
+===============================
+Per-request and per-task span timing with optional statistical stack sampling.
+
+A *trace* is opened for a sampled HTTP request (``ProfilingMiddleware``) or
+Celery task (``start_task_profile``/``finish_task_profile``). While a trace is
+active, instrumented hot paths record spans into it:
+
+- ``db``      SQLAlchemy cursor executions (engine events)
+- ``http``    outbound httpx requests
+- ``gemini``  Gemini generate calls
+- ``pdf``     PDF text extraction
+- ``cache``   cache hits/misses
+
+Traces are exported in Chrome Trace Event format (loadable in Perfetto or
+``chrome://tracing``) to ``settings.profiling_export_dir`` and/or POSTed to
+``settings.profiling_collector_url``. Stack samples are exported as folded
+stacks (``frame;frame;frame count``) for flamegraph tooling.
+
+Profiling can be switched on without a redeploy through the admin runtime
+config (``PUT /api/v1/admin/profiling``), which is shared across processes via
+the cache backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import settings
+from app.observability.metrics import record_histogram
+
+logger = structlog.get_logger(__name__)
+
+PROFILE_HEADER = "x-profile"
+TRACE_ID_HEADER = "x-trace-id"
+TASK_PROFILE_HEADER = "x_profile"
+RUNTIME_CONFIG_CACHE_KEY = "profiling:runtime_config"
+RUNTIME_CONFIG_REFRESH_SECONDS = 15.0
+
+MODE_SPANS = "spans"
+MODE_STACK = "stack"
+
+
+# =============================================================================
+# Trace Model
+# =============================================================================
+
+
+@dataclass
+class Span:
+    """A timed unit of work inside a trace."""
+
+    kind: str
+    name: str
+    start: float
+    duration_ms: float
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    """All spans and stack samples collected for one request or task."""
+
+    name: str
+    kind: str
+    mode: str = MODE_SPANS
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    start: float = field(default_factory=time.perf_counter)
+    duration_ms: float | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+    spans: list[Span] = field(default_factory=list)
+    stacks: Counter = field(default_factory=Counter)
+    max_spans: int = 5000
+    dropped_spans: int = 0
+
+    def add_span(
+        self,
+        kind: str,
+        name: str,
+        start: float,
+        duration_ms: float,
+        **attrs: Any,
+    ) -> None:
+        if len(self.spans) >= self.max_spans:
+            self.dropped_spans += 1
+            return
+        self.spans.append(Span(kind, name, start, duration_ms, attrs))
+
+    def finish(self) -> None:
+        self.duration_ms = (time.perf_counter() - self.start) * 1000
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate span count and total time per span kind."""
+        totals: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            bucket = totals.setdefault(span.kind, {"count": 0, "total_ms": 0.0})
+            bucket["count"] += 1
+            bucket["total_ms"] = round(bucket["total_ms"] + span.duration_ms, 3)
+        return totals
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Render as Chrome Trace Event format (microsecond timestamps)."""
+
+        def _us(value: float) -> float:
+            return round((value - self.start) * 1_000_000, 1)
+
+        events: list[dict[str, Any]] = [
+            {
+                "name": self.name,
+                "cat": self.kind,
+                "ph": "X",
+                "ts": 0,
+                "dur": round((self.duration_ms or 0) * 1000, 1),
+                "pid": 1,
+                "tid": 1,
+                "args": self.attrs,
+            }
+        ]
+        for span in self.spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": _us(span.start),
+                    "dur": round(span.duration_ms * 1000, 1),
+                    "pid": 1,
+                    "tid": 1,
+                    "args": span.attrs,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": self.trace_id,
+                "started_at": self.started_at.isoformat(),
+                "mode": self.mode,
+                "dropped_spans": self.dropped_spans,
+                "summary": self.summary(),
+            },
+        }
+
+    def folded_stacks(self) -> str:
+        """Render stack samples in folded (flamegraph) format."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+_current_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar(
+    "profiling_trace", default=None
+)
+
+
+def get_current_trace() -> Trace | None:
+    """Return the trace active in the current context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[None]:
+    """
+    Time a block of work as a span on the active trace.
+
+    No-op (beyond one contextvar lookup) when the current request/task is not
+    being profiled.
+
+    Usage:
+        with span("pdf", "extract_text", pages=12):
+            ...
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(kind, name, start, (time.perf_counter() - start) * 1000, **attrs)
+
+
+def record_event(kind: str, name: str, **attrs: Any) -> None:
+    """Record a zero-duration span (e.g. a cache hit) on the active trace."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(kind, name, time.perf_counter(), 0.0, **attrs)
+
+
+# =============================================================================
+# Statistical Stack Sampler
+# =============================================================================
+
+
+class StackSampler:
+    """
+    Periodically sample the call stack of one thread from a background thread.
+
+    For the API this samples the event loop thread, so concurrent requests on
+    the same loop can appear in each other's samples; hot spots still
+    dominate the folded output.
+    """
+
+    def __init__(
+        self,
+        trace: Trace,
+        thread_id: int | None = None,
+        interval_seconds: float | None = None,
+        max_depth: int = 64,
+    ):
+        self.trace = trace
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval_seconds or settings.profiling_stack_interval_ms / 1000
+        self.max_depth = max_depth
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.trace.stacks[self._fold(frame)] += 1
+
+    def _fold(self, frame) -> str:
+        names: list[str] = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+# =============================================================================
+# Runtime Configuration (admin toggle)
+# =============================================================================
+
+
+@dataclass
+class ProfilingConfig:
+    """Effective profiling switches; defaults come from settings."""
+
+    enabled: bool
+    sample_rate: float
+    stack_sampling: bool
+    allow_header: bool
+
+    @classmethod
+    def from_settings(cls) -> ProfilingConfig:
+        return cls(
+            enabled=settings.profiling_enabled,
+            sample_rate=settings.profiling_sample_rate,
+            stack_sampling=settings.profiling_stack_sampling,
+            allow_header=settings.profiling_allow_header,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "stack_sampling": self.stack_sampling,
+            "allow_header": self.allow_header,
+        }
+
+
+_runtime_config: ProfilingConfig | None = None
+_runtime_config_loaded_at = 0.0
+
+
+async def get_profiling_config() -> ProfilingConfig:
+    """
+    Return the effective profiling config.
+
+    Admin overrides live in the cache backend so every API pod and worker
+    picks them up; they are re-read at most every few seconds per process.
+    """
+    global _runtime_config, _runtime_config_loaded_at
+    now = time.monotonic()
+    if _runtime_config is not None and now - _runtime_config_loaded_at < (
+        RUNTIME_CONFIG_REFRESH_SECONDS
+    ):
+        return _runtime_config
+
+    from app.services.cache_service import get_cache_backend
+
+    config = ProfilingConfig.from_settings()
+    try:
+        stored = await get_cache_backend().get(RUNTIME_CONFIG_CACHE_KEY)
+    except Exception as exc:
+        logger.warning("Failed to load profiling runtime config", error=str(exc))
+        stored = None
+    if isinstance(stored, dict):
+        for key, value in stored.items():
+            if hasattr(config, key) and value is not None:
+                setattr(config, key, value)
+
+    _runtime_config = config
+    _runtime_config_loaded_at = now
+    return config
+
+
+async def set_profiling_config(overrides: dict[str, Any]) -> ProfilingConfig:
+    """Persist admin overrides and apply them to this process immediately."""
+    global _runtime_config, _runtime_config_loaded_at
+    from app.services.cache_service import get_cache_backend
+
+    current = await get_profiling_config()
+    merged = {**current.to_dict(), **{k: v for k, v in overrides.items() if v is not None}}
+    # Long TTL: the override stays until an admin changes it again.
+    await get_cache_backend().set(RUNTIME_CONFIG_CACHE_KEY, merged, 30 * 86400)
+    _runtime_config = ProfilingConfig(**merged)
+    _runtime_config_loaded_at = time.monotonic()
+    return _runtime_config
+
+
+def reset_profiling_config() -> None:
+    """Drop the per-process config memo (used by tests)."""
+    global _runtime_config, _runtime_config_loaded_at
+    _runtime_config = None
+    _runtime_config_loaded_at = 0.0
+
+
+def resolve_mode(header_value: str | None, config: ProfilingConfig) -> str | None:
+    """
+    Decide whether (and how) to profile a unit of work.
+
+    An explicit ``X-Profile: spans|stack`` header wins when allowed; otherwise
+    the configured sample rate applies.
+    """
+    if header_value and config.allow_header:
+        value = header_value.strip().lower()
+        if value == MODE_STACK:
+            return MODE_STACK
+        if value in {"1", "true", MODE_SPANS}:
+            return MODE_SPANS
+    if config.enabled and config.sample_rate > 0 and random.random() < config.sample_rate:
+        return MODE_STACK if config.stack_sampling else MODE_SPANS
+    return None
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+_export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trace-export")
+
+
+def _write_trace(trace: Trace) -> None:
+    payload = trace.to_chrome_trace()
+    export_dir = settings.profiling_export_dir
+    if export_dir:
+        target = Path(export_dir)
+        target.mkdir(parents=True, exist_ok=True)
+        stem = f"{trace.started_at:%Y%m%dT%H%M%S}_{trace.kind}_{trace.trace_id}"
+        (target / f"{stem}.trace.json").write_text(json.dumps(payload, default=str))
+        if trace.stacks:
+            (target / f"{stem}.folded").write_text(trace.folded_stacks())
+
+    if settings.profiling_collector_url:
+        import httpx
+
+        payload["otherData"]["folded_stacks"] = trace.folded_stacks() if trace.stacks else None
+        httpx.post(settings.profiling_collector_url, json=payload, timeout=5.0)
+
+
+def _export_done(future) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.warning("Trace export failed", error=str(exc))
+
+
+def export_trace(trace: Trace) -> None:
+    """Emit summary metrics and hand the trace to the background exporter."""
+    for kind, totals in trace.summary().items():
+        record_histogram("profile.span_total_ms", totals["total_ms"], tags={"kind": kind})
+    logger.info(
+        "Profiled trace",
+        trace_id=trace.trace_id,
+        trace_name=trace.name,
+        trace_kind=trace.kind,
+        duration_ms=round(trace.duration_ms or 0, 2),
+        spans=trace.summary(),
+        stack_samples=sum(trace.stacks.values()),
+    )
+    if settings.profiling_export_dir or settings.profiling_collector_url:
+        _export_executor.submit(_write_trace, trace).add_done_callback(_export_done)
+
+
+# =============================================================================
+# Lifecycle helpers
+# =============================================================================
+
+
+@dataclass
+class _ActiveProfile:
+    trace: Trace
+    token: contextvars.Token
+    sampler: StackSampler | None
+
+
+def _start(trace: Trace) -> _ActiveProfile:
+    token = _current_trace.set(trace)
+    sampler = None
+    if trace.mode == MODE_STACK:
+        sampler = StackSampler(trace)
+        sampler.start()
+    return _ActiveProfile(trace=trace, token=token, sampler=sampler)
+
+
+def _finish(active: _ActiveProfile) -> Trace:
+    if active.sampler is not None:
+        active.sampler.stop()
+    active.trace.finish()
+    try:
+        _current_trace.reset(active.token)
+    except ValueError:
+        # Token created in a different context (e.g. Celery signal ordering).
+        _current_trace.set(None)
+    export_trace(active.trace)
+    return active.trace
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that opens a trace for sampled HTTP requests.
+
+    Adds ``X-Trace-ID`` to profiled responses so a slow request can be matched
+    to its exported trace file.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        header_value = None
+        for key, value in scope.get("headers", []):
+            if key == PROFILE_HEADER.encode():
+                header_value = value.decode("latin-1")
+                break
+
+        mode = resolve_mode(header_value, await get_profiling_config())
+        if mode is None:
+            return await self.app(scope, receive, send)
+
+        trace = Trace(
+            name=f"{scope.get('method', 'GET')} {scope.get('path', '/')}",
+            kind="http",
+            mode=mode,
+            attrs={"propagate": header_value is not None},
+        )
+        active = _start(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.attrs["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((TRACE_ID_HEADER.encode(), trace.trace_id.encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _finish(active)
+
+
+_active_tasks: dict[str, _ActiveProfile] = {}
+
+
+def profile_header_for_publish() -> str | None:
+    """Mode to propagate to tasks dispatched from an explicitly profiled request."""
+    trace = _current_trace.get()
+    if trace is not None and trace.attrs.get("propagate"):
+        return trace.mode
+    return None
+
+
+def _task_profiling_config() -> ProfilingConfig:
+    """
+    Effective config for Celery tasks, including admin overrides.
+
+    ``task_prerun`` is synchronous, so a stale memo is refreshed on the worker
+    loop between tasks. If a loop is already running in this thread (eager
+    tasks), the last known config is used instead.
+    """
+    if _runtime_config is not None and (
+        time.monotonic() - _runtime_config_loaded_at < RUNTIME_CONFIG_REFRESH_SECONDS
+    ):
+        return _runtime_config
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        from app.tasks.worker_runtime import get_worker_loop
+
+        return get_worker_loop().run_until_complete(get_profiling_config())
+    return _runtime_config or ProfilingConfig.from_settings()
+
+
+def start_task_profile(task_id: str, task_name: str, header_value: str | None) -> None:
+    """Open a trace for a Celery task if requested via header or sampling."""
+    config = _task_profiling_config()
+    mode = None
+    if header_value in {MODE_SPANS, MODE_STACK}:
+        mode = header_value
+    elif config.enabled and random.random() < settings.profiling_task_sample_rate:
+        mode = MODE_STACK if config.stack_sampling else MODE_SPANS
+    if mode is None:
+        return
+    trace = Trace(name=task_name, kind="task", mode=mode, attrs={"task_id": task_id})
+    _active_tasks[task_id] = _start(trace)
+
+
+def finish_task_profile(task_id: str, state: str | None = None) -> Trace | None:
+    """Close the trace opened by ``start_task_profile``, if any."""
+    active = _active_tasks.pop(task_id, None)
+    if active is None:
+        return None
+    if state:
+        active.trace.attrs["state"] = state
+    return _finish(active)
+
+
+# =============================================================================
+# Instrumentation
+# =============================================================================
+
+_instrumented = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    starts = conn.info.get("profiling_query_start")
+    if trace is None or not starts:
+        return
+    start = starts.pop()
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    trace.add_span(
+        "db",
+        verb,
+        start,
+        (time.perf_counter() - start) * 1000,
+        statement=statement[:300],
+        executemany=executemany,
+    )
+
+
+def _wrap_httpx_send(original):
+    async def send(self, request, *args, **kwargs):
+        with span("http", f"{request.method} {request.url.host}", path=request.url.path):
+            return await original(self, request, *args, **kwargs)
+
+    send.__wrapped__ = original
+    return send
+
+
+def _wrap_httpx_sync_send(original):
+    def send(self, request, *args, **kwargs):
+        with span("http", f"{request.method} {request.url.host}", path=request.url.path):
+            return original(self, request, *args, **kwargs)
+
+    send.__wrapped__ = original
+    return send
+
+
+def install_instrumentation() -> None:
+    """
+    Hook DB and outbound HTTP instrumentation (idempotent).
+
+    Gemini, PDF and cache spans are recorded at their call sites via ``span``
+    and ``record_event``.
+    """
+    global _instrumented
+    if _instrumented:
+        return
+
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    httpx.AsyncClient.send = _wrap_httpx_send(httpx.AsyncClient.send)
+    httpx.Client.send = _wrap_httpx_sync_send(httpx.Client.send)
+    _instrumented = True
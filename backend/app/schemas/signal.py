@@ -44,6 +44,7 @@ class SignalRead(BaseModel):
 class SignalListResponse(BaseModel):
     signals: list[SignalRead]
     total: int
+    next_cursor: str | None = None
 
 
 class SubscriptionCreate(BaseModel):
@@ -2,11 +2,19 @@
 RFP Sniper - Services Layer
 ============================
 Business logic and external integrations.
+
+Exports resolve on first access so importing one service module does not load
+the others (see ``app.lazy_imports``).
 """
 
-from app.services.filters import FilterResult, KillerFilterService
-from app.services.gemini_service import GeminiService
-from app.services.ingest_service import SAMGovService
+import importlib
+
+_EXPORTS = {
+    "SAMGovService": "app.services.ingest_service",
+    "KillerFilterService": "app.services.filters",
+    "FilterResult": "app.services.filters",
+    "GeminiService": "app.services.gemini_service",
+}
 
 __all__ = [
     "SAMGovService",
@@ -14,3 +22,10 @@ __all__ = [
     "FilterResult",
     "GeminiService",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
@@ -7,6 +7,7 @@ Helper to log activity events.
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.activity import ActivityFeedEntry, ActivityType
+from app.services.event_buffer import buffer_event
 
 
 async def log_activity(
@@ -18,7 +19,7 @@ async def log_activity(
     section_id: int | None = None,
     metadata: dict | None = None,
 ) -> ActivityFeedEntry:
-    """Insert an activity feed entry and commit."""
+    """Record an activity feed entry, written when the caller commits."""
     entry = ActivityFeedEntry(
         proposal_id=proposal_id,
         user_id=user_id,
@@ -27,7 +28,7 @@ async def log_activity(
         section_id=section_id,
         metadata_json=metadata,
     )
-    session.add(entry)
-    await session.flush()
-    await session.refresh(entry)
+    if not buffer_event(session, entry):
+        await session.flush()
+        await session.refresh(entry)
     return entry
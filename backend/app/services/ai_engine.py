@@ -9,20 +9,25 @@ Features:
 - The Writer: Generate proposal sections with strict citation enforcement
 """
 
+from __future__ import annotations
+
 import json
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
-import google.generativeai as genai
 import structlog
-from google.generativeai import caching
 
 from app.config import settings
+from app.lazy_imports import lazy_module
+from app.services.llm_gateway import LLMPriority, llm_generate
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+caching = lazy_module("google.generativeai.caching")
+
 
 # =============================================================================
 # Data Classes
@@ -356,8 +361,11 @@ Extract all requirements and return as JSON."""
         start_time = datetime.utcnow()
 
         try:
-            response = await self.pro_model.generate_content_async(
+            response = await llm_generate(
+                self.pro_model,
                 prompt,
+                operation="compliance_extraction",
+                model_name=settings.gemini_model_pro,
                 generation_config=genai.GenerationConfig(
                     temperature=0.1,
                     response_mime_type="application/json",
@@ -484,8 +492,10 @@ INSTRUCTIONS:
         prompt = "\n".join(prompt_parts)
 
         try:
-            response = await model.generate_content_async(
+            response = await llm_generate(
+                model,
                 prompt,
+                operation="section_generation",
                 generation_config=genai.GenerationConfig(
                     temperature=0.7,
                     max_output_tokens=max_words * 3,
@@ -628,9 +638,14 @@ INSTRUCTIONS:
             return False
 
         try:
-            response = await self.flash_model.generate_content_async(
+            response = await llm_generate(
+                self.flash_model,
                 "Respond with only: OK",
+                operation="health_check",
+                model_name=settings.gemini_model_flash,
                 generation_config=genai.GenerationConfig(max_output_tokens=10),
+                priority=LLMPriority.INTERACTIVE,
+                cache=False,
             )
             return "ok" in response.text.lower()
         except Exception as e:
@@ -6,10 +6,11 @@ Helpers for writing audit events.
 
 from datetime import datetime, timedelta
 
-from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.audit import AuditEvent
+from app.services.event_buffer import buffer_event
+from app.services.event_partitions import purge_partitioned_events
 
 
 async def log_audit_event(
@@ -23,6 +24,9 @@ async def log_audit_event(
 ) -> AuditEvent:
     """
     Record an audit event.
+
+    The event is written when the caller's transaction commits, batched with
+    other events when the API's event buffer is running.
     """
     event = AuditEvent(
         user_id=user_id,
@@ -31,7 +35,7 @@ async def log_audit_event(
         action=action,
         event_metadata=metadata or {},
     )
-    session.add(event)
+    buffer_event(session, event)
     return event
 
 
@@ -39,8 +43,8 @@ async def purge_audit_events(session: AsyncSession, retention_days: int) -> int:
     """
     Purge audit events older than retention_days.
 
-    Returns number of rows deleted.
+    Expired monthly partitions are dropped whole where the table is
+    partitioned. Returns number of rows removed.
     """
     cutoff = datetime.utcnow() - timedelta(days=retention_days)
-    result = await session.execute(delete(AuditEvent).where(AuditEvent.created_at < cutoff))
-    return result.rowcount or 0
+    return await purge_partitioned_events(session, AuditEvent, cutoff)
@@ -7,16 +7,20 @@ Uses Gemini Pro for deep analysis of opportunity fit.
 
 import json
 
-import google.generativeai as genai
 import structlog
 
 from app.config import settings
+from app.lazy_imports import lazy_module
 from app.models.capture import BidScorecard, BidScorecardRecommendation, ScorerType
 from app.models.rfp import RFP
 from app.models.user import UserProfile
+from app.services.llm_gateway import llm_generate
+from app.services.model_registry import model_registry
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+
 # 12 weighted criteria summing to 100
 DEFAULT_BID_CRITERIA = [
     {
@@ -104,8 +108,8 @@ class BidDecisionService:
         self.model_name = settings.gemini_model_pro
 
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(
+            model_registry.configure(self.api_key)
+            self.model = model_registry.get_model(
                 self.model_name,
                 system_instruction=SYSTEM_PROMPT,
             )
@@ -185,8 +189,11 @@ class BidDecisionService:
         prompt = self._build_prompt(rfp, profile, criteria)
 
         try:
-            response = await self.model.generate_content_async(
+            response = await llm_generate(
+                self.model,
                 prompt,
+                operation="bid_decision",
+                model_name=self.model_name,
                 generation_config=genai.GenerationConfig(
                     temperature=0.2,
                     response_mime_type="application/json",
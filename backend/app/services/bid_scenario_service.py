@@ -1,15 +1,26 @@
 """
 Bid Scenario Simulator Service
 ==============================
-Deterministic stress-test simulation for bid/no-bid decisions.
+Deterministic stress-test simulation for bid/no-bid decisions, plus a
+batch Monte Carlo engine for sensitivity sweeps across a portfolio of
+scorecards.
+
+``simulate_batch`` evaluates scorecard x scenario x sample on padded NumPy
+arrays of shape (scenarios, scorecards, samples, criteria), processed in
+chunks of at most ``MAX_CHUNK_ELEMENTS`` elements. All scenarios share the
+same random draws, so differences between them are not masked by sampling
+noise.
 """
 
 from __future__ import annotations
 
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from statistics import NormalDist
 from typing import Any
 
+import numpy as np
+
 from app.models.capture import BidScorecard, BidScorecardRecommendation
 from app.services.bid_decision_service import DEFAULT_BID_CRITERIA
 
@@ -28,6 +39,26 @@ class ScenarioDefinition:
     notes: str | None = None
 
 
+@dataclass(slots=True)
+class MonteCarloSettings:
+    iterations: int = 2000
+    # Standard deviation of criterion score noise, in score points.
+    score_std: float = 10.0
+    # Log-normal sigma applied multiplicatively to criterion weights.
+    weight_std: float = 0.15
+    confidence_level: float = 0.9
+    seed: int | None = None
+
+
+HISTOGRAM_BINS = 10
+# Upper bound on float64 elements in any (scenarios, scorecards, samples,
+# criteria) block; about 32 MB per intermediate array.
+MAX_CHUNK_ELEMENTS = 4_000_000
+# Largest scenarios x scorecards x samples x criteria product a batch request
+# may ask for.
+MAX_BATCH_CELLS = 100_000_000
+
+
 class BidScenarioService:
     """Deterministic bid/no-bid scenario simulator with explainable drivers."""
 
@@ -158,6 +189,15 @@ class BidScenarioService:
             )
         return normalized
 
+    def _recommendation_masks(self, scores: np.ndarray) -> dict[str, np.ndarray]:
+        bid = scores >= 70
+        no_bid = scores <= 45
+        return {
+            BidScorecardRecommendation.BID.value: bid,
+            BidScorecardRecommendation.NO_BID.value: no_bid,
+            BidScorecardRecommendation.CONDITIONAL.value: ~(bid | no_bid),
+        }
+
     def default_scenarios(self, available_criteria: set[str]) -> list[ScenarioDefinition]:
         templates = [
             ScenarioDefinition(
@@ -384,3 +424,195 @@ class BidScenarioService:
             },
             "scenarios": scenario_results,
         }
+
+    def simulate_batch(
+        self,
+        scorecards: Sequence[BidScorecard],
+        scenarios: Sequence[ScenarioDefinition] | None = None,
+        settings: MonteCarloSettings | None = None,
+    ) -> dict[str, Any]:
+        """
+        Monte Carlo sensitivity analysis for each scorecard under the baseline
+        and each scenario.
+
+        Every sample perturbs criterion scores with Gaussian noise and weights
+        with log-normal noise. Results carry the score distribution, a
+        confidence interval, recommendation probabilities and tornado
+        sensitivities per criterion.
+        """
+        settings = settings or MonteCarloSettings()
+        scenario_defs = [
+            ScenarioDefinition(name="Baseline", adjustments=[]),
+            *(scenarios or []),
+        ]
+        criteria = [self._baseline_criteria(card) for card in scorecards]
+        if not criteria:
+            return {"settings": asdict(settings), "scorecards": []}
+
+        n_cards = len(criteria)
+        n_criteria = max(len(rows) for rows in criteria)
+        weights = np.zeros((n_cards, n_criteria))
+        scores = np.zeros((n_cards, n_criteria))
+        deltas = np.zeros((len(scenario_defs), n_cards, n_criteria))
+        for k, rows in enumerate(criteria):
+            positions = {row["name"]: i for i, row in enumerate(rows)}
+            weights[k, : len(rows)] = [row["weight"] for row in rows]
+            scores[k, : len(rows)] = [row["score"] for row in rows]
+            for m, scenario in enumerate(scenario_defs):
+                for adjustment in scenario.adjustments:
+                    i = positions.get(self._normalize_criterion_name(adjustment.criterion))
+                    if i is not None:
+                        deltas[m, k, i] = adjustment.delta
+
+        # (M, K, C): deterministic criterion scores per scenario.
+        scenario_scores = np.clip(scores[None] + deltas, 0.0, 100.0)
+        total_weight = weights.sum(axis=-1)
+        safe_total = np.where(total_weight > 0, total_weight, 1.0)
+        point_scores = np.where(
+            total_weight > 0, (scenario_scores * weights).sum(axis=-1) / safe_total, 0.0
+        )
+
+        tail = (1.0 - settings.confidence_level) / 2.0
+        quantiles = [tail, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0 - tail]
+        n_scenarios = len(scenario_defs)
+        percentiles = np.zeros((len(quantiles), n_scenarios, n_cards))
+        mean = np.zeros((n_scenarios, n_cards))
+        std = np.zeros((n_scenarios, n_cards))
+        histogram = np.zeros((n_scenarios, n_cards, HISTOGRAM_BINS), dtype=np.int64)
+        correlation = np.zeros((n_scenarios, n_cards, n_criteria))
+        recommendation_shares = {
+            recommendation.value: np.zeros((n_scenarios, n_cards))
+            for recommendation in BidScorecardRecommendation
+        }
+
+        # Each scorecard draws from its own stream so results do not depend on
+        # how the portfolio is chunked.
+        card_rngs = [
+            np.random.default_rng(seed)
+            for seed in np.random.SeedSequence(settings.seed).spawn(n_cards)
+        ]
+        cell = settings.iterations * n_criteria
+        card_chunk = max(1, min(n_cards, MAX_CHUNK_ELEMENTS // cell))
+        scenario_chunk = max(1, min(n_scenarios, MAX_CHUNK_ELEMENTS // (card_chunk * cell)))
+        for k0 in range(0, n_cards, card_chunk):
+            ks = slice(k0, k0 + card_chunk)
+            noise = [
+                (
+                    rng.normal(0.0, settings.score_std, (settings.iterations, n_criteria)),
+                    rng.lognormal(0.0, settings.weight_std, (settings.iterations, n_criteria)),
+                )
+                for rng in card_rngs[ks]
+            ]
+            # (k, N, C) draws shared by every scenario of these scorecards.
+            score_noise = np.stack([score for score, _ in noise])
+            sampled_weights = weights[ks, None, :] * np.stack([weight for _, weight in noise])
+            sampled_total = sampled_weights.sum(axis=-1)
+            safe_sampled_total = np.where(sampled_total > 0, sampled_total, 1.0)
+            for m0 in range(0, n_scenarios, scenario_chunk):
+                ms = slice(m0, m0 + scenario_chunk)
+                # (m, k, N, C) perturbed criterion scores and (m, k, N) overall scores.
+                sampled_scores = np.clip(
+                    scenario_scores[ms, ks, None, :] + score_noise[None], 0.0, 100.0
+                )
+                overall = np.einsum("mknc,knc->mkn", sampled_scores, sampled_weights)
+                overall = np.where(sampled_total > 0, overall / safe_sampled_total, 0.0)
+
+                percentiles[:, ms, ks] = np.quantile(overall, quantiles, axis=-1)
+                mean[ms, ks] = overall.mean(axis=-1)
+                std[ms, ks] = overall.std(axis=-1)
+                for label, mask in self._recommendation_masks(overall).items():
+                    recommendation_shares[label][ms, ks] = mask.mean(axis=-1)
+
+                bins = np.minimum(
+                    (overall // (100 / HISTOGRAM_BINS)).astype(np.int64), HISTOGRAM_BINS - 1
+                )
+                rows = bins.shape[0] * bins.shape[1]
+                offsets = np.arange(rows).reshape(bins.shape[:2] + (1,)) * HISTOGRAM_BINS
+                histogram[ms, ks] = np.bincount(
+                    (bins + offsets).ravel(), minlength=rows * HISTOGRAM_BINS
+                ).reshape(bins.shape[:2] + (HISTOGRAM_BINS,))
+
+                sampled_scores -= sampled_scores.mean(axis=-2, keepdims=True)
+                centered_y = overall - overall.mean(axis=-1, keepdims=True)
+                denominator = np.sqrt(
+                    np.einsum("mknc,mknc->mkc", sampled_scores, sampled_scores)
+                    * (centered_y**2).sum(axis=-1)[..., None]
+                )
+                np.divide(
+                    np.einsum("mknc,mkn->mkc", sampled_scores, centered_y),
+                    denominator,
+                    out=correlation[ms, ks],
+                    where=denominator > 0,
+                )
+
+        # Tornado: move one criterion at a time to the low/high end of the
+        # confidence band; the weighted mean is linear in each score.
+        swing = NormalDist().inv_cdf(1.0 - tail) * settings.score_std
+        low = np.clip(scenario_scores - swing, 0.0, 100.0)
+        high = np.clip(scenario_scores + swing, 0.0, 100.0)
+        share = weights / safe_total[:, None]
+        tornado_low = point_scores[..., None] + share * (low - scenario_scores)
+        tornado_high = point_scores[..., None] + share * (high - scenario_scores)
+
+        results: list[dict[str, Any]] = []
+        for k, (card, rows) in enumerate(zip(scorecards, criteria, strict=True)):
+            baseline_recommendation = card.recommendation or self._recommendation_for_score(
+                float(point_scores[0, k])
+            )
+            scenario_results: list[dict[str, Any]] = []
+            for m, scenario in enumerate(scenario_defs):
+                recommendation = self._recommendation_for_score(float(point_scores[m, k]))
+                sensitivities = [
+                    {
+                        "criterion": row["name"],
+                        "weight": row["weight"],
+                        "low_score": round(float(tornado_low[m, k, i]), 2),
+                        "high_score": round(float(tornado_high[m, k, i]), 2),
+                        "swing": round(float(tornado_high[m, k, i] - tornado_low[m, k, i]), 2),
+                        "correlation": round(float(correlation[m, k, i]), 3),
+                    }
+                    for i, row in enumerate(rows)
+                ]
+                sensitivities.sort(key=lambda item: item["swing"], reverse=True)
+                scenario_results.append(
+                    {
+                        "name": scenario.name,
+                        "notes": scenario.notes,
+                        "overall_score": round(float(point_scores[m, k]), 2),
+                        "recommendation": recommendation.value,
+                        "distribution": {
+                            "mean": round(float(mean[m, k]), 2),
+                            "std": round(float(std[m, k]), 2),
+                            "p5": round(float(percentiles[1, m, k]), 2),
+                            "p25": round(float(percentiles[2, m, k]), 2),
+                            "p50": round(float(percentiles[3, m, k]), 2),
+                            "p75": round(float(percentiles[4, m, k]), 2),
+                            "p95": round(float(percentiles[5, m, k]), 2),
+                            "histogram": [int(count) for count in histogram[m, k]],
+                        },
+                        "confidence_interval": {
+                            "level": settings.confidence_level,
+                            "lower": round(float(percentiles[0, m, k]), 2),
+                            "upper": round(float(percentiles[-1, m, k]), 2),
+                        },
+                        "recommendation_probabilities": {
+                            label: round(float(values[m, k]), 4)
+                            for label, values in recommendation_shares.items()
+                        },
+                        "recommendation_change_probability": round(
+                            1.0 - float(recommendation_shares[baseline_recommendation.value][m, k]),
+                            4,
+                        ),
+                        "sensitivities": sensitivities,
+                    }
+                )
+            results.append(
+                {
+                    "scorecard_id": card.id,
+                    "rfp_id": card.rfp_id,
+                    "baseline_recommendation": baseline_recommendation.value,
+                    "scenarios": scenario_results,
+                }
+            )
+
+        return {"settings": asdict(settings), "scorecards": results}
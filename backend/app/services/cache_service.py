@@ -2,24 +2,45 @@
 RFP Sniper - Cache Service
 ==========================
 Redis-backed or in-memory cache with TTL support.
+
+Entries can carry entity tags (see ``app.services.cache_tags``); writes
+invalidate every entry under a tag in two pipelined round trips instead of
+scanning key prefixes. ``cache_get_or_compute`` adds stale-while-revalidate and
+single-flight filling on top, and ``cached_route`` applies it to GET routes.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
+import inspect
 import json
 import time
+from collections.abc import Awaitable, Callable, Iterable
+from enum import Enum
 from typing import Any
 
 import structlog
 
 from app.config import settings
+from app.observability.profiling import record_event
 
 logger = structlog.get_logger(__name__)
 
 
+TAG_KEY_PREFIX = "cache:tag:"
+TAG_SET_TTL_SECONDS = 86_400
+FILL_LOCK_PREFIX = "cache:fill:"
+FILL_LOCK_TTL_MS = 10_000
+FILL_WAIT_SECONDS = 2.0
+_ENVELOPE_MARKER = "__cached__"
+
+
 class MemoryCache:
     def __init__(self):
         self._store: dict[str, tuple[float, Any]] = {}
+        self._tags: dict[str, set[str]] = {}
 
     async def get(self, key: str) -> Any | None:
         item = self._store.get(key)
@@ -31,13 +52,33 @@ class MemoryCache:
             return None
         return value
 
-    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+    async def set(self, key: str, value: Any, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
         expires_at = time.time() + ttl_seconds if ttl_seconds else 0
         self._store[key] = (expires_at, value)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
 
     async def delete(self, key: str) -> None:
         self._store.pop(key, None)
 
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        return self.invalidate_tags_now(tags)
+
+    def invalidate_tags_now(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if self._store.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    async def acquire_fill_lock(self, key: str) -> bool:
+        # In-process single-flight already serializes fills for this backend.
+        return True
+
+    async def release_fill_lock(self, key: str) -> None:
+        return None
+
     async def clear_prefix(self, prefix: str) -> None:
         keys = [key for key in self._store.keys() if key.startswith(prefix)]
         for key in keys:
@@ -45,6 +86,7 @@ class MemoryCache:
 
     async def clear(self) -> None:
         self._store.clear()
+        self._tags.clear()
 
 
 class RedisCache:
@@ -62,13 +104,59 @@ class RedisCache:
         except json.JSONDecodeError:
             return value
 
-    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+    async def set(self, key: str, value: Any, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
         payload = json.dumps(value, default=str)
-        await self._redis.set(key, payload, ex=ttl_seconds)
+        tags = list(tags)
+        if not tags:
+            await self._redis.set(key, payload, ex=ttl_seconds)
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(key, payload, ex=ttl_seconds)
+            for tag in tags:
+                tag_key = TAG_KEY_PREFIX + tag
+                pipe.sadd(tag_key, key)
+                # Tag sets must outlive their members; expired members are harmless.
+                pipe.expire(tag_key, max(ttl_seconds, TAG_SET_TTL_SECONDS))
+            await pipe.execute()
 
     async def delete(self, key: str) -> None:
         await self._redis.delete(key)
 
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tag_keys = [TAG_KEY_PREFIX + tag for tag in dict.fromkeys(tags)]
+        if not tag_keys:
+            return 0
+        # Every command names its keys explicitly so this also works on
+        # Redis Cluster, where tag sets and entries live in different slots.
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            member_sets = await pipe.execute()
+
+        members_by_tag = {
+            tag_key: list(members) for tag_key, members in zip(tag_keys, member_sets, strict=True)
+        }
+        keys = list(dict.fromkeys(key for members in member_sets for key in members))
+        if not keys:
+            return 0
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.delete(key)
+            # Remove only the members read above; entries tagged since then stay tracked.
+            for tag_key, members in members_by_tag.items():
+                if members:
+                    pipe.srem(tag_key, *members)
+            results = await pipe.execute()
+        return sum(int(deleted) for deleted in results[: len(keys)])
+
+    async def acquire_fill_lock(self, key: str) -> bool:
+        return bool(
+            await self._redis.set(FILL_LOCK_PREFIX + key, "1", nx=True, px=FILL_LOCK_TTL_MS)
+        )
+
+    async def release_fill_lock(self, key: str) -> None:
+        await self._redis.delete(FILL_LOCK_PREFIX + key)
+
     async def clear_prefix(self, prefix: str) -> None:
         async for key in self._redis.scan_iter(match=f"{prefix}*"):
             await self._redis.delete(key)
@@ -96,13 +184,20 @@ def get_cache_backend():
 
 async def cache_get(key: str) -> Any | None:
     backend = get_cache_backend()
-    return await backend.get(key)
+    value = await backend.get(key)
+    record_event("cache", "hit" if value is not None else "miss", key=key)
+    return value
 
 
-async def cache_set(key: str, value: Any, ttl_seconds: int | None = None) -> None:
+async def cache_set(
+    key: str,
+    value: Any,
+    ttl_seconds: int | None = None,
+    tags: Iterable[str] = (),
+) -> None:
     backend = get_cache_backend()
     ttl = ttl_seconds if ttl_seconds is not None else settings.cache_ttl_seconds
-    await backend.set(key, value, ttl)
+    await backend.set(key, value, ttl, tags)
 
 
 async def cache_delete(key: str) -> None:
@@ -118,3 +213,257 @@ async def cache_clear_prefix(prefix: str) -> None:
 async def cache_clear() -> None:
     backend = get_cache_backend()
     await backend.clear()
+
+
+# =============================================================================
+# Tag invalidation
+# =============================================================================
+
+_pending_invalidations: set[asyncio.Task] = set()
+
+
+async def cache_invalidate_tags(tags: Iterable[str]) -> None:
+    """Drop every cached entry carrying any of ``tags``."""
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return
+    backend = get_cache_backend()
+    try:
+        removed = await backend.invalidate_tags(tags)
+    except Exception as exc:
+        logger.warning("Cache tag invalidation failed", tags=tags, error=str(exc))
+        return
+    record_event("cache", "invalidate", tags=len(tags), removed=removed)
+
+
+def cache_invalidate_tags_soon(tags: Iterable[str]) -> None:
+    """Invalidate from synchronous code (e.g. ORM commit hooks).
+
+    The in-memory backend is cleared immediately; Redis invalidation is
+    scheduled on the running event loop. Without a loop the entries simply
+    age out with their TTL. Celery tasks drain the scheduled work through
+    ``await_pending_invalidations`` before ``run_async`` returns.
+    """
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return
+    backend = get_cache_backend()
+    if isinstance(backend, MemoryCache):
+        backend.invalidate_tags_now(tags)
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.debug("No event loop for cache invalidation", tags=tags)
+        return
+    task = loop.create_task(cache_invalidate_tags(tags))
+    _pending_invalidations.add(task)
+    task.add_done_callback(_invalidation_done)
+
+
+async def await_pending_invalidations() -> None:
+    """Wait for invalidations scheduled on the current loop to finish."""
+    loop = asyncio.get_running_loop()
+    while pending := [task for task in _pending_invalidations if task.get_loop() is loop]:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _invalidation_done(task: asyncio.Task) -> None:
+    _pending_invalidations.discard(task)
+    if task.cancelled():
+        logger.warning("Cache tag invalidation cancelled")
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("Cache tag invalidation failed", error=str(exc))
+
+
+# =============================================================================
+# Read-through caching with stale-while-revalidate and single-flight
+# =============================================================================
+
+_inflight: dict[str, asyncio.Future] = {}
+_background_refreshes: set[asyncio.Task] = set()
+
+
+def _unwrap_envelope(raw: Any) -> tuple[Any, float] | None:
+    if isinstance(raw, dict) and raw.get(_ENVELOPE_MARKER) == 1:
+        return raw.get("value"), float(raw.get("fresh_until", 0))
+    return None
+
+
+async def _fill(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    stale: int,
+    tags: Callable[[Any], Iterable[str]] | Iterable[str],
+) -> Any:
+    backend = get_cache_backend()
+    locked = await backend.acquire_fill_lock(key)
+    if not locked:
+        # Another process is filling this key; wait briefly for its result.
+        deadline = time.monotonic() + FILL_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = _unwrap_envelope(await backend.get(key))
+            if entry is not None and entry[1] > time.time():
+                return entry[0]
+    try:
+        value = await compute()
+        entry_tags = tags(value) if callable(tags) else tags
+        envelope = {_ENVELOPE_MARKER: 1, "value": value, "fresh_until": time.time() + ttl}
+        await backend.set(key, envelope, ttl + stale, list(entry_tags))
+        return value
+    finally:
+        if locked:
+            await backend.release_fill_lock(key)
+
+
+async def _single_flight(key: str, fill: Callable[[], Awaitable[Any]]) -> Any:
+    existing = _inflight.get(key)
+    if existing is not None and existing.get_loop() is asyncio.get_running_loop():
+        return await asyncio.shield(existing)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await fill()
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Mark retrieved so an unawaited failure is not logged as unhandled.
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def cache_get_or_compute(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    tags: Callable[[Any], Iterable[str]] | Iterable[str] = (),
+    ttl_seconds: int | None = None,
+    stale_seconds: int = 0,
+    refresh: Callable[[], Awaitable[Any]] | None = None,
+) -> Any:
+    """Return the cached value for ``key`` or compute and store it.
+
+    Concurrent misses for a key share one computation. Within
+    ``stale_seconds`` after expiry the stale value is served while a
+    background ``refresh`` (defaulting to ``compute``) repopulates the entry.
+    ``tags`` may be a callable receiving the computed value.
+    """
+    ttl = ttl_seconds if ttl_seconds is not None else settings.cache_ttl_seconds
+    backend = get_cache_backend()
+    entry = _unwrap_envelope(await backend.get(key))
+    if entry is not None:
+        value, fresh_until = entry
+        if fresh_until > time.time():
+            record_event("cache", "hit", key=key)
+            return value
+        if stale_seconds:
+            record_event("cache", "stale", key=key)
+            if key not in _inflight:
+                task = asyncio.create_task(
+                    _single_flight(
+                        key, lambda: _fill(key, refresh or compute, ttl, stale_seconds, tags)
+                    )
+                )
+                _background_refreshes.add(task)
+                task.add_done_callback(_refresh_done)
+            return value
+
+    record_event("cache", "miss", key=key)
+    return await _single_flight(key, lambda: _fill(key, compute, ttl, stale_seconds, tags))
+
+
+def _refresh_done(task: asyncio.Task) -> None:
+    _background_refreshes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background cache refresh failed", error=str(task.exception()))
+
+
+# =============================================================================
+# Route decorator
+# =============================================================================
+
+
+def _route_key_part(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, list | tuple):
+        return [_route_key_part(item) for item in value]
+    return None
+
+
+def cached_route(
+    namespace: str,
+    *,
+    tags: Callable[[dict[str, Any], Any], Iterable[str]],
+    ttl_seconds: int | None = None,
+    stale_seconds: int | None = None,
+):
+    """Cache a GET route's JSON-encoded response under entity tags.
+
+    The key covers the caller (``current_user.id``) and every scalar route
+    argument. ``tags(arguments, payload)`` returns the entity tags for the
+    encoded payload. Stale background refreshes run on a fresh DB session so
+    they never share the request's session.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            from fastapi.encoders import jsonable_encoder
+            from sqlalchemy.ext.asyncio import AsyncSession
+
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            key_parts: dict[str, Any] = {}
+            session_arg = None
+            for name, value in arguments.items():
+                if isinstance(value, AsyncSession):
+                    session_arg = name
+                elif name == "current_user":
+                    key_parts[name] = getattr(value, "id", None)
+                else:
+                    key_parts[name] = _route_key_part(value)
+            digest = hashlib.sha1(
+                json.dumps(key_parts, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            key = f"route:{namespace}:{digest}"
+
+            async def compute():
+                return jsonable_encoder(await func(**arguments))
+
+            async def refresh():
+                if session_arg is None:
+                    return await compute()
+                from app.database import async_session_factory
+
+                async with async_session_factory() as session:
+                    result = await func(**{**arguments, session_arg: session})
+                    return jsonable_encoder(result)
+
+            return await cache_get_or_compute(
+                key,
+                compute,
+                tags=lambda payload: tags(arguments, payload),
+                ttl_seconds=ttl_seconds,
+                stale_seconds=(
+                    stale_seconds if stale_seconds is not None else settings.cache_stale_seconds
+                ),
+                refresh=refresh,
+            )
+
+        return wrapper
+
+    return decorator
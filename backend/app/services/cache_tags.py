@@ -0,0 +1,114 @@
+"""
+RFP Sniper - Cache Tags
+=======================
+Entity tags for cached responses and automatic invalidation on commit.
+
+Cached entries are tagged with the entities they were built from
+(``user:1``, ``rfp:42``, ``proposal:7``, ``outline:3``). A session listener
+collects the tags of every RFP, proposal, outline and knowledge-base row that
+is inserted, updated or deleted and invalidates them once the transaction
+commits, so routes, Celery tasks and services never need to remember which
+cache keys they affect.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.services.cache_service import cache_invalidate_tags_soon
+
+_PENDING_TAGS_KEY = "cache_invalidation_tags"
+_installed = False
+
+
+def user_tag(user_id: int | None) -> str:
+    return f"user:{user_id}"
+
+
+def rfp_tag(rfp_id: int | None) -> str:
+    return f"rfp:{rfp_id}"
+
+
+def proposal_tag(proposal_id: int | None) -> str:
+    return f"proposal:{proposal_id}"
+
+
+def outline_tag(outline_id: int | None) -> str:
+    return f"outline:{outline_id}"
+
+
+def workspace_tag(workspace_id: int | None) -> str:
+    return f"workspace:{workspace_id}"
+
+
+# Entity type -> (tag builder, attribute) pairs. Attributes are read from the
+# loaded state only, so the flush hook never triggers a lazy load.
+def _entity_tag_sources() -> dict[type, list[tuple[Callable[[int], str], str]]]:
+    from app.models.knowledge_base import KnowledgeBaseDocument
+    from app.models.outline import OutlineSection, ProposalOutline
+    from app.models.proposal import Proposal, ProposalSection
+    from app.models.rfp import RFP
+
+    return {
+        RFP: [(rfp_tag, "id"), (user_tag, "user_id")],
+        Proposal: [(proposal_tag, "id"), (user_tag, "user_id")],
+        ProposalSection: [(proposal_tag, "proposal_id")],
+        ProposalOutline: [(proposal_tag, "proposal_id"), (outline_tag, "id")],
+        OutlineSection: [(outline_tag, "outline_id")],
+        KnowledgeBaseDocument: [(user_tag, "user_id")],
+    }
+
+
+def entity_tags(instances: Iterable[Any], session: Session | None = None) -> set[str]:
+    """Tags for ``instances``.
+
+    With a session, proposal children also pick up the owner's user tag when
+    their proposal is already in the identity map (user-level aggregates such
+    as analytics count sections).
+    """
+    from app.models.proposal import Proposal
+
+    sources = _entity_tag_sources()
+    tags: set[str] = set()
+    for instance in instances:
+        loaded = instance.__dict__
+        for build_tag, attribute in sources.get(type(instance), ()):
+            value = loaded.get(attribute)
+            if value is not None:
+                tags.add(build_tag(value))
+        proposal_id = loaded.get("proposal_id")
+        if session is not None and proposal_id is not None:
+            proposal = session.identity_map.get(Session.identity_key(Proposal, proposal_id))
+            if proposal is not None and proposal.__dict__.get("user_id") is not None:
+                tags.add(user_tag(proposal.__dict__["user_id"]))
+    return tags
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    tags = entity_tags([*session.new, *session.dirty, *session.deleted], session)
+    if tags:
+        session.info.setdefault(_PENDING_TAGS_KEY, set()).update(tags)
+
+
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        cache_invalidate_tags_soon(sorted(tags))
+
+
+def _after_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_TAGS_KEY, None)
+
+
+def install_cache_invalidation() -> None:
+    """Register the commit-time invalidation listeners (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+    _installed = True
@@ -112,12 +112,18 @@ Respond in JSON:
 
     # Try Gemini Flash
     try:
-        import google.generativeai as genai
+        from app.services.llm_gateway import llm_generate
+        from app.services.model_registry import model_registry
 
         if settings.gemini_api_key:
-            genai.configure(api_key=settings.gemini_api_key)
-            model = genai.GenerativeModel(settings.gemini_model_flash)
-            response = await model.generate_content_async(prompt)
+            model_registry.configure(settings.gemini_api_key)
+            model = model_registry.get_model(settings.gemini_model_flash)
+            response = await llm_generate(
+                model,
+                prompt,
+                operation="capability_gap",
+                model_name=settings.gemini_model_flash,
+            )
             text = response.text.strip()
             # Strip markdown code fences if present
             if text.startswith("```"):
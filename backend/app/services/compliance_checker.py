@@ -11,6 +11,8 @@ from typing import Any
 
 import structlog
 
+from app.services.keyword_scanner import KeywordScanner, get_keyword_scanner
+
 logger = structlog.get_logger(__name__)
 
 
@@ -101,9 +103,7 @@ class FARComplianceChecker:
             "id": "CERT-001",
             "name": "Representations and Certifications",
             "level": ComplianceLevel.CRITICAL,
-            "check": lambda text: any(
-                kw in text.lower() for kw in ["certif", "represent", "attest", "affirm"]
-            ),
+            "keywords": ["certif", "represent", "attest", "affirm"],
             "description": "Proposal should include required certifications and representations",
             "suggestion": "Add a section explicitly addressing required FAR certifications",
             "far_reference": "FAR 52.204-8",
@@ -112,10 +112,7 @@ class FARComplianceChecker:
             "id": "KEY-001",
             "name": "Key Personnel Identification",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower()
-                for kw in ["key personnel", "project manager", "program manager", "key staff"]
-            ),
+            "keywords": ["key personnel", "project manager", "program manager", "key staff"],
             "description": "Key personnel should be clearly identified with qualifications",
             "suggestion": "Include resumes and qualifications for all key personnel",
             "far_reference": "FAR 15.305(a)(2)",
@@ -124,10 +121,7 @@ class FARComplianceChecker:
             "id": "PP-001",
             "name": "Past Performance References",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower()
-                for kw in ["past performance", "contract reference", "cpars", "prior experience"]
-            ),
+            "keywords": ["past performance", "contract reference", "cpars", "prior experience"],
             "description": "Past performance should include verifiable references",
             "suggestion": "Include contract numbers, POCs, and CPARS ratings",
             "far_reference": "FAR 15.305(a)(2)",
@@ -136,9 +130,7 @@ class FARComplianceChecker:
             "id": "PRICE-001",
             "name": "Price/Cost Information",
             "level": ComplianceLevel.CRITICAL,
-            "check": lambda text: any(
-                kw in text.lower() for kw in ["price", "cost", "labor rate", "pricing"]
-            ),
+            "keywords": ["price", "cost", "labor rate", "pricing"],
             "description": "Price/cost volume should be clearly separated and formatted",
             "suggestion": "Ensure pricing follows solicitation format requirements",
             "far_reference": "FAR 15.403",
@@ -147,10 +139,7 @@ class FARComplianceChecker:
             "id": "TECH-001",
             "name": "Technical Approach",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower()
-                for kw in ["technical approach", "methodology", "approach", "solution"]
-            ),
+            "keywords": ["technical approach", "methodology", "approach", "solution"],
             "description": "Technical approach should address all SOW requirements",
             "suggestion": "Ensure technical approach maps to each SOW requirement",
             "far_reference": "FAR 15.305(a)(3)",
@@ -159,9 +148,7 @@ class FARComplianceChecker:
             "id": "SUB-001",
             "name": "Subcontracting Plan",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower() for kw in ["subcontract", "teaming", "subcontracting plan"]
-            ),
+            "keywords": ["subcontract", "teaming", "subcontracting plan"],
             "description": "Subcontracting plan may be required for contracts > $750K",
             "suggestion": "Include small business subcontracting goals if applicable",
             "far_reference": "FAR 19.702",
@@ -170,10 +157,7 @@ class FARComplianceChecker:
             "id": "OCI-001",
             "name": "Organizational Conflict of Interest",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower()
-                for kw in ["conflict of interest", "oci", "organizational conflict"]
-            ),
+            "keywords": ["conflict of interest", "oci", "organizational conflict"],
             "description": "Address potential organizational conflicts of interest",
             "suggestion": "Include OCI mitigation plan if applicable",
             "far_reference": "FAR 9.5",
@@ -182,9 +166,7 @@ class FARComplianceChecker:
             "id": "SEC-001",
             "name": "Security Requirements",
             "level": ComplianceLevel.CRITICAL,
-            "check": lambda text: any(
-                kw in text.lower() for kw in ["clearance", "security", "classified", "cui"]
-            ),
+            "keywords": ["clearance", "security", "classified", "cui"],
             "description": "Security requirements should be clearly addressed",
             "suggestion": "Document clearance levels and security compliance",
             "far_reference": "FAR 4.4",
@@ -193,9 +175,7 @@ class FARComplianceChecker:
             "id": "DEL-001",
             "name": "Deliverables Schedule",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower() for kw in ["deliverable", "milestone", "schedule", "timeline"]
-            ),
+            "keywords": ["deliverable", "milestone", "schedule", "timeline"],
             "description": "Deliverables should include clear schedules",
             "suggestion": "Provide specific dates or durations for all deliverables",
             "far_reference": "FAR 11.4",
@@ -204,16 +184,29 @@ class FARComplianceChecker:
             "id": "QA-001",
             "name": "Quality Assurance",
             "level": ComplianceLevel.WARNING,
-            "check": lambda text: any(
-                kw in text.lower()
-                for kw in ["quality", "qa", "quality assurance", "quality control"]
-            ),
+            "keywords": ["quality", "qa", "quality assurance", "quality control"],
             "description": "Quality assurance plan should be included",
             "suggestion": "Document QA processes and metrics",
             "far_reference": "FAR 46.2",
         },
     ]
 
+    # Value-triggered checks, matched in the same scan as the standard checks
+    VALUE_CHECK_KEYWORDS = {
+        "SUB-002": ["subcontracting plan"],
+        "COST-001": ["cost accounting", "cas", "dcaa"],
+    }
+
+    def __init__(self) -> None:
+        rules: dict[str, list[str]] = {
+            check["id"]: check["keywords"] for check in self.COMPLIANCE_CHECKS
+        }
+        rules.update(
+            {f"FAR-{clause}": info["keywords"] for clause, info in self.FAR_CLAUSES.items()}
+        )
+        rules.update(self.VALUE_CHECK_KEYWORDS)
+        self._scanner = KeywordScanner(rules)
+
     def check_proposal(
         self,
         proposal_text: str,
@@ -232,14 +225,12 @@ class FARComplianceChecker:
             ComplianceReport with all findings
         """
         issues = []
-        text_lower = proposal_text.lower()
+        hits = self._scanner.scan(proposal_text)
 
         # Run standard checks
         for check in self.COMPLIANCE_CHECKS:
-            check_func = check["check"]
-
-            # If check returns False, there's a potential issue
-            if not check_func(proposal_text):
+            # If no keyword is present, there's a potential issue
+            if not hits.matched(check["id"]):
                 issues.append(
                     ComplianceIssue(
                         rule_id=check["id"],
@@ -257,8 +248,7 @@ class FARComplianceChecker:
                 clause_info = self.FAR_CLAUSES.get(clause)
                 if clause_info:
                     # Check if clause is addressed
-                    keywords = clause_info.get("keywords", [])
-                    if not any(kw in text_lower for kw in keywords):
+                    if not hits.matched(f"FAR-{clause}"):
                         issues.append(
                             ComplianceIssue(
                                 rule_id=f"FAR-{clause}",
@@ -274,7 +264,7 @@ class FARComplianceChecker:
         if contract_value:
             # Subcontracting plan required for > $750K
             if contract_value > 750000:
-                if "subcontracting plan" not in text_lower:
+                if not hits.matched("SUB-002"):
                     issues.append(
                         ComplianceIssue(
                             rule_id="SUB-002",
@@ -288,7 +278,7 @@ class FARComplianceChecker:
 
             # Cost/pricing data for > $2M
             if contract_value > 2000000:
-                if not any(kw in text_lower for kw in ["cost accounting", "cas", "dcaa"]):
+                if not hits.matched("COST-001"):
                     issues.append(
                         ComplianceIssue(
                             rule_id="COST-001",
@@ -380,6 +370,8 @@ class AIQualityScorer:
         "when necessary",
     ]
 
+    PASSIVE_PATTERNS = ["is being", "was being", "has been", "will be", "being"]
+
     # Strong verbs for proposals
     STRONG_VERBS = [
         "achieved",
@@ -419,6 +411,22 @@ class AIQualityScorer:
         """
         scores = {}
 
+        rules: dict[str, list[str]] = {
+            "vague": self.VAGUE_PHRASES,
+            "strong": self.STRONG_VERBS,
+            "passive": self.PASSIVE_PATTERNS,
+        }
+        req_words: set[str] = set()
+        if requirement_text:
+            # Extract key terms from requirement
+            req_words = set(
+                word.lower()
+                for word in requirement_text.split()
+                if len(word) > 4 and word.isalpha()
+            )
+            rules["requirement"] = sorted(req_words)
+        hits = get_keyword_scanner(rules).scan(content)
+
         # Citation Analysis
         citation_pattern = r"\[\[Source:\s*[^\]]+\]\]"
         citations = re.findall(citation_pattern, content)
@@ -446,7 +454,7 @@ class AIQualityScorer:
         word_count = len(content.split())
 
         # Count vague phrases
-        vague_count = sum(1 for phrase in self.VAGUE_PHRASES if phrase.lower() in content.lower())
+        vague_count = len(hits.keywords_found("vague"))
         vague_ratio = vague_count / max(word_count / 100, 1)
 
         if vague_ratio < 0.5:
@@ -467,7 +475,7 @@ class AIQualityScorer:
 
         # Writing Quality
         # Check for strong verbs
-        strong_verb_count = sum(1 for verb in self.STRONG_VERBS if verb.lower() in content.lower())
+        strong_verb_count = len(hits.keywords_found("strong"))
 
         if strong_verb_count >= 5:
             scores["writing_quality"] = 100
@@ -479,22 +487,14 @@ class AIQualityScorer:
             scores["writing_quality"] = 50
 
         # Check for active voice indicators
-        passive_patterns = ["is being", "was being", "has been", "will be", "being"]
-        passive_count = sum(1 for p in passive_patterns if p in content.lower())
+        passive_count = len(hits.keywords_found("passive"))
         if passive_count > 3:
             scores["writing_quality"] -= 10
 
         # Requirement Coverage (if requirement provided)
         if requirement_text:
-            # Extract key terms from requirement
-            req_words = set(
-                word.lower()
-                for word in requirement_text.split()
-                if len(word) > 4 and word.isalpha()
-            )
-
-            # Check how many appear in content
-            matched = sum(1 for word in req_words if word in content.lower())
+            # Check how many requirement terms appear in content
+            matched = len(hits.keywords_found("requirement"))
             match_ratio = matched / max(len(req_words), 1)
 
             if match_ratio >= 0.5:
@@ -54,17 +54,21 @@ async def extract_contacts_from_text(text: str) -> list[dict]:
 
 async def _extract_with_gemini(text: str) -> list[dict]:
     """Use Gemini Flash to extract contacts from text."""
-    import google.generativeai as genai
+    from app.services.llm_gateway import llm_generate
+    from app.services.model_registry import model_registry
 
-    genai.configure(api_key=settings.gemini_api_key)
+    model_registry.configure(settings.gemini_api_key)
     model_name = getattr(settings, "gemini_model_flash", "gemini-1.5-flash")
-    model = genai.GenerativeModel(model_name)
+    model = model_registry.get_model(model_name)
 
     # Truncate to avoid token limits
     truncated = text[:30000] if len(text) > 30000 else text
     prompt = EXTRACTION_PROMPT + truncated
 
-    response = await model.generate_content_async(prompt)
+    # Extraction is idempotent for a given text, so reuse earlier answers.
+    response = await llm_generate(
+        model, prompt, operation="contact_extraction", model_name=model_name, cache=True
+    )
     raw = response.text.strip()
 
     # Strip markdown code fences if present
@@ -0,0 +1,308 @@
+"""
+RFP Sniper - Gemini Context Cache Manager
+=========================================
+Lifecycle of Gemini ``CachedContent`` for knowledge base documents.
+
+A cache is identified by its user and a content key: the hash of the sorted
+content hashes of its documents plus the model. Any proposal or
+focus-document selection resolving to the same documents reuses the same
+cache, and a cache is never reused once a document's text has changed.
+
+* ``acquire`` returns a live cache for a document set, creating one when the
+  set is large enough to be worth caching, and extends caches that are close
+  to expiry as they are used.
+* ``refresh_expiring`` extends recently used caches before their TTL runs out
+  (beat task), so generation keeps hitting warm context.
+* ``cleanup`` drops expired rows, deletes caches whose documents changed or
+  disappeared, and removes caches created by this app that no row references.
+
+Token counts and token-hours of storage are tracked per cache for cost
+reporting.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.config import settings
+from app.models.knowledge_base import GeminiContextCache, KnowledgeBaseDocument
+from app.observability.metrics import increment_counter, set_gauge
+
+if TYPE_CHECKING:
+    from app.services.gemini_service import GeminiService
+
+logger = structlog.get_logger(__name__)
+
+DISPLAY_NAME_PREFIX = "rfp_sniper_kb_"
+CHARS_PER_TOKEN = 4
+# A cache this close to expiry is not handed out; generation could outlive it.
+MIN_REMAINING = timedelta(minutes=5)
+ORPHAN_GRACE = timedelta(minutes=15)
+
+
+def document_content_hash(document: KnowledgeBaseDocument) -> str:
+    """Hash of everything about a document that ends up in the cached text."""
+    digest = hashlib.sha256()
+    for part in (
+        document.original_filename,
+        document.document_type.value,
+        document.full_text or "",
+    ):
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def content_key(documents: Sequence[KnowledgeBaseDocument], model_name: str) -> str:
+    """Cache key for a document set, independent of document order."""
+    hashes = sorted(document_content_hash(doc) for doc in documents)
+    return hashlib.sha256("\n".join([model_name, *hashes]).encode()).hexdigest()
+
+
+def storage_cost_usd(entry: GeminiContextCache) -> float:
+    """Estimated storage cost accrued by a cache so far."""
+    return entry.storage_token_hours / 1_000_000 * settings.gemini_context_cache_usd_per_mtok_hour
+
+
+class ContextCacheManager:
+    """Creates, reuses, refreshes and removes knowledge base context caches."""
+
+    def __init__(self, gemini_service: "GeminiService", ttl_hours: int | None = None):
+        self.gemini = gemini_service
+        self.ttl_hours = ttl_hours or settings.gemini_context_cache_ttl_hours
+
+    @property
+    def refresh_window(self) -> timedelta:
+        return timedelta(minutes=settings.gemini_context_cache_refresh_minutes)
+
+    # -------------------------------------------------------------------------
+    # Lookup and creation
+    # -------------------------------------------------------------------------
+
+    async def acquire(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        documents: Sequence[KnowledgeBaseDocument],
+        *,
+        create: bool = True,
+    ) -> GeminiContextCache | None:
+        """
+        Live cache holding exactly ``documents``, or None to send them inline.
+
+        Commits the session when a cache row is created or updated.
+        """
+        documents = [doc for doc in documents if doc.full_text]
+        if not documents or not self.gemini.api_key:
+            return None
+
+        model_name = settings.gemini_model_pro
+        key = content_key(documents, model_name)
+        now = datetime.utcnow()
+        entry = await self._get(session, user_id, key)
+
+        if entry is not None and entry.expires_at > now + MIN_REMAINING:
+            entry.hit_count += 1
+            entry.last_used_at = now
+            if entry.expires_at - now < self.refresh_window:
+                await self._extend(entry, now)
+            await session.commit()
+            increment_counter("gemini.context_cache", tags={"result": "hit"})
+            return entry
+
+        if entry is not None:
+            # Expired or about to: Gemini drops it on its own.
+            await session.delete(entry)
+            await session.commit()
+
+        size_chars = sum(len(doc.full_text or "") for doc in documents)
+        if not create or size_chars // CHARS_PER_TOKEN < settings.gemini_context_cache_min_tokens:
+            increment_counter("gemini.context_cache", tags={"result": "inline"})
+            return None
+
+        increment_counter("gemini.context_cache", tags={"result": "miss"})
+        return await self._create(session, user_id, key, model_name, documents, size_chars)
+
+    async def _get(
+        self, session: AsyncSession, user_id: int, key: str
+    ) -> GeminiContextCache | None:
+        result = await session.execute(
+            select(GeminiContextCache).where(
+                GeminiContextCache.user_id == user_id,
+                GeminiContextCache.content_key == key,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def _create(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        key: str,
+        model_name: str,
+        documents: Sequence[KnowledgeBaseDocument],
+        size_chars: int,
+    ) -> GeminiContextCache | None:
+        cache = await self.gemini.create_cached_content(
+            documents,
+            display_name=f"{DISPLAY_NAME_PREFIX}{user_id}_{key[:16]}",
+            ttl_hours=self.ttl_hours,
+        )
+        if cache is None:
+            return None
+
+        usage = getattr(cache, "usage_metadata", None)
+        token_count = getattr(usage, "total_token_count", None) or size_chars // CHARS_PER_TOKEN
+        now = datetime.utcnow()
+        entry = GeminiContextCache(
+            user_id=user_id,
+            content_key=key,
+            cache_name=cache.name,
+            model_name=model_name,
+            document_ids=sorted(doc.id for doc in documents if doc.id is not None),
+            token_count=token_count,
+            size_bytes=size_chars,
+            storage_token_hours=float(token_count * self.ttl_hours),
+            expires_at=now + timedelta(hours=self.ttl_hours),
+            last_used_at=now,
+            created_at=now,
+        )
+        try:
+            async with session.begin_nested():
+                session.add(entry)
+        except IntegrityError:
+            # Another worker cached the same documents first; use theirs.
+            await self.gemini.delete_context_cache(cache.name)
+            return await self._get(session, user_id, key)
+        await session.commit()
+        increment_counter("gemini.context_cache", tags={"result": "created"})
+        logger.info(
+            "Context cache registered",
+            cache_name=cache.name,
+            user_id=user_id,
+            documents=len(documents),
+            token_count=token_count,
+        )
+        return entry
+
+    async def _extend(self, entry: GeminiContextCache, now: datetime) -> bool:
+        if not await self.gemini.extend_context_cache(entry.cache_name, self.ttl_hours):
+            return False
+        new_expiry = now + timedelta(hours=self.ttl_hours)
+        added_hours = (new_expiry - max(entry.expires_at, now)).total_seconds() / 3600
+        entry.storage_token_hours += entry.token_count * max(added_hours, 0.0)
+        entry.expires_at = new_expiry
+        entry.refresh_count += 1
+        increment_counter("gemini.context_cache", tags={"result": "refreshed"})
+        return True
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    async def refresh_expiring(self, session: AsyncSession) -> int:
+        """Extend recently used caches that expire within the refresh window."""
+        now = datetime.utcnow()
+        idle_cutoff = now - timedelta(hours=settings.gemini_context_cache_idle_hours)
+        result = await session.execute(
+            select(GeminiContextCache).where(
+                GeminiContextCache.expires_at > now,
+                GeminiContextCache.expires_at <= now + self.refresh_window,
+                GeminiContextCache.last_used_at >= idle_cutoff,
+            )
+        )
+        refreshed = 0
+        for entry in result.scalars().all():
+            if await self._extend(entry, now):
+                refreshed += 1
+        if refreshed:
+            await session.commit()
+        return refreshed
+
+    async def cleanup(self, session: AsyncSession) -> dict[str, int]:
+        """Remove expired rows, caches of changed documents and orphaned caches."""
+        now = datetime.utcnow()
+        expired = stale = orphaned = 0
+
+        result = await session.execute(select(GeminiContextCache))
+        entries = list(result.scalars().all())
+        live: list[GeminiContextCache] = []
+        for entry in entries:
+            if entry.expires_at <= now:
+                await session.delete(entry)
+                expired += 1
+            else:
+                live.append(entry)
+
+        document_ids = {doc_id for entry in live for doc_id in entry.document_ids or []}
+        documents: dict[int, KnowledgeBaseDocument] = {}
+        if document_ids:
+            docs_result = await session.execute(
+                select(KnowledgeBaseDocument).where(KnowledgeBaseDocument.id.in_(document_ids))
+            )
+            documents = {doc.id: doc for doc in docs_result.scalars().all()}
+
+        known_names: set[str] = set()
+        for entry in live:
+            entry_docs = [documents.get(doc_id) for doc_id in entry.document_ids or []]
+            if (
+                any(doc is None or doc.user_id != entry.user_id for doc in entry_docs)
+                or content_key(entry_docs, entry.model_name) != entry.content_key
+            ):
+                await self.gemini.delete_context_cache(entry.cache_name)
+                await session.delete(entry)
+                stale += 1
+            else:
+                known_names.add(entry.cache_name)
+        await session.commit()
+
+        try:
+            remote = await self.gemini.list_context_caches()
+        except Exception as e:
+            logger.warning("Failed to list context caches", error=str(e))
+            remote = []
+        # Skip caches young enough that their row may not be committed yet.
+        orphan_cutoff = datetime.now(UTC) - ORPHAN_GRACE
+        for cache in remote:
+            display_name = getattr(cache, "display_name", "") or ""
+            created = getattr(cache, "create_time", None)
+            if (
+                display_name.startswith(DISPLAY_NAME_PREFIX)
+                and cache.name not in known_names
+                and (created is None or created < orphan_cutoff)
+            ):
+                if await self.gemini.delete_context_cache(cache.name):
+                    orphaned += 1
+
+        set_gauge("gemini.context_cache.count", len(known_names))
+        set_gauge(
+            "gemini.context_cache.tokens",
+            sum(entry.token_count for entry in live if entry.cache_name in known_names),
+        )
+        if expired or stale or orphaned:
+            logger.info(
+                "Context caches cleaned up", expired=expired, stale=stale, orphaned=orphaned
+            )
+        return {"expired": expired, "stale": stale, "orphaned": orphaned}
+
+    async def usage_summary(self, session: AsyncSession, user_id: int) -> dict:
+        """Live cache count, cached tokens and accrued storage cost for a user."""
+        result = await session.execute(
+            select(GeminiContextCache).where(GeminiContextCache.user_id == user_id)
+        )
+        entries = list(result.scalars().all())
+        now = datetime.utcnow()
+        live = [entry for entry in entries if entry.expires_at > now]
+        return {
+            "caches": len(live),
+            "cached_tokens": sum(entry.token_count for entry in live),
+            "size_bytes": sum(entry.size_bytes for entry in live),
+            "hits": sum(entry.hit_count for entry in entries),
+            "estimated_cost_usd": round(sum(storage_cost_usd(entry) for entry in entries), 4),
+        }
@@ -7,19 +7,23 @@ Gemini-powered conversational AI assistant for GovCon workflows.
 import asyncio
 from collections.abc import AsyncGenerator
 
-import google.generativeai as genai
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.config import settings
+from app.lazy_imports import lazy_module
 from app.models.capture import CapturePlan
 from app.models.knowledge_base import KnowledgeBaseDocument
 from app.models.proposal import Proposal, ProposalSection
 from app.models.rfp import RFP, ComplianceMatrix
+from app.services.llm_gateway import LLMPriority, estimate_tokens, llm_slot
+from app.services.model_registry import model_registry
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+
 SYSTEM_PROMPT = """You are Dash, an AI assistant for government contracting professionals \
 using GovTech Sniper.
 
@@ -179,6 +183,13 @@ def _build_gemini_history(conversation_history: list[dict] | None) -> list[dict]
     return history
 
 
+def _estimate_chat_tokens(system_instruction: str, history: list[dict], question: str) -> int:
+    history_text = " ".join(str(part) for msg in history for part in msg["parts"])
+    return estimate_tokens(
+        f"{system_instruction}{history_text}{question}", {"max_output_tokens": 4096}
+    )
+
+
 async def generate_dash_response(
     db: AsyncSession,
     *,
@@ -202,7 +213,7 @@ async def generate_dash_response(
     if not settings.gemini_api_key:
         return "Gemini API is not configured. Set GEMINI_API_KEY to enable AI chat.", citations
 
-    genai.configure(api_key=settings.gemini_api_key)
+    model_registry.configure(settings.gemini_api_key)
     system_instruction = SYSTEM_PROMPT.format(context=context_text)
     history = _build_gemini_history(conversation_history)
 
@@ -216,7 +227,13 @@ async def generate_dash_response(
             ),
         )
         chat = model.start_chat(history=history)
-        response = await chat.send_message_async(question)
+        async with llm_slot(
+            operation="dash_chat",
+            estimated_tokens=_estimate_chat_tokens(system_instruction, history, question),
+            priority=LLMPriority.INTERACTIVE,
+        ) as lease:
+            response = await chat.send_message_async(question)
+            lease.record_usage(response)
         return response.text, citations
     except Exception as e:
         logger.error("Dash AI generation failed", error=str(e))
@@ -250,7 +267,7 @@ async def generate_dash_response_stream(
         yield "Gemini API is not configured. Set GEMINI_API_KEY to enable AI chat."
         return
 
-    genai.configure(api_key=settings.gemini_api_key)
+    model_registry.configure(settings.gemini_api_key)
     system_instruction = SYSTEM_PROMPT.format(context=context_text)
     history = _build_gemini_history(conversation_history)
 
@@ -264,10 +281,17 @@ async def generate_dash_response_stream(
             ),
         )
         chat = model.start_chat(history=history)
-        response = await chat.send_message_async(question, stream=True)
-        async for chunk in response:
-            if chunk.text:
-                yield chunk.text
+        # The slot is held for the whole stream.
+        async with llm_slot(
+            operation="dash_stream",
+            estimated_tokens=_estimate_chat_tokens(system_instruction, history, question),
+            priority=LLMPriority.INTERACTIVE,
+        ) as lease:
+            response = await chat.send_message_async(question, stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+            lease.record_usage(response)
     except Exception as e:
         logger.error("Dash AI streaming failed", error=str(e))
         yield f"\n\nI encountered an error: {e}"
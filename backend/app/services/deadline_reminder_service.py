@@ -0,0 +1,370 @@
+"""
+RFP Sniper - Deadline Reminder Engine
+=====================================
+Set-based deadline reminders with idempotent notification inserts and a
+batched, concurrent delivery outbox.
+
+One windowed query finds every (user, rfp, days_until) tuple that is due
+today across all users. Each reminder gets a deterministic ``dedupe_key`` and
+is inserted with ON CONFLICT DO NOTHING, so re-running the job (or two
+overlapping runs) on the same day inserts nothing new and re-sends nothing.
+Email and Slack deliveries are queued into a ``DeliveryOutbox`` and flushed
+concurrently over shared HTTP clients with bounded retries. Deliveries that
+still fail are handed to the ``retry_reminder_delivery`` Celery task, which
+rebuilds them from the stored notification.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import httpx
+import structlog
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.database import insert_ignoring_conflicts
+from app.models.notification import Notification, NotificationPreferences, NotificationType
+from app.models.rfp import RFP
+from app.services.notification_channels import email_service, slack_service
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_REMINDER_DAYS = [7, 3, 1]
+INSERT_BATCH_SIZE = 500
+DELIVERY_RETRY_BASE_SECONDS = 60
+
+
+@dataclass
+class DueReminder:
+    """A reminder that should fire today."""
+
+    user_id: int
+    rfp: RFP
+    days_until: int
+    prefs: NotificationPreferences
+
+    @property
+    def dedupe_key(self) -> str:
+        deadline = self.rfp.response_deadline.date().isoformat()
+        return f"deadline:{self.user_id}:{self.rfp.id}:{deadline}:{self.days_until}"
+
+
+async def find_due_reminders(
+    session: AsyncSession,
+    today: date | None = None,
+) -> list[DueReminder]:
+    """
+    Find all due (user, rfp, days) tuples in one windowed query.
+
+    The window spans today through the largest configured reminder offset;
+    each row is then matched against that user's ``deadline_days_before``.
+    """
+    today = today or datetime.utcnow().date()
+
+    max_days_result = await session.execute(
+        select(NotificationPreferences.deadline_days_before).where(
+            NotificationPreferences.deadline_reminders == True  # noqa: E712
+        )
+    )
+    configured = [days or DEFAULT_REMINDER_DAYS for days in max_days_result.scalars().all()]
+    if not configured:
+        return []
+    max_days = max((max(days) for days in configured if days), default=0)
+
+    window_start = datetime.combine(today, datetime.min.time())
+    window_end = datetime.combine(today + timedelta(days=max_days + 1), datetime.min.time())
+
+    result = await session.execute(
+        select(RFP, NotificationPreferences)
+        .join(NotificationPreferences, NotificationPreferences.user_id == RFP.user_id)
+        .where(
+            NotificationPreferences.deadline_reminders == True,  # noqa: E712
+            RFP.response_deadline != None,
+            RFP.response_deadline >= window_start,
+            RFP.response_deadline < window_end,
+        )
+        .order_by(RFP.user_id, RFP.response_deadline)
+    )
+
+    due: list[DueReminder] = []
+    for rfp, prefs in result.all():
+        days_until = (rfp.response_deadline.date() - today).days
+        if days_until in set(prefs.deadline_days_before or DEFAULT_REMINDER_DAYS):
+            due.append(DueReminder(rfp.user_id, rfp, days_until, prefs))
+    return due
+
+
+def _reminder_row(reminder: DueReminder, created_at: datetime) -> dict[str, Any]:
+    days = reminder.days_until
+    return {
+        "user_id": reminder.user_id,
+        "notification_type": NotificationType.DEADLINE_REMINDER,
+        "title": f"RFP Deadline in {days} day{'s' if days != 1 else ''}",
+        "message": f"{reminder.rfp.title} - {reminder.rfp.agency}",
+        "channels": ["in_app"],
+        "is_read": False,
+        "is_sent": False,
+        "rfp_id": reminder.rfp.id,
+        # Notification.meta is stored in the "metadata" column.
+        "metadata": {"days_until": days},
+        "dedupe_key": reminder.dedupe_key,
+        "created_at": created_at,
+    }
+
+
+async def insert_reminder_notifications(
+    session: AsyncSession,
+    reminders: list[DueReminder],
+) -> list[tuple[DueReminder, int]]:
+    """
+    Bulk-insert in-app notifications for reminders not yet recorded.
+
+    Rows whose ``dedupe_key`` already exists are skipped by the database, so
+    overlapping runs cannot fail the batch. Returns only the newly created
+    (reminder, notification id) pairs so delivery happens exactly once per
+    reminder.
+    """
+    by_key = {reminder.dedupe_key: reminder for reminder in reminders}
+    if not by_key:
+        return []
+
+    now = datetime.utcnow()
+    rows = [_reminder_row(reminder, now) for reminder in by_key.values()]
+    table = Notification.__table__
+    dialect = session.get_bind().dialect.name
+    created: list[tuple[DueReminder, int]] = []
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        stmt = (
+            insert_ignoring_conflicts(table, dialect, ["dedupe_key"])
+            .values(rows[start : start + INSERT_BATCH_SIZE])
+            .returning(table.c.id, table.c.dedupe_key)
+        )
+        result = await session.execute(stmt)
+        created.extend((by_key[key], notification_id) for notification_id, key in result.all())
+    await session.commit()
+    return created
+
+
+# =============================================================================
+# Delivery Outbox
+# =============================================================================
+
+
+@dataclass
+class OutboxItem:
+    """One pending delivery to an external channel."""
+
+    channel: str
+    notification_id: int | None
+    send: Callable[[httpx.AsyncClient], Awaitable[bool]]
+    attempts: int = 0
+    delivered: bool = False
+
+
+@dataclass
+class DeliveryOutbox:
+    """
+    Batched delivery queue with bounded concurrency and retry.
+
+    All deliveries in a flush share one pooled ``httpx.AsyncClient``.
+    """
+
+    concurrency: int = 20
+    max_attempts: int = 3
+    backoff_seconds: float = 1.0
+    items: list[OutboxItem] = field(default_factory=list)
+
+    def enqueue(
+        self,
+        channel: str,
+        send: Callable[[httpx.AsyncClient], Awaitable[bool]],
+        notification_id: int | None = None,
+    ) -> None:
+        self.items.append(OutboxItem(channel=channel, notification_id=notification_id, send=send))
+
+    async def _deliver(
+        self,
+        item: OutboxItem,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        while item.attempts < self.max_attempts and not item.delivered:
+            item.attempts += 1
+            async with semaphore:
+                try:
+                    item.delivered = await item.send(client)
+                except Exception as exc:
+                    logger.warning(
+                        "Reminder delivery raised",
+                        channel=item.channel,
+                        attempt=item.attempts,
+                        error=str(exc),
+                    )
+                    item.delivered = False
+            if not item.delivered and item.attempts < self.max_attempts:
+                await asyncio.sleep(self.backoff_seconds * (2 ** (item.attempts - 1)))
+
+    async def flush(self) -> dict[str, Any]:
+        pending, self.items = self.items, []
+        if not pending:
+            return {"delivered": 0, "failed": 0, "items": []}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=10.0, limits=limits) as client:
+            await asyncio.gather(*(self._deliver(item, client, semaphore) for item in pending))
+
+        delivered = sum(1 for item in pending if item.delivered)
+        return {"delivered": delivered, "failed": len(pending) - delivered, "items": pending}
+
+
+def _reminder_sender(
+    channel: str,
+    prefs: NotificationPreferences,
+    rfp: RFP,
+    days: int,
+) -> Callable[[httpx.AsyncClient], Awaitable[bool]] | None:
+    """Build the send callable for one channel, or None if the user disabled it."""
+    if channel == "email" and prefs.email_enabled and prefs.email_address:
+        subject, html, text = email_service.build_deadline_reminder_email(rfp, days)
+        address = prefs.email_address
+
+        async def send_email(client: httpx.AsyncClient) -> bool:
+            return await email_service.send_email(address, subject, html, text, client=client)
+
+        return send_email
+
+    if channel == "slack" and prefs.slack_enabled and prefs.slack_webhook_url:
+        message = slack_service.build_deadline_message(rfp, days)
+        webhook_url = prefs.slack_webhook_url
+
+        async def send_slack(client: httpx.AsyncClient) -> bool:
+            return await slack_service.send_webhook(webhook_url, message, client=client)
+
+        return send_slack
+
+    return None
+
+
+def _enqueue_reminder_deliveries(
+    outbox: DeliveryOutbox,
+    reminder: DueReminder,
+    notification_id: int,
+) -> None:
+    for channel in ("email", "slack"):
+        send = _reminder_sender(channel, reminder.prefs, reminder.rfp, reminder.days_until)
+        if send is not None:
+            outbox.enqueue(channel, send, notification_id)
+
+
+def _schedule_delivery_retries(items: list[OutboxItem]) -> int:
+    """Hand deliveries the outbox gave up on to Celery for delayed retries."""
+    from app.tasks.maintenance_tasks import retry_reminder_delivery
+
+    scheduled = 0
+    for item in items:
+        if item.delivered or item.notification_id is None:
+            continue
+        try:
+            retry_reminder_delivery.apply_async(
+                (item.notification_id, item.channel),
+                countdown=DELIVERY_RETRY_BASE_SECONDS,
+            )
+            scheduled += 1
+        except Exception as exc:
+            logger.error(
+                "Failed to schedule reminder delivery retry",
+                notification_id=item.notification_id,
+                channel=item.channel,
+                error=str(exc),
+            )
+    return scheduled
+
+
+async def _mark_sent(session: AsyncSession, notification_ids: set[int]) -> None:
+    await session.execute(
+        update(Notification)
+        .where(Notification.id.in_(notification_ids))
+        .values(is_sent=True, sent_at=datetime.utcnow())
+    )
+    await session.commit()
+
+
+async def deliver_stored_reminder(
+    session: AsyncSession,
+    notification_id: int,
+    channel: str,
+) -> bool | None:
+    """
+    Re-send one channel of a stored deadline reminder.
+
+    Returns None when there is nothing to send any more (notification, RFP or
+    channel preference gone), else whether the delivery succeeded.
+    """
+    notification = await session.get(Notification, notification_id)
+    if notification is None or notification.rfp_id is None:
+        return None
+    rfp = await session.get(RFP, notification.rfp_id)
+    prefs = (
+        await session.execute(
+            select(NotificationPreferences).where(
+                NotificationPreferences.user_id == notification.user_id
+            )
+        )
+    ).scalar_one_or_none()
+    days = (notification.meta or {}).get("days_until")
+    if rfp is None or prefs is None or days is None:
+        return None
+    send = _reminder_sender(channel, prefs, rfp, int(days))
+    if send is None:
+        return None
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        delivered = await send(client)
+    if delivered:
+        await _mark_sent(session, {notification_id})
+    return delivered
+
+
+async def run_deadline_reminders(
+    session: AsyncSession,
+    today: date | None = None,
+    outbox: DeliveryOutbox | None = None,
+) -> dict[str, int]:
+    """Find, record and deliver all of today's deadline reminders."""
+    outbox = outbox or DeliveryOutbox()
+
+    due = await find_due_reminders(session, today=today)
+    created = await insert_reminder_notifications(session, due)
+
+    for reminder, notification_id in created:
+        _enqueue_reminder_deliveries(outbox, reminder, notification_id)
+
+    outcome = await outbox.flush()
+    retries_scheduled = _schedule_delivery_retries(outcome["items"])
+
+    # A notification counts as sent once at least one external channel succeeded.
+    sent_ids = {
+        item.notification_id
+        for item in outcome["items"]
+        if item.delivered and item.notification_id is not None
+    }
+    if sent_ids:
+        await _mark_sent(session, sent_ids)
+
+    stats = {
+        "due": len(due),
+        "created": len(created),
+        "skipped_existing": len(due) - len(created),
+        "delivered": outcome["delivered"],
+        "failed": outcome["failed"],
+        "retries_scheduled": retries_scheduled,
+    }
+    logger.info("Deadline reminders processed", **stats)
+    return stats
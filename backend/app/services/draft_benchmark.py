@@ -10,6 +10,8 @@ from dataclasses import dataclass
 
 import structlog
 
+from app.services.keyword_scanner import get_keyword_scanner
+
 logger = structlog.get_logger(__name__)
 
 
@@ -162,10 +164,12 @@ def score_section_text(section_name: str, text: str, requirements: list[str]) ->
     sentence_count = len(re.findall(r"[.!?]+", text)) or 1
     paragraph_count = len([p for p in text.split("\n\n") if p.strip()]) or 1
 
+    rules: dict = {"citation": CITATION_KEYWORDS}
+    rules.update({("requirement", i): req.split()[:3] for i, req in enumerate(requirements)})
+    hits = get_keyword_scanner(rules).scan(text)
+
     # Compliance coverage: check how many requirements are addressed
-    req_hits = sum(
-        1 for req in requirements if any(kw.lower() in text.lower() for kw in req.split()[:3])
-    )
+    req_hits = sum(1 for i in range(len(requirements)) if hits.matched(("requirement", i)))
     compliance = (req_hits / max(len(requirements), 1)) * 100
 
     # Specificity: measure concrete details (numbers, dates, percentages, metrics)
@@ -173,7 +177,7 @@ def score_section_text(section_name: str, text: str, requirements: list[str]) ->
     specificity = min(100, (specifics / max(word_count / 100, 1)) * 50)
 
     # Citation density: references to standards, frameworks, past work
-    cite_hits = sum(1 for kw in CITATION_KEYWORDS if kw.lower() in text.lower())
+    cite_hits = len(hits.keywords_found("citation"))
     citation = min(100, (cite_hits / 5) * 50)
 
     # Readability: Flesch-Kincaid approximation (gov writing ~grade 12-14)
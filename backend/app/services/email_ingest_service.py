@@ -1,65 +1,392 @@
-"""Email ingestion service for forwarded RFP solicitations."""
+"""Email ingestion service for forwarded RFP solicitations.
+
+Polling is incremental: each mailbox remembers its UIDVALIDITY and the highest
+UID already ingested, so a poll only searches ``UID last+1:*``. Headers and
+BODYSTRUCTURE for all new messages come back in one batched ``UID FETCH``; text
+bodies follow in a second batch, and attachment parts are downloaded only for
+messages accepted by the caller's ``download_attachments`` filter.
+"""
 
 import asyncio
+import base64
 import email
 import imaplib
+import quopri
+import re
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from email.message import Message
 from io import BytesIO
 
 import structlog
-from pypdf import PdfReader
+
+from app.lazy_imports import lazy_attr
 
 logger = structlog.get_logger(__name__)
 
+PdfReader = lazy_attr("pypdf", "PdfReader")
+
+FETCH_BATCH_SIZE = 200
+_HEADER_FIELDS = "MESSAGE-ID SUBJECT FROM DATE"
+_HEADER_ITEM = f"BODY.PEEK[HEADER.FIELDS ({_HEADER_FIELDS})]"
+_EXTRACTABLE_SUFFIXES = (".pdf", ".txt", ".md", ".csv", ".rtf")
+# IDLE holds a thread for up to its whole timeout; keep those waits off the
+# default executor that fetches run on.
+_IDLE_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="imap-idle")
+
+
+# ---------------------------------------------------------------------------
+# IMAP IDLE
+# ---------------------------------------------------------------------------
+
+
+def _supports_idle(conn: imaplib.IMAP4) -> bool:
+    """Whether the server advertises IDLE (RFC 2177) on this authenticated connection."""
+    # Servers may only list IDLE after login, so ask again instead of trusting
+    # the greeting capabilities imaplib cached on connect.
+    typ, data = conn.capability()
+    if typ != "OK" or not data or not data[0]:
+        return False
+    return b"IDLE" in data[0].upper().split()
+
+
+def _imap_idle(conn: imaplib.IMAP4, timeout: float) -> bool:
+    """Wait in IDLE on the selected mailbox until new mail arrives or ``timeout`` passes.
+
+    Returns True once the server reports ``EXISTS`` and False on timeout or
+    when the server does not support IDLE. Python 3.14 ships ``IMAP4.idle``;
+    earlier versions have no public way to send a tagged command that waits
+    on a continuation, so this is the one place that takes a tag from
+    imaplib's ``_new_tag``.
+    """
+    if not _supports_idle(conn):
+        logger.debug("IMAP server does not support IDLE")
+        return False
+    if hasattr(conn, "idle"):
+        with conn.idle(duration=timeout) as responses:
+            return any(typ == "EXISTS" for typ, _ in responses)
+
+    tag = conn._new_tag()
+    conn.send(tag + b" IDLE\r\n")
+    if not conn.readline().startswith(b"+"):
+        return False
+    sock = conn.socket()
+    deadline = time.monotonic() + timeout
+    got_mail = False
+    try:
+        while not got_mail and (remaining := deadline - time.monotonic()) > 0:
+            sock.settimeout(remaining)
+            got_mail = conn.readline().rstrip().endswith(b"EXISTS")
+    except TimeoutError:
+        pass
+    finally:
+        sock.settimeout(None)
+        conn.send(b"DONE\r\n")
+        while not conn.readline().startswith(tag):
+            pass
+    return got_mail
+
+
+# ---------------------------------------------------------------------------
+# IMAP response parsing
+# ---------------------------------------------------------------------------
+
+
+def _flatten_fetch_response(data: list) -> bytes:
+    """Rejoin imaplib's split (prefix, literal) tuples into one byte stream."""
+    raw = bytearray()
+    for item in data or []:
+        if isinstance(item, tuple):
+            raw += item[0] + b"\r\n" + (item[1] or b"")
+        elif isinstance(item, bytes):
+            raw += item
+        raw += b" "
+    return bytes(raw)
+
+
+def _parse_imap_sexp(raw: bytes) -> list:
+    """Parse IMAP parenthesized data into nested lists.
+
+    Quoted strings become ``str``, literals ``bytes``, ``NIL`` ``None`` and
+    numeric atoms ``int``.
+    """
+    root: list = []
+    stack = [root]
+    pos = 0
+    length = len(raw)
+    while pos < length:
+        char = raw[pos : pos + 1]
+        if char in b" \r\n":
+            pos += 1
+        elif char == b"(":
+            child: list = []
+            stack[-1].append(child)
+            stack.append(child)
+            pos += 1
+        elif char == b")":
+            if len(stack) > 1:
+                stack.pop()
+            pos += 1
+        elif char == b'"':
+            pos += 1
+            value = bytearray()
+            while pos < length and raw[pos : pos + 1] != b'"':
+                if raw[pos : pos + 1] == b"\\":
+                    pos += 1
+                value += raw[pos : pos + 1]
+                pos += 1
+            pos += 1
+            stack[-1].append(value.decode("utf-8", errors="replace"))
+        elif char == b"{":
+            close = raw.index(b"}", pos)
+            size = int(raw[pos + 1 : close])
+            pos = close + 1
+            if raw[pos : pos + 2] == b"\r\n":
+                pos += 2
+            stack[-1].append(raw[pos : pos + size])
+            pos += size
+        else:
+            start = pos
+            depth = 0
+            while pos < length:
+                current = raw[pos : pos + 1]
+                if current == b"[":
+                    depth += 1
+                elif current == b"]":
+                    depth -= 1
+                elif depth == 0 and current in b" ()\r\n":
+                    break
+                pos += 1
+            atom = raw[start:pos].decode("utf-8", errors="replace")
+            if atom.upper() == "NIL":
+                stack[-1].append(None)
+            elif atom.isdigit():
+                stack[-1].append(int(atom))
+            else:
+                stack[-1].append(atom)
+    return root
+
+
+def _parse_fetch_items(data: list) -> list[dict]:
+    """Turn a ``UID FETCH`` response into one ``{ITEM: value}`` dict per message."""
+    tokens = _parse_imap_sexp(_flatten_fetch_response(data))
+    messages: list[dict] = []
+    for token in tokens:
+        if not isinstance(token, list):
+            continue
+        items: dict = {}
+        for index in range(0, len(token) - 1, 2):
+            key = token[index]
+            if isinstance(key, str):
+                items[key.upper().replace(".PEEK", "")] = token[index + 1]
+        if "UID" in items:
+            messages.append(items)
+    return messages
+
+
+def _param_dict(values) -> dict[str, str]:
+    if not isinstance(values, list):
+        return {}
+    return {
+        str(values[i]).lower(): str(values[i + 1])
+        for i in range(0, len(values) - 1, 2)
+        if values[i] is not None and values[i + 1] is not None
+    }
+
+
+@dataclass
+class MessagePart:
+    """One leaf part of a message's BODYSTRUCTURE."""
+
+    number: str
+    content_type: str
+    encoding: str
+    size: int
+    charset: str = "utf-8"
+    filename: str | None = None
+    is_attachment: bool = False
+
+
+def _walk_bodystructure(node: list, prefix: str = "") -> list[MessagePart]:
+    if not node:
+        return []
+    if isinstance(node[0], list):
+        parts: list[MessagePart] = []
+        # Multipart: child structures come first, then the subtype and extensions.
+        for index, child in enumerate(node, start=1):
+            if not isinstance(child, list):
+                break
+            number = f"{prefix}.{index}" if prefix else str(index)
+            parts.extend(_walk_bodystructure(child, number))
+        return parts
+
+    main_type = str(node[0] or "").lower()
+    sub_type = str(node[1] or "").lower() if len(node) > 1 else ""
+    content_type = f"{main_type}/{sub_type}"
+    params = _param_dict(node[2] if len(node) > 2 else None)
+    encoding = str(node[5] or "7bit").lower() if len(node) > 5 else "7bit"
+    size = node[6] if len(node) > 6 and isinstance(node[6], int) else 0
+
+    if main_type == "text":
+        disposition_index = 9
+    elif content_type == "message/rfc822":
+        disposition_index = 11
+    else:
+        disposition_index = 8
+    disposition = node[disposition_index] if len(node) > disposition_index else None
+    disposition_type = ""
+    disposition_params: dict[str, str] = {}
+    if isinstance(disposition, list) and disposition:
+        disposition_type = str(disposition[0] or "").lower()
+        disposition_params = _param_dict(disposition[1] if len(disposition) > 1 else None)
+
+    return [
+        MessagePart(
+            number=prefix or "1",
+            content_type=content_type,
+            encoding=encoding,
+            size=size,
+            charset=params.get("charset", "utf-8"),
+            filename=disposition_params.get("filename") or params.get("name"),
+            is_attachment=disposition_type == "attachment",
+        )
+    ]
+
+
+def _decode_part(payload: bytes, encoding: str) -> bytes:
+    try:
+        if encoding == "base64":
+            return base64.b64decode(payload)
+        if encoding == "quoted-printable":
+            return quopri.decodestring(payload)
+    except Exception:
+        return b""
+    return payload
+
+
+def _decode_text(payload: bytes, charset: str) -> str:
+    try:
+        return payload.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return payload.decode("utf-8", errors="replace")
+
+
+@dataclass
+class _PendingMessage:
+    uid: int
+    headers: Message
+    parts: list[MessagePart]
+    payloads: dict[str, bytes] = field(default_factory=dict)
+
+    def text_parts(self) -> list[MessagePart]:
+        return [
+            part
+            for part in self.parts
+            if not part.is_attachment and part.content_type in ("text/plain", "text/html")
+        ]
+
+    def attachments(self) -> list[MessagePart]:
+        return [part for part in self.parts if part.is_attachment]
+
 
 class EmailIngestService:
-    """Fetches and parses forwarded RFP emails from an IMAP mailbox."""
+    """Fetches and parses forwarded RFP emails from an IMAP mailbox.
+
+    ``uid_validity`` and ``last_uid`` are the mailbox watermark from the
+    previous poll; after ``connect_and_fetch`` they hold the new watermark.
+    Without a watermark the first poll falls back to ``UNSEEN``.
+    """
 
-    def __init__(self, host: str, port: int, username: str, password: str, use_ssl: bool = True):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_ssl: bool = True,
+        *,
+        uid_validity: int | None = None,
+        last_uid: int | None = None,
+        download_attachments: Callable[[dict], bool] | None = None,
+    ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.use_ssl = use_ssl
+        self.uid_validity = uid_validity
+        self.last_uid = last_uid
+        self.download_attachments = download_attachments
+
+    def _connect(self) -> imaplib.IMAP4:
+        if self.use_ssl:
+            conn = imaplib.IMAP4_SSL(self.host, self.port)
+        else:
+            conn = imaplib.IMAP4(self.host, self.port)
+        conn.login(self.username, self.password)
+        return conn
 
     async def connect_and_fetch(self, folder: str = "INBOX", limit: int = 50) -> list[dict]:
-        """Connect to IMAP server and fetch unread emails."""
+        """Connect to IMAP server and fetch messages newer than the watermark."""
         return await asyncio.to_thread(self._fetch_sync, folder, limit)
 
     def _fetch_sync(self, folder: str, limit: int) -> list[dict]:
-        """Synchronous IMAP fetch (run in thread pool)."""
+        """Synchronous incremental IMAP fetch (run in thread pool)."""
         try:
-            if self.use_ssl:
-                conn = imaplib.IMAP4_SSL(self.host, self.port)
-            else:
-                conn = imaplib.IMAP4(self.host, self.port)
+            conn = self._connect()
+            try:
+                conn.select(folder, readonly=True)
+                uid_validity = self._read_uid_validity(conn, folder)
+                last_uid = self.last_uid
+                if uid_validity is not None and uid_validity != self.uid_validity:
+                    # New mailbox or UIDs were renumbered; start over from UNSEEN.
+                    last_uid = None
 
-            conn.login(self.username, self.password)
-            conn.select(folder)
+                uids = self._search_new_uids(conn, last_uid)[:limit]
+                if not uids:
+                    self.uid_validity = uid_validity
+                    self.last_uid = last_uid
+                    return []
 
-            _, msg_ids = conn.search(None, "UNSEEN")
-            if not msg_ids[0]:
-                conn.logout()
-                return []
-
-            ids = msg_ids[0].split()[:limit]
-            results: list[dict] = []
-
-            for msg_id in ids:
-                _, data = conn.fetch(msg_id, "(RFC822)")
-                if not data or not data[0]:
-                    continue
-                raw = data[0][1]
-                if isinstance(raw, bytes):
-                    msg = email.message_from_bytes(raw)
-                else:
-                    msg = email.message_from_string(raw)
-                parsed = self._parse_email(msg)
-                if parsed:
+                pending = self._fetch_headers(conn, uids)
+                self._fetch_payloads(
+                    conn,
+                    pending,
+                    {msg.uid: [p.number for p in msg.text_parts()] for msg in pending},
+                )
+
+                results: list[dict] = []
+                wanted: dict[int, list[str]] = {}
+                for msg in pending:
+                    parsed = self._build_message(msg)
                     results.append(parsed)
+                    extractable = [
+                        part.number
+                        for part in msg.attachments()
+                        if self._is_extractable(part.filename or "", part.content_type)
+                    ]
+                    if extractable and (
+                        self.download_attachments is None or self.download_attachments(parsed)
+                    ):
+                        wanted[msg.uid] = extractable
 
-            conn.logout()
-            return results
+                if wanted:
+                    self._fetch_payloads(conn, pending, wanted)
+                    for index, msg in enumerate(pending):
+                        if msg.uid in wanted:
+                            results[index] = self._build_message(msg)
+
+                self.uid_validity = uid_validity
+                self.last_uid = max(uids)
+                return results
+            finally:
+                try:
+                    conn.logout()
+                except Exception:
+                    pass
 
         except imaplib.IMAP4.error as exc:
             logger.error("IMAP connection failed", error=str(exc))
@@ -68,6 +395,163 @@ class EmailIngestService:
             logger.error("Email ingestion error", error=str(exc))
             return []
 
+    @staticmethod
+    def _read_uid_validity(conn: imaplib.IMAP4, folder: str) -> int | None:
+        _, data = conn.response("UIDVALIDITY")
+        value = data[0] if data else None
+        if value is None:
+            _, status = conn.status(folder, "(UIDVALIDITY)")
+            match = re.search(rb"UIDVALIDITY (\d+)", status[0] if status else b"")
+            value = match.group(1) if match else None
+        return int(value) if value is not None else None
+
+    @staticmethod
+    def _search_new_uids(conn: imaplib.IMAP4, last_uid: int | None) -> list[int]:
+        criteria = "UNSEEN" if last_uid is None else f"UID {last_uid + 1}:*"
+        _, data = conn.uid("SEARCH", None, criteria)
+        if not data or not data[0]:
+            return []
+        uids = sorted(int(uid) for uid in data[0].split())
+        # "n:*" always matches the newest message, even when its UID < n.
+        if last_uid is not None:
+            uids = [uid for uid in uids if uid > last_uid]
+        return uids
+
+    @staticmethod
+    def _fetch_headers(conn: imaplib.IMAP4, uids: list[int]) -> list[_PendingMessage]:
+        pending: list[_PendingMessage] = []
+        for start in range(0, len(uids), FETCH_BATCH_SIZE):
+            batch = uids[start : start + FETCH_BATCH_SIZE]
+            _, data = conn.uid(
+                "FETCH",
+                ",".join(str(uid) for uid in batch),
+                f"(UID BODYSTRUCTURE {_HEADER_ITEM})",
+            )
+            for items in _parse_fetch_items(data):
+                header_bytes = next(
+                    (v for k, v in items.items() if k.startswith("BODY[HEADER")), b""
+                )
+                if isinstance(header_bytes, str):
+                    header_bytes = header_bytes.encode("utf-8", errors="replace")
+                pending.append(
+                    _PendingMessage(
+                        uid=int(items["UID"]),
+                        headers=email.message_from_bytes(header_bytes or b""),
+                        parts=_walk_bodystructure(items.get("BODYSTRUCTURE") or []),
+                    )
+                )
+        pending.sort(key=lambda msg: msg.uid)
+        return pending
+
+    @staticmethod
+    def _fetch_payloads(
+        conn: imaplib.IMAP4,
+        pending: list[_PendingMessage],
+        wanted: dict[int, list[str]],
+    ) -> None:
+        """Fetch body parts, batching messages that need the same part numbers."""
+        by_uid = {msg.uid: msg for msg in pending}
+        groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+        for uid, numbers in wanted.items():
+            if numbers:
+                groups[tuple(numbers)].append(uid)
+
+        for numbers, uids in groups.items():
+            fetch_items = " ".join(f"BODY.PEEK[{number}]" for number in numbers)
+            for start in range(0, len(uids), FETCH_BATCH_SIZE):
+                batch = uids[start : start + FETCH_BATCH_SIZE]
+                _, data = conn.uid(
+                    "FETCH", ",".join(str(uid) for uid in batch), f"(UID {fetch_items})"
+                )
+                for items in _parse_fetch_items(data):
+                    target = by_uid.get(int(items["UID"]))
+                    if target is None:
+                        continue
+                    for number in numbers:
+                        value = items.get(f"BODY[{number}]")
+                        if isinstance(value, str):
+                            value = value.encode("utf-8", errors="replace")
+                        if value:
+                            target.payloads[number] = value
+
+    def _build_message(self, msg: _PendingMessage) -> dict:
+        """Assemble the parsed-email dict from headers and fetched parts."""
+        body_text = ""
+        body_html = ""
+        for part in msg.text_parts():
+            payload = msg.payloads.get(part.number)
+            if not payload:
+                continue
+            text = _decode_text(_decode_part(payload, part.encoding), part.charset)
+            if part.content_type == "text/plain" and not body_text:
+                body_text = text
+            elif part.content_type == "text/html" and not body_html:
+                body_html = text
+
+        attachments: list[dict] = []
+        attachment_text_parts: list[str] = []
+        for part in msg.attachments():
+            filename = part.filename or "unnamed"
+            size = part.size
+            payload = msg.payloads.get(part.number)
+            if payload:
+                decoded = _decode_part(payload, part.encoding)
+                size = len(decoded)
+                text_preview = self._extract_attachment_text(
+                    filename=filename,
+                    content_type=part.content_type,
+                    payload=decoded,
+                )
+                if text_preview:
+                    attachment_text_parts.append(text_preview)
+            attachments.append(
+                {"filename": filename, "content_type": part.content_type, "size": size}
+            )
+
+        attachment_names = [a["filename"] for a in attachments]
+        return {
+            "uid": msg.uid,
+            "message_id": (msg.headers.get("Message-ID", "") or "").strip(),
+            "subject": msg.headers.get("Subject", ""),
+            "sender": msg.headers.get("From", ""),
+            "date": msg.headers.get("Date", ""),
+            "body_text": body_text,
+            "body_html": body_html,
+            "attachments": attachments,
+            "attachment_names": attachment_names,
+            "attachment_text": "\n".join(part for part in attachment_text_parts if part).strip(),
+            "attachment_count": len(attachments),
+        }
+
+    @staticmethod
+    def _is_extractable(filename: str, content_type: str) -> bool:
+        """Whether ``_extract_attachment_text`` can use this attachment's bytes."""
+        return (
+            content_type == "application/pdf"
+            or content_type.startswith("text/")
+            or filename.lower().endswith(_EXTRACTABLE_SUFFIXES)
+        )
+
+    async def wait_for_new_mail(self, folder: str = "INBOX", timeout: float = 60.0) -> bool:
+        """Block in IMAP IDLE until the server reports new mail or ``timeout`` passes."""
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_IDLE_EXECUTOR, self._idle_sync, folder, timeout)
+        except Exception as exc:
+            logger.warning("IMAP IDLE failed", host=self.host, error=str(exc))
+            return False
+
+    def _idle_sync(self, folder: str, timeout: float) -> bool:
+        conn = self._connect()
+        try:
+            conn.select(folder, readonly=True)
+            return _imap_idle(conn, timeout)
+        finally:
+            try:
+                conn.logout()
+            except Exception:
+                pass
+
     @staticmethod
     def _parse_email(msg: Message) -> dict | None:
         """Parse an email message into a structured dict."""
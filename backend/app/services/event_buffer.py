@@ -0,0 +1,196 @@
+"""
+RFP Sniper - Event Write Buffer
+===============================
+Batch inserts for append-only audit and activity events.
+
+Audit events are written on almost every mutating route. While the buffer is
+running (API process, started in the lifespan), events are held on the
+request's session and handed to a per-process queue only once that session
+commits, so rolled-back requests leave no trace. A background task flushes
+the queue with one multi-row insert per table when it reaches
+``event_buffer_max_events`` or every ``event_buffer_flush_seconds``.
+
+Anywhere the buffer is not running (workers, scripts, tests) events are
+added to the caller's session as before.
+"""
+
+import asyncio
+import contextlib
+from collections import defaultdict, deque
+from typing import Any
+
+import structlog
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_SESSION_PENDING_KEY = "buffered_events"
+# Events held in memory while the database is unavailable; beyond this the
+# oldest are dropped (and logged) rather than growing without bound.
+MAX_BACKLOG_MULTIPLIER = 20
+
+
+class EventBuffer:
+    """Per-process queue of committed events awaiting a batch insert."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+        self.queue: deque[SQLModel] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let the loop finish its current flush rather than cancelling it
+            # mid-insert, then write whatever arrived meanwhile.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, events: list[SQLModel]) -> None:
+        self.queue.extend(events)
+        if len(self.queue) >= settings.event_buffer_max_events and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.event_buffer_flush_seconds
+                )
+            self._wakeup.clear()
+            if self._stopping:
+                return
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Insert everything queued so far; returns the number of rows written."""
+        written = 0
+        while self.queue:
+            batch = [
+                self.queue.popleft()
+                for _ in range(min(len(self.queue), settings.event_buffer_max_events))
+            ]
+            try:
+                await self._insert(batch)
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            except Exception as exc:
+                logger.error("Event buffer flush failed", error=str(exc), events=len(batch))
+                self._requeue(batch)
+                break
+            written += len(batch)
+        return written
+
+    async def _insert(self, batch: list[SQLModel]) -> None:
+        by_model: dict[type[SQLModel], list[dict[str, Any]]] = defaultdict(list)
+        for instance in batch:
+            by_model[type(instance)].append(instance.model_dump(exclude={"id"}))
+        async with self.session_factory() as session:
+            for model, rows in by_model.items():
+                await session.execute(insert(model), rows)
+            await session.commit()
+
+    def _requeue(self, batch: list[SQLModel]) -> None:
+        self.queue.extendleft(reversed(batch))
+        limit = settings.event_buffer_max_events * MAX_BACKLOG_MULTIPLIER
+        dropped = 0
+        while len(self.queue) > limit:
+            self.queue.popleft()
+            dropped += 1
+        if dropped:
+            logger.error("Event buffer backlog full; dropped oldest events", dropped=dropped)
+
+
+_buffer: EventBuffer | None = None
+_installed = False
+
+
+def buffer_event(session: AsyncSession, instance: SQLModel) -> bool:
+    """
+    Write ``instance`` when ``session`` commits.
+
+    Returns True if the event was buffered for a batch insert, or False if it
+    was added to the session directly (buffer not running).
+    """
+    if _buffer is None or not _buffer.running:
+        session.add(instance)
+        return False
+    if not session.in_transaction():
+        # A rollback with no open transaction fires no hooks; begin one so
+        # buffered events are discarded even if no SQL ran before it.
+        session.sync_session.begin()
+    session.info.setdefault(_SESSION_PENDING_KEY, []).append(instance)
+    return True
+
+
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_SESSION_PENDING_KEY, None)
+    if not pending:
+        return
+    if _buffer is not None and _buffer.running:
+        _buffer.enqueue(pending)
+    else:
+        logger.warning("Event buffer stopped; dropping buffered events", events=len(pending))
+
+
+def _after_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_SESSION_PENDING_KEY, None)
+
+
+def _install_hooks() -> None:
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+    _installed = True
+
+
+def start_event_buffer(
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> EventBuffer | None:
+    """Start the process-wide buffer on the running loop (no-op if disabled)."""
+    global _buffer
+    if not settings.event_buffer_enabled:
+        return None
+    if _buffer is not None and _buffer.running:
+        return _buffer
+    if session_factory is None:
+        from app.database import async_session_factory
+
+        session_factory = async_session_factory
+    _install_hooks()
+    _buffer = EventBuffer(session_factory)
+    _buffer.start()
+    return _buffer
+
+
+async def stop_event_buffer() -> None:
+    """Stop the flusher and write out anything still queued."""
+    global _buffer
+    if _buffer is None:
+        return
+    buffer, _buffer = _buffer, None
+    await buffer.stop()
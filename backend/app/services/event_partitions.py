@@ -0,0 +1,132 @@
+"""
+RFP Sniper - Event Table Partitions
+===================================
+Monthly range partitions for the append-only event tables.
+
+On Postgres, ``audit_events`` and ``activity_feed`` are partitioned by
+``created_at`` (migration 059), with a DEFAULT partition catching rows outside
+the pre-created months. The maintenance task creates partitions a few months
+ahead, and retention drops whole expired partitions instead of deleting rows.
+Other databases keep plain tables, where retention falls back to a row delete.
+"""
+
+import re
+from datetime import datetime
+
+import structlog
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+PARTITIONED_EVENT_TABLES = ("audit_events", "activity_feed")
+MONTHS_AHEAD = 2
+
+_PARTITION_SUFFIX_RE = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Month covered by a partition, or None for the default partition."""
+    match = _PARTITION_SUFFIX_RE.search(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def is_partitioned(session: AsyncSession, table: str) -> bool:
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.scalar() is not None
+
+
+async def list_partitions(session: AsyncSession, table: str) -> list[str]:
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "WHERE parent.relname = :table ORDER BY child.relname"
+        ),
+        {"table": table},
+    )
+    return list(result.scalars().all())
+
+
+async def ensure_event_partitions(
+    session: AsyncSession,
+    *,
+    months_ahead: int = MONTHS_AHEAD,
+    now: datetime | None = None,
+) -> list[str]:
+    """Create any missing monthly partitions from this month to ``months_ahead``."""
+    created: list[str] = []
+    current = month_start(now or datetime.utcnow())
+    for table in PARTITIONED_EVENT_TABLES:
+        if not await is_partitioned(session, table):
+            continue
+        existing = set(await list_partitions(session, table))
+        for offset in range(months_ahead + 1):
+            lower = add_months(current, offset)
+            name = partition_name(table, lower)
+            if name in existing:
+                continue
+            upper = add_months(lower, 1)
+            try:
+                async with session.begin_nested():
+                    await session.execute(
+                        text(
+                            f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                            f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+                        )
+                    )
+            except Exception as exc:
+                # Typically rows for this month already landed in the default
+                # partition; they stay there and are still queryable.
+                logger.warning("Event partition not created", partition=name, error=str(exc))
+                continue
+            created.append(name)
+    return created
+
+
+async def purge_partitioned_events(session: AsyncSession, model, cutoff: datetime) -> int:
+    """
+    Remove ``model`` rows created before ``cutoff``.
+
+    Partitions that end on or before the cutoff are dropped whole; the rest
+    (the boundary month and the default partition) get a pruned row delete.
+    Returns the number of rows removed.
+    """
+    removed = 0
+    table = model.__tablename__
+    if await is_partitioned(session, table):
+        for name in await list_partitions(session, table):
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            count = await session.execute(text(f'SELECT count(*) FROM "{name}"'))
+            removed += count.scalar() or 0
+            await session.execute(text(f'DROP TABLE "{name}"'))
+            logger.info("Dropped expired event partition", partition=name)
+
+    result = await session.execute(delete(model).where(model.created_at < cutoff))
+    return removed + (result.rowcount or 0)
@@ -11,15 +11,19 @@ The "Killer Filter" is a critical cost-optimization feature:
 
 from dataclasses import dataclass
 
-import google.generativeai as genai
 import structlog
 
 from app.config import settings
+from app.lazy_imports import lazy_module
 from app.models.rfp import RFP
 from app.models.user import ClearanceLevel, UserProfile
+from app.services.llm_gateway import LLMPriority, llm_generate
+from app.services.model_registry import model_registry
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+
 
 @dataclass
 class FilterResult:
@@ -90,8 +94,8 @@ Respond in this exact JSON format:
         self.model_name = settings.gemini_model_flash
 
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(
+            model_registry.configure(self.api_key)
+            self.model = model_registry.get_model(
                 self.model_name,
                 system_instruction=self.SYSTEM_PROMPT,
             )
@@ -231,12 +235,16 @@ Determine if the company is QUALIFIED to bid on this opportunity. Be strict abou
             )
 
             # Call Gemini 1.5 Flash
-            response = await self.model.generate_content_async(
+            response = await llm_generate(
+                self.model,
                 prompt,
+                operation="killer_filter",
+                model_name=self.model_name,
                 generation_config=genai.GenerationConfig(
                     temperature=0.1,  # Low temp for consistent decisions
                     response_mime_type="application/json",
                 ),
+                priority=LLMPriority.BATCH,
             )
 
             # Parse response
@@ -1,51 +1,183 @@
 """
 Forecast matching service — matches procurement forecasts to existing RFPs.
+
+Candidate pairs are generated from blocking indexes (agency, NAICS 4-digit
+prefix, title tokens) rather than scoring every forecast against every RFP.
+Any pair that can reach the alert threshold shares at least one of those keys,
+since value proximity alone is worth at most 25 points. Runs are incremental:
+only pairs involving forecasts or RFPs changed since the user's last run are
+scored.
 """
 
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.models.forecast import ForecastAlert, ProcurementForecast
+from app.models.forecast import ForecastAlert, ForecastMatchState, ProcurementForecast
 from app.models.rfp import RFP
 
+MATCH_THRESHOLD = 30
+NAICS_BLOCK_LENGTH = 4
+TITLE_STOPWORDS = {"the", "a", "an", "and", "or", "for", "of", "to", "in", "services"}
+
+
+def _title_tokens(title: str | None) -> set[str]:
+    if not title:
+        return set()
+    return set(title.lower().split()) - TITLE_STOPWORDS
+
 
-async def run_forecast_matching(session: AsyncSession, user_id: int) -> list[ForecastAlert]:
+class _RFPBlockIndex:
+    """Blocking index over RFP rows for candidate generation."""
+
+    def __init__(self, rfps: Iterable[Any]):
+        self.by_agency: dict[str, set[int]] = defaultdict(set)
+        # RFPs keyed by their own 4-digit prefix, and by every shorter prefix.
+        self.by_naics_block: dict[str, set[int]] = defaultdict(set)
+        self.by_naics_prefix: dict[str, set[int]] = defaultdict(set)
+        self.by_token: dict[str, set[int]] = defaultdict(set)
+        # Whitespace-only codes prefix-match everything in _compute_match.
+        self.with_naics: set[int] = set()
+        self.blank_naics: set[int] = set()
+
+        for rfp in rfps:
+            if rfp.agency:
+                self.by_agency[rfp.agency.lower()].add(rfp.id)
+            if rfp.naics_code:
+                self.with_naics.add(rfp.id)
+            naics = (rfp.naics_code or "").strip()
+            if rfp.naics_code and not naics:
+                self.blank_naics.add(rfp.id)
+            if naics:
+                self.by_naics_block[naics[:NAICS_BLOCK_LENGTH]].add(rfp.id)
+                for length in range(1, min(len(naics), NAICS_BLOCK_LENGTH) + 1):
+                    self.by_naics_prefix[naics[:length]].add(rfp.id)
+            for token in _title_tokens(rfp.title):
+                self.by_token[token].add(rfp.id)
+
+    def candidates(self, forecast: Any) -> set[int]:
+        found: set[int] = set()
+        if forecast.agency:
+            found |= self.by_agency.get(forecast.agency.lower(), set())
+
+        naics = (forecast.naics_code or "").strip()
+        if forecast.naics_code:
+            found |= self.blank_naics
+            if not naics:
+                found |= self.with_naics
+        if naics:
+            block = naics[:NAICS_BLOCK_LENGTH]
+            # rfp.naics.startswith(forecast.naics[:4])
+            found |= self.by_naics_prefix.get(block, set())
+            # forecast.naics.startswith(rfp.naics[:4])
+            for length in range(1, len(block) + 1):
+                found |= self.by_naics_block.get(naics[:length], set())
+
+        for token in _title_tokens(forecast.title):
+            found |= self.by_token.get(token, set())
+        return found
+
+
+_FORECAST_COLUMNS = (
+    ProcurementForecast.id,
+    ProcurementForecast.agency,
+    ProcurementForecast.naics_code,
+    ProcurementForecast.title,
+    ProcurementForecast.estimated_value,
+    ProcurementForecast.updated_at,
+)
+_RFP_COLUMNS = (RFP.id, RFP.agency, RFP.naics_code, RFP.title, RFP.estimated_value)
+
+
+async def _load_forecasts(
+    session: AsyncSession, user_id: int, changed_since: datetime | None
+) -> list[Any]:
+    query = select(*_FORECAST_COLUMNS).where(
+        ProcurementForecast.user_id == user_id,
+        ProcurementForecast.linked_rfp_id.is_(None),  # type: ignore[union-attr]
+    )
+    if changed_since is not None:
+        query = query.where(ProcurementForecast.updated_at > changed_since)
+    return list((await session.execute(query)).all())
+
+
+async def _load_rfps(
+    session: AsyncSession, user_id: int, changed_since: datetime | None
+) -> list[Any]:
+    query = select(*_RFP_COLUMNS).where(RFP.user_id == user_id)
+    if changed_since is not None:
+        query = query.where(RFP.updated_at > changed_since)
+    return list((await session.execute(query)).all())
+
+
+async def run_forecast_matching(
+    session: AsyncSession,
+    user_id: int,
+    *,
+    full: bool = False,
+) -> list[ForecastAlert]:
     """
     Match user's forecasts to their RFPs based on:
     - Agency (exact match, 30 points)
     - NAICS code (prefix match, 25 points)
     - Title keyword overlap (20 points)
     - Value range within ±50% (25 points)
+
+    Only forecasts/RFPs changed since the previous run are considered unless
+    ``full`` is set or the user has never run matching.
     """
-    forecasts_result = await session.execute(
-        select(ProcurementForecast).where(
-            ProcurementForecast.user_id == user_id,
-            ProcurementForecast.linked_rfp_id.is_(None),  # type: ignore[union-attr]
+    run_started = datetime.utcnow()
+    state = (
+        await session.execute(
+            select(ForecastMatchState).where(ForecastMatchState.user_id == user_id)
         )
-    )
-    forecasts = forecasts_result.scalars().all()
-
-    rfps_result = await session.execute(select(RFP).where(RFP.user_id == user_id))
-    rfps = rfps_result.scalars().all()
+    ).scalar_one_or_none()
+    watermark = None if full or state is None else state.last_run_at
+
+    if watermark is None:
+        forecasts = await _load_forecasts(session, user_id, None)
+        rfps = await _load_rfps(session, user_id, None) if forecasts else []
+        new_forecast_ids = {f.id for f in forecasts}
+        new_rfp_ids = {r.id for r in rfps}
+    else:
+        new_rfps = await _load_rfps(session, user_id, watermark)
+        new_rfp_ids = {r.id for r in new_rfps}
+        # New RFPs must be checked against every open forecast; otherwise only
+        # changed forecasts need scoring.
+        forecasts = await _load_forecasts(session, user_id, None if new_rfps else watermark)
+        new_forecast_ids = {f.id for f in forecasts if f.updated_at > watermark}
+        rfps = await _load_rfps(session, user_id, None) if new_forecast_ids else new_rfps
+
+    scored: list[tuple[Any, Any, float, list[str]]] = []
+    if forecasts and rfps:
+        index = _RFPBlockIndex(rfps)
+        rfps_by_id = {rfp.id: rfp for rfp in rfps}
+        for forecast in forecasts:
+            forecast_is_new = forecast.id in new_forecast_ids
+            for rfp_id in index.candidates(forecast):
+                if not forecast_is_new and rfp_id not in new_rfp_ids:
+                    continue
+                rfp = rfps_by_id[rfp_id]
+                score, reasons = _compute_match(forecast, rfp)
+                if score >= MATCH_THRESHOLD:
+                    scored.append((forecast, rfp, score, reasons))
 
     new_alerts: list[ForecastAlert] = []
-
-    for forecast in forecasts:
-        for rfp in rfps:
-            score, reasons = _compute_match(forecast, rfp)
-            if score < 30:
-                continue
-
-            # Check if alert already exists
-            existing = await session.execute(
-                select(ForecastAlert).where(
-                    ForecastAlert.forecast_id == forecast.id,
-                    ForecastAlert.rfp_id == rfp.id,
-                )
+    if scored:
+        existing_result = await session.execute(
+            select(ForecastAlert.forecast_id, ForecastAlert.rfp_id).where(
+                ForecastAlert.forecast_id.in_({forecast.id for forecast, *_ in scored})
             )
-            if existing.scalar_one_or_none():
-                continue
+        )
+        existing_pairs = {(row.forecast_id, row.rfp_id) for row in existing_result.all()}
 
+        for forecast, rfp, score, reasons in scored:
+            if (forecast.id, rfp.id) in existing_pairs:
+                continue
             alert = ForecastAlert(
                 user_id=user_id,
                 forecast_id=forecast.id,
@@ -56,8 +188,13 @@ async def run_forecast_matching(session: AsyncSession, user_id: int) -> list[For
             session.add(alert)
             new_alerts.append(alert)
 
-    if new_alerts:
-        await session.flush()
+    if state is None:
+        state = ForecastMatchState(user_id=user_id)
+        session.add(state)
+    state.last_run_at = run_started
+    state.updated_at = run_started
+
+    await session.flush()
 
     return new_alerts
 
@@ -86,12 +223,8 @@ def _compute_match(forecast: ProcurementForecast, rfp: RFP) -> tuple[float, list
 
     # Title keyword overlap (20 points)
     if forecast.title and rfp.title:
-        f_words = set(forecast.title.lower().split())
-        r_words = set(rfp.title.lower().split())
-        # Remove common words
-        stopwords = {"the", "a", "an", "and", "or", "for", "of", "to", "in", "services"}
-        f_words -= stopwords
-        r_words -= stopwords
+        f_words = _title_tokens(forecast.title)
+        r_words = _title_tokens(rfp.title)
         if f_words and r_words:
             overlap = len(f_words & r_words) / max(len(f_words), len(r_words))
             if overlap > 0.3:
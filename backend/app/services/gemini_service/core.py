@@ -9,32 +9,42 @@ Key Features:
 - RAG-style generation with citation tracking
 """
 
+from __future__ import annotations
+
+import asyncio
 import re
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
 from typing import Any
 
-import google.generativeai as genai
 import structlog
-from google.generativeai import caching
-
-try:
-    from google.api_core.exceptions import ResourceExhausted as GeminiResourceExhausted
-except Exception:  # pragma: no cover - dependency shape can vary by runtime
-    GeminiResourceExhausted = None
 
+from app.lazy_imports import lazy_module, loaded_attr
 from app.models.knowledge_base import KnowledgeBaseDocument
 from app.models.proposal import Citation, GeneratedContent
 from app.models.rfp import ComplianceRequirement, ImportanceLevel
+from app.services.llm_gateway import LLMPriority, llm_generate, llm_generate_stream
+from app.services.model_registry import model_registry
 
 from . import settings
 from .generation import GeminiGenerationMixin
 from .prompts import (
     DEEP_READ_PROMPT,
     GENERATION_PROMPT,
+    PROMPT_VERSION,
 )
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+caching = lazy_module("google.generativeai.caching")
+
+CONTEXT_CACHE_SYSTEM_INSTRUCTION = """You are a proposal writing assistant.
+When generating text, you MUST cite your sources using this exact format:
+[[Source: filename.pdf, Page XX]]
+
+Every factual claim must have a citation. If you cannot find a source, say so explicitly."""
+
 
 class GeminiService(GeminiGenerationMixin):
     """
@@ -70,7 +80,7 @@ class GeminiService(GeminiGenerationMixin):
         self.api_key = api_key or settings.gemini_api_key
 
         if self.api_key:
-            genai.configure(api_key=self.api_key)
+            model_registry.configure(self.api_key)
             self.pro_model_name = self._resolve_model_name(
                 settings.gemini_model_pro,
                 fallback_keywords=["gemini", "pro"],
@@ -79,8 +89,8 @@ class GeminiService(GeminiGenerationMixin):
                 settings.gemini_model_flash,
                 fallback_keywords=["gemini", "flash"],
             )
-            self.pro_model = genai.GenerativeModel(self.pro_model_name)
-            self.flash_model = genai.GenerativeModel(self.flash_model_name)
+            self.pro_model = model_registry.get_model(self.pro_model_name)
+            self.flash_model = model_registry.get_model(self.flash_model_name)
         else:
             self.pro_model_name = settings.gemini_model_pro
             self.flash_model_name = settings.gemini_model_flash
@@ -116,35 +126,14 @@ class GeminiService(GeminiGenerationMixin):
 
     def _resolve_model_name(self, preferred: str, fallback_keywords: list[str]) -> str:
         """
-        Resolve a usable model name from the API, falling back to a best match.
+        Resolve a usable model name from the process-wide model list, falling
+        back to a best match.
         """
-        try:
-            models = genai.list_models()
-        except Exception as e:
-            logger.warning("Failed to list Gemini models; using configured name", error=str(e))
-            return preferred
-
-        def supports_generate(m) -> bool:
-            methods = getattr(m, "supported_generation_methods", None) or []
-            return "generateContent" in methods
-
-        candidates = [m for m in models if supports_generate(m)]
-
-        # Exact or suffix match for preferred
-        for m in candidates:
-            if m.name == preferred or m.name.endswith(preferred):
-                return m.name
-
-        # Keyword-based fallback
-        for m in candidates:
-            name = m.name.lower()
-            if all(keyword in name for keyword in fallback_keywords):
-                return m.name
-
-        return preferred
+        return model_registry.resolve(preferred, fallback_keywords)
 
     def _is_quota_error(self, exc: Exception) -> bool:
-        if GeminiResourceExhausted is not None and isinstance(exc, GeminiResourceExhausted):
+        resource_exhausted = loaded_attr("google.api_core.exceptions", "ResourceExhausted")
+        if resource_exhausted is not None and isinstance(exc, resource_exhausted):
             return True
         lowered = str(exc).lower()
         return "quota exceeded" in lowered or "resourceexhausted" in lowered
@@ -192,12 +181,6 @@ class GeminiService(GeminiGenerationMixin):
                 f"Gemini API rate limit reached. Retry in about {remaining} seconds."
             )
 
-    def _configured_fallback_model_names(self) -> list[str]:
-        configured = [
-            model.strip() for model in settings.gemini_fallback_models.split(",") if model.strip()
-        ]
-        return configured
-
     def _build_model_candidates(
         self,
         *,
@@ -220,18 +203,7 @@ class GeminiService(GeminiGenerationMixin):
         if not self.api_key:
             return candidates
 
-        for model_name in self._configured_fallback_model_names():
-            if model_name in seen_names:
-                continue
-            try:
-                candidates.append((model_name, genai.GenerativeModel(model_name)))
-                seen_names.add(model_name)
-            except Exception as e:
-                logger.warning(
-                    "Failed to initialize fallback model",
-                    model=model_name,
-                    error=str(e),
-                )
+        candidates.extend(model_registry.fallback_candidates(seen_names))
 
         return candidates
 
@@ -242,7 +214,18 @@ class GeminiService(GeminiGenerationMixin):
         generation_config: genai.GenerationConfig,
         primary_model: genai.GenerativeModel | None,
         primary_model_name: str | None,
+        operation: str = "generate",
+        priority: LLMPriority | None = None,
+        cache: bool | None = None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> tuple[Any, str]:
+        """
+        Generate with the first available model, falling back on quota errors.
+
+        With ``on_chunk`` the response is streamed and each text delta is
+        passed to it. Once a chunk has been delivered there is no fallback to
+        another model, as the caller has already shown partial output.
+        """
         self._assert_privacy_runtime_guarantees()
         self._ensure_quota_available()
 
@@ -256,19 +239,35 @@ class GeminiService(GeminiGenerationMixin):
         max_retry_after = 0
         last_quota_error: Exception | None = None
         last_error: Exception | None = None
+        emitted = False
+
+        async def forward(text: str) -> None:
+            nonlocal emitted
+            emitted = True
+            await on_chunk(text)
 
         for model_name, model in candidates:
+            call_kwargs = {
+                "operation": operation,
+                "model_name": model_name,
+                "generation_config": generation_config,
+                "priority": priority,
+                "cache": cache,
+                "prompt_version": PROMPT_VERSION,
+            }
             try:
-                response = await model.generate_content_async(
-                    prompt,
-                    generation_config=generation_config,
-                )
+                if on_chunk is None:
+                    response = await llm_generate(model, prompt, **call_kwargs)
+                else:
+                    response = await llm_generate_stream(
+                        model, prompt, on_chunk=forward, **call_kwargs
+                    )
                 if model_name != (primary_model_name or "primary"):
                     logger.info("Gemini fallback model used", model=model_name)
                 return response, model_name
             except Exception as exc:
                 last_error = exc
-                if self._is_quota_error(exc):
+                if self._is_quota_error(exc) and not emitted:
                     last_quota_error = exc
                     retry_after = self._extract_retry_after_seconds(exc) or 0
                     max_retry_after = max(max_retry_after, retry_after)
@@ -357,6 +356,7 @@ class GeminiService(GeminiGenerationMixin):
                 ),
                 primary_model=self.pro_model,
                 primary_model_name=self.pro_model_name,
+                operation="deep_read",
             )
 
             import json
@@ -409,56 +409,55 @@ class GeminiService(GeminiGenerationMixin):
     # Context Caching: Knowledge Base Upload
     # =========================================================================
 
-    async def create_context_cache(
+    @staticmethod
+    def combine_documents(documents: list[KnowledgeBaseDocument]) -> str:
+        """Concatenate document texts with clear separators for caching."""
+        parts: list[str] = []
+        for doc in documents:
+            if doc.full_text:
+                parts.append(
+                    f"\n\n{'=' * 50}\n"
+                    f"DOCUMENT: {doc.original_filename}\n"
+                    f"TYPE: {doc.document_type.value}\n"
+                    f"{'=' * 50}\n\n"
+                    f"{doc.full_text}"
+                )
+        return "".join(parts)
+
+    async def create_cached_content(
         self,
         documents: list[KnowledgeBaseDocument],
-        cache_name: str,
+        display_name: str,
         ttl_hours: int = 24,
-    ) -> str | None:
+    ) -> caching.CachedContent | None:
         """
         Upload documents to Gemini's Context Caching API.
 
-        This allows referencing large document sets without
-        re-uploading them with each request.
-
         Args:
             documents: List of knowledge base documents
-            cache_name: Unique name for this cache
+            display_name: Display name for this cache
             ttl_hours: Cache time-to-live in hours
 
         Returns:
-            Cache resource name, or None if failed
+            The created ``CachedContent``, or None if failed
         """
         if not self.api_key:
             logger.error("Cannot create cache: API key not configured")
             return None
 
         try:
-            # Combine all document texts with clear separators
-            combined_text = ""
-            for doc in documents:
-                if doc.full_text:
-                    combined_text += f"\n\n{'=' * 50}\n"
-                    combined_text += f"DOCUMENT: {doc.original_filename}\n"
-                    combined_text += f"TYPE: {doc.document_type.value}\n"
-                    combined_text += f"{'=' * 50}\n\n"
-                    combined_text += doc.full_text
-
+            combined_text = self.combine_documents(documents)
             if not combined_text:
                 logger.warning("No document content to cache")
                 return None
 
-            # Create the cache
-            cache = caching.CachedContent.create(
+            cache = await asyncio.to_thread(
+                caching.CachedContent.create,
                 model=settings.gemini_model_pro,
-                display_name=cache_name,
+                display_name=display_name,
                 contents=[combined_text],
                 ttl=timedelta(hours=ttl_hours),
-                system_instruction="""You are a proposal writing assistant.
-When generating text, you MUST cite your sources using this exact format:
-[[Source: filename.pdf, Page XX]]
-
-Every factual claim must have a citation. If you cannot find a source, say so explicitly.""",
+                system_instruction=CONTEXT_CACHE_SYSTEM_INSTRUCTION,
             )
 
             logger.info(
@@ -468,12 +467,60 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
                 ttl_hours=ttl_hours,
             )
 
-            return cache.name
+            return cache
 
         except Exception as e:
             logger.error(f"Failed to create context cache: {e}")
             return None
 
+    async def create_context_cache(
+        self,
+        documents: list[KnowledgeBaseDocument],
+        cache_name: str,
+        ttl_hours: int = 24,
+    ) -> str | None:
+        """
+        Upload documents to Gemini's Context Caching API.
+
+        Args:
+            documents: List of knowledge base documents
+            cache_name: Unique name for this cache
+            ttl_hours: Cache time-to-live in hours
+
+        Returns:
+            Cache resource name, or None if failed
+        """
+        cache = await self.create_cached_content(documents, cache_name, ttl_hours)
+        return cache.name if cache is not None else None
+
+    async def extend_context_cache(self, cache_name: str, ttl_hours: int) -> bool:
+        """Push a cache's expiry to ``ttl_hours`` from now."""
+        try:
+            cache = await asyncio.to_thread(caching.CachedContent.get, cache_name)
+            await asyncio.to_thread(cache.update, ttl=timedelta(hours=ttl_hours))
+            return True
+        except Exception as e:
+            logger.warning("Failed to extend context cache", cache_name=cache_name, error=str(e))
+            return False
+
+    async def delete_context_cache(self, cache_name: str) -> bool:
+        """Delete a cache; a cache that no longer exists counts as deleted."""
+        try:
+            cache = await asyncio.to_thread(caching.CachedContent.get, cache_name)
+            await asyncio.to_thread(cache.delete)
+            return True
+        except Exception as e:
+            if "not found" in str(e).lower() or "404" in str(e):
+                return True
+            logger.warning("Failed to delete context cache", cache_name=cache_name, error=str(e))
+            return False
+
+    async def list_context_caches(self) -> list[caching.CachedContent]:
+        """All context caches visible to the configured API key."""
+        if not self.api_key:
+            return []
+        return await asyncio.to_thread(lambda: list(caching.CachedContent.list(page_size=100)))
+
     def get_cached_model(self, cache_name: str) -> genai.GenerativeModel | None:
         """
         Get a model instance using a cached context.
@@ -504,6 +551,7 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
         documents_text: str | None = None,
         max_words: int = 500,
         tone: str = "professional",
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> GeneratedContent:
         """
         Generate proposal section with citations.
@@ -516,9 +564,10 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
             section: Section number/name
             category: Requirement category
             cache_name: Cached content name (preferred)
-            documents_text: Fallback inline document text
+            documents_text: Inline document text, used when the cache is unavailable
             max_words: Target word count
             tone: Writing tone (professional/technical/executive)
+            on_chunk: Streams the response, awaited with each raw text delta
 
         Returns:
             GeneratedContent with raw text, clean text, and citations
@@ -526,6 +575,8 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
         if settings.mock_ai:
             citation_text = "[[Source: Mock_Document.pdf, Page 1]]"
             raw_text = f"This is a mock response generated for testing purposes. {citation_text}"
+            if on_chunk is not None:
+                await on_chunk(raw_text)
             return GeneratedContent(
                 raw_text=raw_text,
                 clean_text="This is a mock response generated for testing purposes.",
@@ -540,12 +591,11 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
         start_time = datetime.utcnow()
 
         # Get the model (cached or fresh)
-        if cache_name:
-            model = self.get_cached_model(cache_name)
-            if not model:
-                logger.warning("Cache not found, using fresh model")
-                model = self.pro_model
-        else:
+        model = self.get_cached_model(cache_name) if cache_name else None
+        using_cache = model is not None
+        if cache_name and not using_cache:
+            logger.warning("Cache not found, using fresh model")
+        if not using_cache:
             model = self.pro_model
 
         if not model:
@@ -561,7 +611,7 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
         )
 
         # Add documents text if not using cache
-        if documents_text and not cache_name:
+        if documents_text and not using_cache:
             prompt = f"KNOWLEDGE BASE DOCUMENTS:\n{documents_text}\n\n{prompt}"
 
         try:
@@ -573,6 +623,8 @@ Every factual claim must have a citation. If you cannot find a source, say so ex
                 ),
                 primary_model=model,
                 primary_model_name=self.pro_model_name if model is self.pro_model else "cached",
+                operation="generate_section",
+                on_chunk=on_chunk,
             )
 
             raw_text = response.text
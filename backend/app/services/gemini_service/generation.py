@@ -4,13 +4,15 @@ Gemini generation mixin — rewrite, expand, outline, utilities.
 
 import json
 import re
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-import google.generativeai as genai
 import structlog
 
+from app.lazy_imports import lazy_module
 from app.models.proposal import Citation, GeneratedContent
+from app.services.llm_gateway import LLMPriority, llm_generate
 
 from . import settings
 from .prompts import EXPAND_PROMPT, OUTLINE_PROMPT, REWRITE_PROMPT
@@ -20,6 +22,8 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+
 
 class GeminiGenerationMixin:
     """Methods for rewrite, expand, outline, citations, and health check."""
@@ -75,9 +79,12 @@ class GeminiGenerationMixin:
         tone: str = "professional",
         instructions: str | None = None,
         documents_text: str | None = None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> GeneratedContent:
         """Rewrite existing section content with a new tone or instructions."""
         if settings.mock_ai:
+            if on_chunk is not None:
+                await on_chunk(f"[Rewritten] {content}")
             return GeneratedContent(
                 raw_text=f"[Rewritten] {content}",
                 clean_text=f"[Rewritten] {re.sub(self.CITATION_PATTERN, '', content).strip()}",
@@ -111,6 +118,9 @@ class GeminiGenerationMixin:
             ),
             primary_model=self.pro_model,
             primary_model_name=self.pro_model_name,
+            operation="rewrite",
+            priority=LLMPriority.INTERACTIVE,
+            on_chunk=on_chunk,
         )
 
         raw_text = response.text
@@ -138,10 +148,13 @@ class GeminiGenerationMixin:
         target_words: int = 800,
         focus_area: str | None = None,
         documents_text: str | None = None,
+        on_chunk: Callable[[str], Awaitable[None]] | None = None,
     ) -> GeneratedContent:
         """Expand existing section content with more detail."""
         if settings.mock_ai:
             expanded = f"{content}\n\n[Expanded with additional detail on the requirement.]"
+            if on_chunk is not None:
+                await on_chunk(expanded)
             return GeneratedContent(
                 raw_text=expanded,
                 clean_text=re.sub(self.CITATION_PATTERN, "", expanded).strip(),
@@ -175,6 +188,9 @@ class GeminiGenerationMixin:
             ),
             primary_model=self.pro_model,
             primary_model_name=self.pro_model_name,
+            operation="expand",
+            priority=LLMPriority.INTERACTIVE,
+            on_chunk=on_chunk,
         )
 
         raw_text = response.text
@@ -242,6 +258,7 @@ class GeminiGenerationMixin:
             ),
             primary_model=self.pro_model,
             primary_model_name=self.pro_model_name,
+            operation="outline",
         )
         return json.loads(response.text)
 
@@ -268,9 +285,14 @@ class GeminiGenerationMixin:
             return False
 
         try:
-            response = await self.flash_model.generate_content_async(
+            response = await llm_generate(
+                self.flash_model,
                 "Say 'OK' if you're working.",
+                operation="health_check",
+                model_name=self.flash_model_name,
                 generation_config=genai.GenerationConfig(max_output_tokens=10),
+                priority=LLMPriority.INTERACTIVE,
+                cache=False,
             )
             return "ok" in response.text.lower()
         except Exception as e:
@@ -1,5 +1,9 @@
 """Prompt templates for Gemini AI Service."""
 
+# Part of the LLM response cache key; bump when a template's expected output
+# changes in a way the prompt text alone does not capture.
+PROMPT_VERSION = "1"
+
 DEEP_READ_PROMPT = """You are an expert government proposal analyst. Extract ALL compliance requirements from this RFP by systematically analyzing every section.
 
 IMPORTANT: Government RFPs scatter requirements across multiple sections. You MUST analyze ALL of the following if present:
@@ -0,0 +1,276 @@
+"""
+RFP Sniper - Generation Streaming
+=================================
+Forwards token chunks of section generation to proposal websocket rooms.
+
+Sections are generated in Celery workers and API processes, but websocket
+connections only exist in API processes. Generation publishes events to a
+per-proposal channel on the stream broker. The API relay
+(``app.api.routes.websocket.streaming``) subscribes to every proposal channel
+and forwards each event to the users present in that proposal's room.
+
+Brokers: Redis pub/sub when ``generation_stream_backend`` is ``redis``. This
+is required when workers and the API run as separate processes. Otherwise an
+in-process broker is used.
+
+Event ``type`` values:
+
+* ``generation_started``
+* ``generation_chunk``: ``seq``, ``text`` and the citations completed by the
+  chunk
+* ``generation_complete``
+* ``generation_error``
+
+Streaming is best effort. If a publish fails, that publisher stops sending
+and generation carries on. The final content is persisted as before.
+"""
+
+import asyncio
+import json
+import weakref
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import structlog
+
+from app.config import settings
+from app.models.proposal import Citation
+from app.observability.metrics import increment_counter
+
+logger = structlog.get_logger(__name__)
+
+CHANNEL_PREFIX = "generation:proposal:"
+# An unterminated "[[" held back longer than this is not a citation marker.
+MAX_MARKER_CHARS = 300
+LOCAL_QUEUE_SIZE = 1000
+
+
+def proposal_channel(proposal_id: int) -> str:
+    return f"{CHANNEL_PREFIX}{proposal_id}"
+
+
+# =============================================================================
+# Incremental citations
+# =============================================================================
+
+
+class IncrementalCitationParser:
+    """Extracts citations from streamed text once each marker is complete."""
+
+    def __init__(self, extract: Callable[[str], list[Citation]]):
+        self._extract = extract
+        self._pending = ""
+        self._seen: set[tuple[str, int | None]] = set()
+        self.citations: list[Citation] = []
+
+    def feed(self, text: str) -> list[Citation]:
+        """Add a chunk; returns citations not seen in earlier chunks."""
+        self._pending += text
+        cut = self._pending.rfind("[[")
+        if cut == -1 and self._pending.endswith("["):
+            cut = len(self._pending) - 1
+        if (
+            cut != -1
+            and "]]" not in self._pending[cut:]
+            and len(self._pending) - cut <= MAX_MARKER_CHARS
+        ):
+            # Keep the open marker until a later chunk closes it.
+            ready, self._pending = self._pending[:cut], self._pending[cut:]
+        else:
+            ready, self._pending = self._pending, ""
+        return self._collect(ready)
+
+    def flush(self) -> list[Citation]:
+        """Parse whatever is still held back at the end of the stream."""
+        ready, self._pending = self._pending, ""
+        return self._collect(ready)
+
+    def _collect(self, text: str) -> list[Citation]:
+        if not text:
+            return []
+        new: list[Citation] = []
+        for citation in self._extract(text):
+            key = (citation.source_file, citation.page_number)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            new.append(citation)
+        self.citations.extend(new)
+        return new
+
+
+# =============================================================================
+# Brokers
+# =============================================================================
+
+
+class LocalStreamBroker:
+    """In-process broker; subscribers may run on any event loop of the process."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._subscribers: dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+
+    def _offer(self, queue: asyncio.Queue, message: dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            increment_counter("generation_stream.dropped", tags={"broker": self.name})
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        current = asyncio.get_running_loop()
+        for queue, loop in list(self._subscribers.items()):
+            if loop is current:
+                self._offer(queue, message)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(self._offer, queue, message)
+
+    async def subscribe(self) -> AsyncIterator[dict[str, Any]]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=LOCAL_QUEUE_SIZE)
+        self._subscribers[queue] = asyncio.get_running_loop()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers.pop(queue, None)
+
+
+class RedisStreamBroker:
+    """Redis pub/sub broker shared by API processes and Celery workers."""
+
+    name = "redis"
+
+    def __init__(self, redis_url: str) -> None:
+        self._redis_url = redis_url
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self):
+        # Redis connections are bound to the loop that created them.
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(
+                self._redis_url, decode_responses=True, socket_connect_timeout=1
+            )
+            self._clients[loop] = client
+        return client
+
+    async def publish(self, channel: str, message: dict[str, Any]) -> None:
+        await self._client().publish(channel, json.dumps(message, default=str))
+
+    async def subscribe(self) -> AsyncIterator[dict[str, Any]]:
+        pubsub = self._client().pubsub()
+        await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") != "pmessage":
+                    continue
+                try:
+                    message = json.loads(item["data"])
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(message, dict):
+                    yield message
+        finally:
+            await pubsub.aclose()
+
+
+_broker: LocalStreamBroker | RedisStreamBroker | None = None
+
+
+def get_stream_broker() -> LocalStreamBroker | RedisStreamBroker:
+    global _broker
+    if _broker is None:
+        if settings.generation_stream_backend.lower() == "redis":
+            _broker = RedisStreamBroker(settings.redis_url)
+        else:
+            _broker = LocalStreamBroker()
+    return _broker
+
+
+def reset_stream_broker() -> None:
+    """Rebuild the broker from settings on next use (tests, settings changes)."""
+    global _broker
+    _broker = None
+
+
+# =============================================================================
+# Publisher
+# =============================================================================
+
+
+class SectionStreamPublisher:
+    """Publishes the progress of one section generation to its proposal room."""
+
+    def __init__(
+        self,
+        *,
+        proposal_id: int,
+        section_id: int,
+        user_id: int | None,
+        extract_citations: Callable[[str], list[Citation]],
+        operation: str = "generate",
+        broker: LocalStreamBroker | RedisStreamBroker | None = None,
+    ) -> None:
+        self.proposal_id = proposal_id
+        self.section_id = section_id
+        self.user_id = user_id
+        self.operation = operation
+        self.broker = broker or get_stream_broker()
+        self.parser = IncrementalCitationParser(extract_citations)
+        self.seq = 0
+        self._enabled = True
+
+    async def _publish(self, event_type: str, **payload: Any) -> None:
+        if not self._enabled:
+            return
+        message = {
+            "type": event_type,
+            "proposal_id": self.proposal_id,
+            "section_id": self.section_id,
+            "user_id": self.user_id,
+            "operation": self.operation,
+            **payload,
+        }
+        try:
+            await self.broker.publish(proposal_channel(self.proposal_id), message)
+        except Exception as exc:
+            self._enabled = False
+            logger.warning(
+                "Generation stream publish failed; continuing without streaming",
+                proposal_id=self.proposal_id,
+                section_id=self.section_id,
+                error=str(exc),
+            )
+
+    async def started(self) -> None:
+        await self._publish("generation_started")
+
+    async def chunk(self, text: str) -> None:
+        """``on_chunk`` callback for GeminiService generation methods."""
+        self.seq += 1
+        citations = self.parser.feed(text)
+        await self._publish(
+            "generation_chunk",
+            seq=self.seq,
+            text=text,
+            citations=[citation.model_dump() for citation in citations],
+        )
+
+    async def complete(self, **payload: Any) -> None:
+        """Announce the persisted result; ``payload`` is added to the event."""
+        self.parser.flush()
+        await self._publish(
+            "generation_complete",
+            seq=self.seq,
+            citations=[citation.model_dump() for citation in self.parser.citations],
+            **payload,
+        )
+
+    async def error(self, message: str) -> None:
+        await self._publish("generation_error", seq=self.seq, error=message)
@@ -65,10 +65,10 @@ async def generate_graphic(
     user_prompt = f"Title: {title or 'Untitled'}\n\nContent:\n{content[:4000]}"
 
     try:
-        import google.generativeai as genai
+        from app.services.model_registry import model_registry
 
-        genai.configure(api_key=settings.gemini_api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model_registry.configure(settings.gemini_api_key)
+        model = model_registry.get_model("gemini-1.5-flash")
         response = model.generate_content(
             [
                 {"role": "user", "parts": [f"{system_prompt}\n\n{user_prompt}"]},
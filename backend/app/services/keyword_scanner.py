@@ -0,0 +1,118 @@
+"""
+RFP Sniper - Keyword Scanner
+============================
+Single-pass, case-insensitive multi-keyword matching for the scoring services.
+
+A rule set maps rule ids to keyword lists. All keywords are compiled into one
+trie-shaped regex (shared prefixes are merged so the engine branches by
+character rather than trying every keyword at every offset). A lookahead scan
+visits each offset of the lowercased text once, takes the longest keyword
+starting there, and expands it to every keyword that is a prefix of it, so
+overlapping and nested keywords are all counted with plain substring
+semantics.
+"""
+
+import re
+from collections import defaultdict
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+@dataclass
+class ScanResult:
+    """Per-rule and per-keyword hits from one scan.
+
+    Positions are offsets into ``text.lower()``.
+    """
+
+    rules: Mapping[Hashable, tuple[str, ...]] = field(default_factory=dict)
+    rule_positions: dict[Hashable, list[int]] = field(default_factory=dict)
+    keyword_positions: dict[str, list[int]] = field(default_factory=dict)
+
+    def count(self, rule: Hashable) -> int:
+        return len(self.rule_positions.get(rule, ()))
+
+    def matched(self, rule: Hashable) -> bool:
+        return bool(self.rule_positions.get(rule))
+
+    def keyword_count(self, keyword: str) -> int:
+        return len(self.keyword_positions.get(keyword.lower(), ()))
+
+    def keywords_found(self, rule: Hashable | None = None) -> set[str]:
+        """Distinct keywords seen, optionally limited to one rule."""
+        if rule is None:
+            return set(self.keyword_positions)
+        return {kw for kw in self.rules.get(rule, ()) if kw in self.keyword_positions}
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a keyword trie; terminal nodes make the remainder optional."""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in node.items() if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        # Greedy optional keeps the longest keyword at this offset.
+        body = body if len(branches) > 1 else "(?:" + body + ")"
+        return body + "?"
+    return body
+
+
+class KeywordScanner:
+    """Compiled keyword matcher for a fixed rule set."""
+
+    def __init__(self, rules: Mapping[Hashable, Iterable[str]]):
+        self.rules: dict[Hashable, tuple[str, ...]] = {}
+        self._keyword_rules: dict[str, list[Hashable]] = defaultdict(list)
+        for rule, keywords in rules.items():
+            normalized = tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+            self.rules[rule] = normalized
+            for keyword in normalized:
+                self._keyword_rules[keyword].append(rule)
+
+        keywords = sorted(self._keyword_rules)
+        # For the longest keyword matched at an offset, every keyword that is
+        # a prefix of it also occurs there.
+        self._prefixes: dict[str, list[str]] = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+        trie: dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self._pattern = re.compile(f"(?=({_trie_pattern(trie)}))") if keywords else None
+
+    def scan(self, text: str) -> ScanResult:
+        result = ScanResult(rules=self.rules, rule_positions={rule: [] for rule in self.rules})
+        if not text or self._pattern is None:
+            return result
+
+        keyword_positions: dict[str, list[int]] = defaultdict(list)
+        for match in self._pattern.finditer(text.lower()):
+            longest = match.group(1)
+            if not longest:
+                continue
+            start = match.start()
+            for keyword in self._prefixes[longest]:
+                keyword_positions[keyword].append(start)
+                for rule in self._keyword_rules[keyword]:
+                    result.rule_positions[rule].append(start)
+
+        result.keyword_positions = dict(keyword_positions)
+        return result
+
+
+@lru_cache(maxsize=512)
+def _cached_scanner(rules: tuple[tuple[Hashable, tuple[str, ...]], ...]) -> KeywordScanner:
+    return KeywordScanner(dict(rules))
+
+
+def get_keyword_scanner(rules: Mapping[Hashable, Iterable[str]]) -> KeywordScanner:
+    """Return a compiled scanner for ``rules``, reusing one built earlier."""
+    return _cached_scanner(tuple((rule, tuple(keywords)) for rule, keywords in rules.items()))
@@ -0,0 +1,375 @@
+"""
+RFP Sniper - LLM Response Cache
+===============================
+Reuses Gemini responses for repeated, effectively deterministic prompts.
+
+Screening, scoring, extraction and outline calls run at temperature 0.1-0.3
+and are often repeated with identical inputs (re-screening the same
+opportunity, retried rewrites, re-running extraction on the same RFP). The
+gateway checks this cache before queuing such a call and stores the text of
+successful responses afterwards.
+
+Keys hash the model (name, system instruction, cached context), the prompt,
+the generation config, the operation and a prompt template version together
+with ``llm_cache_version``, so bumping either retires old entries.
+
+Tiers:
+
+1. In-process LRU bounded by entry count and bytes.
+2. Shared tier: Redis when ``cache_backend`` is ``redis`` (bounded by TTL and
+   the server's eviction policy), otherwise a directory when ``llm_cache_dir``
+   is set (bounded by ``llm_cache_disk_max_mb``, least recently used files go
+   first). Shared hits are promoted into the LRU.
+
+By default only calls at or below ``llm_cache_max_temperature`` are cached;
+call sites pass ``cache=False`` to opt out or ``cache=True`` to opt in.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import structlog
+
+from app.config import settings
+from app.observability.metrics import increment_counter, set_gauge
+
+logger = structlog.get_logger(__name__)
+
+KEY_PREFIX = "llm:resp:"
+# Prune the disk tier after this many writes rather than on every write.
+DISK_PRUNE_EVERY = 50
+
+
+@dataclass
+class CachedLLMResponse:
+    """Stand-in for a Gemini response served from the cache."""
+
+    text: str
+    usage_metadata: Any = field(
+        default_factory=lambda: SimpleNamespace(
+            prompt_token_count=0, candidates_token_count=0, total_token_count=0
+        )
+    )
+    cached: bool = True
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+
+def _config_value(config: Any, name: str) -> Any:
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(name)
+    return getattr(config, name, None)
+
+
+def effective_temperature(model: Any, generation_config: Any) -> float | None:
+    """Temperature a call will run at, if it is known."""
+    temperature = _config_value(generation_config, "temperature")
+    if temperature is None:
+        temperature = _config_value(getattr(model, "_generation_config", None), "temperature")
+    return temperature
+
+
+def is_cacheable(model: Any, prompt: Any, generation_config: Any, cache: bool | None) -> bool:
+    """Whether a call should go through the response cache."""
+    if not settings.llm_cache_enabled or cache is False or not isinstance(prompt, str):
+        return False
+    if cache is True:
+        return True
+    temperature = effective_temperature(model, generation_config)
+    return temperature is not None and temperature <= settings.llm_cache_max_temperature
+
+
+def response_cache_key(
+    model: Any,
+    prompt: str,
+    *,
+    model_name: str | None,
+    generation_config: Any,
+    operation: str,
+    prompt_version: str = "",
+) -> str:
+    parts = [
+        str(settings.llm_cache_version),
+        operation,
+        prompt_version,
+        model_name or str(getattr(model, "model_name", "")),
+        repr(getattr(model, "_system_instruction", None)),
+        repr(getattr(model, "cached_content", None)),
+        repr(
+            generation_config
+            if generation_config is not None
+            else getattr(model, "_generation_config", None)
+        ),
+        prompt,
+    ]
+    digest = hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+    return KEY_PREFIX + digest
+
+
+def _response_entry(response: Any) -> dict[str, Any] | None:
+    """Cacheable payload of a response, or None for blocked/empty ones."""
+    try:
+        text = response.text
+    except Exception:
+        return None
+    if not isinstance(text, str) or not text:
+        return None
+    return {"text": text, "stored_at": time.time()}
+
+
+# =============================================================================
+# Tiers
+# =============================================================================
+
+
+class MemoryTier:
+    """LRU bounded by entry count and approximate payload bytes."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any], int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry, _ = item
+            if time.time() > expires_at:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        size = len(entry["text"]) + len(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.time() + self.ttl_seconds, entry, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisTier:
+    """Shared tier on the cache service's Redis connection."""
+
+    name = "redis"
+
+    def __init__(self, backend: Any, ttl_seconds: int):
+        self._backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        value = await self._backend.get(key)
+        return value if isinstance(value, dict) else None
+
+    async def set(self, key: str, entry: dict[str, Any]) -> None:
+        await self._backend.set(key, entry, self.ttl_seconds)
+
+
+class DiskTier:
+    """Shared tier of JSON files, pruned least-recently-used first."""
+
+    name = "disk"
+
+    def __init__(self, directory: str | Path, max_bytes: int, ttl_seconds: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        digest = key.removeprefix(KEY_PREFIX)
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, entry: dict[str, Any]) -> None:
+        self._writes += 1
+        prune = self._writes % DISK_PRUNE_EVERY == 0
+        await asyncio.to_thread(self._write, key, entry, prune)
+
+    def _read(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if time.time() - stat.st_mtime > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        # Access time drives pruning; noatime mounts would otherwise hide reads.
+        os.utime(path, (time.time(), stat.st_mtime))
+        return entry if isinstance(entry, dict) else None
+
+    def _write(self, key: str, entry: dict[str, Any], prune: bool) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(tmp, path)
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete least recently used files until under the size limit."""
+        files = []
+        total = 0
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+        removed = 0
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class LLMResponseCache:
+    """Two-tier response cache with hit-rate accounting."""
+
+    def __init__(self, memory: MemoryTier, shared: RedisTier | DiskTier | None = None):
+        self.memory = memory
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> "LLMResponseCache":
+        ttl = settings.llm_cache_ttl_seconds
+        memory = MemoryTier(
+            max_entries=settings.llm_cache_memory_entries,
+            max_bytes=settings.llm_cache_memory_max_mb * 1024 * 1024,
+            ttl_seconds=ttl,
+        )
+        shared: RedisTier | DiskTier | None = None
+        if settings.cache_backend.lower() == "redis":
+            from app.services.cache_service import get_cache_backend
+
+            shared = RedisTier(get_cache_backend(), ttl)
+        elif settings.llm_cache_dir:
+            shared = DiskTier(
+                settings.llm_cache_dir, settings.llm_cache_disk_max_mb * 1024 * 1024, ttl
+            )
+        return cls(memory, shared)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _record(self, operation: str, result: str, tier: str | None = None) -> None:
+        tags = {"operation": operation, "result": result}
+        if tier:
+            tags["tier"] = tier
+        increment_counter("llm.cache", tags=tags)
+        set_gauge("llm.cache.hit_rate", self.hit_rate)
+
+    async def get(self, key: str, *, operation: str) -> CachedLLMResponse | None:
+        entry = self.memory.get(key)
+        tier = self.memory.name
+        if entry is None and self.shared is not None:
+            try:
+                entry = await self.shared.get(key)
+            except Exception as exc:
+                logger.warning("LLM cache read failed", tier=self.shared.name, error=str(exc))
+                entry = None
+            if entry is not None:
+                tier = self.shared.name
+                self.memory.set(key, entry)
+        if entry is None or not isinstance(entry.get("text"), str):
+            self.misses += 1
+            self._record(operation, "miss")
+            return None
+        self.hits += 1
+        self._record(operation, "hit", tier)
+        return CachedLLMResponse(text=entry["text"])
+
+    async def put(self, key: str, response: Any) -> None:
+        entry = _response_entry(response)
+        if entry is None:
+            return
+        self.memory.set(key, entry)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, entry)
+            except Exception as exc:
+                logger.warning("LLM cache write failed", tier=self.shared.name, error=str(exc))
+
+    def clear(self) -> None:
+        """Drop the in-process tier and reset counters (tests)."""
+        self.memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_response_cache: LLMResponseCache | None = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache.from_settings()
+    return _response_cache
+
+
+def reset_llm_response_cache() -> None:
+    """Rebuild the cache from settings on next use (tests, settings changes)."""
+    global _response_cache
+    _response_cache = None
@@ -0,0 +1,671 @@
+"""
+RFP Sniper - LLM Gateway
+========================
+Single admission point for Gemini calls.
+
+Every model call waits for a slot from the gateway of the running event loop
+(one per API process or Celery worker process). Admission order is:
+
+1. Priority class: interactive (Dash, rewrite) before standard before batch
+   (screening, bulk generation). A request that has waited
+   ``llm_gateway_priority_aging_seconds`` is promoted one class so batch work
+   cannot starve outright.
+2. Within a class, start-time fair queuing across tenants: each request is
+   tagged with its tenant's cumulative (weighted) token cost, so a tenant that
+   queues hundreds of large prompts only gets its share of slots while other
+   tenants' requests go first.
+
+Admission is also bounded by a concurrency limit and by global and
+per-tenant tokens-per-minute buckets. Buckets are charged with an estimate up
+front and corrected with the reported usage afterwards. Identical in-flight
+prompts to the same model share one call, and low-temperature calls are served
+from the response cache (``app.services.llm_cache``) without queuing.
+Streamed calls (``generate_stream``) go through the same admission and cache
+but are never coalesced, since every caller needs its own chunks.
+
+The tenant and default priority come from a context variable bound per
+request (``get_current_user``) or per Celery task (from its ``user_id``).
+Budgets are per process.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import itertools
+import time
+import weakref
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+import structlog
+
+from app.config import settings
+from app.observability.metrics import increment_counter, record_histogram
+from app.observability.profiling import span
+from app.services.llm_cache import get_llm_response_cache, is_cacheable, response_cache_key
+
+logger = structlog.get_logger(__name__)
+
+# Celery header that overrides a task's default priority class (a member name).
+LLM_PRIORITY_HEADER = "llm_priority"
+DEFAULT_OUTPUT_TOKEN_ESTIMATE = 1024
+CHARS_PER_TOKEN = 4
+# How often idle tenants' fair-queuing tags and full buckets are dropped.
+TENANT_SWEEP_SECONDS = 60.0
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    STANDARD = 1
+    BATCH = 2
+
+
+class LLMQueueTimeout(RuntimeError):
+    """Raised when a request waits longer than the gateway queue timeout."""
+
+
+# =============================================================================
+# Tenant context
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class LLMContext:
+    tenant: str = "system"
+    priority: LLMPriority = LLMPriority.STANDARD
+    weight: float = 1.0
+
+
+_DEFAULT_CONTEXT = LLMContext()
+_llm_context: contextvars.ContextVar[LLMContext | None] = contextvars.ContextVar(
+    "llm_context", default=None
+)
+
+
+def current_llm_context() -> LLMContext:
+    return _llm_context.get() or _DEFAULT_CONTEXT
+
+
+def bind_llm_tenant(
+    tenant: str,
+    *,
+    priority: LLMPriority | None = None,
+    weight: float | None = None,
+) -> contextvars.Token:
+    """Attribute LLM calls in the current context to ``tenant``."""
+    current = current_llm_context()
+    return _llm_context.set(
+        LLMContext(
+            tenant=tenant,
+            priority=current.priority if priority is None else priority,
+            weight=current.weight if weight is None else weight,
+        )
+    )
+
+
+def reset_llm_context(token: contextvars.Token) -> None:
+    _llm_context.reset(token)
+
+
+@contextmanager
+def llm_context(
+    tenant: str | None = None,
+    *,
+    priority: LLMPriority | None = None,
+    weight: float | None = None,
+) -> Iterator[LLMContext]:
+    """Temporarily override the tenant and/or default priority."""
+    token = bind_llm_tenant(
+        tenant or current_llm_context().tenant, priority=priority, weight=weight
+    )
+    try:
+        yield current_llm_context()
+    finally:
+        reset_llm_context(token)
+
+
+def user_tenant(user_id: int | None) -> str:
+    return f"user:{user_id}" if user_id is not None else "system"
+
+
+# =============================================================================
+# Budgets
+# =============================================================================
+
+
+class _TokenBucket:
+    """Tokens-per-minute bucket; may go into debt when usage exceeds estimates."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_seconds(self, cost: int, now: float) -> float:
+        """Seconds until ``cost`` fits (a cost above capacity needs a full bucket)."""
+        self._refill(now)
+        needed = min(float(cost), self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def debit(self, tokens: int) -> None:
+        self.tokens -= tokens
+
+
+@dataclass
+class _Waiter:
+    tenant: str
+    priority: LLMPriority
+    cost: int
+    start_tag: float
+    enqueued_at: float
+    future: asyncio.Future
+    seq: int
+
+
+@dataclass
+class LLMLease:
+    """An admitted request; report usage so budgets reflect real token counts."""
+
+    tenant: str
+    priority: LLMPriority
+    operation: str
+    estimated_tokens: int
+    queue_seconds: float
+    actual_tokens: int | None = None
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        output_tokens = getattr(usage, "candidates_token_count", None)
+        total = getattr(usage, "total_token_count", None)
+        if not isinstance(total, int):
+            if not isinstance(prompt_tokens, int) or not isinstance(output_tokens, int):
+                return
+            total = prompt_tokens + output_tokens
+        self.prompt_tokens = prompt_tokens if isinstance(prompt_tokens, int) else 0
+        self.output_tokens = output_tokens if isinstance(output_tokens, int) else 0
+        self.actual_tokens = total
+
+
+@dataclass
+class StreamedLLMResponse:
+    """Aggregate of a streamed call: the full text and the final usage."""
+
+    text: str
+    usage_metadata: Any = None
+    cached: bool = False
+
+
+def _chunk_text(chunk: Any) -> str:
+    try:
+        text = chunk.text
+    except Exception:
+        # Chunks without text parts (safety ratings, finish reason only).
+        return ""
+    return text if isinstance(text, str) else ""
+
+
+def estimate_tokens(prompt: Any, generation_config: Any = None) -> int:
+    """Rough prompt + output token estimate used for admission."""
+    prompt_chars = len(prompt) if isinstance(prompt, str) else len(str(prompt))
+    max_output = getattr(generation_config, "max_output_tokens", None)
+    if max_output is None and isinstance(generation_config, dict):
+        max_output = generation_config.get("max_output_tokens")
+    if not isinstance(max_output, int) or max_output <= 0:
+        max_output = DEFAULT_OUTPUT_TOKEN_ESTIMATE
+    return max(1, prompt_chars // CHARS_PER_TOKEN + max_output)
+
+
+# =============================================================================
+# Gateway
+# =============================================================================
+
+
+class LLMGateway:
+    """Fair, budgeted admission of model calls for one event loop."""
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int,
+        tokens_per_minute: int = 0,
+        tenant_tokens_per_minute: int = 0,
+        queue_timeout_seconds: float = 120.0,
+        priority_aging_seconds: float = 30.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.tenant_tokens_per_minute = tenant_tokens_per_minute
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.priority_aging_seconds = priority_aging_seconds
+        self._global_bucket = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._tenant_buckets: dict[str, _TokenBucket] = {}
+        self._queues: dict[tuple[LLMPriority, str], deque[_Waiter]] = {}
+        self._finish_tags: dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._active = 0
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._next_sweep = time.monotonic() + TENANT_SWEEP_SECONDS
+
+    @classmethod
+    def from_settings(cls) -> "LLMGateway":
+        return cls(
+            max_concurrency=settings.llm_gateway_max_concurrency,
+            tokens_per_minute=settings.llm_gateway_tokens_per_minute,
+            tenant_tokens_per_minute=settings.llm_gateway_tenant_tokens_per_minute,
+            queue_timeout_seconds=settings.llm_gateway_queue_timeout_seconds,
+            priority_aging_seconds=settings.llm_gateway_priority_aging_seconds,
+        )
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(
+            1 for queue in self._queues.values() for waiter in queue if not waiter.future.done()
+        )
+
+    # -------------------------------------------------------------------------
+    # Queueing
+    # -------------------------------------------------------------------------
+
+    def _tenant_bucket(self, tenant: str) -> _TokenBucket | None:
+        if not self.tenant_tokens_per_minute:
+            return None
+        bucket = self._tenant_buckets.get(tenant)
+        if bucket is None:
+            bucket = _TokenBucket(self.tenant_tokens_per_minute)
+            self._tenant_buckets[tenant] = bucket
+        return bucket
+
+    def _enqueue(self, context: LLMContext, priority: LLMPriority, cost: int) -> _Waiter:
+        start_tag = max(self._virtual_time, self._finish_tags.get(context.tenant, 0.0))
+        self._finish_tags[context.tenant] = start_tag + cost / max(context.weight, 0.01)
+        waiter = _Waiter(
+            tenant=context.tenant,
+            priority=priority,
+            cost=cost,
+            start_tag=start_tag,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+            seq=next(self._seq),
+        )
+        self._queues.setdefault((priority, context.tenant), deque()).append(waiter)
+        return waiter
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> int:
+        if self.priority_aging_seconds <= 0:
+            return waiter.priority
+        promoted = int((now - waiter.enqueued_at) // self.priority_aging_seconds)
+        return max(0, waiter.priority - promoted)
+
+    def _heads(self, now: float) -> list[_Waiter]:
+        heads: list[_Waiter] = []
+        for key in list(self._queues):
+            queue = self._queues[key]
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                del self._queues[key]
+                continue
+            heads.append(queue[0])
+        heads.sort(key=lambda w: (self._effective_priority(w, now), w.start_tag, w.seq))
+        return heads
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        retry_in: float | None = None
+        now = time.monotonic()
+        while self._active < self.max_concurrency:
+            granted = False
+            for waiter in self._heads(now):
+                if self._global_bucket is not None:
+                    wait = self._global_bucket.wait_seconds(waiter.cost, now)
+                    if wait > 0:
+                        # The global budget blocks everyone equally.
+                        retry_in = wait if retry_in is None else min(retry_in, wait)
+                        break
+                bucket = self._tenant_bucket(waiter.tenant)
+                if bucket is not None:
+                    wait = bucket.wait_seconds(waiter.cost, now)
+                    if wait > 0:
+                        retry_in = wait if retry_in is None else min(retry_in, wait)
+                        continue
+                self._grant(waiter, bucket)
+                granted = True
+                break
+            if not granted:
+                break
+        if retry_in is not None and self._queues:
+            self._timer = asyncio.get_running_loop().call_later(retry_in, self._dispatch)
+
+    def _grant(self, waiter: _Waiter, bucket: _TokenBucket | None) -> None:
+        self._queues[(waiter.priority, waiter.tenant)].popleft()
+        self._virtual_time = max(self._virtual_time, waiter.start_tag)
+        if self._global_bucket is not None:
+            self._global_bucket.debit(waiter.cost)
+        if bucket is not None:
+            bucket.debit(waiter.cost)
+        self._active += 1
+        waiter.future.set_result(None)
+
+    def _release(self, lease: LLMLease) -> None:
+        self._active -= 1
+        if lease.actual_tokens is not None:
+            correction = lease.actual_tokens - lease.estimated_tokens
+            if self._global_bucket is not None:
+                self._global_bucket.debit(correction)
+            bucket = self._tenant_bucket(lease.tenant)
+            if bucket is not None:
+                bucket.debit(correction)
+        self._sweep_idle_tenants(time.monotonic())
+        self._dispatch()
+
+    def _sweep_idle_tenants(self, now: float) -> None:
+        """
+        Forget tenants whose state no longer affects admission: a finish tag
+        at or behind virtual time is equivalent to none, and a full bucket to
+        a fresh one. With nothing queued, virtual time catches up to the
+        latest finish tag, so every tag is dropped.
+        """
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + TENANT_SWEEP_SECONDS
+        if not self.queued and self._finish_tags:
+            self._virtual_time = max(self._virtual_time, *self._finish_tags.values())
+        for tenant in [t for t, tag in self._finish_tags.items() if tag <= self._virtual_time]:
+            del self._finish_tags[tenant]
+        idle_buckets = []
+        for tenant, bucket in self._tenant_buckets.items():
+            bucket._refill(now)
+            if bucket.tokens >= bucket.capacity:
+                idle_buckets.append(tenant)
+        for tenant in idle_buckets:
+            del self._tenant_buckets[tenant]
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        *,
+        operation: str,
+        estimated_tokens: int,
+        priority: LLMPriority | None = None,
+    ) -> AsyncIterator[LLMLease]:
+        """Wait for a slot; the slot is held until the block exits."""
+        context = current_llm_context()
+        priority = context.priority if priority is None else priority
+        waiter = self._enqueue(context, priority, max(1, estimated_tokens))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.queue_timeout_seconds)
+        except BaseException as exc:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller gave up; hand the slot back.
+                self._active -= 1
+                self._dispatch()
+            if isinstance(exc, TimeoutError):
+                increment_counter("llm.queue_timeouts", tags={"tenant": context.tenant})
+                raise LLMQueueTimeout(
+                    f"LLM request waited more than {self.queue_timeout_seconds:.0f}s for capacity."
+                ) from None
+            raise
+
+        queue_seconds = time.monotonic() - waiter.enqueued_at
+        lease = LLMLease(
+            tenant=context.tenant,
+            priority=priority,
+            operation=operation,
+            estimated_tokens=waiter.cost,
+            queue_seconds=queue_seconds,
+        )
+        outcome = "error"
+        try:
+            yield lease
+            outcome = "ok"
+        finally:
+            self._release(lease)
+            self._record_metrics(lease, outcome)
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: Any,
+        *,
+        operation: str,
+        model_name: str | None = None,
+        generation_config: Any = None,
+        priority: LLMPriority | None = None,
+        coalesce: bool = True,
+        cache: bool | None = None,
+        prompt_version: str = "",
+    ) -> Any:
+        """
+        ``model.generate_content_async`` through the gateway.
+
+        Low-temperature calls are answered from the response cache when
+        possible (``cache=False`` opts out, ``cache=True`` opts in regardless
+        of temperature); ``prompt_version`` is part of the cache key.
+        """
+        cache_key = None
+        if is_cacheable(model, prompt, generation_config, cache):
+            cache_key = response_cache_key(
+                model,
+                prompt,
+                model_name=model_name,
+                generation_config=generation_config,
+                operation=operation,
+                prompt_version=prompt_version,
+            )
+            cached = await get_llm_response_cache().get(cache_key, operation=operation)
+            if cached is not None:
+                return cached
+
+        key = None
+        if coalesce and isinstance(prompt, str):
+            digest = hashlib.sha256(
+                f"{id(model)}|{model_name}|{generation_config!r}|{prompt}".encode()
+            ).hexdigest()
+            key = digest
+            while (leader := self._inflight.get(key)) is not None:
+                increment_counter("llm.coalesced", tags={"operation": operation})
+                try:
+                    return await asyncio.shield(leader)
+                except asyncio.CancelledError:
+                    if not leader.cancelled() or asyncio.current_task().cancelling():
+                        raise  # this caller was cancelled
+                    # The leader's caller went away; retry, possibly as the new leader.
+
+        shared: asyncio.Future | None = None
+        if key is not None:
+            shared = asyncio.get_running_loop().create_future()
+            self._inflight[key] = shared
+        try:
+            async with self.admit(
+                operation=operation,
+                estimated_tokens=estimate_tokens(prompt, generation_config),
+                priority=priority,
+            ) as lease:
+                kwargs = {}
+                if generation_config is not None:
+                    kwargs["generation_config"] = generation_config
+                prompt_chars = len(prompt) if isinstance(prompt, str) else 0
+                with span("gemini", model_name or operation, prompt_chars=prompt_chars):
+                    response = await model.generate_content_async(prompt, **kwargs)
+                lease.record_usage(response)
+        except BaseException as exc:
+            if shared is not None:
+                if isinstance(exc, asyncio.CancelledError):
+                    shared.cancel()
+                else:
+                    shared.set_exception(exc)
+                    shared.exception()  # followers may not exist; mark retrieved
+            raise
+        finally:
+            if key is not None:
+                self._inflight.pop(key, None)
+        if shared is not None:
+            shared.set_result(response)
+        if cache_key is not None:
+            await get_llm_response_cache().put(cache_key, response)
+        return response
+
+    async def generate_stream(
+        self,
+        model: Any,
+        prompt: Any,
+        *,
+        on_chunk: Callable[[str], Awaitable[None]],
+        operation: str,
+        model_name: str | None = None,
+        generation_config: Any = None,
+        priority: LLMPriority | None = None,
+        cache: bool | None = None,
+        prompt_version: str = "",
+    ) -> StreamedLLMResponse:
+        """
+        ``model.generate_content_async(stream=True)`` through the gateway.
+
+        ``on_chunk`` is awaited with each text delta as it arrives; a cached
+        response is delivered as a single chunk. Returns the aggregated text
+        and usage once the stream is exhausted.
+        """
+        cache_key = None
+        if is_cacheable(model, prompt, generation_config, cache):
+            cache_key = response_cache_key(
+                model,
+                prompt,
+                model_name=model_name,
+                generation_config=generation_config,
+                operation=operation,
+                prompt_version=prompt_version,
+            )
+            cached = await get_llm_response_cache().get(cache_key, operation=operation)
+            if cached is not None:
+                await on_chunk(cached.text)
+                return StreamedLLMResponse(
+                    text=cached.text, usage_metadata=cached.usage_metadata, cached=True
+                )
+
+        parts: list[str] = []
+        async with self.admit(
+            operation=operation,
+            estimated_tokens=estimate_tokens(prompt, generation_config),
+            priority=priority,
+        ) as lease:
+            kwargs: dict[str, Any] = {"stream": True}
+            if generation_config is not None:
+                kwargs["generation_config"] = generation_config
+            prompt_chars = len(prompt) if isinstance(prompt, str) else 0
+            with span("gemini", model_name or operation, prompt_chars=prompt_chars):
+                stream = await model.generate_content_async(prompt, **kwargs)
+                async for chunk in stream:
+                    text = _chunk_text(chunk)
+                    if not text:
+                        continue
+                    if not parts:
+                        record_histogram(
+                            "llm.first_token_ms",
+                            (time.monotonic() - lease.started_at) * 1000,
+                            tags={"operation": operation},
+                        )
+                    parts.append(text)
+                    await on_chunk(text)
+            # A stream without any text was blocked; ``.text`` raises the reason.
+            text = "".join(parts) if parts else stream.text
+            response = StreamedLLMResponse(
+                text=text, usage_metadata=getattr(stream, "usage_metadata", None)
+            )
+            lease.record_usage(response)
+        if cache_key is not None:
+            await get_llm_response_cache().put(cache_key, response)
+        return response
+
+    def _record_metrics(self, lease: LLMLease, outcome: str) -> None:
+        tenant_tags = {"tenant": lease.tenant}
+        record_histogram(
+            "llm.queue_ms",
+            lease.queue_seconds * 1000,
+            tags={**tenant_tags, "priority": lease.priority.name.lower()},
+        )
+        record_histogram(
+            "llm.latency_ms",
+            (time.monotonic() - lease.started_at) * 1000,
+            tags={**tenant_tags, "operation": lease.operation},
+        )
+        increment_counter(
+            "llm.requests",
+            tags={**tenant_tags, "operation": lease.operation, "outcome": outcome},
+        )
+        if lease.actual_tokens is not None:
+            increment_counter("llm.prompt_tokens", lease.prompt_tokens, tags=tenant_tags)
+            increment_counter("llm.output_tokens", lease.output_tokens, tags=tenant_tags)
+        if lease.queue_seconds > 5:
+            logger.info(
+                "LLM request queued",
+                tenant=lease.tenant,
+                operation=lease.operation,
+                priority=lease.priority.name,
+                queue_seconds=round(lease.queue_seconds, 2),
+            )
+
+
+_gateways: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMGateway]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Gateway for the running event loop (one per API or worker process)."""
+    loop = asyncio.get_running_loop()
+    gateway = _gateways.get(loop)
+    if gateway is None:
+        gateway = LLMGateway.from_settings()
+        _gateways[loop] = gateway
+    return gateway
+
+
+async def llm_generate(model: Any, prompt: Any, **kwargs: Any) -> Any:
+    """Shortcut for ``get_llm_gateway().generate(...)``."""
+    return await get_llm_gateway().generate(model, prompt, **kwargs)
+
+
+async def llm_generate_stream(model: Any, prompt: Any, **kwargs: Any) -> StreamedLLMResponse:
+    """Shortcut for ``get_llm_gateway().generate_stream(...)``."""
+    return await get_llm_gateway().generate_stream(model, prompt, **kwargs)
+
+
+def llm_slot(
+    *,
+    operation: str,
+    estimated_tokens: int,
+    priority: LLMPriority | None = None,
+):
+    """Shortcut for ``get_llm_gateway().admit(...)`` (chat and streaming calls)."""
+    return get_llm_gateway().admit(
+        operation=operation, estimated_tokens=estimated_tokens, priority=priority
+    )
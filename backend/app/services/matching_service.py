@@ -8,15 +8,19 @@ Uses Gemini Flash for cost-effective multi-category scoring.
 import json
 from dataclasses import dataclass, field
 
-import google.generativeai as genai
 import structlog
 
 from app.config import settings
+from app.lazy_imports import lazy_module
 from app.models.rfp import RFP
 from app.models.user import UserProfile
+from app.services.llm_gateway import LLMPriority, llm_generate
+from app.services.model_registry import model_registry
 
 logger = structlog.get_logger(__name__)
 
+genai = lazy_module("google.generativeai")
+
 SCORING_CATEGORIES = [
     "naics_fit",
     "set_aside_eligibility",
@@ -92,8 +96,8 @@ class OpportunityMatchingService:
         self.model_name = settings.gemini_model_flash
 
         if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(
+            model_registry.configure(self.api_key)
+            self.model = model_registry.get_model(
                 self.model_name,
                 system_instruction=SYSTEM_PROMPT,
             )
@@ -166,12 +170,16 @@ class OpportunityMatchingService:
         prompt = f"""Score this opportunity match:\n\n{profile_text}\n\n{rfp_text}"""
 
         try:
-            response = await self.model.generate_content_async(
+            response = await llm_generate(
+                self.model,
                 prompt,
+                operation="opportunity_matching",
+                model_name=self.model_name,
                 generation_config=genai.GenerationConfig(
                     temperature=0.1,
                     response_mime_type="application/json",
                 ),
+                priority=LLMPriority.BATCH,
             )
             data = json.loads(response.text)
             return MatchResult(
@@ -0,0 +1,209 @@
+"""
+RFP Sniper - Gemini Model Registry
+==================================
+Process-wide cache of available Gemini models and pre-built model handles.
+
+Services used to call ``genai.configure`` and ``genai.list_models()`` (a
+network round trip) every time they were constructed, which happens per task
+and per request. The registry configures the client once, resolves model
+names against a cached model list that is refreshed in a background thread
+once it is older than ``gemini_model_registry_ttl_seconds``, and hands out
+shared ``GenerativeModel`` handles keyed by name, system instruction and
+generation config.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+import structlog
+
+from app.config import settings
+from app.lazy_imports import lazy_module
+
+logger = structlog.get_logger(__name__)
+
+genai = lazy_module("google.generativeai")
+
+# Retry a failed model listing sooner than a normal refresh.
+LIST_FAILURE_RETRY_SECONDS = 60
+MAX_CACHED_MODELS = 64
+
+
+class GeminiModelRegistry:
+    """Resolves and caches Gemini models for the current process."""
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._configured_key: str | None = None
+        self._available: list[str] | None = None
+        self._expires_at = 0.0
+        self._refreshing = False
+        self._models: OrderedDict[tuple, genai.GenerativeModel] = OrderedDict()
+
+    def _check_fork(self) -> None:
+        # Refresh threads and lock state do not survive a fork.
+        if self._pid != os.getpid():
+            available = self._available
+            self._reset()
+            self._available = available
+
+    def clear(self) -> None:
+        """Forget everything (tests, key rotation)."""
+        self._reset()
+
+    # -------------------------------------------------------------------------
+    # Client configuration
+    # -------------------------------------------------------------------------
+
+    def configure(self, api_key: str) -> None:
+        """Configure the genai client, once per process and key."""
+        self._check_fork()
+        if self._configured_key == api_key:
+            return
+        with self._lock:
+            if self._configured_key == api_key:
+                return
+            genai.configure(api_key=api_key)
+            if self._configured_key is not None:
+                self._models.clear()
+                self._available = None
+                self._expires_at = 0.0
+            self._configured_key = api_key
+
+    # -------------------------------------------------------------------------
+    # Available models
+    # -------------------------------------------------------------------------
+
+    def _list_generate_models(self) -> list[str] | None:
+        try:
+            models = genai.list_models()
+            return [
+                model.name
+                for model in models
+                if "generateContent" in (getattr(model, "supported_generation_methods", None) or [])
+            ]
+        except Exception as e:
+            logger.warning("Failed to list Gemini models; using configured names", error=str(e))
+            return None
+
+    def refresh(self) -> None:
+        """List models now and update the cache."""
+        names = self._list_generate_models()
+        with self._lock:
+            if names is not None:
+                self._available = names
+                self._expires_at = time.monotonic() + settings.gemini_model_registry_ttl_seconds
+            else:
+                self._expires_at = time.monotonic() + LIST_FAILURE_RETRY_SECONDS
+            self._refreshing = False
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh thread unless one is already running."""
+        self._check_fork()
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="gemini-model-refresh", daemon=True).start()
+
+    def available_models(self) -> list[str]:
+        """
+        Names of models supporting generateContent.
+
+        Only the first call in a process waits on the API; afterwards a stale
+        list is returned immediately while a background refresh runs.
+        """
+        self._check_fork()
+        if self._available is None and self._expires_at == 0.0:
+            with self._lock:
+                self._refreshing = True
+            self.refresh()
+        elif time.monotonic() >= self._expires_at:
+            self.refresh_in_background()
+        return self._available or []
+
+    def resolve(self, preferred: str, fallback_keywords: Iterable[str] = ()) -> str:
+        """Best available model name for ``preferred``, or ``preferred`` itself."""
+        candidates = self.available_models()
+        for name in candidates:
+            if name == preferred or name.endswith(preferred):
+                return name
+        keywords = [keyword.lower() for keyword in fallback_keywords]
+        if keywords:
+            for name in candidates:
+                lowered = name.lower()
+                if all(keyword in lowered for keyword in keywords):
+                    return name
+        return preferred
+
+    # -------------------------------------------------------------------------
+    # Model handles
+    # -------------------------------------------------------------------------
+
+    def get_model(
+        self,
+        model_name: str,
+        *,
+        system_instruction: str | None = None,
+        generation_config: Any = None,
+    ) -> genai.GenerativeModel:
+        """Shared ``GenerativeModel`` for this name, instruction and config."""
+        self._check_fork()
+        key = (model_name, system_instruction, repr(generation_config))
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+        kwargs: dict[str, Any] = {}
+        if system_instruction is not None:
+            kwargs["system_instruction"] = system_instruction
+        if generation_config is not None:
+            kwargs["generation_config"] = generation_config
+        model = genai.GenerativeModel(model_name, **kwargs)
+        with self._lock:
+            self._models[key] = model
+            while len(self._models) > MAX_CACHED_MODELS:
+                self._models.popitem(last=False)
+        return model
+
+    def fallback_candidates(
+        self, exclude: Iterable[str] = ()
+    ) -> list[tuple[str, genai.GenerativeModel]]:
+        """Handles for the configured fallback models not in ``exclude``."""
+        seen = set(exclude)
+        candidates: list[tuple[str, genai.GenerativeModel]] = []
+        for model_name in settings.gemini_fallback_models.split(","):
+            model_name = model_name.strip()
+            if not model_name or model_name in seen:
+                continue
+            try:
+                candidates.append((model_name, self.get_model(model_name)))
+                seen.add(model_name)
+            except Exception as e:
+                logger.warning(
+                    "Failed to initialize fallback model",
+                    model=model_name,
+                    error=str(e),
+                )
+        return candidates
+
+
+model_registry = GeminiModelRegistry()
+
+
+def warm_model_registry() -> None:
+    """Configure the client and list models in the background, if a key is set."""
+    if settings.gemini_api_key and not settings.mock_ai:
+        model_registry.configure(settings.gemini_api_key)
+        model_registry.refresh_in_background()
@@ -0,0 +1,151 @@
+"""
+RFP Sniper - Near-Duplicate Detection
+=====================================
+MinHash signatures over word shingles plus a banded LSH index.
+
+Signatures are computed once at ingest from a document's chunk content and
+stored on the document. Duplicate detection then only touches the compact
+signatures: LSH bucketing yields candidate pairs without comparing every
+document to every other, and each candidate's Jaccard similarity is estimated
+from signature agreement.
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from random import Random
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+# Fixed seed so signatures stay comparable across processes and releases.
+_rng = Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return set()
+    if len(tokens) < size:
+        windows: Iterable[list[str]] = [tokens]
+    else:
+        windows = (tokens[i : i + size] for i in range(len(tokens) - size + 1))
+    return {
+        int.from_bytes(
+            hashlib.blake2b(" ".join(window).encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for window in windows
+    }
+
+
+def compute_minhash(text: str) -> list[int] | None:
+    """Return the MinHash signature of ``text``, or None if it has no tokens."""
+    hashes = _shingle_hashes(text)
+    if not hashes:
+        return None
+    return [
+        min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def compute_document_minhash(chunk_texts: Iterable[str]) -> list[int] | None:
+    """Signature for a document from its ordered chunk contents."""
+    return compute_minhash("\n".join(text for text in chunk_texts if text))
+
+
+def estimate_similarity(left: list[int], right: list[int]) -> float:
+    """Estimated Jaccard similarity between two signatures."""
+    if len(left) != len(right) or not left:
+        return 0.0
+    return sum(1 for a, b in zip(left, right, strict=True) if a == b) / len(left)
+
+
+@dataclass
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures."""
+
+    bands: int = LSH_BANDS
+    rows: int = LSH_ROWS
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    signatures: dict[int, list[int]] = field(default_factory=dict)
+
+    def _band_keys(self, signature: list[int]) -> list[tuple[int, tuple[int, ...]]]:
+        return [
+            (band, tuple(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: int, signature: list[int]) -> None:
+        if len(signature) != self.bands * self.rows:
+            return
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets[band_key].append(key)
+
+    def query(self, signature: list[int]) -> set[int]:
+        """Keys sharing at least one band with ``signature``."""
+        found: set[int] = set()
+        for band_key in self._band_keys(signature):
+            found.update(self.buckets.get(band_key, ()))
+        return found
+
+    def candidate_pairs(self) -> set[tuple[int, int]]:
+        pairs: set[tuple[int, int]] = set()
+        for members in self.buckets.values():
+            if len(members) < 2:
+                continue
+            ordered = sorted(set(members))
+            for i, left in enumerate(ordered):
+                for right in ordered[i + 1 :]:
+                    pairs.add((left, right))
+        return pairs
+
+    def similar_pairs(
+        self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ) -> list[tuple[int, int, float]]:
+        """Candidate pairs whose estimated similarity meets ``threshold``."""
+        results = []
+        for left, right in self.candidate_pairs():
+            similarity = estimate_similarity(self.signatures[left], self.signatures[right])
+            if similarity >= threshold:
+                results.append((left, right, similarity))
+        results.sort(key=lambda item: (-item[2], item[0], item[1]))
+        return results
+
+
+def group_similar_pairs(pairs: list[tuple[int, int, float]]) -> list[set[int]]:
+    """Connected components over similar pairs."""
+    parent: dict[int, int] = {}
+
+    def find(key: int) -> int:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for left, right, _ in pairs:
+        root_left, root_right = find(left), find(right)
+        if root_left != root_right:
+            parent[max(root_left, root_right)] = min(root_left, root_right)
+
+    groups: dict[int, set[int]] = defaultdict(set)
+    for key in parent:
+        groups[find(key)].add(key)
+    return sorted(groups.values(), key=min)
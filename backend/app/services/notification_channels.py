@@ -0,0 +1,214 @@
+"""
+RFP Sniper - Notification Channels
+==================================
+Email (Resend) and Slack webhook delivery for notifications.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import structlog
+
+from app.config import settings
+from app.models.rfp import RFP
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = structlog.get_logger(__name__)
+
+
+# =============================================================================
+# Email Service
+# =============================================================================
+
+
+@asynccontextmanager
+async def _http_client(client: httpx.AsyncClient | None = None, **kwargs):
+    """Yield the caller's shared client, or a short-lived one."""
+    if client is not None:
+        yield client
+        return
+    import httpx
+
+    async with httpx.AsyncClient(**kwargs) as owned:
+        yield owned
+
+
+class EmailService:
+    """Email sending service via Resend."""
+
+    @staticmethod
+    async def send_email(
+        to_email: str,
+        subject: str,
+        body_html: str,
+        body_text: str = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> bool:
+        """Send an email via Resend API, reusing ``client`` when provided."""
+        if not settings.email_enabled:
+            logger.info("Email delivery disabled, skipping", to=to_email, subject=subject)
+            return True
+
+        api_key = settings.resend_api_key
+        if not api_key:
+            logger.warning("RESEND_API_KEY not configured, email skipped", to=to_email)
+            return False
+
+        try:
+            payload = {
+                "from": settings.email_from,
+                "to": [to_email],
+                "subject": subject,
+                "html": body_html,
+            }
+            if body_text:
+                payload["text"] = body_text
+
+            async with _http_client(client, timeout=10) as http:
+                resp = await http.post(
+                    "https://api.resend.com/emails",
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    json=payload,
+                )
+                resp.raise_for_status()
+
+            logger.info("Email sent via Resend", to=to_email, subject=subject)
+            return True
+
+        except Exception as e:
+            logger.error("Email send failed", to=to_email, error=str(e))
+            return False
+
+    @staticmethod
+    def build_deadline_reminder_email(
+        rfp: RFP,
+        days_until: int,
+    ) -> tuple[str, str, str]:
+        """
+        Build deadline reminder email content.
+
+        Returns: (subject, html_body, text_body)
+        """
+        subject = (
+            f"⏰ RFP Deadline in {days_until} day{'s' if days_until != 1 else ''}: {rfp.title[:50]}"
+        )
+
+        html_body = f"""
+        <html>
+        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <div style="background: #1a365d; color: white; padding: 20px; text-align: center;">
+                <h1 style="margin: 0;">RFP Sniper</h1>
+            </div>
+
+            <div style="padding: 20px;">
+                <h2>⏰ Deadline Reminder</h2>
+
+                <p>The response deadline for the following opportunity is in <strong>{days_until} day{"s" if days_until != 1 else ""}</strong>:</p>
+
+                <div style="background: #f7f7f7; padding: 15px; border-left: 4px solid #e53e3e; margin: 20px 0;">
+                    <h3 style="margin-top: 0;">{rfp.title}</h3>
+                    <p><strong>Solicitation:</strong> {rfp.solicitation_number}</p>
+                    <p><strong>Agency:</strong> {rfp.agency}</p>
+                    <p><strong>Deadline:</strong> {rfp.response_deadline.strftime("%B %d, %Y at %I:%M %p") if rfp.response_deadline else "TBD"}</p>
+                </div>
+
+                <p>
+                    <a href="{settings.app_url}/opportunities/{rfp.id}"
+                       style="background: #3182ce; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">
+                        View in RFP Sniper
+                    </a>
+                </p>
+            </div>
+
+            <div style="background: #f7f7f7; padding: 15px; text-align: center; font-size: 12px; color: #666;">
+                <p>You're receiving this because you have deadline reminders enabled.</p>
+                <p><a href="{settings.app_url}/settings/notifications">Manage notification preferences</a></p>
+            </div>
+        </body>
+        </html>
+        """
+
+        text_body = f"""
+RFP Sniper - Deadline Reminder
+
+The response deadline for the following opportunity is in {days_until} day{"s" if days_until != 1 else ""}:
+
+{rfp.title}
+Solicitation: {rfp.solicitation_number}
+Agency: {rfp.agency}
+Deadline: {rfp.response_deadline.strftime("%B %d, %Y at %I:%M %p") if rfp.response_deadline else "TBD"}
+
+View in RFP Sniper: {settings.app_url}/opportunities/{rfp.id}
+        """
+
+        return subject, html_body, text_body
+
+
+email_service = EmailService()
+
+
+# =============================================================================
+# Slack Service
+# =============================================================================
+
+
+class SlackService:
+    """
+    Slack webhook notification service.
+    """
+
+    @staticmethod
+    async def send_webhook(
+        webhook_url: str,
+        message: dict,
+        client: httpx.AsyncClient | None = None,
+    ) -> bool:
+        """
+        Send a message to Slack via webhook.
+        """
+        try:
+            async with _http_client(client) as http:
+                response = await http.post(
+                    webhook_url,
+                    json=message,
+                    timeout=10.0,
+                )
+                return response.status_code == 200
+
+        except Exception as e:
+            logger.error(f"Slack webhook failed: {e}")
+            return False
+
+    @staticmethod
+    def build_deadline_message(rfp: RFP, days_until: int) -> dict:
+        """Build Slack message for deadline reminder."""
+        return {
+            "blocks": [
+                {
+                    "type": "header",
+                    "text": {
+                        "type": "plain_text",
+                        "text": f"⏰ RFP Deadline in {days_until} Day{'s' if days_until != 1 else ''}",
+                    },
+                },
+                {
+                    "type": "section",
+                    "fields": [
+                        {"type": "mrkdwn", "text": f"*Title:*\n{rfp.title[:100]}"},
+                        {"type": "mrkdwn", "text": f"*Agency:*\n{rfp.agency}"},
+                        {"type": "mrkdwn", "text": f"*Solicitation:*\n{rfp.solicitation_number}"},
+                        {
+                            "type": "mrkdwn",
+                            "text": f"*Deadline:*\n{rfp.response_deadline.strftime('%B %d, %Y') if rfp.response_deadline else 'TBD'}",
+                        },
+                    ],
+                },
+            ],
+        }
+
+
+slack_service = SlackService()
@@ -9,11 +9,15 @@ import io
 from dataclasses import dataclass
 from typing import Any
 
-import pdfplumber
 import structlog
 
+from app.lazy_imports import lazy_module
+from app.observability.profiling import span
+
 logger = structlog.get_logger(__name__)
 
+pdfplumber = lazy_module("pdfplumber")
+
 
 @dataclass
 class PDFPage:
@@ -65,6 +69,10 @@ class PDFProcessor:
         Returns:
             PDFDocument with extracted text and metadata
         """
+        with span("pdf", "extract_text", size_bytes=len(pdf_bytes)):
+            return self._extract_text(pdf_bytes, filename)
+
+    def _extract_text(self, pdf_bytes: bytes, filename: str) -> PDFDocument:
         logger.info(f"Processing PDF: {filename}", size_bytes=len(pdf_bytes))
 
         pages: list[PDFPage] = []
@@ -0,0 +1,548 @@
+"""
+RFP Sniper - Saved Search Percolator
+====================================
+Matches RFPs against saved searches when RFPs are written, instead of
+rescanning the RFP table every time a search is run or a digest is built.
+
+Each ``SavedSearch.filters`` is compiled into a ``CompiledSearch``. A user's
+searches are held in a ``PercolatorIndex``. Every search is posted under the
+values of one anchor field, in order of preference:
+
+1. NAICS code
+2. set-aside
+3. contract vehicle
+4. jurisdiction
+5. keyword trigram
+6. agency trigram
+7. source type, status or currency
+
+An RFP only verifies the searches that share a posting with it. Searches
+without an anchorable filter (value ranges only, or no filters) are always
+verified. Verification mirrors ``apply_saved_search_filters``, the SQL form
+used for full rebuilds, so both paths agree.
+
+Matches are stored as ``SavedSearchMatch`` rows in the same transaction as
+the RFP change. ``after_flush`` collects new and changed RFPs, and
+``before_commit`` percolates them. Creating a search or changing its filters
+rebuilds that search's matches with one query (``rebuild_search_matches``).
+Rebuilds diff against the stored rows, so matches that still apply keep their
+``matched_at``. Both writers insert with ON CONFLICT DO NOTHING, so a rebuild
+racing an RFP write never fails either transaction.
+"""
+
+import re
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import delete, event, func, inspect, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.database import insert_ignoring_conflicts
+from app.models.rfp import RFP, RFPStatus
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+
+logger = structlog.get_logger(__name__)
+
+GRAM_SIZE = 3
+INDEX_CACHE_SIZE = 1024
+# RFP columns read by saved-search filters; other updates are not percolated.
+MATCHED_RFP_FIELDS = (
+    "title",
+    "description",
+    "summary",
+    "solicitation_number",
+    "agency",
+    "naics_code",
+    "set_aside",
+    "status",
+    "source_type",
+    "jurisdiction",
+    "currency",
+    "contract_vehicle",
+    "estimated_value",
+)
+
+_PENDING_RFPS_KEY = "saved_search_percolate_rfps"
+_MATCH_CONFLICT_COLUMNS = ["saved_search_id", "rfp_id"]
+INSERT_BATCH_SIZE = 500
+_WORD_RUN = re.compile(r"\w+")
+_installed = False
+
+
+# =============================================================================
+# Filters
+# =============================================================================
+
+
+def normalize_filter_values(value: object | None) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return []
+
+
+def apply_saved_search_filters(query, filters: dict):
+    """Add the WHERE clauses of a saved search's ``filters`` to an RFP query."""
+    keywords = normalize_filter_values(filters.get("keywords"))
+    agencies = normalize_filter_values(filters.get("agencies"))
+    naics_codes = normalize_filter_values(filters.get("naics_codes"))
+    set_asides = normalize_filter_values(filters.get("set_asides"))
+    statuses = normalize_filter_values(filters.get("statuses"))
+    source_types = normalize_filter_values(filters.get("source_types"))
+    jurisdictions = normalize_filter_values(filters.get("jurisdictions"))
+    currencies = normalize_filter_values(filters.get("currencies"))
+    contract_vehicles = normalize_filter_values(filters.get("contract_vehicles"))
+
+    min_value = filters.get("min_value")
+    max_value = filters.get("max_value")
+
+    if keywords:
+        like_terms = []
+        for keyword in keywords:
+            pattern = f"%{keyword}%"
+            like_terms.append(RFP.title.ilike(pattern))
+            like_terms.append(RFP.description.ilike(pattern))
+            like_terms.append(RFP.summary.ilike(pattern))
+            like_terms.append(RFP.solicitation_number.ilike(pattern))
+        query = query.where(or_(*like_terms))
+
+    if agencies:
+        agency_filters = [RFP.agency.ilike(f"%{agency}%") for agency in agencies]
+        query = query.where(or_(*agency_filters))
+
+    if naics_codes:
+        query = query.where(RFP.naics_code.in_(naics_codes))
+
+    if set_asides:
+        query = query.where(RFP.set_aside.in_(set_asides))
+
+    if statuses:
+        valid_statuses = [
+            RFPStatus(status) for status in statuses if status in RFPStatus._value2member_map_
+        ]
+        if valid_statuses:
+            query = query.where(RFP.status.in_(valid_statuses))
+
+    if source_types:
+        query = query.where(RFP.source_type.in_(source_types))
+
+    if jurisdictions:
+        query = query.where(RFP.jurisdiction.in_(jurisdictions))
+
+    if currencies:
+        query = query.where(RFP.currency.in_([value.upper() for value in currencies]))
+
+    if contract_vehicles:
+        query = query.where(RFP.contract_vehicle.in_(contract_vehicles))
+
+    if isinstance(min_value, (int, float)):
+        query = query.where(RFP.estimated_value != None)  # noqa: E711
+        query = query.where(RFP.estimated_value >= int(min_value))
+
+    if isinstance(max_value, (int, float)):
+        query = query.where(RFP.estimated_value != None)  # noqa: E711
+        query = query.where(RFP.estimated_value <= int(max_value))
+
+    return query
+
+
+# =============================================================================
+# Compiled searches
+# =============================================================================
+
+
+def _anchor_gram(term: str) -> str | None:
+    """Lower-cased gram that appears in any text containing ``term``."""
+    runs = _WORD_RUN.findall(term.lower())
+    if not runs:
+        return None
+    return max(runs, key=len)[:GRAM_SIZE]
+
+
+def _contains_any(value: str | None, needles: tuple[str, ...]) -> bool:
+    if not value:
+        return False
+    haystack = value.lower()
+    return any(needle in haystack for needle in needles)
+
+
+@dataclass(frozen=True)
+class CompiledSearch:
+    """Saved-search filters in a form that can be evaluated against one RFP."""
+
+    search_id: int
+    keywords: tuple[str, ...] = ()
+    agencies: tuple[str, ...] = ()
+    naics_codes: frozenset[str] = frozenset()
+    set_asides: frozenset[str] = frozenset()
+    statuses: frozenset[RFPStatus] = frozenset()
+    source_types: frozenset[str] = frozenset()
+    jurisdictions: frozenset[str] = frozenset()
+    currencies: frozenset[str] = frozenset()
+    contract_vehicles: frozenset[str] = frozenset()
+    min_value: int | None = None
+    max_value: int | None = None
+
+    @classmethod
+    def from_filters(cls, search_id: int, filters: dict | None) -> "CompiledSearch":
+        filters = filters or {}
+        min_value = filters.get("min_value")
+        max_value = filters.get("max_value")
+        return cls(
+            search_id=search_id,
+            keywords=tuple(k.lower() for k in normalize_filter_values(filters.get("keywords"))),
+            agencies=tuple(a.lower() for a in normalize_filter_values(filters.get("agencies"))),
+            naics_codes=frozenset(normalize_filter_values(filters.get("naics_codes"))),
+            set_asides=frozenset(normalize_filter_values(filters.get("set_asides"))),
+            statuses=frozenset(
+                RFPStatus(status)
+                for status in normalize_filter_values(filters.get("statuses"))
+                if status in RFPStatus._value2member_map_
+            ),
+            source_types=frozenset(normalize_filter_values(filters.get("source_types"))),
+            jurisdictions=frozenset(normalize_filter_values(filters.get("jurisdictions"))),
+            currencies=frozenset(
+                value.upper() for value in normalize_filter_values(filters.get("currencies"))
+            ),
+            contract_vehicles=frozenset(normalize_filter_values(filters.get("contract_vehicles"))),
+            min_value=int(min_value) if isinstance(min_value, (int, float)) else None,
+            max_value=int(max_value) if isinstance(max_value, (int, float)) else None,
+        )
+
+    def postings(self) -> list[tuple[str, str]] | None:
+        """Index keys for the anchor field; None when the search has no anchor."""
+        if self.naics_codes:
+            return [("naics", code) for code in self.naics_codes]
+        if self.set_asides:
+            return [("set_aside", value) for value in self.set_asides]
+        if self.contract_vehicles:
+            return [("contract_vehicle", value) for value in self.contract_vehicles]
+        if self.jurisdictions:
+            return [("jurisdiction", value) for value in self.jurisdictions]
+        for kind, terms in (("text", self.keywords), ("agency", self.agencies)):
+            grams = [_anchor_gram(term) for term in terms]
+            if grams and None not in grams:
+                return [(kind, gram) for gram in grams]
+        if self.source_types:
+            return [("source_type", value) for value in self.source_types]
+        if self.statuses:
+            return [("status", status.value) for status in self.statuses]
+        if self.currencies:
+            return [("currency", value) for value in self.currencies]
+        return None
+
+    def matches(self, rfp: RFP) -> bool:
+        if self.keywords and not any(
+            _contains_any(value, self.keywords)
+            for value in (rfp.title, rfp.description, rfp.summary, rfp.solicitation_number)
+        ):
+            return False
+        if self.agencies and not _contains_any(rfp.agency, self.agencies):
+            return False
+        if self.naics_codes and rfp.naics_code not in self.naics_codes:
+            return False
+        if self.set_asides and rfp.set_aside not in self.set_asides:
+            return False
+        if self.statuses and rfp.status not in self.statuses:
+            return False
+        if self.source_types and rfp.source_type not in self.source_types:
+            return False
+        if self.jurisdictions and rfp.jurisdiction not in self.jurisdictions:
+            return False
+        if self.currencies and rfp.currency not in self.currencies:
+            return False
+        if self.contract_vehicles and rfp.contract_vehicle not in self.contract_vehicles:
+            return False
+        if self.min_value is not None and (
+            rfp.estimated_value is None or rfp.estimated_value < self.min_value
+        ):
+            return False
+        return self.max_value is None or (
+            rfp.estimated_value is not None and rfp.estimated_value <= self.max_value
+        )
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+def _text_grams(values: Iterable[str | None], sizes: set[int], wanted: set[str]) -> set[str]:
+    found: set[str] = set()
+    for value in values:
+        if not value:
+            continue
+        text = value.lower()
+        for size in sizes:
+            for start in range(len(text) - size + 1):
+                gram = text[start : start + size]
+                if gram in wanted:
+                    found.add(gram)
+    return found
+
+
+@dataclass
+class PercolatorIndex:
+    """Inverted index over one user's compiled saved searches."""
+
+    searches: dict[int, CompiledSearch] = field(default_factory=dict)
+    postings: dict[tuple[str, str], set[int]] = field(default_factory=lambda: defaultdict(set))
+    unanchored: set[int] = field(default_factory=set)
+    # Registered grams (and their lengths) per gram field ("text", "agency")
+    grams: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    gram_sizes: dict[str, set[int]] = field(default_factory=lambda: defaultdict(set))
+
+    @classmethod
+    def build(cls, searches: Iterable[CompiledSearch]) -> "PercolatorIndex":
+        index = cls()
+        for search in searches:
+            index.searches[search.search_id] = search
+            keys = search.postings()
+            if keys is None:
+                index.unanchored.add(search.search_id)
+                continue
+            for kind, value in keys:
+                index.postings[(kind, value)].add(search.search_id)
+                if kind in ("text", "agency"):
+                    index.grams[kind].add(value)
+                    index.gram_sizes[kind].add(len(value))
+        return index
+
+    def candidates(self, rfp: RFP) -> set[int]:
+        ids = set(self.unanchored)
+        exact = (
+            ("naics", rfp.naics_code),
+            ("set_aside", rfp.set_aside),
+            ("contract_vehicle", rfp.contract_vehicle),
+            ("jurisdiction", rfp.jurisdiction),
+            ("source_type", rfp.source_type),
+            ("status", rfp.status.value if isinstance(rfp.status, RFPStatus) else rfp.status),
+            ("currency", rfp.currency),
+        )
+        for key in exact:
+            ids |= self.postings.get(key, set())
+
+        gram_fields = (
+            ("text", (rfp.title, rfp.description, rfp.summary, rfp.solicitation_number)),
+            ("agency", (rfp.agency,)),
+        )
+        for kind, values in gram_fields:
+            if kind in self.grams:
+                for gram in _text_grams(values, self.gram_sizes[kind], self.grams[kind]):
+                    ids |= self.postings[(kind, gram)]
+        return ids
+
+    def match(self, rfp: RFP) -> set[int]:
+        """Ids of the searches that ``rfp`` satisfies."""
+        return {
+            search_id for search_id in self.candidates(rfp) if self.searches[search_id].matches(rfp)
+        }
+
+
+# Compiled indexes per user, keyed by a version of the user's searches so
+# edits made by other processes are picked up.
+_index_cache: OrderedDict[int, tuple[tuple, PercolatorIndex]] = OrderedDict()
+
+
+def reset_percolator_cache() -> None:
+    _index_cache.clear()
+
+
+def _user_index(session: Session, user_id: int) -> PercolatorIndex:
+    version = tuple(
+        session.execute(
+            select(func.count(SavedSearch.id), func.max(SavedSearch.updated_at)).where(
+                SavedSearch.user_id == user_id
+            )
+        ).one()
+    )
+    cached = _index_cache.get(user_id)
+    if cached is not None and cached[0] == version:
+        _index_cache.move_to_end(user_id)
+        return cached[1]
+
+    rows = session.execute(
+        select(SavedSearch.id, SavedSearch.filters).where(SavedSearch.user_id == user_id)
+    ).all()
+    index = PercolatorIndex.build(
+        CompiledSearch.from_filters(search_id, filters) for search_id, filters in rows
+    )
+    _index_cache[user_id] = (version, index)
+    if len(_index_cache) > INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
+# =============================================================================
+# Recording matches
+# =============================================================================
+
+
+def _insert_matches_statement(session: Session | AsyncSession, rows: list[dict]):
+    return insert_ignoring_conflicts(
+        SavedSearchMatch.__table__,
+        session.get_bind().dialect.name,
+        _MATCH_CONFLICT_COLUMNS,
+    ).values(rows)
+
+
+def percolate_rfps(session: Session, rfps: Iterable[RFP]) -> int:
+    """
+    Bring the stored matches of ``rfps`` up to date in the session's
+    transaction. Returns the number of new matches.
+    """
+    by_user: dict[int, list[RFP]] = defaultdict(list)
+    for rfp in rfps:
+        if rfp.id is not None and rfp.user_id is not None:
+            by_user[rfp.user_id].append(rfp)
+
+    added = 0
+    for user_id, user_rfps in by_user.items():
+        index = _user_index(session, user_id)
+        rfp_ids = [rfp.id for rfp in user_rfps]
+        existing: dict[int, set[int]] = defaultdict(set)
+        if index.searches:
+            for search_id, rfp_id in session.execute(
+                select(SavedSearchMatch.saved_search_id, SavedSearchMatch.rfp_id).where(
+                    SavedSearchMatch.rfp_id.in_(rfp_ids)
+                )
+            ).all():
+                existing[rfp_id].add(search_id)
+        elif not session.execute(
+            select(SavedSearchMatch.id).where(SavedSearchMatch.rfp_id.in_(rfp_ids)).limit(1)
+        ).first():
+            continue
+
+        now = datetime.utcnow()
+        new_rows: list[dict] = []
+        for rfp in user_rfps:
+            matched = index.match(rfp)
+            stale = existing[rfp.id] - matched
+            if stale:
+                session.execute(
+                    delete(SavedSearchMatch).where(
+                        SavedSearchMatch.rfp_id == rfp.id,
+                        SavedSearchMatch.saved_search_id.in_(stale),
+                    )
+                )
+            new_rows.extend(
+                {
+                    "saved_search_id": search_id,
+                    "rfp_id": rfp.id,
+                    "user_id": user_id,
+                    "matched_at": now,
+                }
+                for search_id in sorted(matched - existing[rfp.id])
+            )
+        for start in range(0, len(new_rows), INSERT_BATCH_SIZE):
+            batch = new_rows[start : start + INSERT_BATCH_SIZE]
+            result = session.execute(_insert_matches_statement(session, batch))
+            added += max(result.rowcount, 0)
+    return added
+
+
+async def rebuild_search_matches(session: AsyncSession, search: SavedSearch) -> int:
+    """
+    Bring a search's stored matches in line with a full scan of the user's
+    RFPs. Returns the number of matching RFPs.
+
+    Rows that still match are left alone so their ``matched_at`` survives a
+    filter edit. Rows added by the scan are dated to the RFP's creation: the
+    RFPs were already there, so the digest should not report them as new.
+    """
+    query = apply_saved_search_filters(
+        select(RFP.id, RFP.created_at).where(RFP.user_id == search.user_id),
+        search.filters or {},
+    )
+    wanted = dict((await session.execute(query)).all())
+    existing = set(
+        (
+            await session.execute(
+                select(SavedSearchMatch.rfp_id).where(SavedSearchMatch.saved_search_id == search.id)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    stale = existing - wanted.keys()
+    if stale:
+        await session.execute(
+            delete(SavedSearchMatch).where(
+                SavedSearchMatch.saved_search_id == search.id,
+                SavedSearchMatch.rfp_id.in_(stale),
+            )
+        )
+    new_rows = [
+        {
+            "saved_search_id": search.id,
+            "rfp_id": rfp_id,
+            "user_id": search.user_id,
+            "matched_at": created_at or datetime.utcnow(),
+        }
+        for rfp_id, created_at in sorted(wanted.items())
+        if rfp_id not in existing
+    ]
+    for start in range(0, len(new_rows), INSERT_BATCH_SIZE):
+        await session.execute(
+            _insert_matches_statement(session, new_rows[start : start + INSERT_BATCH_SIZE])
+        )
+    search.matches_built_at = datetime.utcnow()
+    await session.flush()
+    return len(wanted)
+
+
+# =============================================================================
+# Session hooks
+# =============================================================================
+
+
+def _has_matched_changes(rfp: RFP) -> bool:
+    attrs = inspect(rfp).attrs
+    return any(attrs[name].history.has_changes() for name in MATCHED_RFP_FIELDS)
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    changed = [obj for obj in session.new if isinstance(obj, RFP)]
+    changed += [obj for obj in session.dirty if isinstance(obj, RFP) and _has_matched_changes(obj)]
+    if changed:
+        session.info.setdefault(_PENDING_RFPS_KEY, {}).update({id(obj): obj for obj in changed})
+
+
+def _before_commit(session: Session) -> None:
+    # Flush first so RFPs added since the last flush are collected as well.
+    session.flush()
+    pending = session.info.pop(_PENDING_RFPS_KEY, None)
+    if not pending:
+        return
+    rfps = [rfp for rfp in pending.values() if rfp in session]
+    if not rfps:
+        return
+    added = percolate_rfps(session, rfps)
+    if added:
+        logger.debug("Saved search matches recorded", rfps=len(rfps), matches=added)
+
+
+def _after_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_PENDING_RFPS_KEY, None)
+
+
+def install_saved_search_percolator() -> None:
+    """Register the hooks that percolate RFP writes (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "before_commit", _before_commit)
+    event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+    _installed = True
@@ -0,0 +1,324 @@
+"""
+RFP Sniper - Section Version Store
+==================================
+Delta-compressed storage for proposal section versions.
+
+Every ``KEYFRAME_INTERVAL`` versions (and whenever a delta would not be much
+smaller than the text itself) a version is stored in full; the rest store a
+forward delta against the previous version in ``diff_from_previous``. Reading
+a version follows ``base_version_number`` links back to a keyframe and replays
+the deltas forward. New version numbers are allocated under a row lock on
+the section, and (section_id, version_number) is unique, so concurrent saves
+cannot fork the chain. Recent
+reconstructions are kept in an in-process LRU so autosave-heavy sections do
+not replay the same chain repeatedly.
+
+Deltas are JSON lists over word/whitespace tokens: a positive int copies that
+many base tokens, a negative int skips them, and a string is inserted text.
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from difflib import SequenceMatcher, unified_diff
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
+
+from app.models.proposal import ProposalSection, SectionVersion
+
+KEYFRAME_INTERVAL = 20
+# Store a keyframe when the delta is at least this fraction of the full text.
+MAX_DELTA_RATIO = 0.5
+RECONSTRUCTION_CACHE_SIZE = 256
+
+STORAGE_FULL = "full"
+STORAGE_DELTA = "delta"
+
+_WORD_TOKEN_RE = re.compile(r"\s+|[^\s]+")
+
+_reconstruction_cache: OrderedDict[tuple[int, int, str], str] = OrderedDict()
+
+
+# =============================================================================
+# Tokenizing, deltas and diffs
+# =============================================================================
+
+
+def _tokens(text: str, granularity: str = "word") -> list[str]:
+    if granularity == "line":
+        return text.splitlines(keepends=True)
+    return _WORD_TOKEN_RE.findall(text)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compute_delta(base: str, target: str) -> list[int | str]:
+    """Encode ``target`` as copy/skip/insert operations over ``base`` tokens."""
+    base_tokens = _tokens(base)
+    target_tokens = _tokens(target)
+    matcher = SequenceMatcher(None, base_tokens, target_tokens, autojunk=False)
+    ops: list[int | str] = []
+    for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(a_end - a_start)
+            continue
+        if a_end > a_start:
+            ops.append(-(a_end - a_start))
+        if b_end > b_start:
+            ops.append("".join(target_tokens[b_start:b_end]))
+    return ops
+
+
+def apply_delta(base: str, delta: list[int | str]) -> str:
+    """Rebuild the target text from ``base`` and a delta from ``compute_delta``."""
+    base_tokens = _tokens(base)
+    position = 0
+    pieces: list[str] = []
+    for op in delta:
+        if isinstance(op, str):
+            pieces.append(op)
+        elif op >= 0:
+            pieces.extend(base_tokens[position : position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(pieces)
+
+
+def diff_hunks(before: str, after: str, granularity: str = "word") -> dict[str, Any]:
+    """Changed hunks between two texts, with character offsets into each."""
+    a_tokens = _tokens(before, granularity)
+    b_tokens = _tokens(after, granularity)
+    a_offsets = [0]
+    for token in a_tokens:
+        a_offsets.append(a_offsets[-1] + len(token))
+    b_offsets = [0]
+    for token in b_tokens:
+        b_offsets.append(b_offsets[-1] + len(token))
+
+    matcher = SequenceMatcher(None, a_tokens, b_tokens, autojunk=False)
+    hunks: list[dict[str, Any]] = []
+    stats = {"inserted_words": 0, "deleted_words": 0, "unchanged_words": 0}
+    for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+        removed = "".join(a_tokens[a_start:a_end])
+        added = "".join(b_tokens[b_start:b_end])
+        if tag == "equal":
+            stats["unchanged_words"] += len(removed.split())
+            continue
+        stats["deleted_words"] += len(removed.split())
+        stats["inserted_words"] += len(added.split())
+        hunks.append(
+            {
+                "op": tag,
+                "a_start": a_offsets[a_start],
+                "a_end": a_offsets[a_end],
+                "b_start": b_offsets[b_start],
+                "b_end": b_offsets[b_end],
+                "removed": removed,
+                "added": added,
+            }
+        )
+    return {"granularity": granularity, "hunks": hunks, "stats": stats}
+
+
+def readable_diff(before: str, after: str, before_label: str, after_label: str) -> str:
+    """Line-based unified diff for display; empty when the texts match."""
+    return "".join(
+        unified_diff(
+            before.splitlines(keepends=True),
+            after.splitlines(keepends=True),
+            fromfile=before_label,
+            tofile=after_label,
+        )
+    )
+
+
+# =============================================================================
+# Reconstruction cache
+# =============================================================================
+
+
+def _cache_key(version: SectionVersion) -> tuple[int, int, str]:
+    return (version.section_id, version.version_number, version.content_hash or "")
+
+
+def _cache_get(version: SectionVersion) -> str | None:
+    if not version.content_hash:
+        return None
+    key = _cache_key(version)
+    content = _reconstruction_cache.get(key)
+    if content is not None:
+        _reconstruction_cache.move_to_end(key)
+    return content
+
+
+def _cache_put(version: SectionVersion, content: str) -> None:
+    if not version.content_hash:
+        return
+    _reconstruction_cache[_cache_key(version)] = content
+    _reconstruction_cache.move_to_end(_cache_key(version))
+    while len(_reconstruction_cache) > RECONSTRUCTION_CACHE_SIZE:
+        _reconstruction_cache.popitem(last=False)
+
+
+def clear_reconstruction_cache() -> None:
+    _reconstruction_cache.clear()
+
+
+# =============================================================================
+# Reading and writing versions
+# =============================================================================
+
+
+async def load_version_contents(
+    session: AsyncSession,
+    section_id: int,
+    versions: list[SectionVersion],
+) -> dict[int, str]:
+    """Reconstruct the content of each version, keyed by version number."""
+    contents: dict[int, str] = {}
+    missing: list[SectionVersion] = []
+    for version in versions:
+        if version.storage_kind != STORAGE_DELTA:
+            contents[version.version_number] = version.content or ""
+            continue
+        cached = _cache_get(version)
+        if cached is not None:
+            contents[version.version_number] = cached
+        else:
+            missing.append(version)
+    if not missing:
+        return contents
+
+    highest = max(v.version_number for v in missing)
+    lowest = min(v.version_number for v in missing)
+    keyframe_result = await session.execute(
+        select(func.max(SectionVersion.version_number)).where(
+            SectionVersion.section_id == section_id,
+            SectionVersion.storage_kind == STORAGE_FULL,
+            SectionVersion.version_number <= lowest,
+        )
+    )
+    keyframe = keyframe_result.scalar() or 1
+
+    chain_result = await session.execute(
+        select(SectionVersion).where(
+            SectionVersion.section_id == section_id,
+            SectionVersion.version_number >= keyframe,
+            SectionVersion.version_number <= highest,
+        )
+    )
+    by_number = {version.version_number: version for version in chain_result.scalars().all()}
+    for version in missing:
+        contents[version.version_number] = await _rebuild(session, version, by_number)
+    return contents
+
+
+async def _rebuild(
+    session: AsyncSession,
+    version: SectionVersion,
+    by_number: dict[int, SectionVersion],
+) -> str:
+    """Walk base links back to a keyframe or cached text, then replay deltas forward."""
+    pending: list[SectionVersion] = []
+    node = version
+    while True:
+        if node.storage_kind != STORAGE_DELTA:
+            current = node.content or ""
+            break
+        cached = _cache_get(node)
+        if cached is not None:
+            current = cached
+            break
+        pending.append(node)
+        base_number = node.base_version_number
+        if base_number is None:
+            base_number = node.version_number - 1
+        base = by_number.get(base_number)
+        if base is None:
+            base = (
+                await session.execute(
+                    select(SectionVersion).where(
+                        SectionVersion.section_id == node.section_id,
+                        SectionVersion.version_number == base_number,
+                    )
+                )
+            ).scalar_one()
+            by_number[base_number] = base
+        node = base
+
+    for node in reversed(pending):
+        current = apply_delta(current, json.loads(node.diff_from_previous or "[]"))
+        _cache_put(node, current)
+    return current
+
+
+async def load_version_content(session: AsyncSession, version: SectionVersion) -> str:
+    contents = await load_version_contents(session, version.section_id, [version])
+    return contents[version.version_number]
+
+
+async def add_section_version(
+    session: AsyncSession,
+    *,
+    section_id: int,
+    user_id: int,
+    content: str,
+    change_type: str,
+    change_summary: str | None = None,
+    word_count: int | None = None,
+) -> SectionVersion:
+    """
+    Append a version, stored as a keyframe or a delta from the previous one.
+
+    The section row is locked for the rest of the transaction so concurrent
+    saves take consecutive version numbers instead of both deltaing against
+    the same predecessor.
+    """
+    await session.execute(
+        select(ProposalSection.id).where(ProposalSection.id == section_id).with_for_update()
+    )
+    previous = (
+        await session.execute(
+            select(SectionVersion)
+            .where(SectionVersion.section_id == section_id)
+            .order_by(SectionVersion.version_number.desc())
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    version_number = (previous.version_number if previous else 0) + 1
+
+    version = SectionVersion(
+        section_id=section_id,
+        user_id=user_id,
+        version_number=version_number,
+        word_count=len(content.split()) if word_count is None else word_count,
+        change_type=change_type,
+        change_summary=change_summary,
+        content_hash=content_hash(content),
+    )
+
+    delta_text: str | None = None
+    if previous is not None and (version_number - 1) % KEYFRAME_INTERVAL != 0:
+        previous_content = await load_version_content(session, previous)
+        delta_text = json.dumps(compute_delta(previous_content, content), separators=(",", ":"))
+        if len(delta_text) >= MAX_DELTA_RATIO * max(len(content), 1):
+            delta_text = None
+
+    if delta_text is None:
+        version.storage_kind = STORAGE_FULL
+        version.content = content
+    else:
+        version.storage_kind = STORAGE_DELTA
+        version.content = None
+        version.diff_from_previous = delta_text
+        version.base_version_number = previous.version_number
+
+    session.add(version)
+    _cache_put(version, content)
+    return version
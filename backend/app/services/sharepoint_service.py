@@ -4,6 +4,12 @@ RFP Sniper - SharePoint Integration Service
 Microsoft Graph API client for SharePoint file operations.
 Requires IntegrationConfig with provider=sharepoint and config containing:
   tenant_id, client_id, client_secret, site_id, drive_id
+
+Files larger than Graph's 4 MB simple-upload limit go through an upload
+session in 320 KiB-aligned chunks. Folder watching uses drive delta queries:
+SharePoint only supports delta on the drive root, so changes are filtered to
+the watched folder by their parent item id (delta items carry no
+``parentReference.path``).
 """
 
 import logging
@@ -14,6 +20,21 @@ logger = logging.getLogger(__name__)
 
 GRAPH_BASE = "https://graph.microsoft.com/v1.0"
 
+SIMPLE_UPLOAD_MAX_BYTES = 4 * 1024 * 1024
+# Upload session chunks must be a multiple of 320 KiB.
+UPLOAD_CHUNK_BYTES = 10 * 320 * 1024
+
+
+def _item_summary(item: dict) -> dict:
+    return {
+        "id": item["id"],
+        "name": item["name"],
+        "is_folder": "folder" in item,
+        "size": item.get("size", 0),
+        "last_modified": item.get("lastModifiedDateTime"),
+        "web_url": item.get("webUrl"),
+    }
+
 
 class SharePointService:
     """Thin wrapper around Microsoft Graph API for SharePoint file operations."""
@@ -69,17 +90,7 @@ class SharePointService:
             resp = await client.get(url, headers=self._headers(token))
             resp.raise_for_status()
             items = resp.json().get("value", [])
-            return [
-                {
-                    "id": item["id"],
-                    "name": item["name"],
-                    "is_folder": "folder" in item,
-                    "size": item.get("size", 0),
-                    "last_modified": item.get("lastModifiedDateTime"),
-                    "web_url": item.get("webUrl"),
-                }
-                for item in items
-            ]
+            return [_item_summary(item) for item in items]
 
     async def download_file(self, file_id: str) -> bytes:
         """Download a file by its Drive item ID."""
@@ -91,7 +102,10 @@ class SharePointService:
             return resp.content
 
     async def upload_file(self, folder_path: str, name: str, content: bytes) -> dict:
-        """Upload a file to a specific folder."""
+        """Upload a file to a specific folder, using an upload session when large."""
+        if len(content) > SIMPLE_UPLOAD_MAX_BYTES:
+            return await self._upload_file_in_chunks(folder_path, name, content)
+
         token = await self._get_token()
         path = f"{folder_path.strip('/')}/{name}"
         url = f"{GRAPH_BASE}/drives/{self.drive_id}/root:/{path}:/content"
@@ -99,13 +113,97 @@ class SharePointService:
         async with httpx.AsyncClient() as client:
             resp = await client.put(url, headers=headers, content=content)
             resp.raise_for_status()
-            data = resp.json()
-            return {
-                "id": data["id"],
-                "name": data["name"],
-                "web_url": data.get("webUrl"),
-                "size": data.get("size", 0),
-            }
+            return self._upload_summary(resp.json())
+
+    async def _upload_file_in_chunks(
+        self,
+        folder_path: str,
+        name: str,
+        content: bytes,
+        chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+    ) -> dict:
+        """Upload through a Graph upload session, replacing any existing file."""
+        token = await self._get_token()
+        path = f"{folder_path.strip('/')}/{name}"
+        url = f"{GRAPH_BASE}/drives/{self.drive_id}/root:/{path}:/createUploadSession"
+        body = {"item": {"@microsoft.graph.conflictBehavior": "replace"}}
+        total = len(content)
+        async with httpx.AsyncClient() as client:
+            resp = await client.post(url, headers=self._headers(token), json=body)
+            resp.raise_for_status()
+            upload_url = resp.json()["uploadUrl"]
+
+            try:
+                data: dict = {}
+                for start in range(0, total, chunk_bytes):
+                    chunk = content[start : start + chunk_bytes]
+                    end = start + len(chunk) - 1
+                    # The pre-authenticated upload URL rejects an Authorization header.
+                    resp = await client.put(
+                        upload_url,
+                        headers={
+                            "Content-Length": str(len(chunk)),
+                            "Content-Range": f"bytes {start}-{end}/{total}",
+                        },
+                        content=chunk,
+                        timeout=120.0,
+                    )
+                    resp.raise_for_status()
+                    data = resp.json()
+            except Exception:
+                try:
+                    await client.delete(upload_url)
+                except httpx.HTTPError:
+                    pass
+                raise
+            return self._upload_summary(data)
+
+    @staticmethod
+    def _upload_summary(data: dict) -> dict:
+        return {
+            "id": data["id"],
+            "name": data["name"],
+            "web_url": data.get("webUrl"),
+            "size": data.get("size", 0),
+        }
+
+    async def get_folder_changes(self, folder_path: str, delta_link: str | None = None) -> dict:
+        """
+        Files in ``folder_path`` created or changed since ``delta_link``.
+
+        Without a delta link the whole drive is enumerated once to establish the
+        baseline. Returns ``{"items": [...], "delta_link": str}``; pass the new
+        delta link on the next call. An expired delta link (HTTP 410) restarts
+        from a fresh enumeration.
+        """
+        token = await self._get_token()
+        url = delta_link or f"{GRAPH_BASE}/drives/{self.drive_id}/root/delta"
+        folder = folder_path.strip("/")
+        folder_url = f"{GRAPH_BASE}/drives/{self.drive_id}/" + (
+            f"root:/{folder}" if folder else "root"
+        )
+        items: list[dict] = []
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(folder_url, headers=self._headers(token))
+            resp.raise_for_status()
+            folder_id = resp.json()["id"]
+            while True:
+                resp = await client.get(url, headers=self._headers(token))
+                if resp.status_code == 410 and delta_link:
+                    logger.info("SharePoint delta link expired; re-enumerating drive")
+                    return await self.get_folder_changes(folder_path)
+                resp.raise_for_status()
+                page = resp.json()
+                for item in page.get("value", []):
+                    parent_id = item.get("parentReference", {}).get("id")
+                    if "deleted" in item or parent_id != folder_id:
+                        continue
+                    items.append(_item_summary(item))
+                next_link = page.get("@odata.nextLink")
+                if next_link:
+                    url = next_link
+                    continue
+                return {"items": items, "delta_link": page["@odata.deltaLink"]}
 
     async def get_file_versions(self, file_id: str) -> list[dict]:
         """Get version history for a file."""
@@ -7,13 +7,16 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-import feedparser
 import structlog
 
+from app.lazy_imports import lazy_module
 from app.models.market_signal import SignalType
+from app.services.keyword_scanner import get_keyword_scanner
 
 logger = structlog.get_logger(__name__)
 
+feedparser = lazy_module("feedparser")
+
 
 # ---------------------------------------------------------------------------
 # RSS Feed Registry — government procurement news/award/budget feeds
@@ -87,25 +90,25 @@ def score_relevance(
     Returns 0.0–1.0 relevance score.
     """
     score = 0.0
-    combined = f"{entry.get('title', '')} {entry.get('content', '')}".lower()
+    combined = f"{entry.get('title', '')} {entry.get('content', '')}"
     entry_agency = (entry.get("agency") or "").lower()
+    hits = get_keyword_scanner(
+        {"agency": agencies, "keyword": keywords, "naics": naics_codes}
+    ).scan(combined)
 
     # Agency match (high signal)
-    for agency in agencies:
-        if agency.lower() in combined or agency.lower() == entry_agency:
-            score += 0.4
-            break
+    if hits.matched("agency") or any(agency.lower() == entry_agency for agency in agencies):
+        score += 0.4
 
     # Keyword match
-    kw_hits = sum(1 for kw in keywords if kw.lower() in combined)
+    found = hits.keywords_found("keyword")
+    kw_hits = sum(1 for kw in keywords if kw.lower() in found)
     if keywords:
         score += min(0.4, kw_hits * 0.15)
 
     # NAICS match
-    for code in naics_codes:
-        if code in combined:
-            score += 0.2
-            break
+    if hits.matched("naics"):
+        score += 0.2
 
     return min(1.0, score)
 
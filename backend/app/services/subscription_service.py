@@ -6,7 +6,6 @@ Plan definitions, feature access checks, usage stats, and Stripe integration.
 
 from datetime import UTC, datetime, timedelta
 
-import stripe
 import structlog
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -14,11 +13,14 @@ from sqlmodel import func, select
 
 from app.api.deps import FEATURE_GATES, TIER_LEVELS
 from app.config import get_settings
+from app.lazy_imports import lazy_module
 from app.models.proposal import Proposal
 from app.models.rfp import RFP
 from app.models.user import User, UserTier
 
 logger = structlog.get_logger(__name__)
+
+stripe = lazy_module("stripe")
 settings = get_settings()
 
 
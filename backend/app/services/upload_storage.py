@@ -0,0 +1,99 @@
+"""
+RFP Sniper - Upload Storage
+===========================
+Streams uploaded files to disk without holding them in memory.
+
+``save_upload`` copies an ``UploadFile`` to a ``.partial`` file in fixed-size
+chunks. It hashes each chunk as it goes and stops once the size limit is
+exceeded. Writes and hashing run in a worker thread, so a large upload does
+not stall the event loop. The partial file is renamed into place only after
+the whole upload has been written, and is removed if the copy fails.
+
+The SHA-256 of the content lets callers spot an upload that is byte-identical
+to one already stored and reuse the stored file and its processed results.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload exceeded the configured size limit while streaming."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Upload exceeds {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: str
+    size_bytes: int
+    sha256: str
+
+
+def safe_upload_filename(filename: str | None) -> str:
+    """Client filename without directory components."""
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name or "upload"
+
+
+def _write_chunk(handle: BinaryIO, digest: "hashlib._Hash", chunk: bytes) -> None:
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+async def save_upload(
+    upload: UploadFile,
+    directory: str,
+    filename: str,
+    *,
+    max_bytes: int,
+    chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+) -> StoredUpload:
+    """
+    Stream ``upload`` to ``directory/filename``.
+
+    Raises UploadTooLargeError as soon as more than ``max_bytes`` have been
+    read; nothing is left on disk in that case.
+    """
+    final_path = os.path.join(directory, filename)
+    fd, partial_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".partial")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while chunk := await upload.read(chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                await asyncio.to_thread(_write_chunk, handle, digest, chunk)
+        await asyncio.to_thread(os.replace, partial_path, final_path)
+    except BaseException:
+        try:
+            os.remove(partial_path)
+        except OSError:
+            pass
+        raise
+    return StoredUpload(path=final_path, size_bytes=size, sha256=digest.hexdigest())
+
+
+async def remove_file(path: str) -> None:
+    """Delete a stored file, ignoring files that are already gone."""
+    try:
+        await asyncio.to_thread(os.remove, path)
+    except FileNotFoundError:
+        pass
+
+
+async def read_file(path: str) -> bytes:
+    return await asyncio.to_thread(Path(path).read_bytes)
@@ -1,13 +1,32 @@
 """
 RFP Sniper - Webhook Service
 ============================
-Dispatch webhook events and store delivery logs.
+Queue webhook events in an outbox and deliver them from a worker.
+
+``dispatch_webhook_event`` only writes pending ``WebhookDelivery`` rows in the
+caller's transaction, so API latency never depends on subscriber endpoints.
+Once that transaction commits a delivery task is queued (bursts of commits
+coalesce into one run), and a periodic sweep picks up anything missed.
+
+The worker claims due rows, fans out across endpoints concurrently and
+retries failures with exponential backoff. Each endpoint's events are sent in
+order: a row is only claimed once no earlier row for its endpoint is waiting,
+and the first failure defers the rest of that endpoint's batch. A per-endpoint
+circuit breaker opens after repeated failures.
 """
 
-from datetime import datetime
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any
 
 import httpx
+import structlog
+from sqlalchemy import case, event, exists, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
 from sqlmodel import select
 
 from app.config import settings
@@ -17,6 +36,23 @@ from app.models.webhook import (
     WebhookSubscription,
 )
 
+logger = structlog.get_logger(__name__)
+
+RESPONSE_BODY_MAX_CHARS = 2000
+# Claimed rows are hidden from other workers for this long.
+CLAIM_LEASE_SECONDS = 300
+MAX_RETRY_DELAY_SECONDS = 3600
+KICK_COALESCE_SECONDS = 1.0
+
+_OUTBOX_PENDING_KEY = "webhook_outbox_pending"
+_installed = False
+_last_kick = 0.0
+
+
+# =============================================================================
+# Producing events
+# =============================================================================
+
 
 async def dispatch_webhook_event(
     session: AsyncSession,
@@ -26,8 +62,11 @@ async def dispatch_webhook_event(
     payload: dict,
 ) -> list[WebhookDelivery]:
     """
-    Dispatch a webhook event to all matching subscriptions.
-    Always records a delivery entry.
+    Record a webhook event for all matching subscriptions.
+
+    Deliveries are written as pending outbox rows in the caller's transaction
+    and sent after it commits. With delivery disabled they are recorded as
+    skipped.
     """
     result = await session.execute(
         select(WebhookSubscription).where(
@@ -48,39 +87,313 @@ async def dispatch_webhook_event(
             payload=payload,
             status=WebhookDeliveryStatus.PENDING,
         )
-        session.add(delivery)
-        await session.flush()
-
         if not settings.webhook_delivery_enabled:
             delivery.status = WebhookDeliveryStatus.SKIPPED
             delivery.delivered_at = datetime.utcnow()
-            deliveries.append(delivery)
-            continue
+        session.add(delivery)
+        deliveries.append(delivery)
+
+    if deliveries:
+        await session.flush()
+        if settings.webhook_delivery_enabled:
+            session.info[_OUTBOX_PENDING_KEY] = True
+
+    return deliveries
+
+
+def schedule_webhook_delivery() -> None:
+    """Queue a delivery run, coalescing bursts of commits into one task."""
+    global _last_kick
+    now = time.monotonic()
+    if now - _last_kick < KICK_COALESCE_SECONDS:
+        return
+    _last_kick = now
 
+    def _publish() -> None:
         try:
-            headers = {
-                "Content-Type": "application/json",
-                "X-Webhook-Event": event_type,
-            }
-            if subscription.secret:
-                headers["X-Webhook-Secret"] = subscription.secret
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(subscription.target_url, json=payload, headers=headers)
-
-            delivery.response_code = response.status_code
-            delivery.response_body = response.text
-            delivery.delivered_at = datetime.utcnow()
+            from app.tasks.webhook_tasks import deliver_webhooks
 
-            if 200 <= response.status_code < 300:
-                delivery.status = WebhookDeliveryStatus.DELIVERED
-            else:
-                delivery.status = WebhookDeliveryStatus.FAILED
+            deliver_webhooks.apply_async(countdown=KICK_COALESCE_SECONDS, retry=False)
         except Exception as exc:
+            logger.warning("Webhook delivery task not queued", error=str(exc))
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _publish()
+        return
+    # Publishing talks to the broker synchronously; keep it off the loop.
+    loop.run_in_executor(None, _publish)
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_OUTBOX_PENDING_KEY, False):
+        schedule_webhook_delivery()
+
+
+def _after_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_OUTBOX_PENDING_KEY, None)
+
+
+def install_webhook_outbox() -> None:
+    """Register the commit hook that queues delivery runs (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_soft_rollback)
+    _installed = True
+
+
+# =============================================================================
+# Delivering events
+# =============================================================================
+
+
+def _truncate(text: str | None) -> str | None:
+    if text is None or len(text) <= RESPONSE_BODY_MAX_CHARS:
+        return text
+    return text[:RESPONSE_BODY_MAX_CHARS] + "…[truncated]"
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (1-based) attempt."""
+    delay = min(settings.webhook_retry_base_seconds * 2 ** (attempt - 1), MAX_RETRY_DELAY_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def _claim_due_deliveries(
+    session: AsyncSession, now: datetime, limit: int
+) -> list[WebhookDelivery]:
+    # An earlier row for the same endpoint that is in flight or backing off
+    # holds back everything queued after it.
+    earlier = aliased(WebhookDelivery)
+    blocked = exists().where(
+        earlier.subscription_id == WebhookDelivery.subscription_id,
+        earlier.id < WebhookDelivery.id,
+        earlier.status == WebhookDeliveryStatus.PENDING,
+        earlier.next_attempt_at > now,
+    )
+    stmt = (
+        select(WebhookDelivery)
+        .where(
+            WebhookDelivery.status == WebhookDeliveryStatus.PENDING,
+            or_(
+                WebhookDelivery.next_attempt_at.is_(None),
+                WebhookDelivery.next_attempt_at <= now,
+            ),
+            ~blocked,
+        )
+        .order_by(WebhookDelivery.id)
+        .limit(limit)
+    )
+    if session.get_bind().dialect.name != "sqlite":
+        stmt = stmt.with_for_update(skip_locked=True)
+    deliveries = list((await session.execute(stmt)).scalars().all())
+    lease_until = now + timedelta(seconds=CLAIM_LEASE_SECONDS)
+    claimed: list[WebhookDelivery] = []
+    for delivery in deliveries:
+        if delivery.attempt_count >= settings.webhook_max_attempts:
+            # Claimed as often as allowed without recording an outcome
+            # (e.g. the worker died mid-send); stop re-claiming it.
             delivery.status = WebhookDeliveryStatus.FAILED
-            delivery.response_body = str(exc)
+            delivery.delivered_at = now
+            delivery.next_attempt_at = None
+            continue
+        # Counted at claim time so a crash mid-send still uses up an attempt.
+        delivery.attempt_count += 1
+        delivery.next_attempt_at = lease_until
+        claimed.append(delivery)
+    return claimed
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    subscription: WebhookSubscription,
+    delivery: WebhookDelivery,
+) -> bool:
+    headers = {
+        "Content-Type": "application/json",
+        "X-Webhook-Event": delivery.event_type,
+        "X-Webhook-Delivery": str(delivery.id),
+    }
+    if subscription.secret:
+        headers["X-Webhook-Secret"] = subscription.secret
+
+    try:
+        response = await client.post(
+            subscription.target_url, json=delivery.payload, headers=headers
+        )
+    except Exception as exc:
+        delivery.response_code = None
+        delivery.response_body = _truncate(str(exc))
+        return False
+    delivery.response_code = response.status_code
+    delivery.response_body = _truncate(response.text)
+    return 200 <= response.status_code < 300
+
+
+def _record_success(delivery: WebhookDelivery) -> None:
+    delivery.status = WebhookDeliveryStatus.DELIVERED
+    delivery.delivered_at = datetime.utcnow()
+    delivery.next_attempt_at = None
+
+
+def _record_failure(delivery: WebhookDelivery) -> None:
+    now = datetime.utcnow()
+    if delivery.attempt_count >= settings.webhook_max_attempts:
+        delivery.status = WebhookDeliveryStatus.FAILED
+        delivery.delivered_at = now
+        delivery.next_attempt_at = None
+    else:
+        delivery.next_attempt_at = now + timedelta(
+            seconds=retry_delay_seconds(delivery.attempt_count)
+        )
+
+
+def _defer(deliveries: list[WebhookDelivery], until: datetime) -> None:
+    """Push rows back without spending the attempt charged at claim time."""
+    for delivery in deliveries:
+        delivery.attempt_count -= 1
+        delivery.next_attempt_at = until
+
+
+async def _deliver_to_endpoint(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    subscription: WebhookSubscription | None,
+    deliveries: list[WebhookDelivery],
+    stats: dict[str, int],
+    outcomes: dict[int, tuple[bool, int]],
+) -> None:
+    if subscription is None or not subscription.is_active:
+        for delivery in deliveries:
+            delivery.status = WebhookDeliveryStatus.SKIPPED
             delivery.delivered_at = datetime.utcnow()
+            delivery.next_attempt_at = None
+            stats["skipped"] += 1
+        return
 
-        deliveries.append(delivery)
+    open_until = subscription.circuit_open_until
+    if open_until and open_until > datetime.utcnow():
+        _defer(deliveries, open_until)
+        stats["deferred"] += len(deliveries)
+        return
 
-    return deliveries
+    # (streak reset by a success, failures since the last success)
+    succeeded, failures = False, 0
+    async with semaphore:
+        for index, delivery in enumerate(deliveries):
+            if await _send(client, subscription, delivery):
+                _record_success(delivery)
+                stats["delivered"] += 1
+                succeeded, failures = True, 0
+                continue
+
+            _record_failure(delivery)
+            failures += 1
+            if delivery.status == WebhookDeliveryStatus.FAILED:
+                stats["failed"] += 1
+                continue
+            stats["retrying"] += 1
+            # Later events wait for this one so the endpoint sees them in order.
+            _defer(deliveries[index + 1 :], delivery.next_attempt_at)
+            stats["deferred"] += len(deliveries) - index - 1
+            break
+    outcomes[subscription.id] = (succeeded, failures)
+
+
+async def _apply_breaker_outcomes(
+    session: AsyncSession, outcomes: dict[int, tuple[bool, int]], now: datetime
+) -> None:
+    """
+    Update each endpoint's failure streak in SQL so concurrent workers add to
+    it rather than overwrite each other's counts.
+    """
+    threshold = settings.webhook_circuit_failure_threshold
+    open_until = now + timedelta(seconds=settings.webhook_circuit_cooldown_seconds)
+    for subscription_id, (succeeded, failures) in outcomes.items():
+        if not succeeded and not failures:
+            continue
+        base = 0 if succeeded else WebhookSubscription.consecutive_failures
+        streak = base + failures
+        current_open = None if succeeded else WebhookSubscription.circuit_open_until
+        stmt = (
+            update(WebhookSubscription)
+            .where(WebhookSubscription.id == subscription_id)
+            .values(
+                consecutive_failures=streak,
+                circuit_open_until=case((streak >= threshold, open_until), else_=current_open)
+                if failures
+                else None,
+            )
+            .returning(WebhookSubscription.consecutive_failures)
+            .execution_options(synchronize_session=False)
+        )
+        new_streak = (await session.execute(stmt)).scalar()
+        if failures and new_streak is not None and new_streak >= threshold:
+            logger.warning(
+                "Webhook circuit opened",
+                subscription_id=subscription_id,
+                failures=new_streak,
+            )
+
+
+async def deliver_pending_webhooks(
+    session: AsyncSession,
+    *,
+    limit: int | None = None,
+) -> dict[str, int]:
+    """
+    Deliver due outbox rows and record the outcomes.
+
+    Rows are claimed (and committed) before any HTTP call so concurrent
+    workers never send the same delivery twice within the claim lease.
+    """
+    now = datetime.utcnow()
+    deliveries = await _claim_due_deliveries(
+        session, now, limit or settings.webhook_delivery_batch_size
+    )
+    stats = {
+        "claimed": len(deliveries),
+        "delivered": 0,
+        "retrying": 0,
+        "failed": 0,
+        "deferred": 0,
+        "skipped": 0,
+    }
+    if not deliveries:
+        await session.commit()
+        return stats
+
+    subscription_ids = {delivery.subscription_id for delivery in deliveries}
+    result = await session.execute(
+        select(WebhookSubscription).where(WebhookSubscription.id.in_(subscription_ids))
+    )
+    subscriptions = {subscription.id: subscription for subscription in result.scalars().all()}
+    await session.commit()
+
+    by_subscription: dict[int, list[WebhookDelivery]] = defaultdict(list)
+    for delivery in deliveries:
+        by_subscription[delivery.subscription_id].append(delivery)
+
+    outcomes: dict[int, tuple[bool, int]] = {}
+    concurrency = settings.webhook_delivery_concurrency
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(
+        timeout=settings.webhook_delivery_timeout_seconds,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        await asyncio.gather(
+            *(
+                _deliver_to_endpoint(
+                    client, semaphore, subscriptions.get(subscription_id), batch, stats, outcomes
+                )
+                for subscription_id, batch in by_subscription.items()
+            )
+        )
+
+    await _apply_breaker_outcomes(session, outcomes, datetime.utcnow())
+    await session.commit()
+    return stats
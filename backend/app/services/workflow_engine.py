@@ -8,8 +8,8 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.api.routes.notifications import Notification, NotificationType
 from app.models.capture import CapturePlan, TeamingPartner
+from app.models.notification import Notification, NotificationType
 from app.models.rfp import RFP
 from app.models.workflow import ExecutionStatus, TriggerType, WorkflowExecution, WorkflowRule
 
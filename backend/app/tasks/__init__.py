@@ -2,12 +2,20 @@
 RFP Sniper - Celery Tasks
 ==========================
 Async task queue for long-running operations.
+
+Exports resolve on first access so a worker only imports the task modules of
+its queues (see ``app.tasks.celery_app``).
 """
 
-from app.tasks.analysis_tasks import analyze_rfp, run_killer_filter
-from app.tasks.celery_app import celery_app
-from app.tasks.generation_tasks import generate_proposal_section
-from app.tasks.ingest_tasks import ingest_sam_opportunities
+import importlib
+
+_EXPORTS = {
+    "celery_app": "app.tasks.celery_app",
+    "ingest_sam_opportunities": "app.tasks.ingest_tasks",
+    "analyze_rfp": "app.tasks.analysis_tasks",
+    "run_killer_filter": "app.tasks.analysis_tasks",
+    "generate_proposal_section": "app.tasks.generation_tasks",
+}
 
 __all__ = [
     "celery_app",
@@ -16,3 +24,10 @@ __all__ = [
     "run_killer_filter",
     "generate_proposal_section",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
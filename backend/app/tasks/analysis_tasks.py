@@ -4,7 +4,6 @@ RFP Sniper - Analysis Tasks
 Celery tasks for RFP analysis using Gemini AI.
 """
 
-import asyncio
 from datetime import datetime
 
 import structlog
@@ -12,23 +11,15 @@ import structlog
 from app.database import get_celery_session_context
 from app.models.rfp import RFP, ComplianceMatrix, RFPStatus
 from app.models.user import UserProfile
+from app.services.context_cache_manager import ContextCacheManager
 from app.services.filters import KillerFilterService
 from app.services.gemini_service import GeminiService
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
 
-def run_async(coro):
-    """Helper to run async code in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @celery_app.task(
     bind=True,
     name="app.tasks.analysis_tasks.analyze_rfp",
@@ -235,17 +226,19 @@ def run_killer_filter(
 @celery_app.task(name="app.tasks.analysis_tasks.cleanup_expired_caches")
 def cleanup_expired_caches():
     """
-    Clean up expired Gemini context caches.
+    Clean up expired, stale and orphaned Gemini context caches.
     Runs via Celery Beat schedule.
     """
     logger.info("Cleaning up expired context caches")
 
     async def _cleanup():
-        async with get_session_context() as session:
+        async with get_celery_session_context() as session:
             from sqlmodel import select
 
             from app.models.knowledge_base import KnowledgeBaseDocument
 
+            removed = await ContextCacheManager(GeminiService()).cleanup(session)
+
             # Find documents with expired caches
             now = datetime.utcnow()
             result = await session.execute(
@@ -264,6 +257,21 @@ def cleanup_expired_caches():
             if expired_docs:
                 await session.commit()
 
-            return {"cleaned": len(expired_docs)}
+            return {"cleaned": len(expired_docs), **removed}
 
     return run_async(_cleanup())
+
+
+@celery_app.task(name="app.tasks.analysis_tasks.refresh_expiring_caches")
+def refresh_expiring_caches():
+    """
+    Extend recently used Gemini context caches before they expire.
+    Runs via Celery Beat schedule.
+    """
+
+    async def _refresh():
+        async with get_celery_session_context() as session:
+            refreshed = await ContextCacheManager(GeminiService()).refresh_expiring(session)
+            return {"refreshed": refreshed}
+
+    return run_async(_refresh())
@@ -3,29 +3,81 @@ RFP Sniper - Celery Application Configuration
 ==============================================
 """
 
+import contextlib
+
 import structlog
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import before_task_publish, task_postrun, task_prerun
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
 from kombu import Queue
 
 from app.config import settings
+from app.observability.profiling import (
+    TASK_PROFILE_HEADER,
+    finish_task_profile,
+    install_instrumentation,
+    profile_header_for_publish,
+    start_task_profile,
+)
+from app.services.cache_tags import install_cache_invalidation
+from app.services.llm_gateway import (
+    LLM_PRIORITY_HEADER,
+    LLMPriority,
+    bind_llm_tenant,
+    reset_llm_context,
+    user_tenant,
+)
+from app.services.saved_search_percolator import install_saved_search_percolator
+from app.services.webhook_service import install_webhook_outbox
+
+# Task modules per queue, including modules whose beat entries are sent to
+# that queue. A worker started with CELERY_WORKER_QUEUES only imports the
+# modules of its queues, so e.g. a webhooks worker never loads the AI/PDF stack.
+TASK_MODULES_BY_QUEUE: dict[str, tuple[str, ...]] = {
+    "celery": (
+        "app.tasks.maintenance_tasks",
+        "app.tasks.sharepoint_sync_tasks",
+        "app.tasks.email_ingest_tasks",
+        "app.tasks.signal_tasks",
+    ),
+    "ingest": ("app.tasks.ingest_tasks", "app.tasks.email_ingest_tasks"),
+    "analysis": ("app.tasks.analysis_tasks",),
+    "generation": ("app.tasks.generation_tasks",),
+    "documents": ("app.tasks.document_tasks",),
+    "periodic": (
+        "app.tasks.ingest_tasks",
+        "app.tasks.signal_tasks",
+        "app.tasks.maintenance_tasks",
+        "app.tasks.sharepoint_sync_tasks",
+    ),
+    "maintenance": ("app.tasks.analysis_tasks", "app.tasks.maintenance_tasks"),
+    "webhooks": ("app.tasks.webhook_tasks",),
+}
+
+
+def task_modules_for_queues(queues: str) -> list[str]:
+    """Task modules to import for a comma-separated queue list (all if empty)."""
+    names = [name.strip() for name in queues.split(",") if name.strip()] or list(
+        TASK_MODULES_BY_QUEUE
+    )
+    unknown = [name for name in names if name not in TASK_MODULES_BY_QUEUE]
+    if unknown:
+        raise ValueError(f"Unknown Celery queue(s) in CELERY_WORKER_QUEUES: {unknown}")
+    return list(dict.fromkeys(module for name in names for module in TASK_MODULES_BY_QUEUE[name]))
+
 
 # Create Celery app
 celery_app = Celery(
     "rfp_sniper",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=[
-        "app.tasks.ingest_tasks",
-        "app.tasks.analysis_tasks",
-        "app.tasks.generation_tasks",
-        "app.tasks.document_tasks",
-        "app.tasks.maintenance_tasks",
-        "app.tasks.sharepoint_sync_tasks",
-        "app.tasks.email_ingest_tasks",
-        "app.tasks.signal_tasks",
-    ],
+    include=task_modules_for_queues(settings.celery_worker_queues),
 )
 
 # Celery configuration
@@ -50,15 +102,7 @@ celery_app.conf.update(
     task_default_retry_delay=60,
     task_max_retries=3,
     # Queues
-    task_queues=(
-        Queue("celery"),
-        Queue("ingest"),
-        Queue("analysis"),
-        Queue("generation"),
-        Queue("documents"),
-        Queue("periodic"),
-        Queue("maintenance"),
-    ),
+    task_queues=tuple(Queue(name) for name in TASK_MODULES_BY_QUEUE),
     # Beat schedule for periodic tasks
     beat_schedule={
         # Scan SAM.gov every 6 hours for new opportunities
@@ -73,12 +117,24 @@ celery_app.conf.update(
             "schedule": crontab(minute=0, hour=2),  # 2 AM UTC
             "options": {"queue": "maintenance"},
         },
+        # Extend recently used context caches before they expire
+        "refresh-context-caches": {
+            "task": "app.tasks.analysis_tasks.refresh_expiring_caches",
+            "schedule": crontab(minute="*/15"),
+            "options": {"queue": "maintenance"},
+        },
         # Purge audit logs based on retention policy
         "purge-audit-events": {
             "task": "app.tasks.maintenance_tasks.purge_audit_events",
             "schedule": crontab(minute=0, hour=1),  # 1 AM UTC
             "options": {"queue": "maintenance"},
         },
+        # Keep monthly event-table partitions created ahead of time
+        "ensure-event-partitions": {
+            "task": "app.tasks.maintenance_tasks.ensure_event_partitions",
+            "schedule": crontab(minute=30, hour=0),
+            "options": {"queue": "maintenance"},
+        },
         # Check operational alerts hourly
         "check-operational-alerts": {
             "task": "app.tasks.maintenance_tasks.check_operational_alerts",
@@ -127,6 +183,18 @@ celery_app.conf.update(
             "schedule": crontab(minute=0, hour=8),
             "options": {"queue": "periodic"},
         },
+        # Sweep the webhook outbox for retries and missed deliveries every minute
+        "deliver-webhooks": {
+            "task": "app.tasks.webhook_tasks.deliver_webhooks",
+            "schedule": crontab(minute="*"),
+            "options": {"queue": "webhooks"},
+        },
+        # Fill in near-duplicate signatures for legacy documents hourly
+        "backfill-document-minhash": {
+            "task": "app.tasks.document_tasks.backfill_document_minhash",
+            "schedule": crontab(minute=45),
+            "options": {"queue": "documents"},
+        },
         # Watch SharePoint folders for new RFP documents every 15 minutes
         "watch-sharepoint-folders": {
             "task": "app.tasks.sharepoint_sync_tasks.watch_sharepoint_folders",
@@ -140,6 +208,7 @@ celery_app.conf.update(
         "app.tasks.analysis_tasks.*": {"queue": "analysis"},
         "app.tasks.generation_tasks.*": {"queue": "generation"},
         "app.tasks.document_tasks.*": {"queue": "documents"},
+        "app.tasks.webhook_tasks.*": {"queue": "webhooks"},
     },
 )
 
@@ -165,6 +234,20 @@ def inject_correlation_id(headers=None, **kwargs):
         cid = ctx.get("correlation_id")
         if cid:
             headers["correlation_id"] = cid
+        profile_mode = profile_header_for_publish()
+        if profile_mode:
+            headers[TASK_PROFILE_HEADER] = profile_mode
+
+
+# Tasks whose model calls are bulk screening rather than user-facing work.
+BATCH_LLM_TASKS = frozenset(
+    {
+        "app.tasks.ingest_tasks.ingest_sam_opportunities",
+        "app.tasks.ingest_tasks.ingest_from_data_source",
+        "app.tasks.ingest_tasks.periodic_sam_scan",
+        "app.tasks.ingest_tasks.periodic_multi_source_scan",
+    }
+)
 
 
 @task_prerun.connect
@@ -179,8 +262,64 @@ def bind_correlation_id(task_id, task, args, kwargs, **kw):
     else:
         structlog.contextvars.bind_contextvars(task_id=task_id)
 
+    # Attribute model calls to the task's user; background work defaults to
+    # the batch priority class unless the publisher asked otherwise.
+    llm_priority = getattr(request, LLM_PRIORITY_HEADER, None)
+    if not llm_priority and hasattr(request, "headers") and request.headers:
+        llm_priority = request.headers.get(LLM_PRIORITY_HEADER)
+    if llm_priority in LLMPriority.__members__:
+        priority = LLMPriority[llm_priority]
+    else:
+        priority = LLMPriority.BATCH if task.name in BATCH_LLM_TASKS else LLMPriority.STANDARD
+    request.llm_context_token = bind_llm_tenant(
+        user_tenant((kwargs or {}).get("user_id")), priority=priority
+    )
+
+    profile_mode = getattr(request, TASK_PROFILE_HEADER, None)
+    if not profile_mode and hasattr(request, "headers") and request.headers:
+        profile_mode = request.headers.get(TASK_PROFILE_HEADER)
+    start_task_profile(task_id, task.name, profile_mode)
+
 
 @task_postrun.connect
-def unbind_correlation_id(task_id, task, **kw):
+def unbind_correlation_id(task_id, task, state=None, **kw):
     """Clean up structlog context after task completes."""
+    finish_task_profile(task_id, state=state)
     structlog.contextvars.unbind_contextvars("correlation_id", "task_id")
+    token = getattr(task.request, "llm_context_token", None)
+    if token is not None:
+        with contextlib.suppress(ValueError):
+            reset_llm_context(token)
+
+
+# ---------------------------------------------------------------------------
+# Per-process worker runtime
+# ---------------------------------------------------------------------------
+# Each worker process gets one event loop and pooled DB engine, created after
+# fork so nothing is shared with the parent (see app.tasks.worker_runtime).
+# ---------------------------------------------------------------------------
+
+
+@worker_process_init.connect
+def init_worker_runtime(**kwargs):
+    """Start a fresh loop and engine in each worker process and warm the model list."""
+    from app.services.model_registry import warm_model_registry
+    from app.tasks.worker_runtime import get_worker_loop, reset_worker_runtime
+
+    reset_worker_runtime()
+    get_worker_loop()
+    warm_model_registry()
+
+
+@worker_process_shutdown.connect
+def close_worker_runtime(**kwargs):
+    """Release pooled connections and close the loop when a worker exits."""
+    from app.tasks.worker_runtime import shutdown_worker_runtime
+
+    shutdown_worker_runtime()
+
+
+install_instrumentation()
+install_cache_invalidation()
+install_webhook_outbox()
+install_saved_search_percolator()
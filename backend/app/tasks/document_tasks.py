@@ -4,14 +4,17 @@ RFP Sniper - Document Processing Tasks
 Celery tasks for extracting text and chunking knowledge base documents.
 """
 
-import asyncio
 import hashlib
 import io
 import os
+from collections import defaultdict
 from datetime import datetime
 from typing import Any
 
 import structlog
+from sqlalchemy import String, cast, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
 
 from app.database import get_celery_session_context
 from app.models.knowledge_base import (
@@ -20,20 +23,14 @@ from app.models.knowledge_base import (
     ProcessingStatus,
 )
 from app.services.embedding_service import compose_knowledge_document_text, index_entity
+from app.services.near_duplicate_service import compute_document_minhash
 from app.services.pdf_processor import get_pdf_processor
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
-
-def run_async(coro):
-    """Helper to run async code in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+MINHASH_BACKFILL_BATCH_SIZE = 200
 
 
 def _hash_content(text: str) -> str:
@@ -70,7 +67,6 @@ def process_document(self, document_id: int) -> dict:
     async def _process() -> dict:
         async with get_celery_session_context() as session:
             from sqlalchemy import delete
-            from sqlmodel import select
 
             result = await session.execute(
                 select(KnowledgeBaseDocument).where(KnowledgeBaseDocument.id == document_id)
@@ -183,6 +179,9 @@ def process_document(self, document_id: int) -> dict:
 
                 # Update document
                 document.full_text = full_text
+                document.content_minhash = compute_document_minhash(
+                    chunk.get("text", "") for chunk in chunks
+                )
                 document.page_count = page_count
                 document.extracted_metadata = extracted_metadata
                 document.processing_status = ProcessingStatus.READY
@@ -236,3 +235,56 @@ def process_document(self, document_id: int) -> dict:
                 }
 
     return run_async(_process())
+
+
+async def backfill_minhash_signatures(
+    session: AsyncSession, batch_size: int = MINHASH_BACKFILL_BATCH_SIZE
+) -> int:
+    """
+    Compute signatures for ready documents ingested before MinHash was stored.
+
+    Documents whose chunks have no tokens get an empty signature so they are
+    not picked up again. Returns the number of documents updated.
+    """
+    result = await session.execute(
+        select(KnowledgeBaseDocument)
+        .where(
+            KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
+            # JSON columns persist None as a JSON null, not SQL NULL.
+            func.coalesce(cast(KnowledgeBaseDocument.content_minhash, String), "null") == "null",
+        )
+        .order_by(KnowledgeBaseDocument.id)
+        .limit(batch_size)
+    )
+    docs = list(result.scalars().all())
+    if not docs:
+        return 0
+
+    chunk_rows = await session.execute(
+        select(DocumentChunk.document_id, DocumentChunk.content)
+        .where(DocumentChunk.document_id.in_([doc.id for doc in docs]))
+        .order_by(DocumentChunk.document_id, DocumentChunk.chunk_index)
+    )
+    chunk_texts: dict[int, list[str]] = defaultdict(list)
+    for document_id, content in chunk_rows.all():
+        chunk_texts[document_id].append(content or "")
+
+    for doc in docs:
+        doc.content_minhash = compute_document_minhash(chunk_texts.get(doc.id, [])) or []
+        session.add(doc)
+    await session.commit()
+    return len(docs)
+
+
+@celery_app.task(name="app.tasks.document_tasks.backfill_document_minhash")
+def backfill_document_minhash() -> dict:
+    """Periodic sweep that fills in missing near-duplicate signatures."""
+
+    async def _backfill() -> dict:
+        async with get_celery_session_context() as session:
+            updated = await backfill_minhash_signatures(session)
+        if updated:
+            logger.info("Backfilled document MinHash signatures", documents=updated)
+        return {"updated": updated}
+
+    return run_async(_backfill())
@@ -17,6 +17,7 @@ import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
+from app.config import settings
 from app.database import get_celery_session_context
 from app.models.collaboration import SharedWorkspace, WorkspaceMember
 from app.models.email_ingest import EmailIngestConfig, EmailProcessingStatus, IngestedEmail
@@ -25,17 +26,11 @@ from app.models.rfp import RFP, RFPStatus
 from app.services.email_ingest_service import EmailIngestService
 from app.services.encryption_service import decrypt_value
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
-
-def run_async(coro):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+KNOWN_MESSAGE_ID_BATCH = 500
 
 
 # ---------------------------------------------------------------------------
@@ -190,83 +185,157 @@ async def _workspace_routing_allowed(
     return member_result.scalars().first() is not None
 
 
+def _build_ingest_service(config: EmailIngestConfig) -> EmailIngestService:
+    threshold = max(0.0, min(1.0, float(config.min_rfp_confidence)))
+
+    def download_attachments(parsed: dict[str, Any]) -> bool:
+        # Attachment parts are only worth downloading for likely solicitations.
+        confidence, _ = _classify_rfp_likelihood(
+            subject=parsed.get("subject") or "",
+            body=parsed.get("body_text") or parsed.get("body_html") or "",
+            sender=parsed.get("sender") or "",
+            attachment_names=parsed.get("attachment_names") or [],
+        )
+        return confidence >= threshold
+
+    return EmailIngestService(
+        host=config.imap_server,
+        port=config.imap_port,
+        username=config.email_address,
+        password=decrypt_value(config.encrypted_password),
+        use_ssl=config.imap_port == 993,
+        uid_validity=config.uid_validity,
+        last_uid=config.last_seen_uid,
+        download_attachments=download_attachments,
+    )
+
+
+async def _fetch_config_emails(
+    config: EmailIngestConfig,
+    *,
+    limit: int,
+    idle_seconds: int,
+    semaphore: asyncio.Semaphore,
+) -> tuple[EmailIngestService | None, list[dict], Exception | None]:
+    """Fetch one mailbox; a quiet one may then wait in IDLE.
+
+    The poll slot is released while waiting in IDLE so quiet inboxes do not
+    stop the mailboxes queued behind them from being fetched.
+    """
+    try:
+        async with semaphore:
+            service = _build_ingest_service(config)
+            emails = await service.connect_and_fetch(folder=config.folder, limit=limit)
+        if not emails and idle_seconds > 0:
+            if await service.wait_for_new_mail(config.folder, timeout=idle_seconds):
+                async with semaphore:
+                    emails = await service.connect_and_fetch(folder=config.folder, limit=limit)
+        return service, emails, None
+    except Exception as exc:
+        return None, [], exc
+
+
+async def _known_message_ids(
+    session: AsyncSession,
+    keys: set[tuple[int, str]],
+) -> set[tuple[int, str]]:
+    """Load already-ingested (config_id, message_id) pairs in batched queries."""
+    known: set[tuple[int, str]] = set()
+    config_ids = {config_id for config_id, _ in keys}
+    message_ids = sorted({message_id for _, message_id in keys})
+    for start in range(0, len(message_ids), KNOWN_MESSAGE_ID_BATCH):
+        result = await session.execute(
+            select(IngestedEmail.config_id, IngestedEmail.message_id).where(
+                IngestedEmail.config_id.in_(config_ids),
+                IngestedEmail.message_id.in_(message_ids[start : start + KNOWN_MESSAGE_ID_BATCH]),
+            )
+        )
+        known.update((row.config_id, row.message_id) for row in result.all())
+    return known
+
+
 async def poll_email_configs(
     session: AsyncSession,
     *,
     configs: Sequence[EmailIngestConfig],
     limit: int = 50,
+    concurrency: int | None = None,
+    idle_seconds: int | None = None,
 ) -> dict[str, int]:
+    """Fetch new mail for all enabled configs concurrently and stage it for processing."""
     fetched_total = 0
     duplicates = 0
     errors = 0
 
-    for config in configs:
-        if not config.is_enabled:
-            continue
+    enabled = [config for config in configs if config.is_enabled]
+    semaphore = asyncio.Semaphore(concurrency or settings.email_ingest_poll_concurrency)
+    idle = settings.email_ingest_idle_seconds if idle_seconds is None else idle_seconds
+    outcomes = await asyncio.gather(
+        *(
+            _fetch_config_emails(config, limit=limit, idle_seconds=idle, semaphore=semaphore)
+            for config in enabled
+        )
+    )
 
-        try:
-            password = decrypt_value(config.encrypted_password)
-            service = EmailIngestService(
+    batches: list[tuple[EmailIngestConfig, EmailIngestService, list[tuple[str, dict]]]] = []
+    for config, (service, emails, exc) in zip(enabled, outcomes, strict=True):
+        if exc is not None or service is None:
+            logger.error(
+                "IMAP poll failed",
+                config_id=config.id,
                 host=config.imap_server,
-                port=config.imap_port,
-                username=config.email_address,
-                password=password,
-                use_ssl=config.imap_port == 993,
+                error=str(exc),
             )
-            emails = await service.connect_and_fetch(folder=config.folder, limit=limit)
+            errors += 1
+            continue
+        batches.append((config, service, [(_normalize_message_id(p), p) for p in emails]))
 
-            for parsed in emails:
-                msg_id = _normalize_message_id(parsed)
-                existing = await session.execute(
-                    select(IngestedEmail).where(
-                        IngestedEmail.config_id == config.id,
-                        IngestedEmail.message_id == msg_id,
-                    )
-                )
-                if existing.scalar_one_or_none():
-                    duplicates += 1
-                    continue
-
-                body_text = (parsed.get("body_text") or "").strip()
-                if not body_text:
-                    body_text = (parsed.get("body_html") or "").strip()
-                attachment_text = (parsed.get("attachment_text") or "").strip()
-                if attachment_text:
-                    body_text = (
-                        f"{body_text}\n\nAttachment Extracts:\n{attachment_text}".strip()
-                        if body_text
-                        else attachment_text
-                    )
+    known = await _known_message_ids(
+        session,
+        {(config.id, msg_id) for config, _, emails in batches for msg_id, _ in emails},
+    )
 
-                attachment_names = [
-                    str(name)[:255]
-                    for name in (parsed.get("attachment_names") or [])
-                    if isinstance(name, str)
-                ]
-                ingested = IngestedEmail(
-                    config_id=config.id,
-                    message_id=msg_id,
-                    subject=str(parsed.get("subject") or "")[:500],
-                    sender=str(parsed.get("sender") or "")[:255],
-                    received_at=_parse_received_at(parsed.get("date")),
-                    body_text=body_text or None,
-                    attachment_count=len(attachment_names),
-                    attachment_names=attachment_names[:20],
-                    processing_status=EmailProcessingStatus.PENDING,
+    for config, service, emails in batches:
+        for msg_id, parsed in emails:
+            if (config.id, msg_id) in known:
+                duplicates += 1
+                continue
+            known.add((config.id, msg_id))
+
+            body_text = (parsed.get("body_text") or "").strip()
+            if not body_text:
+                body_text = (parsed.get("body_html") or "").strip()
+            attachment_text = (parsed.get("attachment_text") or "").strip()
+            if attachment_text:
+                body_text = (
+                    f"{body_text}\n\nAttachment Extracts:\n{attachment_text}".strip()
+                    if body_text
+                    else attachment_text
                 )
-                session.add(ingested)
-                fetched_total += 1
-
-            config.last_checked_at = datetime.utcnow()
 
-        except Exception as exc:  # pragma: no cover - defensive guard
-            logger.error(
-                "IMAP poll failed",
+            attachment_names = [
+                str(name)[:255]
+                for name in (parsed.get("attachment_names") or [])
+                if isinstance(name, str)
+            ]
+            ingested = IngestedEmail(
                 config_id=config.id,
-                host=config.imap_server,
-                error=str(exc),
+                message_id=msg_id,
+                subject=str(parsed.get("subject") or "")[:500],
+                sender=str(parsed.get("sender") or "")[:255],
+                received_at=_parse_received_at(parsed.get("date")),
+                body_text=body_text or None,
+                attachment_count=len(attachment_names),
+                attachment_names=attachment_names[:20],
+                processing_status=EmailProcessingStatus.PENDING,
             )
-            errors += 1
+            session.add(ingested)
+            fetched_total += 1
+
+        if service.uid_validity is not None or service.last_uid is not None:
+            config.uid_validity = service.uid_validity
+            config.last_seen_uid = service.last_uid
+        config.last_checked_at = datetime.utcnow()
 
     await session.flush()
     return {
@@ -4,7 +4,6 @@ RFP Sniper - Generation Tasks
 Celery tasks for proposal section generation.
 """
 
-import asyncio
 from collections.abc import Callable
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -18,22 +17,16 @@ from app.models.outline import OutlineSection, OutlineStatus, ProposalOutline
 from app.models.proposal import Proposal, ProposalSection, SectionStatus
 from app.models.proposal_focus_document import ProposalFocusDocument
 from app.models.rfp import RFP, ComplianceMatrix
+from app.services.context_cache_manager import ContextCacheManager
 from app.services.gemini_service import GeminiService
+from app.services.generation_stream import SectionStreamPublisher
+from app.services.llm_gateway import LLM_PRIORITY_HEADER, LLMPriority
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
 
-def run_async(coro):
-    """Helper to run async code in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @asynccontextmanager
 async def _outline_session_context(session_override: AsyncSession | None):
     if session_override is not None:
@@ -44,6 +37,39 @@ async def _outline_session_context(session_override: AsyncSession | None):
         yield celery_session
 
 
+async def _load_generation_documents(
+    session: AsyncSession, proposal_id: int, user_id: int
+) -> list[KnowledgeBaseDocument]:
+    """Ready documents for a proposal: its focus documents, else the user's whole KB."""
+    from sqlmodel import select
+
+    focus_result = await session.execute(
+        select(ProposalFocusDocument)
+        .where(ProposalFocusDocument.proposal_id == proposal_id)
+        .order_by(ProposalFocusDocument.priority_order)
+    )
+    focus_docs = focus_result.scalars().all()
+
+    if focus_docs:
+        # Use only focus documents
+        focus_doc_ids = [fd.document_id for fd in focus_docs]
+        docs_result = await session.execute(
+            select(KnowledgeBaseDocument).where(
+                KnowledgeBaseDocument.id.in_(focus_doc_ids),
+                KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
+            )
+        )
+    else:
+        # Fall back to all user documents
+        docs_result = await session.execute(
+            select(KnowledgeBaseDocument).where(
+                KnowledgeBaseDocument.user_id == user_id,
+                KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
+            )
+        )
+    return list(docs_result.scalars().all())
+
+
 @celery_app.task(
     bind=True,
     name="app.tasks.generation_tasks.generate_proposal_section",
@@ -103,46 +129,16 @@ def generate_proposal_section(
             section.status = SectionStatus.GENERATING
             await session.commit()
 
-            # Check for focus documents first
-            focus_result = await session.execute(
-                select(ProposalFocusDocument)
-                .where(ProposalFocusDocument.proposal_id == section.proposal_id)
-                .order_by(ProposalFocusDocument.priority_order)
-            )
-            focus_docs = focus_result.scalars().all()
-
-            if focus_docs:
-                # Use only focus documents
-                focus_doc_ids = [fd.document_id for fd in focus_docs]
-                docs_result = await session.execute(
-                    select(KnowledgeBaseDocument).where(
-                        KnowledgeBaseDocument.id.in_(focus_doc_ids),
-                        KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
-                    )
-                )
-            else:
-                # Fall back to all user documents
-                docs_result = await session.execute(
-                    select(KnowledgeBaseDocument).where(
-                        KnowledgeBaseDocument.user_id == user_id,
-                        KnowledgeBaseDocument.processing_status == ProcessingStatus.READY,
-                    )
-                )
-            documents = docs_result.scalars().all()
+            documents = await _load_generation_documents(session, section.proposal_id, user_id)
 
-            # Check for cached context or build inline
-            cache_name = None
+            # Prefer a warm context cache for this document set; the inline
+            # text is still passed in case the cache has gone away upstream.
+            cache_entry = await ContextCacheManager(gemini_service).acquire(
+                session, user_id, documents
+            )
+            cache_name = cache_entry.cache_name if cache_entry else None
             documents_text = None
-
-            # Look for a valid cache
-            for doc in documents:
-                if doc.gemini_cache_name and doc.gemini_cache_expires_at:
-                    if doc.gemini_cache_expires_at > datetime.utcnow():
-                        cache_name = doc.gemini_cache_name
-                        break
-
-            # If no cache, build inline text
-            if not cache_name and documents:
+            if documents:
                 documents_text = "\n\n".join(
                     [
                         f"=== DOCUMENT: {doc.original_filename} ===\n{doc.full_text or ''}"
@@ -162,6 +158,16 @@ def generate_proposal_section(
             if additional_context:
                 requirement_text += f"\n\nAdditional Context: {additional_context}"
 
+            # Tokens go to the proposal room as they arrive; the section row
+            # is only written once the full response is in.
+            stream = SectionStreamPublisher(
+                proposal_id=section.proposal_id,
+                section_id=section_id,
+                user_id=user_id,
+                extract_citations=gemini_service._extract_citations,
+            )
+            await stream.started()
+
             try:
                 # Generate content
                 generated = await gemini_service.generate_section(
@@ -172,6 +178,7 @@ def generate_proposal_section(
                     documents_text=documents_text,
                     max_words=max_words,
                     tone=tone,
+                    on_chunk=stream.chunk,
                 )
 
                 # Update section
@@ -216,6 +223,11 @@ def generate_proposal_section(
                             break
 
                 await session.commit()
+                await stream.complete(
+                    status=section.status.value,
+                    word_count=len(generated.clean_text.split()),
+                    quality_score=section.quality_score,
+                )
 
                 logger.info(
                     "Section generated",
@@ -238,6 +250,7 @@ def generate_proposal_section(
                 logger.error(f"Generation failed: {e}", section_id=section_id)
                 section.status = SectionStatus.PENDING
                 await session.commit()
+                await stream.error(str(e))
                 raise self.retry(exc=e)
 
     return run_async(_generate())
@@ -284,14 +297,26 @@ def generate_all_sections(
             )
             sections = result.scalars().all()
 
+            if sections:
+                # Create the shared context cache once instead of per section.
+                try:
+                    documents = await _load_generation_documents(session, proposal_id, user_id)
+                    await ContextCacheManager(GeminiService()).acquire(session, user_id, documents)
+                except Exception as e:
+                    logger.warning("Context cache warm-up failed", error=str(e))
+
             queued_tasks = []
             for section in sections:
                 # Queue individual generation tasks
-                task = generate_proposal_section.delay(
-                    section_id=section.id,
-                    user_id=user_id,
-                    max_words=max_words_per_section,
-                    tone=tone,
+                task = generate_proposal_section.apply_async(
+                    kwargs={
+                        "section_id": section.id,
+                        "user_id": user_id,
+                        "max_words": max_words_per_section,
+                        "tone": tone,
+                    },
+                    # Bulk fan-out yields to interactive and single-section work.
+                    headers={LLM_PRIORITY_HEADER: LLMPriority.BATCH.name},
                 )
                 queued_tasks.append(
                     {
@@ -347,31 +372,23 @@ def refresh_context_cache(
             if not documents:
                 return {"status": "skipped", "reason": "No ready documents"}
 
-            # Create cache
-            cache_name = await gemini_service.create_context_cache(
-                documents=documents,
-                cache_name=f"user_{user_id}_kb",
-                ttl_hours=ttl_hours,
+            entry = await ContextCacheManager(gemini_service, ttl_hours=ttl_hours).acquire(
+                session, user_id, documents
             )
 
-            if cache_name:
-                # Update documents with cache info
-                expires_at = datetime.utcnow()
-                from datetime import timedelta
-
-                expires_at += timedelta(hours=ttl_hours)
-
+            if entry:
+                # Mirror the cache on the documents for the knowledge base API.
                 for doc in documents:
-                    doc.gemini_cache_name = cache_name
-                    doc.gemini_cache_expires_at = expires_at
+                    doc.gemini_cache_name = entry.cache_name
+                    doc.gemini_cache_expires_at = entry.expires_at
 
                 await session.commit()
 
                 return {
                     "status": "created",
-                    "cache_name": cache_name,
+                    "cache_name": entry.cache_name,
                     "documents_cached": len(documents),
-                    "expires_at": expires_at.isoformat(),
+                    "expires_at": entry.expires_at.isoformat(),
                 }
             else:
                 return {"status": "failed", "reason": "Cache creation failed"}
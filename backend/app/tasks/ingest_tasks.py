@@ -4,7 +4,6 @@ RFP Sniper - Ingest Tasks
 Celery tasks for SAM.gov data ingestion.
 """
 
-import asyncio
 import hashlib
 import json
 
@@ -18,25 +17,17 @@ from app.models.opportunity_snapshot import SAMOpportunitySnapshot
 from app.models.rfp import RFP, RFPStatus
 from app.models.user import User, UserProfile
 from app.schemas.rfp import SAMSearchParams
-from app.services.cache_service import cache_clear_prefix
+from app.services.cache_service import cache_invalidate_tags
+from app.services.cache_tags import user_tag
 from app.services.filters import KillerFilterService, quick_disqualify
 from app.services.ingest_service import SAMGovAPIError, SAMGovService
 from app.services.rfp_downloader import get_rfp_downloader
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
 
-def run_async(coro):
-    """Helper to run async code in Celery tasks."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @celery_app.task(
     bind=True,
     name="app.tasks.ingest_tasks.ingest_sam_opportunities",
@@ -295,8 +286,9 @@ def ingest_sam_opportunities(
 
                 await session.commit()
 
-        # Ingest updates bypass the RFP CRUD routes, so invalidate list caches explicitly.
-        await cache_clear_prefix(f"rfps:list:{user_id}:")
+        # Commits already invalidate per-entity tags; await the user tag so list
+        # caches are clear before the task reports completion.
+        await cache_invalidate_tags([user_tag(user_id)])
 
         return {
             "task_id": task_id,
@@ -493,12 +485,15 @@ def send_daily_digest():
     """Send daily opportunity digest to subscribed users."""
     from datetime import datetime, timedelta
 
+    from sqlalchemy import func
+
     from app.models.market_signal import (
         DigestFrequency,
         MarketSignal,
         SignalSubscription,
         SignalType,
     )
+    from app.models.saved_search import SavedSearch, SavedSearchMatch
 
     logger.info("Running daily opportunity digest")
 
@@ -530,11 +525,29 @@ def send_daily_digest():
                 )
                 rfps = rfp_result.scalars().all()
 
-                if not rfps:
+                # Saved-search matches recorded since the last digest
+                match_result = await session.execute(
+                    select(SavedSearch.name, func.count(SavedSearchMatch.id))
+                    .join(SavedSearch, SavedSearch.id == SavedSearchMatch.saved_search_id)
+                    .where(
+                        SavedSearchMatch.user_id == sub.user_id,
+                        SavedSearchMatch.matched_at >= cutoff,
+                        SavedSearch.is_active == True,
+                    )
+                    .group_by(SavedSearch.id, SavedSearch.name)
+                    .order_by(SavedSearch.name)
+                )
+                search_matches = [(name, count) for name, count in match_result.all()]
+
+                if not rfps and not search_matches:
                     continue
 
                 # Build digest content
                 lines = [f"Daily Opportunity Digest - {len(rfps)} new matches\n"]
+                for name, count in search_matches:
+                    lines.append(f"  Saved search '{name}': {count} new matches")
+                if search_matches:
+                    lines.append("")
                 for rfp in rfps:
                     score = rfp.match_score or 0
                     lines.append(f"  [{score:.0f}%] {rfp.title}")
@@ -559,7 +572,7 @@ def send_daily_digest():
                     title=f"Daily Digest: {len(rfps)} new matches",
                     signal_type=SignalType.NEWS,
                     content=digest_text,
-                    relevance_score=max(rfp.match_score or 0 for rfp in rfps),
+                    relevance_score=max((rfp.match_score or 0 for rfp in rfps), default=0),
                 )
                 session.add(signal)
                 sent_count += 1
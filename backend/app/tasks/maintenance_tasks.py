@@ -4,7 +4,6 @@ RFP Sniper - Maintenance Tasks
 Scheduled maintenance for audit retention and operational alerts.
 """
 
-import asyncio
 from datetime import datetime
 
 import structlog
@@ -13,20 +12,13 @@ from app.config import settings
 from app.database import get_celery_session_context
 from app.services.alert_service import get_alert_counts
 from app.services.audit_service import purge_audit_events
+from app.services.event_partitions import ensure_event_partitions
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
 
-def run_async(coro):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @celery_app.task(name="app.tasks.maintenance_tasks.purge_audit_events")
 def purge_audit_events_task() -> dict:
     async def _purge() -> dict:
@@ -39,6 +31,20 @@ def purge_audit_events_task() -> dict:
     return {"status": "ok", **result}
 
 
+@celery_app.task(name="app.tasks.maintenance_tasks.ensure_event_partitions")
+def ensure_event_partitions_task() -> dict:
+    """Pre-create upcoming monthly partitions for the event tables."""
+
+    async def _ensure() -> dict:
+        async with get_celery_session_context() as session:
+            created = await ensure_event_partitions(session)
+            return {"created": created}
+
+    result = run_async(_ensure())
+    logger.info("Event partitions ensured", **result)
+    return {"status": "ok", **result}
+
+
 @celery_app.task(name="app.tasks.maintenance_tasks.send_deadline_reminders")
 def send_deadline_reminders_task() -> dict:
     """Send deadline reminder emails/notifications for upcoming RFP deadlines."""
@@ -46,14 +52,35 @@ def send_deadline_reminders_task() -> dict:
 
     async def _send() -> dict:
         async with get_celery_session_context() as session:
-            await send_deadline_reminders(session)
-            return {"sent": True}
+            stats = await send_deadline_reminders(session)
+            return {"sent": True, **(stats or {})}
 
     result = run_async(_send())
     logger.info("Deadline reminders complete", **result)
     return {"status": "ok", **result}
 
 
+@celery_app.task(
+    bind=True,
+    name="app.tasks.maintenance_tasks.retry_reminder_delivery",
+    max_retries=5,
+)
+def retry_reminder_delivery(self, notification_id: int, channel: str) -> dict:
+    """Re-send one channel of a deadline reminder the batch outbox gave up on."""
+    from app.services.deadline_reminder_service import deliver_stored_reminder
+
+    async def _deliver() -> bool | None:
+        async with get_celery_session_context() as session:
+            return await deliver_stored_reminder(session, notification_id, channel)
+
+    delivered = run_async(_deliver())
+    if delivered is None:
+        return {"status": "skipped", "notification_id": notification_id, "channel": channel}
+    if not delivered:
+        raise self.retry(countdown=60 * 2**self.request.retries)
+    return {"status": "delivered", "notification_id": notification_id, "channel": channel}
+
+
 @celery_app.task(name="app.tasks.maintenance_tasks.check_operational_alerts")
 def check_operational_alerts() -> dict:
     async def _check() -> dict:
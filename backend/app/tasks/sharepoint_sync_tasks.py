@@ -2,9 +2,15 @@
 RFP Sniper - SharePoint Sync Celery Tasks
 ==========================================
 Periodic and on-demand sync between proposals and SharePoint.
+
+Pushes render the DOCX in-process and are skipped when the proposal content
+hash matches the one last uploaded for the config. Folder watching follows a
+stored Graph delta link instead of re-listing the folder on every run.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
 from datetime import datetime
 
@@ -12,14 +18,42 @@ from sqlmodel import select
 
 from app.database import get_celery_session_context
 from app.models.integration import IntegrationConfig, IntegrationProvider
-from app.models.proposal import Proposal
+from app.models.proposal import Proposal, ProposalSection
+from app.models.rfp import RFP
 from app.models.sharepoint_sync import SharePointSyncConfig, SharePointSyncLog
 from app.services.sharepoint_service import create_sharepoint_service
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
 
+def proposal_content_hash(
+    proposal: Proposal,
+    sections: list[ProposalSection],
+    rfp: RFP,
+    folder: str,
+) -> str:
+    """SHA-256 over everything the DOCX export renders, plus the target folder."""
+    payload = {
+        "folder": folder,
+        "title": proposal.title,
+        "executive_summary": proposal.executive_summary,
+        "rfp": [rfp.solicitation_number, rfp.agency, rfp.response_deadline],
+        "sections": [
+            [
+                section.section_number,
+                section.title,
+                section.requirement_text,
+                section.final_content or (section.generated_content or {}).get("clean_text", ""),
+            ]
+            for section in sorted(sections, key=lambda s: s.display_order)
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
 @celery_app.task(
     bind=True,
     name="app.tasks.sharepoint_sync_tasks.sync_proposal_to_sharepoint",
@@ -28,7 +62,7 @@ logger = logging.getLogger(__name__)
 )
 def sync_proposal_to_sharepoint(self, config_id: int) -> dict:
     """Export proposal as DOCX and upload to configured SharePoint folder."""
-    return asyncio.get_event_loop().run_until_complete(_sync_proposal(config_id))
+    return run_async(_sync_proposal(config_id))
 
 
 async def _sync_proposal(config_id: int) -> dict:
@@ -67,24 +101,38 @@ async def _sync_proposal(config_id: int) -> dict:
             await session.commit()
             return {"error": "No SharePoint integration"}
 
+        filename = f"{proposal.title.replace(' ', '_')}.docx"
         try:
-            sp = create_sharepoint_service(integration.config)
+            sections_result = await session.execute(
+                select(ProposalSection).where(ProposalSection.proposal_id == proposal.id)
+            )
+            sections = list(sections_result.scalars().all())
+            rfp_result = await session.execute(select(RFP).where(RFP.id == proposal.rfp_id))
+            rfp = rfp_result.scalar_one_or_none()
+            if not rfp:
+                raise ValueError("Associated RFP not found")
+
+            content_hash = proposal_content_hash(proposal, sections, rfp, config.sharepoint_folder)
+            if content_hash == config.last_synced_hash:
+                log = SharePointSyncLog(
+                    config_id=config_id,
+                    action="push",
+                    status="skipped",
+                    details={"file_name": filename, "reason": "unchanged"},
+                )
+                session.add(log)
+                await session.commit()
+                return {"status": "skipped", "file_name": filename}
 
-            # Generate DOCX via internal export endpoint
-            import httpx
+            from app.api.routes.export import create_docx_proposal
 
-            export_url = f"http://localhost:8000/api/v1/export/proposals/{proposal.id}/docx"
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(export_url, timeout=60.0)
-                resp.raise_for_status()
-                docx_bytes = resp.content
+            docx_bytes = await asyncio.to_thread(create_docx_proposal, proposal, sections, rfp)
 
-            # Upload to SharePoint
-            filename = f"{proposal.title.replace(' ', '_')}.docx"
+            sp = create_sharepoint_service(integration.config)
             upload_result = await sp.upload_file(config.sharepoint_folder, filename, docx_bytes)
 
-            # Update config timestamp
             config.last_synced_at = datetime.utcnow()
+            config.last_synced_hash = content_hash
             session.add(config)
 
             # Log success
@@ -133,7 +181,7 @@ async def _sync_proposal(config_id: int) -> dict:
 )
 def watch_sharepoint_folders(self) -> dict:
     """Periodic task: check watched SharePoint folders for new files."""
-    return asyncio.get_event_loop().run_until_complete(_watch_folders())
+    return run_async(_watch_folders())
 
 
 async def _watch_folders() -> dict:
@@ -164,25 +212,10 @@ async def _watch_folders() -> dict:
                     continue
 
                 sp = create_sharepoint_service(integration.config)
-                files = await sp.list_files(config.sharepoint_folder)
-
-                # Filter for new files since last sync
-                cutoff = config.last_synced_at
-                new_files = []
-                for f in files:
-                    if f.get("is_folder"):
-                        continue
-                    modified = f.get("last_modified")
-                    if modified and cutoff:
-                        from datetime import datetime as dt
-
-                        try:
-                            file_dt = dt.fromisoformat(modified.replace("Z", "+00:00"))
-                            if file_dt <= cutoff.replace(tzinfo=file_dt.tzinfo):
-                                continue
-                        except (ValueError, TypeError):
-                            pass
-                    new_files.append(f)
+                changes = await sp.get_folder_changes(
+                    config.sharepoint_folder, config.watch_delta_link
+                )
+                new_files = [f for f in changes["items"] if not f["is_folder"]]
 
                 if new_files:
                     log = SharePointSyncLog(
@@ -199,8 +232,7 @@ async def _watch_folders() -> dict:
                     session.add(log)
                     detected += len(new_files)
 
-                # Update last_synced_at for the watch
-                config.last_synced_at = datetime.utcnow()
+                config.watch_delta_link = changes["delta_link"]
                 session.add(config)
 
             except Exception as e:
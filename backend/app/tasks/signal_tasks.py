@@ -4,7 +4,6 @@ RFP Sniper - Signal Tasks
 Celery tasks for polling RSS feeds and sending signal digests.
 """
 
-import asyncio
 from datetime import datetime, timedelta
 
 import structlog
@@ -14,21 +13,13 @@ from app.database import get_celery_session_context
 from app.models.market_signal import MarketSignal, SignalSubscription
 from app.services.signal_feeds import RSS_FEED_REGISTRY, fetch_feed, score_relevance
 from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
 
 logger = structlog.get_logger(__name__)
 
 RELEVANCE_THRESHOLD = 0.2
 
 
-def run_async(coro):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 @celery_app.task(name="app.tasks.signal_tasks.poll_signal_feeds")
 def poll_signal_feeds() -> dict:
     """Fetch RSS feeds and create MarketSignal records for relevant entries."""
@@ -96,8 +87,8 @@ def poll_signal_feeds() -> dict:
 @celery_app.task(name="app.tasks.signal_tasks.send_signal_digest")
 def send_signal_digest() -> dict:
     """Send email digest of unread signals to subscribed users."""
-    from app.api.routes.notifications import email_service
     from app.config import settings
+    from app.services.notification_channels import email_service
 
     async def _send() -> dict:
         sent = 0
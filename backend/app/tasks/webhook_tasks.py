@@ -0,0 +1,39 @@
+"""
+RFP Sniper - Webhook Delivery Tasks
+===================================
+Drain the webhook outbox written by ``dispatch_webhook_event``.
+"""
+
+import structlog
+
+from app.config import settings
+from app.database import get_celery_session_context
+from app.services.webhook_service import deliver_pending_webhooks
+from app.tasks.celery_app import celery_app
+from app.tasks.worker_runtime import run_async
+
+logger = structlog.get_logger(__name__)
+
+# Upper bound on batches drained by one run; the periodic sweep picks up the rest.
+MAX_BATCHES_PER_RUN = 10
+
+
+@celery_app.task(name="app.tasks.webhook_tasks.deliver_webhooks")
+def deliver_webhooks() -> dict:
+    """Deliver due webhook outbox rows, batch by batch."""
+
+    async def _deliver() -> dict:
+        totals: dict[str, int] = {}
+        for _ in range(MAX_BATCHES_PER_RUN):
+            async with get_celery_session_context() as session:
+                stats = await deliver_pending_webhooks(session)
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+            if stats["claimed"] < settings.webhook_delivery_batch_size:
+                break
+        return totals
+
+    totals = run_async(_deliver())
+    if totals.get("claimed"):
+        logger.info("Webhook outbox drained", **totals)
+    return totals
@@ -0,0 +1,74 @@
+"""
+RFP Sniper - Celery Worker Runtime
+==================================
+One long-lived event loop per worker process.
+
+Tasks are synchronous Celery callables that drive async code through
+``run_async``. Running every task on the same loop lets the pooled worker
+engine (``app.database.bind_worker_engine``) keep its connections between
+tasks. The loop is created lazily and re-created when the process id
+changes, so a loop inherited across ``fork`` is never reused. The loop is
+not installed as the thread's current loop; code should reach it through
+``run_async`` (or ``asyncio.get_running_loop`` inside a task coroutine).
+
+``run_until_complete`` returns as soon as the task coroutine finishes, so
+``run_async`` also drains cache invalidations that commit hooks scheduled on
+the loop; otherwise they would stay suspended until the next task.
+"""
+
+import asyncio
+import os
+from collections.abc import Coroutine
+from typing import Any
+
+from app.database import bind_worker_engine, dispose_worker_engine, forget_worker_engine
+from app.services.cache_service import await_pending_invalidations
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's worker loop, creating it (and its engine) if needed."""
+    global _loop, _loop_pid
+
+    if _loop_pid != os.getpid():
+        # Forked child: the parent's loop and pooled connections are not ours.
+        reset_worker_runtime()
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        _loop_pid = os.getpid()
+        bind_worker_engine(_loop)
+    return _loop
+
+
+def run_async[T](coro: Coroutine[Any, Any, T]) -> T:
+    """Run ``coro`` to completion on the worker loop, then flush cache invalidations."""
+    loop = get_worker_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.run_until_complete(await_pending_invalidations())
+
+
+def reset_worker_runtime() -> None:
+    """Forget the current loop and engine without closing them (post-fork)."""
+    global _loop, _loop_pid
+
+    forget_worker_engine()
+    _loop = None
+    _loop_pid = os.getpid()
+
+
+def shutdown_worker_runtime() -> None:
+    """Dispose the pooled engine and close the loop (worker shutdown)."""
+    global _loop
+
+    if _loop is None or _loop.is_closed() or _loop_pid != os.getpid():
+        return
+    try:
+        _loop.run_until_complete(dispose_worker_engine())
+        _loop.run_until_complete(_loop.shutdown_asyncgens())
+    finally:
+        _loop.close()
+        _loop = None
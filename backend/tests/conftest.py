@@ -27,6 +27,7 @@ from app.models.rfp import RFP
 from app.models.user import User, UserTier
 from app.services.auth_service import create_token_pair, hash_password
 from app.services.cache_service import cache_clear
+from app.services.llm_cache import reset_llm_response_cache
 
 # Test database URL - use isolated SQLite file for deterministic test runs.
 _test_db_path = os.getenv("TEST_DB_PATH")
@@ -87,8 +88,10 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
 async def reset_cache() -> AsyncGenerator[None, None]:
     """Ensure cache is cleared between tests to avoid cross-test pollution."""
     await cache_clear()
+    reset_llm_response_cache()
     yield
     await cache_clear()
+    reset_llm_response_cache()
 
 
 @pytest_asyncio.fixture(autouse=True)
@@ -96,6 +99,7 @@ async def reset_rate_limits() -> AsyncGenerator[None, None]:
     """Flush rate limit keys from Redis so tests don't hit stale limits."""
     from app.api.deps import rate_limiter
 
+    rate_limiter.reset_local()
     try:
         r = await rate_limiter._get_redis()
         keys = []
@@ -2,6 +2,7 @@
 Integration tests for admin/integrations.py routes:
   - GET /api/v1/admin/provider-maturity
   - GET /api/v1/admin/release-gate
+  - GET/PUT /api/v1/admin/profiling
 """
 
 import pytest
@@ -149,3 +150,73 @@ class TestGetReleaseGate:
         data = response.json()
         # Release gate returns structured SLO data
         assert isinstance(data, dict)
+
+
+# ---------------------------------------------------------------------------
+# GET/PUT /api/v1/admin/profiling
+# ---------------------------------------------------------------------------
+
+
+class TestProfilingConfig:
+    """GET/PUT /api/v1/admin/profiling"""
+
+    @pytest.fixture(autouse=True)
+    def reset_profiling(self):
+        from app.observability.profiling import reset_profiling_config
+
+        reset_profiling_config()
+        yield
+        reset_profiling_config()
+
+    @pytest.mark.asyncio
+    async def test_requires_admin(self, client: AsyncClient, member_headers: dict):
+        response = await client.put(
+            "/api/v1/admin/profiling", json={"enabled": True}, headers=member_headers
+        )
+        assert response.status_code == 403
+
+    @pytest.fixture
+    def platform_admin(self, admin_user: User, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "profiling_admin_emails", f"ops@test.com, {admin_user.email}")
+
+    @pytest.mark.asyncio
+    async def test_org_admin_cannot_change_platform_profiling(
+        self, client: AsyncClient, admin_headers: dict
+    ):
+        response = await client.put(
+            "/api/v1/admin/profiling", json={"enabled": True}, headers=admin_headers
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_toggle_profiling(
+        self, client: AsyncClient, admin_headers: dict, platform_admin: None
+    ):
+        response = await client.get("/api/v1/admin/profiling", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
+
+        response = await client.put(
+            "/api/v1/admin/profiling",
+            json={"enabled": True, "sample_rate": 0.25, "allow_header": True},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert data["sample_rate"] == 0.25
+        assert data["stack_sampling"] is False
+
+        profiled = await client.get("/health", headers={"X-Profile": "spans"})
+        assert profiled.headers.get("x-trace-id")
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_sample_rate(
+        self, client: AsyncClient, admin_headers: dict, platform_admin: None
+    ):
+        response = await client.put(
+            "/api/v1/admin/profiling", json={"sample_rate": 2.0}, headers=admin_headers
+        )
+        assert response.status_code == 422
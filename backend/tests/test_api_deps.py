@@ -5,6 +5,7 @@ Unit tests for auth dependencies, rate limiting, feature gates,
 step-up auth, org role lookup, and API usage tracking.
 """
 
+import time
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -29,6 +30,7 @@ from app.api.deps import (
     get_user_org_security_policy,
     get_user_policy_role,
     merge_org_security_policy_settings,
+    rate_limit,
     require_feature,
     require_tier,
     resolve_user_id,
@@ -664,60 +666,77 @@ class TestGetUserOrgSecurityPolicy:
 # ---------------------------------------------------------------------------
 
 
+def _limiter_with_script(*results):
+    limiter = RedisRateLimiter("redis://fake:6379")
+    script = AsyncMock(side_effect=list(results))
+    mock_redis = MagicMock()
+    mock_redis.register_script = MagicMock(return_value=script)
+    limiter._redis = mock_redis
+    return limiter, script
+
+
 class TestRedisRateLimiter:
     @pytest.mark.asyncio
     async def test_allowed_when_under_limit(self):
-        limiter = RedisRateLimiter("redis://fake:6379")
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=1)
-        mock_redis.expire = AsyncMock()
-        limiter._redis = mock_redis
+        limiter, _ = _limiter_with_script([1, 9, 0])
 
-        allowed, remaining = await limiter.is_allowed("test:key", 10, 3600)
+        allowed, remaining, _ = await limiter.is_allowed("test:key", 10, 3600)
         assert allowed is True
         assert remaining == 9
 
     @pytest.mark.asyncio
     async def test_denied_when_over_limit(self):
-        limiter = RedisRateLimiter("redis://fake:6379")
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=11)
-        limiter._redis = mock_redis
+        limiter, _ = _limiter_with_script([0, 0, 360000])
 
-        allowed, remaining = await limiter.is_allowed("test:key", 10, 3600)
+        allowed, remaining, retry_after_ms = await limiter.is_allowed("test:key", 10, 3600)
         assert allowed is False
         assert remaining == 0
+        assert retry_after_ms == 360000
 
     @pytest.mark.asyncio
-    async def test_expire_called_on_first_request(self):
-        limiter = RedisRateLimiter("redis://fake:6379")
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=1)
-        mock_redis.expire = AsyncMock()
-        limiter._redis = mock_redis
+    async def test_single_script_call_with_interval_and_cost(self):
+        limiter, script = _limiter_with_script([5, 5, 0])
 
-        await limiter.is_allowed("test:key", 10, 3600)
-        mock_redis.expire.assert_called_once_with("rate:test:key", 3600)
+        await limiter.is_allowed("test:key", 10, 3600, cost=5)
+        script.assert_awaited_once_with(keys=["rate:test:key"], args=[360000.0, 3600000, 5, 0])
+
+    @pytest.mark.asyncio
+    async def test_hot_key_leases_tokens_locally(self):
+        limiter, script = _limiter_with_script([1, 999, 0], [2, 997, 0], [3, 994, 0])
+
+        assert await limiter.is_allowed("hot", 1000, 3600) == (True, 999, 0)
+        # The second call within the lease window asks for one extra token...
+        assert await limiter.is_allowed("hot", 1000, 3600) == (True, 997, 0)
+        assert script.await_args.kwargs["args"][3] == 1
+        # ...which the third call spends without touching Redis.
+        assert await limiter.is_allowed("hot", 1000, 3600) == (True, 997, 0)
+        assert script.await_count == 2
+
+        assert await limiter.is_allowed("hot", 1000, 3600) == (True, 994, 0)
+        assert script.await_args.kwargs["args"][3] == 2
 
     @pytest.mark.asyncio
-    async def test_expire_not_called_on_subsequent(self):
-        limiter = RedisRateLimiter("redis://fake:6379")
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(return_value=5)
-        mock_redis.expire = AsyncMock()
-        limiter._redis = mock_redis
+    async def test_small_limits_never_lease(self):
+        limiter, script = _limiter_with_script([1, 9, 0], [1, 8, 0])
 
         await limiter.is_allowed("test:key", 10, 3600)
-        mock_redis.expire.assert_not_called()
+        await limiter.is_allowed("test:key", 10, 3600)
+        assert script.await_args.kwargs["args"][3] == 0
+
+    @pytest.mark.asyncio
+    async def test_idle_leases_are_evicted(self):
+        limiter, _ = _limiter_with_script([1, 9, 0], [1, 9, 0])
+
+        await limiter.is_allowed("ip:10.0.0.1:/a", 10, 3600)
+        with patch("app.api.deps.time.monotonic", return_value=time.monotonic() + 120):
+            await limiter.is_allowed("ip:10.0.0.2:/b", 10, 3600)
+        assert list(limiter._leases) == ["rate:ip:10.0.0.2:/b"]
 
     @pytest.mark.asyncio
     async def test_fails_open_on_redis_error(self):
-        limiter = RedisRateLimiter("redis://fake:6379")
-        mock_redis = AsyncMock()
-        mock_redis.incr = AsyncMock(side_effect=ConnectionError("Redis down"))
-        limiter._redis = mock_redis
+        limiter, _ = _limiter_with_script(ConnectionError("Redis down"))
 
-        allowed, remaining = await limiter.is_allowed("test:key", 10, 3600)
+        allowed, remaining, _ = await limiter.is_allowed("test:key", 10, 3600)
         assert allowed is True
         assert remaining == 10
 
@@ -741,10 +760,10 @@ class TestCheckRateLimit:
         request = MagicMock()
 
         with patch("app.api.deps.rate_limiter") as mock_rl:
-            mock_rl.is_allowed = AsyncMock(return_value=(True, 1999))
+            mock_rl.is_allowed = AsyncMock(return_value=(True, 1999, 0))
             await check_rate_limit(request, auth)
             mock_rl.is_allowed.assert_called_once_with(
-                key="user:1", max_requests=2000, window_seconds=3600
+                key="user:1", max_requests=2000, window_seconds=3600, cost=1
             )
 
     @pytest.mark.asyncio
@@ -758,10 +777,10 @@ class TestCheckRateLimit:
             patch("app.api.deps.settings") as mock_settings,
         ):
             mock_settings.debug = False
-            mock_rl.is_allowed = AsyncMock(return_value=(True, 49))
+            mock_rl.is_allowed = AsyncMock(return_value=(True, 49, 0))
             await check_rate_limit(request, None)
             mock_rl.is_allowed.assert_called_once_with(
-                key="ip:10.0.0.1:/api/v1/test", max_requests=50, window_seconds=3600
+                key="ip:10.0.0.1:/api/v1/test", max_requests=50, window_seconds=3600, cost=1
             )
 
     @pytest.mark.asyncio
@@ -775,7 +794,7 @@ class TestCheckRateLimit:
             patch("app.api.deps.settings") as mock_settings,
         ):
             mock_settings.debug = True
-            mock_rl.is_allowed = AsyncMock(return_value=(True, 199))
+            mock_rl.is_allowed = AsyncMock(return_value=(True, 199, 0))
             await check_rate_limit(request, None)
             call_args = mock_rl.is_allowed.call_args
             assert call_args.kwargs["max_requests"] == 200
@@ -788,10 +807,25 @@ class TestCheckRateLimit:
         request = MagicMock()
 
         with patch("app.api.deps.rate_limiter") as mock_rl:
-            mock_rl.is_allowed = AsyncMock(return_value=(False, 0))
+            mock_rl.is_allowed = AsyncMock(return_value=(False, 0, 1500))
             with pytest.raises(HTTPException) as exc:
                 await check_rate_limit(request, auth)
             assert exc.value.status_code == 429
+            assert exc.value.headers["Retry-After"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_weighted_route_charges_cost(self):
+        auth = UserAuth(
+            id=1, email="a@b.com", full_name=None, company_name=None, tier="free", is_active=True
+        )
+        request = MagicMock()
+
+        with patch("app.api.deps.rate_limiter") as mock_rl:
+            mock_rl.is_allowed = AsyncMock(return_value=(False, 2, 179200))
+            with pytest.raises(HTTPException) as exc:
+                await rate_limit(5)(request, auth)
+            assert mock_rl.is_allowed.call_args.kwargs["cost"] == 5
+            assert exc.value.headers["Retry-After"] == "180"
 
     @pytest.mark.asyncio
     async def test_free_tier_limit(self):
@@ -801,7 +835,7 @@ class TestCheckRateLimit:
         request = MagicMock()
 
         with patch("app.api.deps.rate_limiter") as mock_rl:
-            mock_rl.is_allowed = AsyncMock(return_value=(True, 99))
+            mock_rl.is_allowed = AsyncMock(return_value=(True, 99, 0))
             await check_rate_limit(request, auth)
             call_args = mock_rl.is_allowed.call_args
             assert call_args.kwargs["max_requests"] == 100
@@ -2,9 +2,13 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+
 from app.models.capture import BidScorecardRecommendation
+from app.services import bid_scenario_service
 from app.services.bid_scenario_service import (
     BidScenarioService,
+    MonteCarloSettings,
     ScenarioAdjustment,
     ScenarioDefinition,
 )
@@ -226,3 +230,98 @@ class TestSimulate:
         scenario = result["scenarios"][0]
         assert scenario["decision_risk"] in ("low", "medium", "high")
         assert 0 <= scenario["risk_score"] <= 1
+
+
+class TestSimulateBatch:
+    svc = BidScenarioService()
+    criteria = [
+        {"name": "price_competitiveness", "weight": 40, "score": 80},
+        {"name": "technical_capability", "weight": 60, "score": 65},
+    ]
+
+    def test_zero_noise_matches_deterministic_simulation(self):
+        scorecard = _make_scorecard(criteria_scores=self.criteria)
+        scenario = ScenarioDefinition(
+            name="Price war",
+            adjustments=[ScenarioAdjustment("price_competitiveness", -30.0)],
+        )
+        settings = MonteCarloSettings(iterations=200, score_std=0.0, weight_std=0.0, seed=1)
+
+        batch = self.svc.simulate_batch([scorecard], [scenario], settings)
+        single = self.svc.simulate(scorecard, [scenario])
+
+        baseline, price_war = batch["scorecards"][0]["scenarios"]
+        assert baseline["overall_score"] == single["baseline"]["overall_score"]
+        assert price_war["overall_score"] == single["scenarios"][0]["overall_score"]
+        assert price_war["distribution"]["std"] == 0.0
+        assert price_war["recommendation_change_probability"] == 1.0
+
+    def test_portfolio_with_mixed_criteria_counts(self):
+        cards = [
+            _make_scorecard(criteria_scores=self.criteria),
+            _make_scorecard(criteria_scores=[], overall_score=40.0),
+        ]
+        result = self.svc.simulate_batch(
+            cards, settings=MonteCarloSettings(iterations=1000, seed=3)
+        )
+
+        first, legacy = result["scorecards"]
+        assert len(first["scenarios"][0]["sensitivities"]) == 2
+        assert len(legacy["scenarios"][0]["sensitivities"]) == 12
+        assert legacy["baseline_recommendation"] == "no_bid"
+        for card in result["scorecards"]:
+            baseline = card["scenarios"][0]
+            interval = baseline["confidence_interval"]
+            assert interval["lower"] <= baseline["distribution"]["p50"] <= interval["upper"]
+            assert sum(baseline["recommendation_probabilities"].values()) == pytest.approx(1.0)
+
+    def test_tornado_ranks_heavier_criterion_first(self):
+        scorecard = _make_scorecard(criteria_scores=self.criteria)
+        result = self.svc.simulate_batch([scorecard], settings=MonteCarloSettings(seed=5))
+
+        sensitivities = result["scorecards"][0]["scenarios"][0]["sensitivities"]
+        assert [row["criterion"] for row in sensitivities] == [
+            "technical_capability",
+            "price_competitiveness",
+        ]
+        top = sensitivities[0]
+        assert top["low_score"] < 71.0 < top["high_score"]
+        assert top["correlation"] > sensitivities[1]["correlation"] > 0
+
+    def test_seed_makes_results_reproducible(self):
+        scorecard = _make_scorecard(criteria_scores=self.criteria)
+        settings = MonteCarloSettings(iterations=300, seed=11)
+        assert self.svc.simulate_batch([scorecard], settings=settings) == (
+            self.svc.simulate_batch([scorecard], settings=settings)
+        )
+
+    def test_empty_portfolio(self):
+        assert self.svc.simulate_batch([])["scorecards"] == []
+
+    def test_chunked_run_matches_single_block(self, monkeypatch):
+        cards = [
+            _make_scorecard(criteria_scores=self.criteria),
+            _make_scorecard(criteria_scores=[], overall_score=60.0),
+            _make_scorecard(criteria_scores=self.criteria[:1]),
+        ]
+        scenarios = [
+            ScenarioDefinition(
+                name="Price war",
+                adjustments=[ScenarioAdjustment("price_competitiveness", -30.0)],
+            ),
+            ScenarioDefinition(
+                name="Tech lift",
+                adjustments=[ScenarioAdjustment("technical_capability", 15.0)],
+            ),
+        ]
+        settings = MonteCarloSettings(iterations=400, seed=21)
+        whole = self.svc.simulate_batch(cards, scenarios, settings)
+
+        # One scorecard x one scenario per block.
+        monkeypatch.setattr(bid_scenario_service, "MAX_CHUNK_ELEMENTS", 400 * 12)
+        chunked = self.svc.simulate_batch(cards, scenarios, settings)
+
+        assert chunked == whole
+        for card in whole["scorecards"]:
+            for scenario in card["scenarios"]:
+                assert sum(scenario["distribution"]["histogram"]) == 400
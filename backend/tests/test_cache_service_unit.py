@@ -1,12 +1,23 @@
 """
 Cache Service Unit Tests
 =========================
-Tests for MemoryCache (no Redis dependency).
+Tests for MemoryCache and read-through caching (no Redis dependency).
 """
 
+import asyncio
+import time
+
 import pytest
 
-from app.services.cache_service import MemoryCache
+from app.services.cache_service import (
+    TAG_KEY_PREFIX,
+    MemoryCache,
+    RedisCache,
+    cache_get,
+    cache_get_or_compute,
+    cache_invalidate_tags,
+    cache_set,
+)
 
 
 @pytest.fixture
@@ -73,3 +84,117 @@ class TestMemoryCache:
         await cache.set("key", "v1", ttl_seconds=300)
         await cache.set("key", "v2", ttl_seconds=300)
         assert await cache.get("key") == "v2"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_drops_tagged_keys(self, cache: MemoryCache):
+        await cache.set("detail", {"id": 1}, ttl_seconds=300, tags=["rfp:1"])
+        await cache.set("list", [1, 2], ttl_seconds=300, tags=["rfp:1", "user:1"])
+        await cache.set("other", [3], ttl_seconds=300, tags=["user:2"])
+
+        assert await cache.invalidate_tags(["rfp:1"]) == 2
+        assert await cache.get("detail") is None
+        assert await cache.get("list") is None
+        assert await cache.get("other") == [3]
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self._commands: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self._commands.append((name, args))
+
+    async def execute(self):
+        return [getattr(self._redis, name)(*args) for name, args in self._commands]
+
+
+class _FakeRedis:
+    """Only the commands tag invalidation uses; every key is named explicitly."""
+
+    def __init__(self):
+        self.strings: dict[str, str] = {}
+        self.sets: dict[str, set[str]] = {}
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+        return len(members)
+
+    def delete(self, key):
+        return int(self.strings.pop(key, None) is not None)
+
+
+class TestRedisTagInvalidation:
+    @pytest.mark.asyncio
+    async def test_deletes_members_with_explicit_keys(self):
+        redis = _FakeRedis()
+        redis.strings.update({"detail": "1", "list": "2", "other": "3"})
+        redis.sets[TAG_KEY_PREFIX + "rfp:1"] = {"detail", "list"}
+        redis.sets[TAG_KEY_PREFIX + "user:1"] = {"list", "other"}
+        cache = RedisCache.__new__(RedisCache)
+        cache._redis = redis
+
+        assert await cache.invalidate_tags(["rfp:1", "user:1"]) == 3
+        assert redis.strings == {}
+        assert redis.sets[TAG_KEY_PREFIX + "rfp:1"] == set()
+
+
+class TestReadThrough:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": calls}
+
+        results = await asyncio.gather(
+            *(cache_get_or_compute("rt:single", compute, tags=["t:1"]) for _ in range(5))
+        )
+        assert calls == 1
+        assert results == [{"value": 1}] * 5
+        assert await cache_get_or_compute("rt:single", compute) == {"value": 1}
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation_forces_recompute(self):
+        values = iter(["first", "second"])
+
+        async def compute():
+            return next(values)
+
+        assert await cache_get_or_compute("rt:tagged", compute, tags=["rfp:7"]) == "first"
+        await cache_invalidate_tags(["rfp:7"])
+        assert await cache_get_or_compute("rt:tagged", compute, tags=["rfp:7"]) == "second"
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_refreshing(self):
+        values = iter(["old", "new"])
+
+        async def compute():
+            return next(values)
+
+        await cache_get_or_compute("rt:stale", compute, ttl_seconds=60, stale_seconds=60)
+        # Age the entry past its freshness window but within the stale window.
+        envelope = await cache_get("rt:stale")
+        envelope["fresh_until"] = time.time() - 1
+        await cache_set("rt:stale", envelope, ttl_seconds=60)
+
+        served = await cache_get_or_compute("rt:stale", compute, ttl_seconds=60, stale_seconds=60)
+        assert served == "old"
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert (await cache_get("rt:stale"))["value"] == "new"
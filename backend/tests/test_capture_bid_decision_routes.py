@@ -5,6 +5,7 @@ Integration tests for capture/bid_decision.py:
   - GET  /capture/scorecards/{rfp_id}
   - GET  /capture/scorecards/{rfp_id}/summary
   - POST /capture/scorecards/{rfp_id}/scenario-simulator
+  - POST /capture/scorecards/scenario-simulator/batch
 """
 
 import pytest
@@ -324,3 +325,80 @@ class TestScenarioSimulator:
         assert response.status_code == 200
         data = response.json()
         assert "baseline" in data or "scenarios" in data or isinstance(data, dict)
+
+
+class TestScenarioSimulatorBatch:
+    """Tests for POST /capture/scorecards/scenario-simulator/batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_requires_auth(self, client: AsyncClient):
+        response = await client.post(
+            f"{PREFIX}/scorecards/scenario-simulator/batch", json={"rfp_ids": [1]}
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_batch_idor(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_rfp: RFP,
+        test_scorecard: BidScorecard,
+    ):
+        _, other_headers = await _create_second_user(db_session)
+        response = await client.post(
+            f"{PREFIX}/scorecards/scenario-simulator/batch",
+            headers=other_headers,
+            json={"rfp_ids": [test_rfp.id]},
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_batch_success(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        test_rfp: RFP,
+        test_scorecard: BidScorecard,
+    ):
+        response = await client.post(
+            f"{PREFIX}/scorecards/scenario-simulator/batch",
+            headers=auth_headers,
+            json={
+                "rfp_ids": [test_rfp.id, 99999],
+                "iterations": 500,
+                "seed": 7,
+                "scenarios": [
+                    {
+                        "name": "Price war",
+                        "adjustments": [{"criterion": "price_competitiveness", "delta": -20}],
+                    }
+                ],
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["missing_rfp_ids"] == [99999]
+        assert data["settings"]["iterations"] == 500
+        (card,) = data["scorecards"]
+        assert card["rfp_id"] == test_rfp.id
+        assert [s["name"] for s in card["scenarios"]] == ["Baseline", "Price war"]
+        baseline = card["scenarios"][0]
+        assert sum(baseline["distribution"]["histogram"]) == 500
+        assert baseline["confidence_interval"]["lower"] <= baseline["distribution"]["p50"]
+        assert baseline["sensitivities"]
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_oversized_simulation(
+        self, client: AsyncClient, auth_headers: dict, test_rfp: RFP
+    ):
+        response = await client.post(
+            f"{PREFIX}/scorecards/scenario-simulator/batch",
+            headers=auth_headers,
+            json={
+                "rfp_ids": list(range(1, 201)),
+                "iterations": 20000,
+                "scenarios": [{"name": f"S{i}"} for i in range(20)],
+            },
+        )
+        assert response.status_code == 422
@@ -2,11 +2,14 @@
 Tests for collaboration/sharing routes - Data sharing, governance, and audit endpoints.
 """
 
+from datetime import datetime, timedelta
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.routes.collaboration import helpers
 from app.models.collaboration import (
     ShareApprovalStatus,
     SharedDataPermission,
@@ -579,6 +582,135 @@ class TestGovernanceTrends:
         assert data["days"] == 7
         assert data["sla_hours"] == 48
 
+    @pytest.mark.asyncio
+    async def test_governance_trends_bucket_shares_and_sla(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        owner_headers: dict,
+        test_workspace: SharedWorkspace,
+    ):
+        now = datetime.utcnow()
+        today = now.replace(hour=12, minute=0, second=0, microsecond=0)
+        if today > now:
+            today -= timedelta(days=1)
+        yesterday = today - timedelta(days=1)
+        rows = [
+            # Approved within SLA yesterday (2h).
+            (yesterday - timedelta(hours=2), ShareApprovalStatus.APPROVED, yesterday),
+            # Approved after SLA yesterday (30h).
+            (yesterday - timedelta(hours=30), ShareApprovalStatus.APPROVED, yesterday),
+            # Pending beyond SLA.
+            (today - timedelta(hours=48), ShareApprovalStatus.PENDING, None),
+            # Outside the window entirely.
+            (today - timedelta(days=60), ShareApprovalStatus.APPROVED, today - timedelta(days=59)),
+        ]
+        for index, (created_at, status, approved_at) in enumerate(rows):
+            db_session.add(
+                SharedDataPermission(
+                    workspace_id=test_workspace.id,
+                    data_type=SharedDataType.RFP_SUMMARY,
+                    entity_id=100 + index,
+                    requires_approval=True,
+                    approval_status=status,
+                    approved_at=approved_at,
+                    created_at=created_at,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/collaboration/workspaces/{test_workspace.id}/shared/governance-trends",
+            headers=owner_headers,
+            params={"days": 7, "sla_hours": 24},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        points = {point["date"]: point for point in data["points"]}
+        assert len(points) == 7
+        approved_point = points[yesterday.date().isoformat()]
+        assert approved_point["approvals_completed_count"] == 2
+        assert approved_point["approved_within_sla_count"] == 1
+        assert approved_point["approved_after_sla_count"] == 1
+        assert approved_point["average_approval_hours"] == 16.0
+        assert sum(point["shared_count"] for point in data["points"]) == 3
+        assert data["overdue_pending_count"] == 1
+        assert data["sla_approval_rate"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_governance_summary_cache_invalidated_on_approve(
+        self,
+        client: AsyncClient,
+        owner_headers: dict,
+        test_workspace: SharedWorkspace,
+        pending_permission: SharedDataPermission,
+    ):
+        url = f"/api/v1/collaboration/workspaces/{test_workspace.id}/shared/governance-summary"
+        before = await client.get(url, headers=owner_headers)
+        assert before.json()["pending_approval_count"] == 1
+
+        approved = await client.post(
+            f"/api/v1/collaboration/workspaces/{test_workspace.id}"
+            f"/shared/{pending_permission.id}/approve",
+            headers=owner_headers,
+        )
+        assert approved.status_code == 200
+
+        after = await client.get(url, headers=owner_headers)
+        assert after.json()["pending_approval_count"] == 0
+        assert after.json()["approved_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_governance_cache_ttl_ends_at_next_time_boundary(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        owner_headers: dict,
+        test_workspace: SharedWorkspace,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        now = datetime.utcnow()
+        db_session.add_all(
+            [
+                SharedDataPermission(
+                    workspace_id=test_workspace.id,
+                    data_type=SharedDataType.RFP_SUMMARY,
+                    entity_id=201,
+                    requires_approval=False,
+                    approval_status=ShareApprovalStatus.APPROVED,
+                    expires_at=now + timedelta(seconds=90),
+                ),
+                SharedDataPermission(
+                    workspace_id=test_workspace.id,
+                    data_type=SharedDataType.FORECAST,
+                    entity_id=202,
+                    requires_approval=True,
+                    approval_status=ShareApprovalStatus.PENDING,
+                    created_at=now - timedelta(hours=24) + timedelta(seconds=120),
+                ),
+            ]
+        )
+        await db_session.commit()
+
+        ttls: dict[str, int | None] = {}
+        original_cache_set = helpers.cache_set
+
+        async def recording_cache_set(key, value, ttl_seconds=None, tags=()):
+            ttls[key.split(":")[3]] = ttl_seconds
+            await original_cache_set(key, value, ttl_seconds=ttl_seconds, tags=tags)
+
+        monkeypatch.setattr(helpers, "cache_set", recording_cache_set)
+        base = f"/api/v1/collaboration/workspaces/{test_workspace.id}/shared"
+        summary = await client.get(f"{base}/governance-summary", headers=owner_headers)
+        trends = await client.get(
+            f"{base}/governance-trends", headers=owner_headers, params={"sla_hours": 24}
+        )
+        assert summary.json()["expiring_7d_count"] == 1
+        assert trends.json()["overdue_pending_count"] == 0
+        # Expiry in 90s and the pending share going overdue in 120s fire no event.
+        assert 0 < ttls["summary"] <= 90
+        assert 0 < ttls["trends"] <= 120
+
 
 class TestGovernanceAnomalies:
     """Tests for GET /api/v1/collaboration/workspaces/{workspace_id}/shared/governance-anomalies."""
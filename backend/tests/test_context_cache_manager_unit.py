@@ -0,0 +1,231 @@
+"""
+Unit tests for the Gemini context cache manager.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.config import settings
+from app.models.knowledge_base import (
+    DocumentType,
+    GeminiContextCache,
+    KnowledgeBaseDocument,
+    ProcessingStatus,
+)
+from app.models.user import User
+from app.services.context_cache_manager import (
+    DISPLAY_NAME_PREFIX,
+    ContextCacheManager,
+    content_key,
+    storage_cost_usd,
+)
+
+
+class _FakeGemini:
+    api_key = "test-key"
+
+    def __init__(self) -> None:
+        self.created: list[str] = []
+        self.extended: list[str] = []
+        self.deleted: list[str] = []
+        self.remote: list[SimpleNamespace] = []
+
+    async def create_cached_content(self, documents, display_name, ttl_hours=24):
+        name = f"cachedContents/{len(self.created) + 1}"
+        self.created.append(name)
+        return SimpleNamespace(
+            name=name,
+            display_name=display_name,
+            usage_metadata=SimpleNamespace(total_token_count=50_000),
+        )
+
+    async def extend_context_cache(self, cache_name, ttl_hours):
+        self.extended.append(cache_name)
+        return True
+
+    async def delete_context_cache(self, cache_name):
+        self.deleted.append(cache_name)
+        return True
+
+    async def list_context_caches(self):
+        return self.remote
+
+
+@pytest.fixture(autouse=True)
+def small_min_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "gemini_context_cache_min_tokens", 10)
+
+
+async def _add_doc(session: AsyncSession, user: User, name: str, text: str):
+    doc = KnowledgeBaseDocument(
+        user_id=user.id,
+        title=name,
+        document_type=DocumentType.PAST_PERFORMANCE,
+        original_filename=name,
+        file_path=f"/tmp/{name}",
+        processing_status=ProcessingStatus.READY,
+        full_text=text,
+    )
+    session.add(doc)
+    await session.commit()
+    await session.refresh(doc)
+    return doc
+
+
+class TestContentKey:
+    def test_order_independent_and_content_sensitive(self):
+        a = KnowledgeBaseDocument(
+            user_id=1, title="a", original_filename="a.pdf", file_path="a", full_text="alpha"
+        )
+        b = KnowledgeBaseDocument(
+            user_id=1, title="b", original_filename="b.pdf", file_path="b", full_text="beta"
+        )
+        assert content_key([a, b], "pro") == content_key([b, a], "pro")
+        assert content_key([a, b], "pro") != content_key([a, b], "flash")
+        key = content_key([a, b], "pro")
+        b.full_text = "beta v2"
+        assert content_key([a, b], "pro") != key
+
+
+class TestAcquire:
+    @pytest.mark.asyncio
+    async def test_reuses_cache_for_same_document_set(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        gemini = _FakeGemini()
+        manager = ContextCacheManager(gemini)
+        a = await _add_doc(db_session, test_user, "a.pdf", "alpha " * 100)
+        b = await _add_doc(db_session, test_user, "b.pdf", "beta " * 100)
+
+        first = await manager.acquire(db_session, test_user.id, [a, b])
+        second = await manager.acquire(db_session, test_user.id, [b, a])
+
+        assert first is not None and second is not None
+        assert first.cache_name == second.cache_name
+        assert gemini.created == [first.cache_name]
+        assert second.hit_count == 1
+        assert second.token_count == 50_000
+
+        only_a = await manager.acquire(db_session, test_user.id, [a])
+        assert only_a.cache_name != first.cache_name
+
+    @pytest.mark.asyncio
+    async def test_small_document_sets_stay_inline(
+        self, db_session: AsyncSession, test_user: User, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "gemini_context_cache_min_tokens", 10_000)
+        gemini = _FakeGemini()
+        doc = await _add_doc(db_session, test_user, "a.pdf", "short text")
+
+        assert await ContextCacheManager(gemini).acquire(db_session, test_user.id, [doc]) is None
+        assert gemini.created == []
+
+    @pytest.mark.asyncio
+    async def test_extends_cache_close_to_expiry_on_use(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        gemini = _FakeGemini()
+        manager = ContextCacheManager(gemini)
+        doc = await _add_doc(db_session, test_user, "a.pdf", "alpha " * 100)
+        entry = await manager.acquire(db_session, test_user.id, [doc])
+        entry.expires_at = datetime.utcnow() + timedelta(minutes=30)
+        await db_session.commit()
+        cost_before = storage_cost_usd(entry)
+
+        again = await manager.acquire(db_session, test_user.id, [doc])
+
+        assert gemini.extended == [entry.cache_name]
+        assert again.refresh_count == 1
+        assert again.expires_at > datetime.utcnow() + timedelta(hours=23)
+        assert storage_cost_usd(again) > cost_before
+
+
+class TestMaintenance:
+    @pytest.mark.asyncio
+    async def test_refresh_expiring_skips_idle_caches(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        gemini = _FakeGemini()
+        manager = ContextCacheManager(gemini)
+        soon = datetime.utcnow() + timedelta(minutes=20)
+        for name, last_used in (
+            ("cachedContents/active", datetime.utcnow()),
+            ("cachedContents/idle", datetime.utcnow() - timedelta(days=3)),
+        ):
+            db_session.add(
+                GeminiContextCache(
+                    user_id=test_user.id,
+                    content_key=name[-6:].rjust(64, "0"),
+                    cache_name=name,
+                    model_name="pro",
+                    token_count=1000,
+                    expires_at=soon,
+                    last_used_at=last_used,
+                )
+            )
+        await db_session.commit()
+
+        assert await manager.refresh_expiring(db_session) == 1
+        assert gemini.extended == ["cachedContents/active"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_expired_stale_and_orphaned(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        gemini = _FakeGemini()
+        manager = ContextCacheManager(gemini)
+        doc = await _add_doc(db_session, test_user, "a.pdf", "alpha " * 100)
+        live = await manager.acquire(db_session, test_user.id, [doc])
+        other = await _add_doc(db_session, test_user, "b.pdf", "beta " * 100)
+        stale = await manager.acquire(db_session, test_user.id, [other])
+        other.full_text = "beta rewritten " * 100
+        db_session.add(
+            GeminiContextCache(
+                user_id=test_user.id,
+                content_key="e" * 64,
+                cache_name="cachedContents/expired",
+                model_name="pro",
+                expires_at=datetime.utcnow() - timedelta(hours=1),
+            )
+        )
+        await db_session.commit()
+        old = datetime.now(UTC) - timedelta(hours=2)
+        gemini.remote = [
+            SimpleNamespace(
+                name=live.cache_name, display_name=DISPLAY_NAME_PREFIX, create_time=old
+            ),
+            SimpleNamespace(
+                name="cachedContents/orphan", display_name=DISPLAY_NAME_PREFIX, create_time=old
+            ),
+            SimpleNamespace(
+                name="cachedContents/new",
+                display_name=DISPLAY_NAME_PREFIX,
+                create_time=datetime.now(UTC),
+            ),
+            SimpleNamespace(name="cachedContents/foreign", display_name="other", create_time=old),
+        ]
+
+        result = await manager.cleanup(db_session)
+
+        assert result == {"expired": 1, "stale": 1, "orphaned": 1}
+        assert set(gemini.deleted) == {stale.cache_name, "cachedContents/orphan"}
+        remaining = (await db_session.execute(select(GeminiContextCache))).scalars().all()
+        assert [entry.cache_name for entry in remaining] == [live.cache_name]
+
+    @pytest.mark.asyncio
+    async def test_usage_summary(self, db_session: AsyncSession, test_user: User):
+        manager = ContextCacheManager(_FakeGemini())
+        doc = await _add_doc(db_session, test_user, "a.pdf", "alpha " * 100)
+        await manager.acquire(db_session, test_user.id, [doc])
+
+        summary = await manager.usage_summary(db_session, test_user.id)
+
+        assert summary["caches"] == 1
+        assert summary["cached_tokens"] == 50_000
+        assert summary["estimated_cost_usd"] == pytest.approx(
+            50_000 * 24 / 1_000_000 * settings.gemini_context_cache_usd_per_mtok_hour, abs=1e-3
+        )
@@ -0,0 +1,171 @@
+"""
+Deadline reminder engine tests.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.notification import (
+    Notification,
+    NotificationPreferences,
+    NotificationType,
+)
+from app.models.rfp import RFP
+from app.models.user import User
+from app.services.deadline_reminder_service import (
+    DeliveryOutbox,
+    deliver_stored_reminder,
+    find_due_reminders,
+    insert_reminder_notifications,
+    run_deadline_reminders,
+)
+
+TODAY = datetime(2026, 3, 2).date()
+
+
+def _deadline(days: int) -> datetime:
+    return datetime.combine(TODAY + timedelta(days=days), datetime.min.time()) + timedelta(hours=17)
+
+
+@pytest_asyncio.fixture
+async def reminder_setup(db_session: AsyncSession, test_user: User) -> dict:
+    prefs = NotificationPreferences(
+        user_id=test_user.id,
+        email_enabled=True,
+        email_address="capture@example.com",
+        slack_enabled=True,
+        slack_webhook_url="https://hooks.slack.test/abc",
+        deadline_days_before=[7, 3, 1],
+    )
+    db_session.add(prefs)
+    rfps = []
+    for index, days in enumerate([1, 2, 3, 7, 10]):
+        rfp = RFP(
+            user_id=test_user.id,
+            title=f"Reminder RFP {days}d",
+            solicitation_number=f"REM-{index}",
+            agency="GSA",
+            response_deadline=_deadline(days),
+        )
+        db_session.add(rfp)
+        rfps.append(rfp)
+    await db_session.commit()
+    return {"prefs": prefs, "rfps": rfps}
+
+
+class TestFindDueReminders:
+    async def test_matches_configured_days_only(
+        self, db_session: AsyncSession, reminder_setup: dict
+    ):
+        due = await find_due_reminders(db_session, today=TODAY)
+        assert sorted(r.days_until for r in due) == [1, 3, 7]
+
+    async def test_disabled_preferences_skip(self, db_session: AsyncSession, reminder_setup: dict):
+        reminder_setup["prefs"].deadline_reminders = False
+        await db_session.commit()
+        assert await find_due_reminders(db_session, today=TODAY) == []
+
+
+class TestRunDeadlineReminders:
+    async def test_inserts_and_delivers_once(self, db_session: AsyncSession, reminder_setup: dict):
+        send_email = AsyncMock(return_value=True)
+        send_slack = AsyncMock(return_value=True)
+        with (
+            patch("app.services.notification_channels.email_service.send_email", send_email),
+            patch("app.services.notification_channels.slack_service.send_webhook", send_slack),
+        ):
+            stats = await run_deadline_reminders(db_session, today=TODAY)
+            assert stats["created"] == 3
+            assert stats["delivered"] == 6
+            assert send_email.await_count == 3
+            assert send_slack.await_count == 3
+
+            # Re-running the same day is a no-op.
+            rerun = await run_deadline_reminders(db_session, today=TODAY)
+            assert rerun["created"] == 0
+            assert rerun["skipped_existing"] == 3
+            assert send_email.await_count == 3
+
+        rows = (
+            (
+                await db_session.execute(
+                    select(Notification).where(
+                        Notification.notification_type == NotificationType.DEADLINE_REMINDER
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert len(rows) == 3
+        assert all(row.is_sent for row in rows)
+        assert {row.title for row in rows} == {
+            "RFP Deadline in 1 day",
+            "RFP Deadline in 3 days",
+            "RFP Deadline in 7 days",
+        }
+
+    async def test_failed_delivery_is_retried(self, db_session: AsyncSession, reminder_setup: dict):
+        reminder_setup["prefs"].slack_enabled = False
+        await db_session.commit()
+        send_email = AsyncMock(side_effect=[False, True, RuntimeError("boom"), True, True])
+        with patch("app.services.notification_channels.email_service.send_email", send_email):
+            outbox = DeliveryOutbox(concurrency=1, backoff_seconds=0)
+            stats = await run_deadline_reminders(db_session, today=TODAY, outbox=outbox)
+        assert stats["delivered"] == 3
+        assert stats["failed"] == 0
+        assert send_email.await_count == 5
+
+    async def test_exhausted_delivery_is_handed_to_celery(
+        self, db_session: AsyncSession, reminder_setup: dict
+    ):
+        reminder_setup["prefs"].slack_enabled = False
+        await db_session.commit()
+        send_email = AsyncMock(return_value=False)
+        with (
+            patch("app.services.notification_channels.email_service.send_email", send_email),
+            patch("app.tasks.maintenance_tasks.retry_reminder_delivery.apply_async") as retry,
+        ):
+            outbox = DeliveryOutbox(max_attempts=1, backoff_seconds=0)
+            stats = await run_deadline_reminders(db_session, today=TODAY, outbox=outbox)
+
+        assert stats["failed"] == 3
+        assert stats["retries_scheduled"] == 3
+        assert {call.args[0][1] for call in retry.call_args_list} == {"email"}
+
+        notification_id = retry.call_args_list[0].args[0][0]
+        with patch(
+            "app.services.notification_channels.email_service.send_email",
+            AsyncMock(return_value=True),
+        ):
+            assert await deliver_stored_reminder(db_session, notification_id, "email") is True
+        assert await deliver_stored_reminder(db_session, notification_id, "slack") is None
+        notification = await db_session.get(Notification, notification_id)
+        await db_session.refresh(notification)
+        assert notification.is_sent
+
+
+class TestInsertReminderNotifications:
+    async def test_conflicting_keys_are_skipped(
+        self, db_session: AsyncSession, reminder_setup: dict
+    ):
+        due = await find_due_reminders(db_session, today=TODAY)
+        first = await insert_reminder_notifications(db_session, due[:2])
+        # An overlapping run that already inserted some keys only adds the rest.
+        second = await insert_reminder_notifications(db_session, due + due)
+        assert len(first) == 2
+        assert [reminder.dedupe_key for reminder, _ in second] == [due[2].dedupe_key]
+
+
+class TestDeliveryOutbox:
+    async def test_gives_up_after_max_attempts(self):
+        attempts = AsyncMock(return_value=False)
+        outbox = DeliveryOutbox(max_attempts=2, backoff_seconds=0)
+        outbox.enqueue("slack", attempts)
+        outcome = await outbox.flush()
+        assert outcome["failed"] == 1
+        assert attempts.await_count == 2
@@ -4,11 +4,14 @@ RFP Sniper - Knowledge Base Document Tests
 Tests for document management in the knowledge base.
 """
 
+import os
+
 import pytest
 from httpx import AsyncClient
+from sqlmodel import select
 
 from app.config import settings
-from app.models.knowledge_base import KnowledgeBaseDocument
+from app.models.knowledge_base import DocumentChunk, KnowledgeBaseDocument
 
 
 class TestDocumentList:
@@ -143,6 +146,118 @@ class TestDocumentUpload:
         assert uploaded is not None
         assert "/rfp-sniper-uploads/" in uploaded.file_path.replace("\\", "/")
 
+    @pytest.mark.asyncio
+    async def test_duplicate_upload_reuses_stored_file_and_processing(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        db_session,
+        monkeypatch,
+        tmp_path,
+    ):
+        from app.api.routes import documents as document_routes
+
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        monkeypatch.setattr(
+            document_routes, "_should_process_documents_synchronously", lambda: True
+        )
+
+        ids = []
+        for title in ("Original", "Copy"):
+            response = await client.post(
+                "/api/v1/documents",
+                headers=auth_headers,
+                files={"file": ("same.txt", b"Identical capability text", "text/plain")},
+                data={"title": title, "document_type": "other"},
+            )
+            assert response.status_code == 200
+            assert response.json()["processing_status"] == "ready"
+            ids.append(response.json()["id"])
+
+        original = await db_session.get(KnowledgeBaseDocument, ids[0])
+        copy = await db_session.get(KnowledgeBaseDocument, ids[1])
+        assert copy.content_sha256 == original.content_sha256
+        assert len(copy.content_sha256) == 64
+        assert copy.file_path == original.file_path
+        assert copy.full_text == "Identical capability text"
+        assert copy.extracted_metadata["duplicate_of"] == original.id
+        stored_files = [path for path in tmp_path.rglob("*") if path.is_file()]
+        assert [path.name for path in stored_files] == [os.path.basename(original.file_path)]
+
+        chunks = await db_session.execute(
+            select(DocumentChunk).where(DocumentChunk.document_id == copy.id)
+        )
+        assert [chunk.content for chunk in chunks.scalars()] == ["Identical capability text"]
+
+        # The shared file survives until the last document using it is deleted.
+        response = await client.delete(f"/api/v1/documents/{ids[0]}", headers=auth_headers)
+        assert response.status_code == 200
+        assert os.path.exists(copy.file_path)
+        response = await client.delete(f"/api/v1/documents/{ids[1]}", headers=auth_headers)
+        assert response.status_code == 200
+        assert not os.path.exists(copy.file_path)
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_is_rejected_without_leaving_files(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        monkeypatch,
+        tmp_path,
+    ):
+        monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "max_upload_size_mb", 0)
+
+        response = await client.post(
+            "/api/v1/documents",
+            headers=auth_headers,
+            files={"file": ("big.txt", b"more than zero bytes", "text/plain")},
+            data={"title": "Too Big", "document_type": "other"},
+        )
+
+        assert response.status_code == 400
+        assert "File too large" in response.json()["detail"]
+        assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+
+class TestUploadSizeLimit:
+    """The size limit also applies to bodies sent without Content-Length."""
+
+    @staticmethod
+    def _client() -> AsyncClient:
+        from fastapi import FastAPI, Request
+        from httpx import ASGITransport
+
+        from app.main import MaxUploadSizeMiddleware
+
+        limited = FastAPI()
+        limited.add_middleware(MaxUploadSizeMiddleware, max_bytes=1024 * 1024)
+
+        @limited.post("/echo")
+        async def echo(request: Request) -> dict:
+            return {"size": len(await request.body())}
+
+        return AsyncClient(transport=ASGITransport(app=limited), base_url="http://test")
+
+    @staticmethod
+    async def _chunks(count: int):
+        for _ in range(count):
+            yield b"x" * (256 * 1024)
+
+    @pytest.mark.asyncio
+    async def test_chunked_body_within_limit_passes(self):
+        async with self._client() as limited_client:
+            response = await limited_client.post("/echo", content=self._chunks(4))
+        assert response.status_code == 200
+        assert response.json() == {"size": 1024 * 1024}
+
+    @pytest.mark.asyncio
+    async def test_chunked_body_over_limit_is_rejected(self):
+        async with self._client() as limited_client:
+            response = await limited_client.post("/echo", content=self._chunks(5))
+        assert response.status_code == 413
+        assert response.json()["detail"] == "Request body too large. Max 1MB."
+
 
 class TestDocumentDetail:
     """Tests for document detail retrieval."""
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 
 import pytest
@@ -12,6 +13,8 @@ from app.models.rfp import RFP
 from app.models.user import User
 from app.services.auth_service import create_token_pair, hash_password
 from app.services.email_ingest_service import EmailIngestService
+from app.services.encryption_service import encrypt_value
+from app.tasks.email_ingest_tasks import poll_email_configs
 
 
 def _auth_headers(user: User) -> dict[str, str]:
@@ -335,3 +338,90 @@ async def test_sync_now_allows_same_message_id_across_different_configs(
         .all()
     )
     assert len(configs) == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_persists_uid_watermark_and_skips_known_messages(
+    db_session: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    configs = []
+    for index in range(3):
+        config = EmailIngestConfig(
+            user_id=test_user.id,
+            imap_server="imap.example.com",
+            email_address=f"capture+{index}@example.com",
+            encrypted_password=encrypt_value("secret"),
+        )
+        db_session.add(config)
+        configs.append(config)
+    await db_session.commit()
+    db_session.add(
+        IngestedEmail(
+            config_id=configs[0].id,
+            message_id="<known@example.com>",
+            subject="Already ingested",
+            sender="ko@gsa.gov",
+        )
+    )
+    await db_session.commit()
+
+    seen_watermarks: list[tuple[int | None, int | None]] = []
+
+    async def fake_connect_and_fetch(self, folder="INBOX", limit=50):
+        seen_watermarks.append((self.uid_validity, self.last_uid))
+        self.uid_validity = 42
+        self.last_uid = (self.last_uid or 0) + 2
+        return [
+            {"message_id": "<known@example.com>", "subject": "Known"},
+            {"message_id": f"<new-{self.username}>", "subject": "New"},
+        ]
+
+    monkeypatch.setattr(EmailIngestService, "connect_and_fetch", fake_connect_and_fetch)
+
+    summary = await poll_email_configs(db_session, configs=configs, concurrency=2)
+    assert summary == {"configs_checked": 3, "fetched": 5, "duplicates": 1, "errors": 0}
+    assert all(config.uid_validity == 42 and config.last_seen_uid == 2 for config in configs)
+
+    await poll_email_configs(db_session, configs=configs[:1])
+    assert seen_watermarks[-1] == (42, 2)
+    assert configs[0].last_seen_uid == 4
+
+
+@pytest.mark.asyncio
+async def test_idle_inbox_releases_poll_slot(
+    db_session: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    configs = []
+    for name in ("quiet", "busy"):
+        config = EmailIngestConfig(
+            user_id=test_user.id,
+            imap_server="imap.example.com",
+            email_address=f"{name}@example.com",
+            encrypted_password=encrypt_value("secret"),
+        )
+        db_session.add(config)
+        configs.append(config)
+    await db_session.commit()
+
+    busy_fetched = asyncio.Event()
+
+    async def fake_connect_and_fetch(self, folder="INBOX", limit=50):
+        if self.username.startswith("busy"):
+            busy_fetched.set()
+            return [{"message_id": "<busy-1@example.com>", "subject": "New"}]
+        return []
+
+    async def fake_wait_for_new_mail(self, folder="INBOX", timeout=60.0):
+        # Only returns once the other inbox was fetched through the single slot.
+        await asyncio.wait_for(busy_fetched.wait(), timeout=1)
+        return False
+
+    monkeypatch.setattr(EmailIngestService, "connect_and_fetch", fake_connect_and_fetch)
+    monkeypatch.setattr(EmailIngestService, "wait_for_new_mail", fake_wait_for_new_mail)
+
+    summary = await poll_email_configs(db_session, configs=configs, concurrency=1, idle_seconds=30)
+    assert summary == {"configs_checked": 2, "fetched": 1, "duplicates": 0, "errors": 0}
@@ -3,8 +3,9 @@
 import email
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from unittest.mock import MagicMock
 
-from app.services.email_ingest_service import EmailIngestService
+from app.services.email_ingest_service import EmailIngestService, _imap_idle
 
 
 class TestParseEmail:
@@ -121,3 +122,43 @@ class TestInit:
         assert svc.host == "imap.example.com"
         assert svc.port == 993
         assert svc.use_ssl is True
+
+
+class _IdleConn:
+    """Scripted IMAP connection for the pre-3.14 IDLE path."""
+
+    def __init__(self, capabilities: bytes, lines: list[bytes]):
+        self._capabilities = capabilities
+        self._lines = list(lines)
+        self.sent: list[bytes] = []
+        self._sock = MagicMock()
+
+    def capability(self):
+        return "OK", [self._capabilities]
+
+    def _new_tag(self):
+        return b"A001"
+
+    def send(self, data: bytes):
+        self.sent.append(data)
+
+    def readline(self) -> bytes:
+        return self._lines.pop(0)
+
+    def socket(self):
+        return self._sock
+
+
+class TestImapIdle:
+    def test_skips_servers_without_idle(self):
+        conn = _IdleConn(b"IMAP4rev1 UIDPLUS", [])
+        assert _imap_idle(conn, timeout=5) is False
+        assert conn.sent == []
+
+    def test_returns_on_new_mail(self):
+        conn = _IdleConn(
+            b"IMAP4rev1 IDLE",
+            [b"+ idling\r\n", b"* 4 EXISTS\r\n", b"A001 OK IDLE terminated\r\n"],
+        )
+        assert _imap_idle(conn, timeout=5) is True
+        assert conn.sent == [b"A001 IDLE\r\n", b"DONE\r\n"]
@@ -0,0 +1,132 @@
+"""
+Event Storage Unit Tests
+========================
+Tests for event-table partition helpers and the batched event write buffer.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from app.models.audit import AuditEvent
+from app.services import event_buffer
+from app.services.audit_service import log_audit_event
+from app.services.event_partitions import (
+    add_months,
+    ensure_event_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+
+class TestPartitionHelpers:
+    def test_month_math_wraps_years(self):
+        start = month_start(datetime(2025, 11, 17, 13, 45))
+        assert start == datetime(2025, 11, 1)
+        assert add_months(start, 2) == datetime(2026, 1, 1)
+        assert add_months(start, -11) == datetime(2024, 12, 1)
+
+    def test_partition_name_round_trips(self):
+        name = partition_name("audit_events", datetime(2026, 3, 1))
+        assert name == "audit_events_p202603"
+        assert partition_month(name) == datetime(2026, 3, 1)
+        assert partition_month("audit_events_default") is None
+
+    @pytest.mark.asyncio
+    async def test_ensure_is_noop_without_partitioning(self, db_session: AsyncSession):
+        assert await ensure_event_partitions(db_session) == []
+
+
+@pytest.fixture
+async def running_buffer(db_session: AsyncSession):
+    factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+    buffer = event_buffer.start_event_buffer(factory)
+    assert buffer is not None
+    yield buffer
+    await event_buffer.stop_event_buffer()
+
+
+async def _audit_count(session: AsyncSession) -> int:
+    result = await session.execute(select(AuditEvent))
+    return len(result.scalars().all())
+
+
+class TestEventBuffer:
+    @pytest.mark.asyncio
+    async def test_falls_back_to_session_when_stopped(self, db_session: AsyncSession):
+        await log_audit_event(
+            db_session, user_id=None, entity_type="rfp", entity_id=1, action="created"
+        )
+        await db_session.commit()
+        assert await _audit_count(db_session) == 1
+
+    @pytest.mark.asyncio
+    async def test_commit_queues_and_flush_writes_batch(
+        self, db_session: AsyncSession, running_buffer
+    ):
+        for entity_id in range(3):
+            await log_audit_event(
+                db_session,
+                user_id=None,
+                entity_type="rfp",
+                entity_id=entity_id,
+                action="updated",
+            )
+        assert len(running_buffer.queue) == 0
+        await db_session.commit()
+        assert len(running_buffer.queue) == 3
+
+        assert await running_buffer.flush() == 3
+        assert await _audit_count(db_session) == 3
+
+    @pytest.mark.asyncio
+    async def test_rollback_discards_buffered_events(
+        self, db_session: AsyncSession, running_buffer
+    ):
+        await log_audit_event(
+            db_session, user_id=None, entity_type="rfp", entity_id=1, action="deleted"
+        )
+        await db_session.rollback()
+        await db_session.commit()
+        assert len(running_buffer.queue) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues(self, db_session: AsyncSession, running_buffer):
+        async def _fail(batch):
+            raise RuntimeError("database unavailable")
+
+        running_buffer.enqueue([AuditEvent(entity_type="rfp", action="created")])
+        original = running_buffer._insert
+        running_buffer._insert = _fail
+        assert await running_buffer.flush() == 0
+        assert len(running_buffer.queue) == 1
+
+        running_buffer._insert = original
+        assert await running_buffer.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining(self, db_session: AsyncSession, running_buffer):
+        running_buffer.enqueue([AuditEvent(entity_type="rfp", action="exported")])
+        await event_buffer.stop_event_buffer()
+        assert await _audit_count(db_session) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_during_insert_keeps_batch(self, db_session: AsyncSession, running_buffer):
+        started = asyncio.Event()
+        original = running_buffer._insert
+
+        async def _slow(batch):
+            started.set()
+            await asyncio.sleep(0.05)
+            await original(batch)
+
+        running_buffer._insert = _slow
+        running_buffer.enqueue([AuditEvent(entity_type="rfp", action="archived")])
+        running_buffer._wakeup.set()
+        await started.wait()
+        await event_buffer.stop_event_buffer()
+        assert await _audit_count(db_session) == 1
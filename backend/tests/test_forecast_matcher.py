@@ -1,12 +1,28 @@
 """
 Forecast Matcher Unit Tests
 =============================
-Tests for _compute_match() pure scoring function.
+Tests for _compute_match() pure scoring function, the blocking index and
+incremental run_forecast_matching().
 """
 
+import itertools
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
-from app.services.forecast_matcher import _compute_match
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.forecast import ForecastAlert, ForecastMatchState, ProcurementForecast
+from app.models.rfp import RFP
+from app.models.user import User
+from app.services.forecast_matcher import (
+    MATCH_THRESHOLD,
+    _compute_match,
+    _RFPBlockIndex,
+    run_forecast_matching,
+)
 
 
 def _mock_forecast(**kwargs):
@@ -111,3 +127,94 @@ class TestComputeMatch:
         rfp = _mock_rfp(agency=None, naics_code=None, title=None, estimated_value=None)
         score, reasons = _compute_match(forecast, rfp)
         assert score == 0
+
+
+class TestBlockIndex:
+    def test_candidates_cover_every_pair_above_threshold(self):
+        agencies = ["DoD", "dod", "GSA", None]
+        naics = ["541512", "5415", "54", "541330", "  ", None]
+        titles = ["Cyber Security Ops", "Network Security", "Janitorial", None]
+        values = [1_000_000, 1_500_000, None]
+
+        def _row(i, agency, code, title, value):
+            return SimpleNamespace(
+                id=i, agency=agency, naics_code=code, title=title, estimated_value=value
+            )
+
+        combos = list(itertools.product(agencies, naics, titles, values))
+        rows = [_row(i, *combo) for i, combo in enumerate(combos)]
+        index = _RFPBlockIndex(rows)
+        for forecast in rows:
+            candidates = index.candidates(forecast)
+            for rfp in rows:
+                score, _ = _compute_match(forecast, rfp)
+                if score >= MATCH_THRESHOLD:
+                    assert rfp.id in candidates
+
+
+@pytest_asyncio.fixture
+async def matching_data(db_session: AsyncSession, test_user: User) -> dict:
+    rfp = RFP(
+        user_id=test_user.id,
+        title="Cybersecurity Monitoring",
+        solicitation_number="FM-1",
+        agency="Department of Defense",
+        naics_code="541512",
+    )
+    unrelated = RFP(
+        user_id=test_user.id,
+        title="Janitorial Support",
+        solicitation_number="FM-2",
+        agency="GSA",
+        naics_code="561720",
+    )
+    forecast = ProcurementForecast(
+        user_id=test_user.id,
+        title="Cybersecurity Monitoring Recompete",
+        agency="Department of Defense",
+        naics_code="541512",
+    )
+    db_session.add_all([rfp, unrelated, forecast])
+    await db_session.commit()
+    return {"rfp": rfp, "unrelated": unrelated, "forecast": forecast}
+
+
+class TestRunForecastMatching:
+    async def test_creates_alerts_and_watermark(
+        self, db_session: AsyncSession, test_user: User, matching_data: dict
+    ):
+        alerts = await run_forecast_matching(db_session, test_user.id)
+        assert [(a.forecast_id, a.rfp_id) for a in alerts] == [
+            (matching_data["forecast"].id, matching_data["rfp"].id)
+        ]
+        state = (
+            await db_session.execute(
+                select(ForecastMatchState).where(ForecastMatchState.user_id == test_user.id)
+            )
+        ).scalar_one()
+        assert state.last_run_at is not None
+
+        # Nothing changed: incremental and full re-runs add no duplicates.
+        assert await run_forecast_matching(db_session, test_user.id) == []
+        assert await run_forecast_matching(db_session, test_user.id, full=True) == []
+
+    async def test_incremental_picks_up_new_rfp(
+        self, db_session: AsyncSession, test_user: User, matching_data: dict
+    ):
+        await run_forecast_matching(db_session, test_user.id)
+        newer = RFP(
+            user_id=test_user.id,
+            title="Cybersecurity Monitoring Phase II",
+            solicitation_number="FM-3",
+            agency="Department of Defense",
+            naics_code="541512",
+            updated_at=datetime.utcnow() + timedelta(seconds=1),
+        )
+        db_session.add(newer)
+        await db_session.commit()
+
+        alerts = await run_forecast_matching(db_session, test_user.id)
+        assert [a.rfp_id for a in alerts] == [newer.id]
+
+        total = (await db_session.execute(select(ForecastAlert))).scalars().all()
+        assert len(total) == 2
@@ -0,0 +1,166 @@
+"""
+Unit tests for token-streamed generation: gateway streaming, incremental
+citations, the stream broker and the websocket relay.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.routes.websocket.streaming import deliver_generation_event, relay_generation_streams
+from app.services import generation_stream
+from app.services.gemini_service import GeminiService
+from app.services.generation_stream import (
+    IncrementalCitationParser,
+    LocalStreamBroker,
+    SectionStreamPublisher,
+)
+from app.services.llm_gateway import LLMGateway
+
+
+class _Stream:
+    def __init__(self, parts: list[str]) -> None:
+        self._parts = parts
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=7, candidates_token_count=3, total_token_count=10
+        )
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for part in self._parts:
+            yield SimpleNamespace(text=part)
+
+
+class _StreamingModel:
+    model_name = "models/gemini-test"
+
+    def __init__(self, parts: list[str]) -> None:
+        self.parts = parts
+        self.calls: list[dict] = []
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls.append(kwargs)
+        return _Stream(self.parts)
+
+
+class _Connections:
+    def __init__(self, presence: dict[int, dict[int, dict]]) -> None:
+        self.document_presence = presence
+        self.sent: list[tuple[int, dict]] = []
+
+    async def send_to_user(self, user_id: int, message: dict) -> None:
+        self.sent.append((user_id, message))
+
+
+def _extract(text: str):
+    return GeminiService._extract_citations(GeminiService.__new__(GeminiService), text)
+
+
+class TestIncrementalCitationParser:
+    def test_citation_split_across_chunks(self):
+        parser = IncrementalCitationParser(_extract)
+        assert parser.feed("We delivered on time [") == []
+        assert parser.feed("[Source: Past_Perf.pdf, Pa") == []
+        found = parser.feed("ge 4]] and again [[Source: Past_Perf.pdf, Page 4]].")
+        assert [(c.source_file, c.page_number) for c in found] == [("Past_Perf.pdf", 4)]
+        assert parser.feed(" See [[Source: Cap.pdf]]") != []
+        assert len(parser.citations) == 2
+
+    def test_flush_parses_held_back_text(self):
+        parser = IncrementalCitationParser(_extract)
+        parser.feed("[[Source: A.pdf, Page 1")
+        assert parser.flush() == []
+        assert parser.citations == []
+
+
+class TestGatewayStreaming:
+    @pytest.mark.asyncio
+    async def test_chunks_are_forwarded_and_aggregated(self):
+        gateway = LLMGateway(max_concurrency=1)
+        model = _StreamingModel(["Hello ", "", "world"])
+        received: list[str] = []
+
+        async def on_chunk(text: str) -> None:
+            received.append(text)
+
+        response = await gateway.generate_stream(
+            model, "prompt", on_chunk=on_chunk, operation="test", cache=False
+        )
+
+        assert received == ["Hello ", "world"]
+        assert response.text == "Hello world"
+        assert response.usage_metadata.total_token_count == 10
+        assert model.calls == [{"stream": True}]
+        assert gateway.active == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_is_delivered_as_one_chunk(self):
+        gateway = LLMGateway(max_concurrency=1)
+        model = _StreamingModel(["cached ", "answer"])
+        received: list[str] = []
+
+        async def on_chunk(text: str) -> None:
+            received.append(text)
+
+        for _ in range(2):
+            await gateway.generate_stream(
+                model, "prompt", on_chunk=on_chunk, operation="test", cache=True
+            )
+
+        assert len(model.calls) == 1
+        assert received == ["cached ", "answer", "cached answer"]
+
+
+class TestStreamRelay:
+    @pytest.mark.asyncio
+    async def test_publisher_events_reach_room_and_requester(self, monkeypatch):
+        broker = LocalStreamBroker()
+        monkeypatch.setattr(generation_stream, "_broker", broker)
+        connections = _Connections({5: {1: {}, 2: {}}})
+        relay = asyncio.create_task(relay_generation_streams(connections))
+        await asyncio.sleep(0)
+
+        publisher = SectionStreamPublisher(
+            proposal_id=5, section_id=9, user_id=3, extract_citations=_extract
+        )
+        await publisher.started()
+        await publisher.chunk("Text [[Source: A.pdf, Page 2]]")
+        await publisher.complete(word_count=1)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        relay.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await relay
+
+        types = [message["type"] for user_id, message in connections.sent if user_id == 1]
+        assert types == ["generation_started", "generation_chunk", "generation_complete"]
+        assert {user_id for user_id, _ in connections.sent} == {1, 2, 3}
+        chunk = next(m for _, m in connections.sent if m["type"] == "generation_chunk")
+        assert chunk["seq"] == 1
+        assert chunk["citations"][0]["source_file"] == "A.pdf"
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_disables_streaming(self):
+        class _Broken:
+            calls = 0
+
+            async def publish(self, channel, message):
+                self.calls += 1
+                raise ConnectionError("redis down")
+
+        broker = _Broken()
+        publisher = SectionStreamPublisher(
+            proposal_id=1, section_id=1, user_id=1, extract_citations=_extract, broker=broker
+        )
+        await publisher.started()
+        await publisher.chunk("text")
+        assert broker.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_events_for_empty_rooms_only_reach_requester(self):
+        connections = _Connections({})
+        await deliver_generation_event({"proposal_id": 4, "user_id": 8}, connections)
+        assert [user_id for user_id, _ in connections.sent] == [8]
@@ -86,15 +86,16 @@ class TestRefreshContextCache:
         mock_result.scalars.return_value.all.return_value = [mock_doc]
         mock_session.execute.return_value = mock_result
 
-        mock_gemini = MagicMock()
-        mock_gemini.create_context_cache = AsyncMock(return_value=None)
+        mock_manager = MagicMock()
+        mock_manager.acquire = AsyncMock(return_value=None)
 
         with (
             patch(
                 "app.tasks.generation_tasks.get_celery_session_context",
                 _mock_session_ctx(mock_session),
             ),
-            patch("app.tasks.generation_tasks.GeminiService", return_value=mock_gemini),
+            patch("app.tasks.generation_tasks.GeminiService"),
+            patch("app.tasks.generation_tasks.ContextCacheManager", return_value=mock_manager),
         ):
             from app.tasks.generation_tasks import refresh_context_cache
 
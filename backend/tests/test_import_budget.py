@@ -0,0 +1,71 @@
+"""
+Startup import guard: heavy SDKs stay out of cold API and worker imports.
+
+Timing budgets are checked by ``scripts/import_time.py``; this only asserts
+which modules load, which is deterministic.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.tasks.celery_app import TASK_MODULES_BY_QUEUE, task_modules_for_queues
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, sys
+{code}
+from app.lazy_imports import HEAVY_MODULES
+print(json.dumps({{
+    "heavy": [name for name in HEAVY_MODULES if name in sys.modules],
+    "tasks": sorted(
+        name for name in sys.modules
+        if name.startswith("app.tasks.") and name.endswith("_tasks")
+    ),
+}}))
+"""
+
+
+def _probe(code: str, **env: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(code=code)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.slow
+def test_api_startup_does_not_import_heavy_sdks():
+    assert _probe("import app.main")["heavy"] == []
+
+
+@pytest.mark.slow
+def test_queue_worker_imports_only_its_task_modules():
+    result = _probe(
+        "from app.tasks.celery_app import celery_app\ncelery_app.loader.import_default_modules()",
+        CELERY_WORKER_QUEUES="webhooks",
+    )
+    assert result["heavy"] == []
+    assert result["tasks"] == ["app.tasks.webhook_tasks"]
+
+
+def test_every_queue_has_task_modules():
+    assert set(task_modules_for_queues("")) == {
+        module for modules in TASK_MODULES_BY_QUEUE.values() for module in modules
+    }
+    assert task_modules_for_queues("generation, documents") == [
+        "app.tasks.generation_tasks",
+        "app.tasks.document_tasks",
+    ]
+    with pytest.raises(ValueError):
+        task_modules_for_queues("gpu")
@@ -6,9 +6,10 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.knowledge_base import KnowledgeBaseDocument
+from app.models.knowledge_base import DocumentChunk, KnowledgeBaseDocument
 from app.models.user import User
 from app.services.auth_service import create_token_pair, hash_password
+from app.tasks.document_tasks import backfill_minhash_signatures
 
 
 class TestContentFreshness:
@@ -213,3 +214,50 @@ class TestDuplicateDetection:
         assert response.status_code == 200
         data = response.json()
         assert data["total_potential_duplicates"] >= 2
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_content_found(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        db_session: AsyncSession,
+        test_user: User,
+    ):
+        """Re-uploads with different titles but near-identical chunks are grouped."""
+        body = " ".join(
+            f"Past performance narrative sentence {i} for the Navy logistics contract."
+            for i in range(30)
+        )
+        docs = []
+        for title, text in [
+            ("Navy Logistics PP", body),
+            ("scan_0042", body.replace("sentence 5 ", "sentence five ")),
+            ("Unrelated Resume", "Jane Doe senior engineer with ten years of DevOps."),
+        ]:
+            doc = KnowledgeBaseDocument(
+                user_id=test_user.id,
+                title=title,
+                document_type="past_performance",
+                original_filename=f"{title}.pdf",
+                file_path=f"/uploads/{title}.pdf",
+                processing_status="ready",
+            )
+            db_session.add(doc)
+            await db_session.flush()
+            db_session.add(DocumentChunk(document_id=doc.id, content=text))
+            docs.append(doc)
+        await db_session.commit()
+
+        # Legacy documents have no stored signature until the periodic backfill.
+        assert await backfill_minhash_signatures(db_session) == 3
+        assert await backfill_minhash_signatures(db_session) == 0
+
+        response = await client.get("/api/v1/kb-intelligence/duplicates", headers=auth_headers)
+        assert response.status_code == 200
+        content_groups = [
+            g for g in response.json()["duplicate_groups"] if g["match_type"] == "content"
+        ]
+        assert len(content_groups) == 1
+        group = content_groups[0]
+        assert {d["id"] for d in group["documents"]} == {docs[0].id, docs[1].id}
+        assert group["similarity"] >= 0.8
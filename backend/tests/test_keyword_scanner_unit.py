@@ -0,0 +1,52 @@
+"""
+Unit tests for the shared single-pass keyword scanner.
+"""
+
+from app.services.keyword_scanner import KeywordScanner, get_keyword_scanner
+
+
+class TestKeywordScanner:
+    def test_counts_and_positions_per_rule(self):
+        scanner = KeywordScanner({"cloud": ["cloud", "aws"], "sec": ["security"]})
+        hits = scanner.scan("Cloud security on AWS and cloud.")
+        assert hits.count("cloud") == 3
+        assert hits.rule_positions["cloud"] == [0, 18, 26]
+        assert hits.rule_positions["sec"] == [6]
+        assert hits.keyword_count("CLOUD") == 2
+
+    def test_nested_and_overlapping_keywords(self):
+        scanner = KeywordScanner(
+            {"sub": ["subcontract", "subcontracting plan"], "plan": ["plan"], "being": ["being"]}
+        )
+        hits = scanner.scan("Our subcontracting plan is being updated")
+        assert hits.keywords_found("sub") == {"subcontract", "subcontracting plan"}
+        assert hits.count("plan") == 1
+        assert hits.matched("being")
+
+    def test_keyword_shared_between_rules(self):
+        scanner = KeywordScanner({"a": ["quality"], "b": ["quality", "qa"]})
+        hits = scanner.scan("quality")
+        assert hits.count("a") == 1
+        assert hits.count("b") == 1
+        assert hits.keywords_found() == {"quality"}
+
+    def test_regex_metacharacters_are_literal(self):
+        hits = KeywordScanner({"r": ["sam.gov", "a+b"]}).scan("samxgov a+b")
+        assert hits.keywords_found("r") == {"a+b"}
+
+    def test_empty_rules_and_text(self):
+        assert not KeywordScanner({}).scan("anything").matched("x")
+        assert KeywordScanner({"r": ["x"]}).scan("").count("r") == 0
+
+    def test_matches_naive_substring_search(self):
+        keywords = ["ab", "abc", "bc", "c", "cab", "b a"]
+        text = "ABCab cab a b abcabc"
+        hits = KeywordScanner({kw: [kw] for kw in keywords}).scan(text)
+        lowered = text.lower()
+        for kw in keywords:
+            expected = [i for i in range(len(lowered)) if lowered.startswith(kw, i)]
+            assert hits.rule_positions[kw] == expected
+
+    def test_cached_scanner_reused(self):
+        rules = {"r": ["alpha", "beta"]}
+        assert get_keyword_scanner(rules) is get_keyword_scanner(dict(rules))
@@ -0,0 +1,183 @@
+"""
+Unit tests for the LLM response cache and its gateway integration.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.observability.metrics import get_metrics
+from app.services import llm_cache
+from app.services.llm_cache import (
+    CachedLLMResponse,
+    DiskTier,
+    LLMResponseCache,
+    MemoryTier,
+    response_cache_key,
+)
+from app.services.llm_gateway import LLMGateway
+
+
+class _CountingModel:
+    model_name = "models/gemini-test"
+
+    def __init__(self, text: str = "answer") -> None:
+        self.text = text
+        self.calls = 0
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            text=f"{self.text}:{prompt}",
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=5, total_token_count=15
+            ),
+        )
+
+
+def _config(temperature):
+    return {"temperature": temperature} if temperature is not None else None
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    cache = LLMResponseCache(MemoryTier(max_entries=16, max_bytes=1 << 20, ttl_seconds=60))
+    monkeypatch.setattr(llm_cache, "_response_cache", cache)
+    return cache
+
+
+class TestMemoryTier:
+    def test_evicts_least_recently_used_by_count(self):
+        tier = MemoryTier(max_entries=2, max_bytes=1 << 20, ttl_seconds=60)
+        tier.set("a", {"text": "1"})
+        tier.set("b", {"text": "2"})
+        assert tier.get("a") is not None
+        tier.set("c", {"text": "3"})
+        assert tier.get("b") is None
+        assert tier.get("a") is not None
+        assert tier.get("c") is not None
+
+    def test_evicts_by_size(self):
+        tier = MemoryTier(max_entries=100, max_bytes=20, ttl_seconds=60)
+        tier.set("a", {"text": "x" * 10})
+        tier.set("b", {"text": "y" * 10})
+        assert len(tier) == 1
+        assert tier.get("b") is not None
+
+    def test_expired_entries_are_dropped(self, monkeypatch):
+        tier = MemoryTier(max_entries=10, max_bytes=1 << 20, ttl_seconds=1)
+        tier.set("a", {"text": "1"})
+        now = time.time()
+        monkeypatch.setattr(llm_cache.time, "time", lambda: now + 5)
+        assert tier.get("a") is None
+
+
+class TestDiskTier:
+    @pytest.mark.asyncio
+    async def test_round_trip_and_prune(self, tmp_path):
+        tier = DiskTier(tmp_path, max_bytes=10_000, ttl_seconds=60)
+        await tier.set("llm:resp:aa11", {"text": "first"})
+        assert await tier.get("llm:resp:aa11") == {"text": "first"}
+        assert await tier.get("llm:resp:bb22") is None
+
+        await tier.set("llm:resp:bb22", {"text": "second" * 100})
+        old = time.time() - 100
+        os.utime(tmp_path / "aa" / "aa11.json", (old, old))
+        tier.max_bytes = 620
+        assert tier.prune() == 1
+        assert await tier.get("llm:resp:aa11") is None
+        assert await tier.get("llm:resp:bb22") is not None
+
+    @pytest.mark.asyncio
+    async def test_shared_hit_is_promoted(self, tmp_path):
+        shared = DiskTier(tmp_path, max_bytes=10_000, ttl_seconds=60)
+        writer = LLMResponseCache(MemoryTier(16, 1 << 20, 60), shared)
+        await writer.put("llm:resp:cc33", SimpleNamespace(text="stored"))
+
+        reader = LLMResponseCache(MemoryTier(16, 1 << 20, 60), shared)
+        hit = await reader.get("llm:resp:cc33", operation="test")
+        assert isinstance(hit, CachedLLMResponse)
+        assert hit.text == "stored"
+        assert reader.memory.get("llm:resp:cc33") is not None
+
+
+class TestKeys:
+    def test_key_covers_version_config_and_prompt(self):
+        model = _CountingModel()
+        base = {"model_name": "m", "generation_config": _config(0.1), "operation": "op"}
+        key = response_cache_key(model, "p", **base)
+        assert key == response_cache_key(model, "p", **base)
+        assert key != response_cache_key(model, "q", **base)
+        assert key != response_cache_key(model, "p", **{**base, "generation_config": _config(0)})
+        assert key != response_cache_key(model, "p", **base, prompt_version="2")
+
+
+class TestGatewayCaching:
+    @pytest.mark.asyncio
+    async def test_low_temperature_calls_are_reused(self, memory_cache):
+        get_metrics().reset()
+        gateway = LLMGateway(max_concurrency=2)
+        model = _CountingModel()
+
+        first = await gateway.generate(
+            model, "screen", operation="killer_filter", generation_config=_config(0.1)
+        )
+        second = await gateway.generate(
+            model, "screen", operation="killer_filter", generation_config=_config(0.1)
+        )
+
+        assert model.calls == 1
+        assert second.text == first.text
+        assert second.cached is True
+        assert second.usage_metadata.total_token_count == 0
+        assert memory_cache.hit_rate == 0.5
+        counters = get_metrics().get_all()["counters"]
+        assert counters["llm.cache[operation=killer_filter,result=hit,tier=memory]"] == 1
+
+    @pytest.mark.asyncio
+    async def test_high_temperature_and_opt_out_bypass_cache(self, memory_cache):
+        gateway = LLMGateway(max_concurrency=2)
+        model = _CountingModel()
+
+        for _ in range(2):
+            await gateway.generate(model, "draft", operation="gen", generation_config=_config(0.7))
+        for _ in range(2):
+            await gateway.generate(
+                model, "screen", operation="gen", generation_config=_config(0.1), cache=False
+            )
+        assert model.calls == 4
+        assert memory_cache.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_opt_in_caches_regardless_of_temperature(self, memory_cache):
+        gateway = LLMGateway(max_concurrency=2)
+        model = _CountingModel()
+
+        for _ in range(2):
+            await gateway.generate(
+                model, "extract", operation="extract", generation_config=_config(0.7), cache=True
+            )
+        assert model.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_setting_skips_cache(self, memory_cache, monkeypatch):
+        monkeypatch.setattr(settings, "llm_cache_enabled", False)
+        gateway = LLMGateway(max_concurrency=2)
+        model = _CountingModel()
+
+        for _ in range(2):
+            await gateway.generate(model, "p", operation="op", generation_config=_config(0.0))
+        assert model.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_blocked_responses_are_not_stored(self, memory_cache):
+        class _Blocked:
+            @property
+            def text(self):
+                raise ValueError("response was blocked")
+
+        await memory_cache.put("llm:resp:dd44", _Blocked())
+        assert len(memory_cache.memory) == 0
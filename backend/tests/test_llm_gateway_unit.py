@@ -0,0 +1,200 @@
+"""
+Unit tests for the LLM gateway: fair queuing, priorities, budgets, coalescing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.observability.metrics import get_metrics
+from app.services.llm_gateway import (
+    LLMGateway,
+    LLMPriority,
+    LLMQueueTimeout,
+    llm_context,
+)
+
+
+class _GatedModel:
+    """Model whose calls block until released, recording call order."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.release = asyncio.Event()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls.append(prompt)
+        await self.release.wait()
+        return SimpleNamespace(
+            text=f"answer:{prompt}",
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=5, total_token_count=15
+            ),
+        )
+
+
+async def _admit_order(gateway: LLMGateway, requests: list[tuple[str, LLMPriority, str]]):
+    """Queue requests behind a held slot and return the order they are admitted."""
+    order: list[str] = []
+    hold = asyncio.Event()
+
+    async def _run(tenant: str, priority: LLMPriority, label: str) -> None:
+        with llm_context(tenant):
+            async with gateway.admit(operation="test", estimated_tokens=100, priority=priority):
+                order.append(label)
+                await hold.wait()
+
+    blocker = asyncio.create_task(_run("blocker", LLMPriority.STANDARD, "blocker"))
+    await asyncio.sleep(0)
+    tasks = []
+    for tenant, priority, label in requests:
+        tasks.append(asyncio.create_task(_run(tenant, priority, label)))
+        await asyncio.sleep(0)
+    hold.set()
+    await asyncio.gather(blocker, *tasks)
+    return order[1:]
+
+
+class TestScheduling:
+    @pytest.mark.asyncio
+    async def test_fair_share_across_tenants(self):
+        gateway = LLMGateway(max_concurrency=1, priority_aging_seconds=0)
+        order = await _admit_order(
+            gateway,
+            [
+                ("bulk", LLMPriority.BATCH, "bulk-1"),
+                ("bulk", LLMPriority.BATCH, "bulk-2"),
+                ("bulk", LLMPriority.BATCH, "bulk-3"),
+                ("other", LLMPriority.BATCH, "other-1"),
+            ],
+        )
+        assert order.index("other-1") < order.index("bulk-2")
+
+    @pytest.mark.asyncio
+    async def test_interactive_before_batch(self):
+        gateway = LLMGateway(max_concurrency=1, priority_aging_seconds=0)
+        order = await _admit_order(
+            gateway,
+            [
+                ("bulk", LLMPriority.BATCH, "batch"),
+                ("bulk", LLMPriority.STANDARD, "standard"),
+                ("user", LLMPriority.INTERACTIVE, "interactive"),
+            ],
+        )
+        assert order == ["interactive", "standard", "batch"]
+
+    @pytest.mark.asyncio
+    async def test_tenant_token_budget_lets_others_through(self):
+        gateway = LLMGateway(max_concurrency=4, tenant_tokens_per_minute=100)
+        admitted: list[str] = []
+
+        async def _run(tenant: str) -> None:
+            with llm_context(tenant):
+                async with gateway.admit(operation="test", estimated_tokens=100):
+                    admitted.append(tenant)
+
+        await _run("heavy")
+        waiting = asyncio.create_task(_run("heavy"))
+        await _run("light")
+        await asyncio.sleep(0)
+        assert admitted == ["heavy", "light"]
+        assert gateway.queued == 1
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert gateway.queued == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_releases_nothing(self):
+        gateway = LLMGateway(max_concurrency=1, queue_timeout_seconds=0.05)
+        hold = asyncio.Event()
+
+        async def _hold() -> None:
+            async with gateway.admit(operation="test", estimated_tokens=1):
+                await hold.wait()
+
+        holder = asyncio.create_task(_hold())
+        await asyncio.sleep(0)
+        with pytest.raises(LLMQueueTimeout):
+            async with gateway.admit(operation="test", estimated_tokens=1):
+                pass
+        hold.set()
+        await holder
+        assert gateway.active == 0
+
+
+class TestGenerate:
+    @pytest.mark.asyncio
+    async def test_identical_prompts_are_coalesced(self):
+        gateway = LLMGateway(max_concurrency=4)
+        model = _GatedModel()
+
+        first = asyncio.create_task(gateway.generate(model, "same", operation="test"))
+        second = asyncio.create_task(gateway.generate(model, "same", operation="test"))
+        third = asyncio.create_task(gateway.generate(model, "different", operation="test"))
+        await asyncio.sleep(0)
+        model.release.set()
+        results = await asyncio.gather(first, second, third)
+
+        assert sorted(model.calls) == ["different", "same"]
+        assert results[0] is results[1]
+        assert results[2].text == "answer:different"
+
+    @pytest.mark.asyncio
+    async def test_follower_survives_cancelled_leader(self):
+        gateway = LLMGateway(max_concurrency=4)
+        model = _GatedModel()
+
+        leader = asyncio.create_task(gateway.generate(model, "same", operation="test"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(gateway.generate(model, "same", operation="test"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        model.release.set()
+
+        assert (await follower).text == "answer:same"
+        assert leader.cancelled()
+        assert model.calls == ["same", "same"]
+
+    @pytest.mark.asyncio
+    async def test_idle_tenant_state_is_swept(self):
+        gateway = LLMGateway(max_concurrency=4, tenant_tokens_per_minute=10_000)
+        for tenant in ("a", "b"):
+            with llm_context(tenant):
+                async with gateway.admit(operation="test", estimated_tokens=100):
+                    pass
+        assert set(gateway._finish_tags) == {"a", "b"}
+
+        gateway._sweep_idle_tenants(gateway._next_sweep + 3600)
+        assert gateway._finish_tags == {}
+        assert gateway._tenant_buckets == {}
+
+    @pytest.mark.asyncio
+    async def test_records_per_tenant_metrics(self):
+        get_metrics().reset()
+        gateway = LLMGateway(max_concurrency=1)
+        model = _GatedModel()
+        model.release.set()
+
+        with llm_context("user:42"):
+            await gateway.generate(model, "prompt", operation="rewrite")
+
+        collected = get_metrics().get_all()
+        assert collected["counters"]["llm.prompt_tokens[tenant=user:42]"] == 10
+        assert collected["counters"]["llm.output_tokens[tenant=user:42]"] == 5
+        assert "llm.queue_ms[priority=standard,tenant=user:42]" in collected["histograms"]
+        assert gateway.active == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_free_the_slot(self):
+        gateway = LLMGateway(max_concurrency=1)
+
+        class _Failing:
+            async def generate_content_async(self, prompt, **kwargs):
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await gateway.generate(_Failing(), "prompt", operation="test")
+        assert gateway.active == 0
@@ -88,7 +88,7 @@ class TestCheckOperationalAlerts:
 class TestSendDeadlineReminders:
     def test_sends_reminders(self):
         mock_session = AsyncMock()
-        mock_send = AsyncMock()
+        mock_send = AsyncMock(return_value={"due": 2, "created": 2, "delivered": 3, "failed": 0})
 
         with (
             patch(
@@ -102,3 +102,4 @@ class TestSendDeadlineReminders:
             result = send_deadline_reminders_task()
             assert result["status"] == "ok"
             assert result["sent"] is True
+            assert result["created"] == 2
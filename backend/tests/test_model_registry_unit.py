@@ -0,0 +1,77 @@
+"""
+Unit tests for the process-wide Gemini model registry.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.model_registry import GeminiModelRegistry
+
+
+def _model(name: str, methods=("generateContent",)):
+    return SimpleNamespace(name=name, supported_generation_methods=list(methods))
+
+
+@pytest.fixture
+def mock_genai():
+    with patch("app.services.model_registry.genai") as genai:
+        genai.list_models.return_value = [
+            _model("models/gemini-1.5-pro-002"),
+            _model("models/gemini-1.5-flash"),
+            _model("models/embedding-001", methods=("embedContent",)),
+        ]
+        genai.GenerativeModel.side_effect = lambda name, **kwargs: MagicMock(model_name=name)
+        yield genai
+
+
+class TestResolve:
+    def test_lists_models_once_per_process(self, mock_genai):
+        registry = GeminiModelRegistry()
+        assert registry.resolve("gemini-1.5-flash") == "models/gemini-1.5-flash"
+        assert registry.resolve("gemini-9-pro", ["gemini", "pro"]) == "models/gemini-1.5-pro-002"
+        assert registry.resolve("embedding-001") == "embedding-001"
+        mock_genai.list_models.assert_called_once()
+
+    def test_list_failure_falls_back_to_preferred(self, mock_genai):
+        mock_genai.list_models.side_effect = RuntimeError("network down")
+        registry = GeminiModelRegistry()
+        assert registry.resolve("gemini-1.5-pro", ["gemini", "pro"]) == "gemini-1.5-pro"
+        # The failure is remembered until the retry interval passes.
+        registry.resolve("gemini-1.5-pro")
+        mock_genai.list_models.assert_called_once()
+
+    def test_stale_list_refreshes_in_background(self, mock_genai):
+        registry = GeminiModelRegistry()
+        registry.available_models()
+        registry._expires_at = 0.5
+        with patch.object(registry, "refresh_in_background") as refresh:
+            assert registry.available_models()
+        refresh.assert_called_once()
+
+
+class TestModelHandles:
+    def test_configure_once_per_key(self, mock_genai):
+        registry = GeminiModelRegistry()
+        registry.configure("key-a")
+        registry.configure("key-a")
+        mock_genai.configure.assert_called_once_with(api_key="key-a")
+
+    def test_get_model_reuses_handles(self, mock_genai):
+        registry = GeminiModelRegistry()
+        first = registry.get_model("gemini-1.5-flash", system_instruction="Be brief")
+        again = registry.get_model("gemini-1.5-flash", system_instruction="Be brief")
+        other = registry.get_model("gemini-1.5-flash")
+        assert first is again
+        assert other is not first
+        assert mock_genai.GenerativeModel.call_count == 2
+
+    def test_fallback_candidates_skip_excluded(self, mock_genai, monkeypatch):
+        monkeypatch.setattr(
+            "app.services.model_registry.settings.gemini_fallback_models",
+            "gemini-1.5-flash, gemini-2.0-flash,gemini-2.0-flash",
+        )
+        registry = GeminiModelRegistry()
+        names = [name for name, _ in registry.fallback_candidates({"gemini-1.5-flash"})]
+        assert names == ["gemini-2.0-flash"]
@@ -0,0 +1,63 @@
+"""
+Unit tests for MinHash/LSH near-duplicate detection.
+"""
+
+from app.services.near_duplicate_service import (
+    NUM_PERMUTATIONS,
+    LSHIndex,
+    compute_document_minhash,
+    compute_minhash,
+    estimate_similarity,
+    group_similar_pairs,
+)
+
+BASE_TEXT = " ".join(
+    f"The contractor delivered cloud migration task {i} for the agency on schedule."
+    for i in range(40)
+)
+
+
+class TestMinHash:
+    def test_signature_is_deterministic(self):
+        signature = compute_minhash(BASE_TEXT)
+        assert signature is not None
+        assert len(signature) == NUM_PERMUTATIONS
+        assert compute_minhash(BASE_TEXT) == signature
+
+    def test_empty_text_has_no_signature(self):
+        assert compute_minhash("  ...  ") is None
+        assert compute_document_minhash([]) is None
+
+    def test_near_identical_text_scores_high(self):
+        edited = BASE_TEXT.replace("task 7 ", "task seven ")
+        similarity = estimate_similarity(compute_minhash(BASE_TEXT), compute_minhash(edited))
+        assert similarity >= 0.8
+
+    def test_unrelated_text_scores_low(self):
+        other = " ".join(f"Resume of engineer number {i} with clearance." for i in range(40))
+        similarity = estimate_similarity(compute_minhash(BASE_TEXT), compute_minhash(other))
+        assert similarity < 0.2
+
+    def test_case_and_punctuation_are_normalized(self):
+        assert compute_minhash(BASE_TEXT.upper().replace(".", ";")) == compute_minhash(BASE_TEXT)
+
+
+class TestLSHIndex:
+    def test_candidates_and_groups(self):
+        edited = BASE_TEXT.replace("task 3 ", "task three ")
+        other = " ".join(f"Resume of engineer number {i} with clearance." for i in range(40))
+        index = LSHIndex()
+        index.add(1, compute_minhash(BASE_TEXT))
+        index.add(2, compute_minhash(edited))
+        index.add(3, compute_minhash(other))
+        index.add(4, compute_minhash(BASE_TEXT))
+
+        assert {1, 2, 4} <= index.query(compute_minhash(BASE_TEXT))
+        pairs = index.similar_pairs(0.8)
+        assert {(left, right) for left, right, _ in pairs} == {(1, 2), (1, 4), (2, 4)}
+        assert group_similar_pairs(pairs) == [{1, 2, 4}]
+
+    def test_rejects_wrong_signature_length(self):
+        index = LSHIndex()
+        index.add(1, [1, 2, 3])
+        assert index.signatures == {}
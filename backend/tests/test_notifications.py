@@ -11,7 +11,7 @@ import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.routes.notifications import (
+from app.models.notification import (
     Notification,
     NotificationType,
 )
@@ -8,7 +8,7 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.routes.notifications import (
+from app.models.notification import (
     Notification,
     NotificationType,
 )
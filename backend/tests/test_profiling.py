@@ -0,0 +1,164 @@
+"""
+Hot-path profiling tests.
+"""
+
+import json
+import time
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.observability import profiling
+from app.observability.profiling import (
+    MODE_SPANS,
+    MODE_STACK,
+    ProfilingConfig,
+    StackSampler,
+    Trace,
+    finish_task_profile,
+    get_current_trace,
+    record_event,
+    resolve_mode,
+    span,
+    start_task_profile,
+)
+from app.services.cache_service import cache_get, cache_set
+
+
+@pytest.fixture(autouse=True)
+def reset_runtime_config():
+    profiling.reset_profiling_config()
+    yield
+    profiling.reset_profiling_config()
+
+
+def _config(**overrides) -> ProfilingConfig:
+    values = {"enabled": False, "sample_rate": 0.0, "stack_sampling": False, "allow_header": False}
+    values.update(overrides)
+    return ProfilingConfig(**values)
+
+
+class TestResolveMode:
+    def test_disabled_by_default(self):
+        assert resolve_mode(None, _config()) is None
+
+    def test_header_ignored_unless_allowed(self):
+        assert resolve_mode("stack", _config()) is None
+        assert resolve_mode("stack", _config(allow_header=True)) == MODE_STACK
+        assert resolve_mode("1", _config(allow_header=True)) == MODE_SPANS
+
+    def test_sample_rate(self):
+        assert resolve_mode(None, _config(enabled=True, sample_rate=1.0)) == MODE_SPANS
+        assert (
+            resolve_mode(None, _config(enabled=True, sample_rate=1.0, stack_sampling=True))
+            == MODE_STACK
+        )
+
+
+class TestTrace:
+    def test_span_noop_without_trace(self):
+        with span("db", "SELECT"):
+            pass
+        record_event("cache", "hit")
+        assert get_current_trace() is None
+
+    def test_spans_summary_and_chrome_export(self):
+        trace = Trace(name="GET /x", kind="http")
+        token = profiling._current_trace.set(trace)
+        try:
+            with span("gemini", "gemini-1.5-pro"):
+                pass
+            record_event("cache", "miss", key="k")
+            record_event("cache", "hit", key="k")
+        finally:
+            profiling._current_trace.reset(token)
+        trace.finish()
+
+        summary = trace.summary()
+        assert summary["cache"]["count"] == 2
+        assert summary["gemini"]["count"] == 1
+
+        payload = trace.to_chrome_trace()
+        assert payload["traceEvents"][0]["name"] == "GET /x"
+        assert {event["cat"] for event in payload["traceEvents"]} == {"http", "gemini", "cache"}
+        json.dumps(payload)
+
+    def test_span_cap(self):
+        trace = Trace(name="t", kind="task", max_spans=2)
+        for _ in range(5):
+            trace.add_span("db", "SELECT", time.perf_counter(), 0.1)
+        assert len(trace.spans) == 2
+        assert trace.dropped_spans == 3
+
+    def test_stack_sampler_collects_folded_stacks(self):
+        trace = Trace(name="t", kind="task", mode=MODE_STACK)
+        sampler = StackSampler(trace, interval_seconds=0.001)
+        sampler.start()
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        sampler.stop()
+        assert trace.stacks
+        assert "test_stack_sampler_collects_folded_stacks" in trace.folded_stacks()
+
+
+class TestInstrumentation:
+    async def test_db_and_cache_spans_recorded(self, db_session: AsyncSession):
+        profiling.install_instrumentation()
+        trace = Trace(name="unit", kind="task")
+        token = profiling._current_trace.set(trace)
+        try:
+            await db_session.execute(text("SELECT 1"))
+            await cache_set("profiling:test", {"a": 1})
+            await cache_get("profiling:test")
+            await cache_get("profiling:missing")
+        finally:
+            profiling._current_trace.reset(token)
+
+        kinds = [(s.kind, s.name) for s in trace.spans]
+        assert ("db", "SELECT") in kinds
+        assert ("cache", "hit") in kinds
+        assert ("cache", "miss") in kinds
+
+    def test_task_profile_lifecycle(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(profiling.settings, "profiling_export_dir", str(tmp_path))
+        start_task_profile("task-1", "app.tasks.example", MODE_SPANS)
+        assert get_current_trace() is not None
+        with span("http", "GET api.sam.gov"):
+            pass
+        trace = finish_task_profile("task-1", state="SUCCESS")
+        assert get_current_trace() is None
+        assert trace is not None and trace.attrs["state"] == "SUCCESS"
+
+        profiling._export_executor.submit(lambda: None).result(timeout=5)
+        exported = list(tmp_path.glob("*.trace.json"))
+        assert len(exported) == 1
+
+    def test_unsampled_task_is_noop(self):
+        start_task_profile("task-2", "app.tasks.example", None)
+        assert get_current_trace() is None
+        assert finish_task_profile("task-2") is None
+
+    def test_task_sampling_uses_runtime_override(self, monkeypatch):
+        monkeypatch.setattr(profiling.settings, "profiling_task_sample_rate", 1.0)
+        profiling._runtime_config = _config(enabled=True, stack_sampling=False)
+        profiling._runtime_config_loaded_at = time.monotonic()
+
+        start_task_profile("task-3", "app.tasks.example", None)
+        trace = finish_task_profile("task-3")
+        assert trace is not None and trace.mode == MODE_SPANS
+
+
+class TestMiddleware:
+    async def test_header_profiles_request(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(profiling.settings, "profiling_allow_header", True)
+        response = await client.get("/health", headers={"X-Profile": "spans"})
+        assert response.status_code == 200
+        assert response.headers.get("x-trace-id")
+
+    async def test_unprofiled_request_has_no_trace_header(self, client: AsyncClient):
+        response = await client.get("/health", headers={"X-Profile": "spans"})
+        assert response.status_code == 200
+        assert "x-trace-id" not in response.headers
@@ -80,6 +80,52 @@ class TestRFPList:
         assert response.status_code == 200
         assert len(response.json()) == 5
 
+    @pytest.mark.asyncio
+    async def test_list_rfps_cursor_pagination(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ):
+        """Cursor pages walk every RFP once, newest first, including created_at ties."""
+        created_at = datetime.utcnow()
+        for i in range(7):
+            db_session.add(
+                RFP(
+                    user_id=test_user.id,
+                    title=f"Cursor RFP {i}",
+                    solicitation_number=f"CUR-{i:04d}",
+                    notice_id=f"cursor-{i}",
+                    agency="Test Agency",
+                    rfp_type="solicitation",
+                    status="new",
+                    created_at=created_at - timedelta(minutes=i // 2),
+                )
+            )
+        await db_session.commit()
+
+        seen: list[tuple[str, int]] = []
+        cursor = None
+        for _ in range(4):
+            params = {"user_id": test_user.id, "limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/v1/rfps", params=params)
+            assert response.status_code == 200
+            seen.extend((item["created_at"], item["id"]) for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert cursor is None
+        assert len(seen) == 7
+        assert seen == sorted(seen, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_list_rfps_invalid_cursor(self, client: AsyncClient, test_user: User):
+        response = await client.get(
+            "/api/v1/rfps",
+            params={"user_id": test_user.id, "cursor": "not-a-cursor"},
+        )
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_list_rfps_filter_by_status(
         self, client: AsyncClient, test_user: User, test_rfp: RFP
@@ -225,6 +271,25 @@ class TestRFPUpdate:
         assert data["is_qualified"] is True
         assert data["classification"] == "cui"
 
+    @pytest.mark.asyncio
+    async def test_update_rfp_invalidates_cached_detail(
+        self, client: AsyncClient, test_rfp: RFP, auth_headers: dict
+    ):
+        """A cached detail response is dropped when the RFP changes."""
+        first = await client.get(f"/api/v1/rfps/{test_rfp.id}", headers=auth_headers)
+        assert first.status_code == 200
+        assert first.json()["status"] != "analyzing"
+
+        response = await client.patch(
+            f"/api/v1/rfps/{test_rfp.id}",
+            json={"status": "analyzing"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        second = await client.get(f"/api/v1/rfps/{test_rfp.id}", headers=auth_headers)
+        assert second.json()["status"] == "analyzing"
+
     @pytest.mark.asyncio
     async def test_update_rfp_not_found(self, client: AsyncClient, auth_headers: dict):
         """Test updating non-existent RFP."""
@@ -0,0 +1,186 @@
+"""
+Unit tests for the saved-search percolator: compiled filters, the inverted
+index, and matches recorded on RFP commits.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.rfp import RFP, RFPStatus
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.models.user import User
+from app.services.saved_search_percolator import (
+    CompiledSearch,
+    PercolatorIndex,
+    _insert_matches_statement,
+    apply_saved_search_filters,
+    install_saved_search_percolator,
+    rebuild_search_matches,
+)
+
+FILTERS = {
+    1: {"naics_codes": ["541512"], "keywords": "cyber"},
+    2: {"keywords": ["Network Upgrade", "zero-trust"]},
+    3: {"agencies": ["defense"], "min_value": 1_000_000},
+    4: {"set_asides": ["Small Business"], "statuses": ["new"]},
+    5: {"max_value": 3_000_000},
+    6: {"currencies": ["usd"], "source_types": ["sled"]},
+    7: {"statuses": ["not-a-status"], "contract_vehicles": ["SEWP"]},
+    8: {},
+}
+
+
+def _rfps(user_id: int) -> list[RFP]:
+    return [
+        RFP(
+            user_id=user_id,
+            title="Cybersecurity Support Services",
+            solicitation_number="W912-CYB-001",
+            agency="Department of Defense",
+            naics_code="541512",
+            set_aside="Small Business",
+            estimated_value=1_500_000,
+            source_type="federal",
+            contract_vehicle="SEWP",
+        ),
+        RFP(
+            user_id=user_id,
+            title="Statewide network upgrade",
+            solicitation_number="SLED-NET-002",
+            agency="State of Virginia",
+            naics_code="541513",
+            estimated_value=4_000_000,
+            source_type="sled",
+            jurisdiction="VA",
+        ),
+        RFP(
+            user_id=user_id,
+            title="Facilities maintenance",
+            solicitation_number="GSA-FAC-003",
+            agency="General Services Administration",
+            description="Includes ZERO-TRUST badge readers.",
+            status=RFPStatus.ANALYZING,
+        ),
+    ]
+
+
+class TestPercolatorIndex:
+    def test_candidates_skip_searches_without_shared_postings(self):
+        index = PercolatorIndex.build(
+            CompiledSearch.from_filters(search_id, filters)
+            for search_id, filters in FILTERS.items()
+        )
+        cyber, network, _ = _rfps(user_id=1)
+
+        assert index.unanchored == {5, 8}
+        assert 1 not in index.candidates(network)
+        assert 4 not in index.candidates(network)
+        assert index.match(cyber) == {1, 3, 4, 5, 7, 8}
+        assert index.match(network) == {2, 6, 8}
+
+    def test_keyword_anchor_uses_a_word_run(self):
+        search = CompiledSearch.from_filters(1, {"keywords": ["  c++ / rust "]})
+        assert search.postings() == [("text", "rus")]
+        assert CompiledSearch.from_filters(2, {"keywords": ["&"]}).postings() is None
+
+
+class TestRecordedMatches:
+    @pytest.mark.asyncio
+    async def test_index_agrees_with_sql_filters(self, db_session: AsyncSession, test_user: User):
+        install_saved_search_percolator()
+        db_session.add_all(_rfps(test_user.id))
+        await db_session.commit()
+
+        index = PercolatorIndex.build(
+            CompiledSearch.from_filters(search_id, filters)
+            for search_id, filters in FILTERS.items()
+        )
+        rfps = (await db_session.execute(select(RFP))).scalars().all()
+        for search_id, filters in FILTERS.items():
+            query = apply_saved_search_filters(select(RFP.id), filters)
+            expected = set((await db_session.execute(query)).scalars().all())
+            actual = {rfp.id for rfp in rfps if search_id in index.match(rfp)}
+            assert actual == expected, filters
+
+    @pytest.mark.asyncio
+    async def test_commits_record_and_retract_matches(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        install_saved_search_percolator()
+        search = SavedSearch(user_id=test_user.id, name="Cyber", filters=FILTERS[1])
+        db_session.add(search)
+        await db_session.flush()
+        assert await rebuild_search_matches(db_session, search) == 0
+        await db_session.commit()
+
+        cyber, network, _ = _rfps(test_user.id)
+        db_session.add_all([cyber, network])
+        await db_session.commit()
+
+        async def matched_rfp_ids() -> list[int]:
+            result = await db_session.execute(
+                select(SavedSearchMatch.rfp_id).where(SavedSearchMatch.saved_search_id == search.id)
+            )
+            return list(result.scalars().all())
+
+        assert await matched_rfp_ids() == [cyber.id]
+
+        cyber.naics_code = "541513"
+        await db_session.commit()
+        assert await matched_rfp_ids() == []
+
+        network.title = "Cyber network upgrade"
+        network.naics_code = "541512"
+        await db_session.commit()
+        assert await matched_rfp_ids() == [network.id]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_keeps_matched_at_for_matches_that_still_apply(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        install_saved_search_percolator()
+        rfps = _rfps(test_user.id)
+        rfps[0].created_at = datetime.utcnow() - timedelta(days=30)
+        db_session.add_all(rfps)
+        search = SavedSearch(user_id=test_user.id, name="Defense", filters={"agencies": "defense"})
+        db_session.add(search)
+        await db_session.flush()
+
+        # A first build dates pre-existing RFPs to their creation, not "now".
+        assert await rebuild_search_matches(db_session, search) == 1
+        await db_session.commit()
+        match = (
+            await db_session.execute(
+                select(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == search.id)
+            )
+        ).scalar_one()
+        original_matched_at = match.matched_at
+        assert original_matched_at == rfps[0].created_at
+
+        search.filters = {"agencies": ["defense", "virginia"]}
+        assert await rebuild_search_matches(db_session, search) == 2
+        await db_session.commit()
+        await db_session.refresh(match)
+        assert match.matched_at == original_matched_at
+
+    @pytest.mark.asyncio
+    async def test_match_inserts_ignore_rows_written_concurrently(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        search = SavedSearch(user_id=test_user.id, name="Cyber", filters=FILTERS[1])
+        cyber = _rfps(test_user.id)[0]
+        db_session.add_all([search, cyber])
+        await db_session.flush()
+        row = {"saved_search_id": search.id, "rfp_id": cyber.id, "user_id": test_user.id}
+        # Both the percolator and a racing rebuild insert the same pair.
+        for _ in range(2):
+            await db_session.execute(_insert_matches_statement(db_session, [row]))
+        await db_session.commit()
+
+        result = await db_session.execute(
+            select(SavedSearchMatch).where(SavedSearchMatch.saved_search_id == search.id)
+        )
+        assert len(result.scalars().all()) == 1
@@ -198,3 +198,43 @@ class TestRunSavedSearch:
         list_response = await client.get("/api/v1/saved-searches", headers=auth_headers)
         updated = [s for s in list_response.json() if s["id"] == search.id][0]
         assert updated["last_run_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_run_returns_matches_recorded_at_ingest(
+        self, client: AsyncClient, auth_headers: dict, test_user: User
+    ):
+        response = await client.post(
+            "/api/v1/saved-searches",
+            headers=auth_headers,
+            json={"name": "Cloud", "filters": {"keywords": ["cloud migration"]}},
+        )
+        search_id = response.json()["id"]
+
+        response = await client.post(
+            "/api/v1/rfps",
+            headers=auth_headers,
+            json={
+                "title": "Enterprise Cloud Migration Support",
+                "solicitation_number": "PERC-001",
+                "agency": "Department of Energy",
+            },
+        )
+        assert response.status_code == 200
+        rfp_id = response.json()["id"]
+
+        response = await client.post(
+            f"/api/v1/saved-searches/{search_id}/run", headers=auth_headers
+        )
+        assert [match["id"] for match in response.json()["matches"]] == [rfp_id]
+
+        response = await client.patch(
+            f"/api/v1/rfps/{rfp_id}",
+            headers=auth_headers,
+            json={"title": "Enterprise Data Center Support"},
+        )
+        assert response.status_code == 200
+
+        response = await client.post(
+            f"/api/v1/saved-searches/{search_id}/run", headers=auth_headers
+        )
+        assert response.json()["match_count"] == 0
@@ -0,0 +1,58 @@
+"""
+Unit tests for section_version_store delta encoding and diff hunks.
+"""
+
+import json
+import random
+
+from app.services.section_version_store import apply_delta, compute_delta, diff_hunks
+
+
+class TestDeltaRoundTrip:
+    def test_round_trips_edits(self):
+        base = "The contractor shall deliver monthly status reports.\nSecond line."
+        target = "The contractor will deliver weekly status reports.\nSecond line.\nThird."
+        delta = compute_delta(base, target)
+        assert apply_delta(base, delta) == target
+        assert apply_delta(base, json.loads(json.dumps(delta))) == target
+
+    def test_round_trips_from_and_to_empty(self):
+        assert apply_delta("", compute_delta("", "new text")) == "new text"
+        assert apply_delta("old text", compute_delta("old text", "")) == ""
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        words = ["alpha", "beta", "gamma", "delta", "\n", "  ", "epsilon."]
+        for _ in range(200):
+            base = " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+            target = " ".join(rng.choice(words) for _ in range(rng.randint(0, 30)))
+            assert apply_delta(base, compute_delta(base, target)) == target
+
+    def test_small_edit_produces_small_delta(self):
+        base = " ".join(f"word{i}" for i in range(500))
+        target = base.replace("word250", "changed")
+        delta = json.dumps(compute_delta(base, target))
+        assert len(delta) < 100
+
+
+class TestDiffHunks:
+    def test_identical_texts_have_no_hunks(self):
+        result = diff_hunks("same text", "same text")
+        assert result["hunks"] == []
+        assert result["stats"]["unchanged_words"] == 2
+
+    def test_offsets_point_into_both_texts(self):
+        before = "alpha beta gamma"
+        after = "alpha delta gamma"
+        (hunk,) = diff_hunks(before, after)["hunks"]
+        assert before[hunk["a_start"] : hunk["a_end"]] == "beta"
+        assert after[hunk["b_start"] : hunk["b_end"]] == "delta"
+
+    def test_line_granularity(self):
+        before = "one\ntwo\nthree\n"
+        after = "one\n2\nthree\nfour\n"
+        hunks = diff_hunks(before, after, "line")["hunks"]
+        assert [(h["op"], h["removed"], h["added"]) for h in hunks] == [
+            ("replace", "two\n", "2\n"),
+            ("insert", "", "four\n"),
+        ]
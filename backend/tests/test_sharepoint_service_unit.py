@@ -4,7 +4,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.sharepoint_service import SharePointService, create_sharepoint_service
+from app.services.sharepoint_service import (
+    SIMPLE_UPLOAD_MAX_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    SharePointService,
+    create_sharepoint_service,
+)
 
 VALID_CONFIG = {
     "tenant_id": "tenant-123",
@@ -203,6 +208,114 @@ class TestUploadFile:
             assert result["name"] == "upload.docx"
             assert result["size"] == 2048
 
+    @pytest.mark.asyncio
+    async def test_large_upload_uses_upload_session(self):
+        svc = _make_service()
+        svc._token = "tok"
+        content = b"x" * (SIMPLE_UPLOAD_MAX_BYTES + 10)
+
+        session_response = MagicMock()
+        session_response.json.return_value = {"uploadUrl": "https://upload.example.com/s1"}
+        chunk_response = MagicMock()
+        chunk_response.json.return_value = {"id": "big-id", "name": "big.docx", "size": 1}
+
+        with patch("app.services.sharepoint_service.httpx.AsyncClient") as MockClient:
+            mock_client = AsyncMock()
+            mock_client.post.return_value = session_response
+            mock_client.put.return_value = chunk_response
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            MockClient.return_value = mock_client
+
+            result = await svc.upload_file("/proposals", "big.docx", content)
+
+        assert result["id"] == "big-id"
+        assert "createUploadSession" in mock_client.post.call_args[0][0]
+        ranges = [c.kwargs["headers"]["Content-Range"] for c in mock_client.put.call_args_list]
+        total = len(content)
+        assert len(ranges) == -(-total // UPLOAD_CHUNK_BYTES)
+        assert ranges[0] == f"bytes 0-{UPLOAD_CHUNK_BYTES - 1}/{total}"
+        assert ranges[-1].endswith(f"-{total - 1}/{total}")
+        assert all(
+            "Authorization" not in c.kwargs["headers"] for c in mock_client.put.call_args_list
+        )
+
+
+# ---------------------------------------------------------------------------
+# Folder changes (delta)
+# ---------------------------------------------------------------------------
+class TestGetFolderChanges:
+    @pytest.mark.asyncio
+    async def test_follows_pages_and_filters_to_folder(self):
+        svc = _make_service()
+        svc._token = "tok"
+
+        def _item(item_id: str, parent_id: str, **extra) -> dict:
+            # Delta responses only carry the parent's id, never its path.
+            return {
+                "id": item_id,
+                "name": f"{item_id}.pdf",
+                "parentReference": {"driveId": "drive-xyz", "id": parent_id},
+                **extra,
+            }
+
+        folder = MagicMock(status_code=200)
+        folder.json.return_value = {"id": "folder-1", "name": "Incoming RFPs"}
+        first = MagicMock(status_code=200)
+        first.json.return_value = {
+            "value": [_item("a", "folder-1"), _item("b", "folder-2")],
+            "@odata.nextLink": "https://graph.example.com/next",
+        }
+        second = MagicMock(status_code=200)
+        second.json.return_value = {
+            "value": [
+                _item("c", "folder-1", deleted={}),
+                _item("d", "folder-1", folder={}),
+            ],
+            "@odata.deltaLink": "https://graph.example.com/delta?token=abc",
+        }
+
+        with patch("app.services.sharepoint_service.httpx.AsyncClient") as MockClient:
+            mock_client = AsyncMock()
+            mock_client.get.side_effect = [folder, first, second]
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            MockClient.return_value = mock_client
+
+            result = await svc.get_folder_changes("/Incoming RFPs/")
+
+        assert [item["id"] for item in result["items"]] == ["a", "d"]
+        assert result["items"][1]["is_folder"] is True
+        assert result["delta_link"] == "https://graph.example.com/delta?token=abc"
+        urls = [c[0][0] for c in mock_client.get.call_args_list]
+        assert urls[0].endswith("/drives/drive-xyz/root:/Incoming RFPs")
+        assert urls[1].endswith("/drives/drive-xyz/root/delta")
+
+    @pytest.mark.asyncio
+    async def test_expired_delta_link_restarts_enumeration(self):
+        svc = _make_service()
+        svc._token = "tok"
+
+        root = MagicMock(status_code=200)
+        root.json.return_value = {"id": "root-id"}
+        gone = MagicMock(status_code=410)
+        fresh = MagicMock(status_code=200)
+        fresh.json.return_value = {"value": [], "@odata.deltaLink": "https://new"}
+
+        with patch("app.services.sharepoint_service.httpx.AsyncClient") as MockClient:
+            mock_client = AsyncMock()
+            mock_client.get.side_effect = [root, gone, root, fresh]
+            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+            mock_client.__aexit__ = AsyncMock(return_value=False)
+            MockClient.return_value = mock_client
+
+            result = await svc.get_folder_changes("/", "https://stale")
+
+        assert result == {"items": [], "delta_link": "https://new"}
+        urls = [c[0][0] for c in mock_client.get.call_args_list]
+        assert urls[0].endswith("/drives/drive-xyz/root")
+        assert urls[1] == "https://stale"
+
 
 # ---------------------------------------------------------------------------
 # Get file versions
@@ -146,3 +146,136 @@ class TestWatchFolders:
             result = asyncio.run(_watch_folders())
             assert result["detected"] == 0
             assert result["configs_checked"] == 1
+
+
+def _push_session(config, proposal, sections, rfp):
+    """Session whose queries return config, proposal, integration, sections, RFP."""
+    integration = MagicMock()
+    integration.config = {}
+    mock_session = AsyncMock()
+    mock_session.add = MagicMock()
+    results = []
+    for value in (config, proposal, integration):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = value
+        results.append(result)
+    sections_result = MagicMock()
+    sections_result.scalars.return_value.all.return_value = sections
+    rfp_result = MagicMock()
+    rfp_result.scalar_one_or_none.return_value = rfp
+    mock_session.execute = AsyncMock(side_effect=[*results, sections_result, rfp_result])
+    return mock_session
+
+
+class TestSyncProposalPush:
+    def _fixtures(self):
+        config = MagicMock(id=1, proposal_id=1, user_id=1, sharepoint_folder="/Proposals")
+        config.last_synced_hash = None
+        proposal = MagicMock(id=1, rfp_id=1, title="Cyber Proposal", executive_summary="Summary")
+        section = MagicMock(
+            section_number="1",
+            title="Approach",
+            requirement_text="Describe approach",
+            final_content="<p>Our approach</p>",
+            display_order=0,
+        )
+        rfp = MagicMock(solicitation_number="W912-1", agency="DoD", response_deadline=None)
+        return config, proposal, [section], rfp
+
+    def test_renders_in_process_and_records_hash(self):
+        from app.tasks.sharepoint_sync_tasks import _sync_proposal, proposal_content_hash
+
+        config, proposal, sections, rfp = self._fixtures()
+        mock_session = _push_session(config, proposal, sections, rfp)
+        sp = MagicMock()
+        sp.upload_file = AsyncMock(return_value={"id": "item-1", "web_url": "https://sp/x"})
+
+        with (
+            patch(
+                "app.tasks.sharepoint_sync_tasks.get_celery_session_context",
+                _mock_session_ctx(mock_session),
+            ),
+            patch("app.tasks.sharepoint_sync_tasks.create_sharepoint_service", return_value=sp),
+            patch("app.api.routes.export.create_docx_proposal", return_value=b"docx") as render,
+        ):
+            result = asyncio.run(_sync_proposal(config_id=1))
+
+        assert result["status"] == "success"
+        render.assert_called_once_with(proposal, sections, rfp)
+        sp.upload_file.assert_awaited_once_with("/Proposals", "Cyber_Proposal.docx", b"docx")
+        assert config.last_synced_hash == proposal_content_hash(
+            proposal, sections, rfp, "/Proposals"
+        )
+
+    def test_unchanged_content_skips_render_and_upload(self):
+        from app.tasks.sharepoint_sync_tasks import _sync_proposal, proposal_content_hash
+
+        config, proposal, sections, rfp = self._fixtures()
+        config.last_synced_hash = proposal_content_hash(proposal, sections, rfp, "/Proposals")
+        mock_session = _push_session(config, proposal, sections, rfp)
+        sp = MagicMock()
+        sp.upload_file = AsyncMock()
+
+        with (
+            patch(
+                "app.tasks.sharepoint_sync_tasks.get_celery_session_context",
+                _mock_session_ctx(mock_session),
+            ),
+            patch("app.tasks.sharepoint_sync_tasks.create_sharepoint_service", return_value=sp),
+            patch("app.api.routes.export.create_docx_proposal") as render,
+        ):
+            result = asyncio.run(_sync_proposal(config_id=1))
+
+        assert result["status"] == "skipped"
+        render.assert_not_called()
+        sp.upload_file.assert_not_awaited()
+        log = mock_session.add.call_args[0][0]
+        assert log.status == "skipped"
+
+    def test_hash_changes_with_section_content_and_folder(self):
+        from app.tasks.sharepoint_sync_tasks import proposal_content_hash
+
+        _, proposal, sections, rfp = self._fixtures()
+        before = proposal_content_hash(proposal, sections, rfp, "/Proposals")
+        assert proposal_content_hash(proposal, sections, rfp, "/Archive") != before
+        sections[0].final_content = "<p>Revised approach</p>"
+        assert proposal_content_hash(proposal, sections, rfp, "/Proposals") != before
+
+
+class TestWatchFoldersDelta:
+    def test_uses_and_stores_delta_link(self):
+        from app.tasks.sharepoint_sync_tasks import _watch_folders
+
+        config = MagicMock(id=1, user_id=1, sharepoint_folder="/Incoming")
+        config.watch_delta_link = "https://graph/delta?token=old"
+        configs_result = MagicMock()
+        configs_result.scalars.return_value.all.return_value = [config]
+        integration_result = MagicMock()
+        integration_result.scalar_one_or_none.return_value = MagicMock(config={})
+        mock_session = AsyncMock()
+        mock_session.add = MagicMock()
+        mock_session.execute = AsyncMock(side_effect=[configs_result, integration_result])
+
+        sp = MagicMock()
+        sp.get_folder_changes = AsyncMock(
+            return_value={
+                "items": [
+                    {"id": "f1", "name": "rfp.pdf", "is_folder": False},
+                    {"id": "d1", "name": "Archive", "is_folder": True},
+                ],
+                "delta_link": "https://graph/delta?token=new",
+            }
+        )
+
+        with (
+            patch(
+                "app.tasks.sharepoint_sync_tasks.get_celery_session_context",
+                _mock_session_ctx(mock_session),
+            ),
+            patch("app.tasks.sharepoint_sync_tasks.create_sharepoint_service", return_value=sp),
+        ):
+            result = asyncio.run(_watch_folders())
+
+        assert result["detected"] == 1
+        sp.get_folder_changes.assert_awaited_once_with("/Incoming", "https://graph/delta?token=old")
+        assert config.watch_delta_link == "https://graph/delta?token=new"
@@ -177,6 +177,73 @@ class TestSearchPartners:
         assert resp.json() == []
 
 
+class TestSearchPartnersPagination:
+    @pytest_asyncio.fixture
+    async def many_partners(self, db_session: AsyncSession, test_user: User) -> None:
+        for name in ["Zeta Cloud", "Cloud", "Alpha Cloud Group", "Cloudworks", "Beta Cloud"]:
+            db_session.add(
+                TeamingPartner(
+                    user_id=test_user.id,
+                    name=name,
+                    is_public=True,
+                    naics_codes=["541512"],
+                    capabilities=["Cloud_Ops 100%"],
+                )
+            )
+        await db_session.commit()
+
+    @pytest.mark.asyncio
+    async def test_relevance_ordering(
+        self, client: AsyncClient, auth_headers: dict, many_partners: None
+    ) -> None:
+        resp = await client.get(f"{BASE}/search", headers=auth_headers, params={"q": "cloud"})
+        assert resp.status_code == 200
+        assert [p["name"] for p in resp.json()] == [
+            "Cloud",
+            "Cloudworks",
+            "Alpha Cloud Group",
+            "Beta Cloud",
+            "Zeta Cloud",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_all_results(
+        self, client: AsyncClient, auth_headers: dict, many_partners: None
+    ) -> None:
+        names: list[str] = []
+        params: dict = {"q": "cloud", "naics": "541512", "limit": 2}
+        for _ in range(5):
+            resp = await client.get(f"{BASE}/search", headers=auth_headers, params=params)
+            assert resp.status_code == 200
+            names.extend(p["name"] for p in resp.json())
+            next_cursor = resp.headers.get("x-next-cursor")
+            if not next_cursor:
+                break
+            params["cursor"] = next_cursor
+        assert len(names) == 5
+        assert len(set(names)) == 5
+
+    @pytest.mark.asyncio
+    async def test_capability_wildcards_are_literal(
+        self, client: AsyncClient, auth_headers: dict, many_partners: None
+    ) -> None:
+        resp = await client.get(
+            f"{BASE}/search", headers=auth_headers, params={"capability": "_ops 100%"}
+        )
+        assert len(resp.json()) == 5
+        resp = await client.get(
+            f"{BASE}/search", headers=auth_headers, params={"capability": "xops"}
+        )
+        assert resp.json() == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient, auth_headers: dict) -> None:
+        resp = await client.get(
+            f"{BASE}/search", headers=auth_headers, params={"cursor": "not-a-cursor"}
+        )
+        assert resp.status_code == 400
+
+
 class TestGetPartnerProfile:
     @pytest.mark.asyncio
     async def test_get_profile_requires_auth(self, client: AsyncClient) -> None:
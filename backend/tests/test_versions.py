@@ -225,7 +225,7 @@ class TestSectionVersions:
         response = await client.get(
             f"/api/v1/versions/sections/{section.id}/compare",
             headers=auth_headers,
-            params={"version_a": 1, "version_b": 2},
+            params={"version_a": 1, "version_b": 2, "include_content": True},
         )
         assert response.status_code == 200
         data = response.json()
@@ -2,9 +2,13 @@
 Integration tests for versions.py — /versions/ proposal and section version history
 """
 
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
 
 from app.models.proposal import (
     Proposal,
@@ -16,6 +20,13 @@ from app.models.proposal import (
 from app.models.rfp import RFP
 from app.models.user import User
 from app.services.auth_service import create_token_pair, hash_password
+from app.services.section_version_store import (
+    add_section_version,
+    clear_reconstruction_cache,
+    compute_delta,
+    content_hash,
+    load_version_content,
+)
 
 
 async def _create_second_user(db_session: AsyncSession) -> tuple[User, dict]:
@@ -266,6 +277,39 @@ class TestGetSectionVersion:
         )
         assert response.status_code == 200
         assert response.json()["content"] == "Detailed content"
+        assert response.json()["diff_from_previous"] is None
+
+    @pytest.mark.asyncio
+    async def test_delta_version_returns_readable_diff(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        db_session: AsyncSession,
+        test_user: User,
+        test_proposal: Proposal,
+    ):
+        section = await _create_section(db_session, test_proposal)
+        for text in ["Our approach is proven.\n", "Our phased approach is proven.\n"]:
+            version = await add_section_version(
+                db_session,
+                section_id=section.id,
+                user_id=test_user.id,
+                content=text,
+                change_type="edited",
+            )
+        await db_session.commit()
+        clear_reconstruction_cache()
+        assert version.storage_kind == "delta"
+
+        response = await client.get(
+            f"/api/v1/versions/sections/{section.id}/version/{version.id}",
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["content"] == "Our phased approach is proven.\n"
+        assert "-Our approach is proven." in data["diff_from_previous"]
+        assert "+Our phased approach is proven." in data["diff_from_previous"]
 
 
 class TestRestoreSectionVersion:
@@ -360,8 +404,70 @@ class TestCompareSectionVersions:
         )
         assert response.status_code == 200
         data = response.json()
-        assert data["version_a"]["content"] == "Content v1"
-        assert data["version_b"]["content"] == "Content v2"
+        assert "content" not in data["version_a"]
+        assert data["granularity"] == "word"
+        assert data["hunks"] == [
+            {
+                "op": "replace",
+                "a_start": 8,
+                "a_end": 10,
+                "b_start": 8,
+                "b_end": 10,
+                "removed": "v1",
+                "added": "v2",
+            }
+        ]
+        assert data["stats"] == {"inserted_words": 1, "deleted_words": 1, "unchanged_words": 1}
+
+    @pytest.mark.asyncio
+    async def test_compare_reconstructs_delta_versions(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        db_session: AsyncSession,
+        test_user: User,
+        test_proposal: Proposal,
+    ):
+        section = await _create_section(db_session, test_proposal)
+        texts = [
+            "Our approach delivers the system on time.",
+            "Our phased approach delivers the system on time.",
+            "Our phased approach delivers the system on time and on budget.",
+        ]
+        for text in texts:
+            await add_section_version(
+                db_session,
+                section_id=section.id,
+                user_id=test_user.id,
+                content=text,
+                change_type="edited",
+            )
+        await db_session.commit()
+        clear_reconstruction_cache()
+
+        stored = (
+            (
+                await db_session.execute(
+                    select(SectionVersion)
+                    .where(SectionVersion.section_id == section.id)
+                    .order_by(SectionVersion.version_number)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [v.storage_kind for v in stored] == ["full", "delta", "delta"]
+        assert stored[2].content is None
+
+        response = await client.get(
+            f"/api/v1/versions/sections/{section.id}/compare",
+            headers=auth_headers,
+            params={"version_a": 1, "version_b": 3, "include_content": True},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version_b"]["content"] == texts[2]
+        assert [hunk["added"] for hunk in data["hunks"]] == [" phased", "time and on budget."]
 
     @pytest.mark.asyncio
     async def test_compare_missing_version(
@@ -391,3 +497,66 @@ class TestCompareSectionVersions:
             params={"version_a": 1, "version_b": 99},
         )
         assert response.status_code == 404
+
+
+class TestSectionVersionChain:
+    """Storage invariants of the delta chain behind section versions."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_version_number_is_rejected(
+        self, db_session: AsyncSession, test_user: User, test_proposal: Proposal
+    ):
+        section = await _create_section(db_session, test_proposal)
+        for _ in range(2):
+            db_session.add(
+                SectionVersion(
+                    section_id=section.id,
+                    user_id=test_user.id,
+                    version_number=1,
+                    content="Same number",
+                    change_type="edited",
+                )
+            )
+        with pytest.raises(IntegrityError):
+            await db_session.commit()
+        await db_session.rollback()
+
+    @pytest.mark.asyncio
+    async def test_replay_follows_base_version_links(
+        self, db_session: AsyncSession, test_user: User, test_proposal: Proposal
+    ):
+        section = await _create_section(db_session, test_proposal)
+        base_text = "Our approach delivers the system on time."
+        other_text = "A completely different keyframe body."
+        target_text = "Our approach delivers the whole system on time."
+        rows = [
+            SectionVersion(
+                section_id=section.id,
+                user_id=test_user.id,
+                version_number=number,
+                content=text,
+                content_hash=content_hash(text),
+                storage_kind="full",
+                change_type="edited",
+            )
+            for number, text in ((1, base_text), (2, other_text))
+        ]
+        # Version 3 is a delta against version 1, not its numeric predecessor.
+        rows.append(
+            SectionVersion(
+                section_id=section.id,
+                user_id=test_user.id,
+                version_number=3,
+                content=None,
+                content_hash=content_hash(target_text),
+                storage_kind="delta",
+                base_version_number=1,
+                diff_from_previous=json.dumps(compute_delta(base_text, target_text)),
+                change_type="edited",
+            )
+        )
+        db_session.add_all(rows)
+        await db_session.commit()
+        clear_reconstruction_cache()
+
+        assert await load_version_content(db_session, rows[2]) == target_text
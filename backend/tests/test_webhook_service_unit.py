@@ -1,18 +1,21 @@
 """Unit tests for webhook_service module."""
 
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.user import User
 from app.models.webhook import (
     WebhookDeliveryStatus,
     WebhookSubscription,
 )
+from app.services import webhook_service
 from app.services.auth_service import hash_password
-from app.services.webhook_service import dispatch_webhook_event
+from app.services.webhook_service import deliver_pending_webhooks, dispatch_webhook_event
 
 
 @pytest_asyncio.fixture
@@ -97,6 +100,43 @@ async def test_dispatch_skips_non_matching_event(
     assert deliveries == []
 
 
+@pytest.fixture
+def delivery_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "webhook_delivery_enabled", True)
+    kicks = []
+    monkeypatch.setattr(webhook_service, "schedule_webhook_delivery", lambda: kicks.append(1))
+    return kicks
+
+
+def _mock_http(response=None, error=None):
+    client = AsyncMock()
+    if error is not None:
+        client.post.side_effect = error
+    else:
+        client.post.return_value = response
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=False)
+    return patch("app.services.webhook_service.httpx.AsyncClient", return_value=client), client
+
+
+def _response(status_code: int, text: str = "OK"):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    return response
+
+
+async def _dispatch(db_session: AsyncSession, user: User, event_type: str = "rfp.created"):
+    deliveries = await dispatch_webhook_event(
+        db_session,
+        user_id=user.id,
+        event_type=event_type,
+        payload={"rfp_id": 42},
+    )
+    await db_session.commit()
+    return deliveries
+
+
 # ---------------------------------------------------------------------------
 # Delivery disabled (skipped)
 # ---------------------------------------------------------------------------
@@ -119,103 +159,222 @@ async def test_dispatch_skips_when_delivery_disabled(
         assert deliveries[0].status == WebhookDeliveryStatus.SKIPPED
 
 
+# ---------------------------------------------------------------------------
+# Outbox: dispatch only records, delivery happens after commit
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_dispatch_writes_pending_row_without_http(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+):
+    http, client = _mock_http(_response(200))
+    with http:
+        deliveries = await _dispatch(db_session, webhook_user)
+
+    assert len(deliveries) == 1
+    assert deliveries[0].status == WebhookDeliveryStatus.PENDING
+    client.post.assert_not_called()
+    assert delivery_enabled == [1]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_dispatch_is_not_scheduled(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+):
+    await dispatch_webhook_event(
+        db_session, user_id=webhook_user.id, event_type="rfp.created", payload={}
+    )
+    await db_session.rollback()
+    await db_session.commit()
+    assert delivery_enabled == []
+
+
 # ---------------------------------------------------------------------------
 # Successful delivery
 # ---------------------------------------------------------------------------
 @pytest.mark.asyncio
-async def test_dispatch_successful_delivery(
+async def test_deliver_successful_delivery(
     db_session: AsyncSession,
     webhook_user: User,
     active_subscription: WebhookSubscription,
+    delivery_enabled: list,
 ):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.text = "OK"
+    deliveries = await _dispatch(db_session, webhook_user)
+    http, client = _mock_http(_response(200))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
 
-    with patch("app.services.webhook_service.settings") as mock_settings:
-        mock_settings.webhook_delivery_enabled = True
-
-        with patch("app.services.webhook_service.httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_client
-
-            deliveries = await dispatch_webhook_event(
-                db_session,
-                user_id=webhook_user.id,
-                event_type="rfp.created",
-                payload={"rfp_id": 42},
-            )
-            assert len(deliveries) == 1
-            assert deliveries[0].status == WebhookDeliveryStatus.DELIVERED
-            assert deliveries[0].response_code == 200
-            assert deliveries[0].delivered_at is not None
+    assert stats["delivered"] == 1
+    assert deliveries[0].status == WebhookDeliveryStatus.DELIVERED
+    assert deliveries[0].response_code == 200
+    assert deliveries[0].attempt_count == 1
+    assert deliveries[0].delivered_at is not None
+    assert client.post.call_args.kwargs["json"] == {"rfp_id": 42}
 
 
 # ---------------------------------------------------------------------------
-# Failed delivery (HTTP error)
+# Failed delivery (HTTP error) is retried with backoff
 # ---------------------------------------------------------------------------
 @pytest.mark.asyncio
-async def test_dispatch_failed_delivery_http_error(
+async def test_deliver_http_error_schedules_retry(
     db_session: AsyncSession,
     webhook_user: User,
     active_subscription: WebhookSubscription,
+    delivery_enabled: list,
 ):
-    mock_response = MagicMock()
-    mock_response.status_code = 500
-    mock_response.text = "Internal Server Error"
+    deliveries = await _dispatch(db_session, webhook_user)
+    http, _ = _mock_http(_response(500, "Internal Server Error"))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
 
-    with patch("app.services.webhook_service.settings") as mock_settings:
-        mock_settings.webhook_delivery_enabled = True
-
-        with patch("app.services.webhook_service.httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_client
-
-            deliveries = await dispatch_webhook_event(
-                db_session,
-                user_id=webhook_user.id,
-                event_type="rfp.created",
-                payload={"rfp_id": 1},
-            )
-            assert len(deliveries) == 1
-            assert deliveries[0].status == WebhookDeliveryStatus.FAILED
-            assert deliveries[0].response_code == 500
+    delivery = deliveries[0]
+    assert stats["retrying"] == 1
+    assert delivery.status == WebhookDeliveryStatus.PENDING
+    assert delivery.response_code == 500
+    assert delivery.next_attempt_at > datetime.utcnow()
+
+    # Not due yet, so a second run leaves it alone.
+    with http:
+        assert (await deliver_pending_webhooks(db_session))["claimed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_deliver_fails_after_max_attempts(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "webhook_max_attempts", 1)
+    deliveries = await _dispatch(db_session, webhook_user)
+    http, _ = _mock_http(error=ConnectionError("Connection refused"))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
+
+    assert stats["failed"] == 1
+    assert deliveries[0].status == WebhookDeliveryStatus.FAILED
+    assert "Connection refused" in deliveries[0].response_body
+
+
+@pytest.mark.asyncio
+async def test_deliver_truncates_response_body(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+):
+    deliveries = await _dispatch(db_session, webhook_user)
+    http, _ = _mock_http(_response(200, "x" * 50_000))
+    with http:
+        await deliver_pending_webhooks(db_session)
+
+    assert len(deliveries[0].response_body) < 50_000
+    assert deliveries[0].response_body.endswith("[truncated]")
 
 
 # ---------------------------------------------------------------------------
-# Failed delivery (network exception)
+# Circuit breaker
 # ---------------------------------------------------------------------------
 @pytest.mark.asyncio
-async def test_dispatch_failed_delivery_exception(
+async def test_circuit_opens_after_consecutive_failures(
     db_session: AsyncSession,
     webhook_user: User,
     active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+    monkeypatch,
 ):
-    with patch("app.services.webhook_service.settings") as mock_settings:
-        mock_settings.webhook_delivery_enabled = True
-
-        with patch("app.services.webhook_service.httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.side_effect = ConnectionError("Connection refused")
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_client
-
-            deliveries = await dispatch_webhook_event(
-                db_session,
-                user_id=webhook_user.id,
-                event_type="rfp.created",
-                payload={"rfp_id": 1},
-            )
-            assert len(deliveries) == 1
-            assert deliveries[0].status == WebhookDeliveryStatus.FAILED
-            assert "Connection refused" in deliveries[0].response_body
+    monkeypatch.setattr(settings, "webhook_circuit_failure_threshold", 2)
+    active_subscription.consecutive_failures = 1
+    await db_session.commit()
+    await _dispatch(db_session, webhook_user)
+
+    http, _ = _mock_http(_response(503, "Unavailable"))
+    with http:
+        await deliver_pending_webhooks(db_session)
+
+    await db_session.refresh(active_subscription)
+    assert active_subscription.consecutive_failures == 2
+    assert active_subscription.circuit_open_until > datetime.utcnow()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_defers_without_spending_attempts(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+):
+    open_until = datetime.utcnow() + timedelta(minutes=5)
+    active_subscription.circuit_open_until = open_until
+    await db_session.commit()
+    deliveries = await _dispatch(db_session, webhook_user)
+
+    http, client = _mock_http(_response(200))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
+
+    client.post.assert_not_called()
+    assert stats["deferred"] == 1
+    assert deliveries[0].attempt_count == 0
+    assert deliveries[0].next_attempt_at == open_until
+
+
+# ---------------------------------------------------------------------------
+# Per-endpoint ordering
+# ---------------------------------------------------------------------------
+@pytest.mark.asyncio
+async def test_failure_holds_back_later_events_for_endpoint(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+):
+    first = (await _dispatch(db_session, webhook_user))[0]
+    later = [(await _dispatch(db_session, webhook_user))[0] for _ in range(2)]
+
+    http, client = _mock_http(_response(503, "Unavailable"))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
+
+    assert client.post.call_count == 1
+    assert stats["retrying"] == 1
+    assert stats["deferred"] == 2
+    assert all(row.attempt_count == 0 for row in later)
+    assert all(row.next_attempt_at == first.next_attempt_at for row in later)
+
+    # New events queue behind the waiting retry instead of overtaking it.
+    await _dispatch(db_session, webhook_user)
+    with http:
+        assert (await deliver_pending_webhooks(db_session))["claimed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_row_claimed_max_times_is_failed_not_reclaimed(
+    db_session: AsyncSession,
+    webhook_user: User,
+    active_subscription: WebhookSubscription,
+    delivery_enabled: list,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "webhook_max_attempts", 2)
+    delivery = (await _dispatch(db_session, webhook_user))[0]
+    # Two earlier claims whose worker died before recording an outcome.
+    delivery.attempt_count = 2
+    await db_session.commit()
+
+    http, client = _mock_http(_response(200))
+    with http:
+        stats = await deliver_pending_webhooks(db_session)
+
+    client.post.assert_not_called()
+    assert stats["claimed"] == 0
+    assert delivery.status == WebhookDeliveryStatus.FAILED
 
 
 # ---------------------------------------------------------------------------
@@ -241,38 +400,24 @@ async def test_dispatch_catch_all_subscription(
 
 
 # ---------------------------------------------------------------------------
-# Secret header
+# Headers
 # ---------------------------------------------------------------------------
 @pytest.mark.asyncio
-async def test_dispatch_includes_secret_header(
+async def test_deliver_includes_secret_and_delivery_headers(
     db_session: AsyncSession,
     webhook_user: User,
     active_subscription: WebhookSubscription,
+    delivery_enabled: list,
 ):
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.text = "OK"
-
-    with patch("app.services.webhook_service.settings") as mock_settings:
-        mock_settings.webhook_delivery_enabled = True
-
-        with patch("app.services.webhook_service.httpx.AsyncClient") as MockClient:
-            mock_client = AsyncMock()
-            mock_client.post.return_value = mock_response
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_client
-
-            await dispatch_webhook_event(
-                db_session,
-                user_id=webhook_user.id,
-                event_type="rfp.created",
-                payload={"rfp_id": 1},
-            )
-            call_kwargs = mock_client.post.call_args
-            headers = call_kwargs.kwargs.get("headers", {})
-            assert headers.get("X-Webhook-Secret") == "webhook-secret-123"
-            assert headers.get("X-Webhook-Event") == "rfp.created"
+    deliveries = await _dispatch(db_session, webhook_user)
+    http, client = _mock_http(_response(200))
+    with http:
+        await deliver_pending_webhooks(db_session)
+
+    headers = client.post.call_args.kwargs.get("headers", {})
+    assert headers.get("X-Webhook-Secret") == "webhook-secret-123"
+    assert headers.get("X-Webhook-Event") == "rfp.created"
+    assert headers.get("X-Webhook-Delivery") == str(deliveries[0].id)
 
 
 # ---------------------------------------------------------------------------
@@ -354,3 +354,20 @@ class TestAIRewrite:
         assert data["mode"] == "shorten"
         assert data["original_length"] > 0
         assert data["rewritten_length"] > 0
+
+    @pytest.mark.asyncio
+    @patch("app.api.routes.word_addin.settings")
+    async def test_rewrite_stream_mock_mode(
+        self, mock_settings, client: AsyncClient, auth_headers: dict
+    ):
+        """The streaming variant emits chunk events and a final done event."""
+        mock_settings.mock_ai = True
+        response = await client.post(
+            "/api/v1/word-addin/ai/rewrite/stream",
+            headers=auth_headers,
+            json={"content": "Our approach is comprehensive.", "mode": "shorten"},
+        )
+        assert response.status_code == 200
+        assert "event: chunk" in response.text
+        assert "event: done" in response.text
+        assert '"rewritten":"[shorten] Our approach is comprehensive."' in response.text
@@ -0,0 +1,95 @@
+"""
+Unit tests for the Celery worker runtime (persistent loop + pooled engine).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app import database
+from app.database import get_celery_session_context
+from app.services import cache_service, cache_tags
+from app.tasks import worker_runtime
+from app.tasks.worker_runtime import run_async, shutdown_worker_runtime
+
+
+@pytest.fixture(autouse=True)
+def _fresh_runtime():
+    shutdown_worker_runtime()
+    yield
+    shutdown_worker_runtime()
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+async def _session_bind():
+    async with get_celery_session_context() as session:
+        return session.get_bind()
+
+
+class TestRunAsync:
+    def test_reuses_one_loop_across_calls(self):
+        first = run_async(_current_loop())
+        second = run_async(_current_loop())
+        assert first is second
+        assert not first.is_closed()
+
+    def test_new_loop_after_fork(self, monkeypatch):
+        parent_loop = run_async(_current_loop())
+        monkeypatch.setattr(worker_runtime.os, "getpid", lambda: -1)
+
+        child_loop = run_async(_current_loop())
+        assert child_loop is not parent_loop
+        parent_loop.close()
+
+    def test_shutdown_closes_loop_and_engine(self):
+        loop = run_async(_current_loop())
+        shutdown_worker_runtime()
+        assert loop.is_closed()
+        assert database._worker_engine is None
+
+
+class TestCelerySessionContext:
+    def test_worker_loop_sessions_share_pooled_engine(self):
+        first = run_async(_session_bind())
+        second = run_async(_session_bind())
+        assert first is second
+        assert first is database._worker_engine.sync_engine
+
+    @pytest.mark.asyncio
+    async def test_other_loops_use_throwaway_engine(self):
+        run_async_engine = database._worker_engine
+        bind = await _session_bind()
+        assert run_async_engine is None or bind is not run_async_engine.sync_engine
+        assert bind.pool.__class__.__name__ == "NullPool"
+
+
+class _DeferredTagBackend:
+    """Tag invalidation that needs several loop iterations, like a Redis round-trip."""
+
+    def __init__(self):
+        self.tagged = {"rfp:9": {"rfps:detail:9"}}
+
+    async def invalidate_tags(self, tags):
+        await asyncio.sleep(0.01)
+        removed = set().union(*(self.tagged.pop(tag, set()) for tag in tags))
+        return len(removed)
+
+
+async def _commit_rfp_change():
+    # What the after_commit listener sees once a task's session commits.
+    cache_tags._after_commit(SimpleNamespace(info={"cache_invalidation_tags": {"rfp:9"}}))
+    return "done"
+
+
+class TestCacheInvalidationDrain:
+    def test_commit_hook_invalidation_finishes_before_run_async_returns(self, monkeypatch):
+        backend = _DeferredTagBackend()
+        monkeypatch.setattr(cache_service, "_cache_backend", backend)
+
+        assert run_async(_commit_rfp_change()) == "done"
+        assert backend.tagged == {}
+        assert not cache_service._pending_invalidations
@@ -28,6 +28,94 @@ def make_service() -> EmailIngestService:
     )
 
 
+class FakeIMAP:
+    """Minimal IMAP server double that answers UID SEARCH/FETCH like imaplib."""
+
+    def __init__(self, messages: dict[int, dict], uid_validity: int = 777):
+        self.messages = messages
+        self.uid_validity = uid_validity
+        self.calls: list[tuple[str, str]] = []
+
+    def login(self, *_):
+        return "OK", [b"Logged in"]
+
+    def select(self, *_args, **_kwargs):
+        return "OK", [str(len(self.messages)).encode()]
+
+    def response(self, code):
+        return code, [str(self.uid_validity).encode()]
+
+    def logout(self):
+        return "BYE", []
+
+    def uid(self, command, *args):
+        if command == "SEARCH":
+            criteria = args[1]
+            self.calls.append(("SEARCH", criteria))
+            uids = sorted(self.messages)
+            if criteria.startswith("UID "):
+                low = int(criteria.split()[1].split(":")[0])
+                uids = [u for u in uids if u >= low] or uids[-1:]
+            return "OK", [" ".join(str(u) for u in uids).encode()]
+
+        uid_set, items = args
+        self.calls.append(("FETCH", f"{uid_set} {items}"))
+        data: list = []
+        for seq, uid in enumerate(int(u) for u in uid_set.split(",")):
+            message = self.messages[uid]
+            if "BODYSTRUCTURE" in items:
+                header = message["header"]
+                prefix = (
+                    f"{seq + 1} (UID {uid} BODYSTRUCTURE {message['structure']} "
+                    f"BODY[HEADER.FIELDS (MESSAGE-ID SUBJECT FROM DATE)] {{{len(header)}}}"
+                )
+                data.extend([(prefix.encode(), header), b")"])
+            else:
+                chunks = []
+                for number, payload in message["parts"].items():
+                    if f"BODY.PEEK[{number}]" in items:
+                        chunks.append((number, payload))
+                first = True
+                for number, payload in chunks:
+                    lead = f"{seq + 1} (UID {uid} " if first else " "
+                    data.append((f"{lead}BODY[{number}] {{{len(payload)}}}".encode(), payload))
+                    first = False
+                data.append(b")")
+        return "OK", data
+
+
+def _header(uid: int, subject: str) -> bytes:
+    return (
+        f"Message-ID: <msg-{uid}@example.com>\r\n"
+        f"Subject: {subject}\r\n"
+        "From: Contracting Officer <ko@gsa.gov>\r\n"
+        "Date: Fri, 14 Feb 2026 14:00:00 +0000\r\n\r\n"
+    ).encode()
+
+
+def _plain_message(uid: int) -> dict:
+    return {
+        "header": _header(uid, f"Message {uid}"),
+        "structure": '("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 9 1 NIL NIL NIL NIL)',
+        "parts": {"1": f"Body {uid}".encode()},
+    }
+
+
+def _message_with_attachment(uid: int, subject: str) -> dict:
+    return {
+        "header": _header(uid, subject),
+        "structure": (
+            '(("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 20 1 NIL NIL NIL NIL)'
+            '("TEXT" "PLAIN" ("NAME" "sow.txt") NIL NIL "BASE64" 36 1 NIL '
+            '("ATTACHMENT" ("FILENAME" "sow.txt")) NIL NIL) "MIXED" ("BOUNDARY" "b1") NIL NIL NIL)'
+        ),
+        "parts": {
+            "1": b"Please see attached.",
+            "2": b"U3RhdGVtZW50IG9mIHdvcmsgZGV0YWlscw==",
+        },
+    }
+
+
 def make_simple_text_message(subject: str, body: str, sender: str = "sender@gov.mil") -> Message:
     """Create a plain-text non-multipart email."""
     msg = Message()
@@ -369,18 +457,63 @@ class TestFetchSync:
 
     def test_respects_limit(self):
         svc = make_service()
-        mock_conn = MagicMock()
-        # 10 unseen messages, limit=3
-        msg_ids = b" ".join(str(i).encode() for i in range(1, 11))
-        mock_conn.search.return_value = (None, [msg_ids])
-        mock_conn.select.return_value = (None, None)
-        mock_conn.fetch.return_value = (None, None)
+        conn = FakeIMAP({uid: _plain_message(uid) for uid in range(1, 11)})
 
-        with patch("app.services.email_ingest_service.imaplib.IMAP4_SSL", return_value=mock_conn):
-            svc._fetch_sync("INBOX", 3)
+        with patch("app.services.email_ingest_service.imaplib.IMAP4_SSL", return_value=conn):
+            result = svc._fetch_sync("INBOX", 3)
+
+        assert [msg["uid"] for msg in result] == [1, 2, 3]
+        # One batched header fetch and one batched body fetch, not one per message.
+        assert [call[0] for call in conn.calls] == ["SEARCH", "FETCH", "FETCH"]
+        assert svc.last_uid == 3
+
+    def test_incremental_fetch_uses_watermark(self):
+        svc = make_service()
+        svc.uid_validity = 777
+        svc.last_uid = 8
+        conn = FakeIMAP({uid: _plain_message(uid) for uid in range(1, 11)})
+
+        with patch("app.services.email_ingest_service.imaplib.IMAP4_SSL", return_value=conn):
+            result = svc._fetch_sync("INBOX", 50)
+
+        assert conn.calls[0] == ("SEARCH", "UID 9:*")
+        assert [msg["uid"] for msg in result] == [9, 10]
+        assert svc.last_uid == 10
+
+    def test_uidvalidity_change_resets_watermark(self):
+        svc = make_service()
+        svc.uid_validity = 1
+        svc.last_uid = 500
+        conn = FakeIMAP({4: _plain_message(4)})
+
+        with patch("app.services.email_ingest_service.imaplib.IMAP4_SSL", return_value=conn):
+            result = svc._fetch_sync("INBOX", 50)
+
+        assert conn.calls[0] == ("SEARCH", "UNSEEN")
+        assert [msg["uid"] for msg in result] == [4]
+        assert svc.uid_validity == 777
+
+    def test_attachments_downloaded_only_when_filter_accepts(self):
+        svc = make_service()
+        svc.download_attachments = lambda parsed: "RFP" in parsed["subject"]
+        conn = FakeIMAP(
+            {
+                1: _message_with_attachment(1, "RFP W912-26-R-0001"),
+                2: _message_with_attachment(2, "Team lunch"),
+            }
+        )
+
+        with patch("app.services.email_ingest_service.imaplib.IMAP4_SSL", return_value=conn):
+            result = svc._fetch_sync("INBOX", 50)
 
-        # fetch called 3 times (once per limited id)
-        assert mock_conn.fetch.call_count == 3
+        rfp, lunch = result
+        assert rfp["body_text"] == "Please see attached."
+        assert rfp["attachment_names"] == ["sow.txt"]
+        assert rfp["attachment_text"] == "Statement of work details"
+        assert lunch["attachment_names"] == ["sow.txt"]
+        assert lunch["attachment_text"] == ""
+        attachment_fetches = [call for call in conn.calls if "BODY.PEEK[2]" in call[1]]
+        assert attachment_fetches == [("FETCH", "1 (UID BODY.PEEK[2])")]
 
 
 # =============================================================================
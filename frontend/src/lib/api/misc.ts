@@ -614,14 +614,31 @@ export const versionApi = {
   compareSectionVersions: async (
     sectionId: number,
     versionA: number,
-    versionB: number
+    versionB: number,
+    options: { granularity?: "word" | "line"; includeContent?: boolean } = {}
   ): Promise<{
     section_id: number;
-    version_a: { version_number: number; content: string; word_count: number; created_at: string };
-    version_b: { version_number: number; content: string; word_count: number; created_at: string };
+    version_a: { version_number: number; content?: string; word_count: number; created_at: string };
+    version_b: { version_number: number; content?: string; word_count: number; created_at: string };
+    granularity: "word" | "line";
+    hunks: {
+      op: "replace" | "insert" | "delete";
+      a_start: number;
+      a_end: number;
+      b_start: number;
+      b_end: number;
+      removed: string;
+      added: string;
+    }[];
+    stats: { inserted_words: number; deleted_words: number; unchanged_words: number };
   }> => {
     const { data } = await api.get(`/versions/sections/${sectionId}/compare`, {
-      params: { version_a: versionA, version_b: versionB },
+      params: {
+        version_a: versionA,
+        version_b: versionB,
+        granularity: options.granularity,
+        include_content: options.includeContent,
+      },
     });
     return data;
   },
@@ -19,6 +19,7 @@ export const signalApi = {
     unread_only?: boolean;
     limit?: number;
     offset?: number;
+    cursor?: string;
   }): Promise<SignalListResponse> => {
     const { data } = await api.get("/signals/feed", { params });
     return data;
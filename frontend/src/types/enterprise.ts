@@ -17,6 +17,8 @@ export interface WebhookDelivery {
   status: string;
   response_code: number | null;
   response_body: string | null;
+  attempt_count: number;
+  next_attempt_at: string | null;
   created_at: string;
   delivered_at: string | null;
 }
@@ -19,6 +19,7 @@ export interface MarketSignal {
 export interface SignalListResponse {
   signals: MarketSignal[];
   total: number;
+  next_cursor?: string | null;
 }
 
 export interface SignalSubscription {
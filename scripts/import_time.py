@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cold-start import benchmark for the API and per-queue Celery workers.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``
+(best of ``RFP_IMPORT_RUNS`` runs). The script reports wall time and the
+slowest modules. It fails if a target exceeds its budget or pulls in a heavy
+SDK listed in ``app.lazy_imports.HEAVY_MODULES``.
+
+Usage (from the repository root):
+
+    python scripts/import_time.py                  # all targets
+    python scripts/import_time.py api worker:webhooks
+    RFP_IMPORT_BUDGET_API=3.5 python scripts/import_time.py api
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# Seconds; override per target with RFP_IMPORT_BUDGET_<TARGET> (":" -> "_").
+DEFAULT_BUDGETS = {
+    "api": 6.0,
+    "worker": 3.0,
+    "worker:webhooks": 2.5,
+    "worker:ingest": 2.5,
+    "worker:generation": 2.5,
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+from app.lazy_imports import HEAVY_MODULES
+heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+print("IMPORT_RESULT " + json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+_WORKER_CODE = "from app.tasks.celery_app import celery_app\ncelery_app.loader.import_default_modules()"
+
+
+def _target_code(target: str) -> tuple[str, dict[str, str]]:
+    if target == "api":
+        return "import app.main", {}
+    if target == "worker":
+        return _WORKER_CODE, {"CELERY_WORKER_QUEUES": ""}
+    if target.startswith("worker:"):
+        return _WORKER_CODE, {"CELERY_WORKER_QUEUES": target.split(":", 1)[1]}
+    raise SystemExit(f"Unknown target {target!r}; use api, worker or worker:<queue>")
+
+
+def _run_once(target: str) -> tuple[dict, str]:
+    code, env_overrides = _target_code(target)
+    env = {**os.environ, **env_overrides}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(code=code)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("IMPORT_RESULT "):
+            return json.loads(line.removeprefix("IMPORT_RESULT ")), proc.stderr
+    raise SystemExit(f"{target}: import failed\n{proc.stderr[-2000:]}")
+
+
+def _slowest_modules(importtime_log: str, limit: int) -> list[tuple[int, str]]:
+    rows = []
+    for line in importtime_log.splitlines():
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def _budget(target: str) -> float:
+    key = "RFP_IMPORT_BUDGET_" + target.upper().replace(":", "_")
+    default = DEFAULT_BUDGETS.get(target, DEFAULT_BUDGETS["worker"])
+    return float(os.getenv(key, default))
+
+
+def main(argv: list[str]) -> int:
+    targets = argv or list(DEFAULT_BUDGETS)
+    runs = int(os.getenv("RFP_IMPORT_RUNS", "3"))
+    top = int(os.getenv("RFP_IMPORT_TOP", "10"))
+    failed = False
+
+    for target in targets:
+        best: tuple[dict, str] | None = None
+        for _ in range(runs):
+            result, log = _run_once(target)
+            if best is None or result["seconds"] < best[0]["seconds"]:
+                best = (result, log)
+        result, log = best
+        budget = _budget(target)
+        over = result["seconds"] > budget
+        status = "OVER BUDGET" if over else "ok"
+        print(f"{target}: {result['seconds']:.2f}s (budget {budget:.2f}s) {status}")
+        for cumulative_us, name in _slowest_modules(log, top):
+            print(f"    {cumulative_us / 1e6:7.3f}s  {name}")
+        if result["heavy"]:
+            print(f"    heavy SDKs imported at startup: {', '.join(result['heavy'])}")
+        failed = failed or over or bool(result["heavy"])
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))